@@ -0,0 +1,118 @@
+import os
+import logging
+from src.utils.logging_utils import setup_logger
+from typing import Any, Dict
+
+
+class ArtifactConfigError(Exception):
+    pass
+
+
+# Configure the logger
+logger = setup_logger(__name__, "transform_data.log", level=logging.DEBUG)
+
+# Supported formats for the intermediate artifacts in data/processed and
+# the compression codecs each of them accepts. "none" disables writing
+# the artifacts entirely.
+ARTIFACT_FORMATS = {
+    "csv": [],
+    "parquet": ["snappy", "zstd", "none"],
+    "feather": ["zstd", "lz4", "none"],
+    "none": [],
+}
+
+DEFAULT_COMPRESSION = {
+    "parquet": "snappy",
+    "feather": "zstd",
+}
+
+
+def load_artifact_config() -> Dict[str, Dict[str, Any]]:
+    """
+    Load the intermediate artifact configuration from environment variables
+    Set this with the appropriate values in the .env file or in the
+    deployment environment.
+    - ARTIFACT_FORMAT: csv (default), parquet, feather or none
+    - ARTIFACT_COMPRESSION: codec for parquet (snappy, zstd) or
+    feather (zstd, lz4); "none" writes uncompressed files
+    - ARTIFACT_STATISTICS: write parquet column statistics (default false)
+    - ARTIFACT_DIR: directory for the artifacts (default data/processed)
+    - ARTIFACT_WRITER_WORKERS: background threads writing the artifacts
+    during transform_data(); 0 writes them in-line (default 2)
+    - ARTIFACT_WRITER_QUEUE_SIZE: artifacts that may be waiting to be
+    written before the pipeline blocks (default 4)
+    :return: Dictionary containing the artifact parameters.
+    """
+    artifact_format = os.getenv("ARTIFACT_FORMAT", "csv").lower()
+
+    config = {
+        "artifacts": {
+            "format": artifact_format,
+            "compression": os.getenv(
+                "ARTIFACT_COMPRESSION",
+                DEFAULT_COMPRESSION.get(artifact_format, "none")
+            ).lower(),
+            "statistics": os.getenv(
+                "ARTIFACT_STATISTICS", "false"
+            ).lower() in ["1", "true", "yes"],
+            "directory": os.getenv("ARTIFACT_DIR", "data/processed"),
+            "writer_workers": os.getenv("ARTIFACT_WRITER_WORKERS", "2"),
+            "writer_queue_size": os.getenv(
+                "ARTIFACT_WRITER_QUEUE_SIZE", "4"
+            ),
+        },
+    }
+
+    validate_artifact_config(config)
+
+    return config
+
+
+def validate_artifact_config(config):
+    artifact_config = config["artifacts"]
+    artifact_format = artifact_config["format"]
+
+    if artifact_format not in ARTIFACT_FORMATS:
+        logger.setLevel(logging.ERROR)
+        logger.error(
+            "Configuration error: artifacts format must be one of "
+            f"{list(ARTIFACT_FORMATS)}, got '{artifact_format}'"
+        )
+        raise ArtifactConfigError(
+            "Configuration error: artifacts format must be one of "
+            f"{list(ARTIFACT_FORMATS)}, got '{artifact_format}'"
+        )
+
+    codecs = ARTIFACT_FORMATS[artifact_format]
+    if codecs and artifact_config["compression"] not in codecs:
+        logger.setLevel(logging.ERROR)
+        logger.error(
+            f"Configuration error: {artifact_format} artifacts compression "
+            f"must be one of {codecs}, "
+            f"got '{artifact_config['compression']}'"
+        )
+        raise ArtifactConfigError(
+            f"Configuration error: {artifact_format} artifacts compression "
+            f"must be one of {codecs}, "
+            f"got '{artifact_config['compression']}'"
+        )
+
+    validate_integer(artifact_config, "writer_workers", minimum=0)
+    validate_integer(artifact_config, "writer_queue_size", minimum=1)
+
+
+def validate_integer(artifact_config, key, minimum):
+    try:
+        artifact_config[key] = int(artifact_config[key])
+        if artifact_config[key] < minimum:
+            raise ValueError
+    except ValueError:
+        logger.setLevel(logging.ERROR)
+        logger.error(
+            f"Configuration error: artifacts {key} must be an integer "
+            f">= {minimum}, got '{artifact_config[key]}'"
+        )
+        raise ArtifactConfigError(
+            f"Configuration error: artifacts {key} must be an integer "
+            f">= {minimum}, got '{artifact_config[key]}'"
+        )
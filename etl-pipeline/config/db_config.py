@@ -1,7 +1,7 @@
 import os
 import logging
 from src.utils.logging_utils import setup_logger
-from typing import Dict
+from typing import Any, Dict
 
 
 class DatabaseConfigError(Exception):
@@ -51,3 +51,67 @@ def validate_db_config(config):
                 raise DatabaseConfigError(
                     f"Configuration error: {db_key} {key} is set to 'error'"
                 )
+
+
+def load_db_pool_config() -> Dict[str, Dict[str, Any]]:
+    """
+    Load the connection pool settings of the shared database engine from
+    environment variables
+    - DB_POOL_SIZE: connections kept open in the pool (default 5)
+    - DB_POOL_MAX_OVERFLOW: extra connections opened under load
+    (default 5)
+    - DB_POOL_PRE_PING: test each connection before handing it out so
+    connections dropped by the server are replaced (default true)
+    - DB_POOL_RECYCLE_SECONDS: replace connections older than this;
+    -1 never recycles them (default 1800)
+    :return: Dictionary containing the pool parameters.
+    """
+
+    config = {
+        "pool": {
+            "pool_size": os.getenv("DB_POOL_SIZE", "5"),
+            "max_overflow": os.getenv("DB_POOL_MAX_OVERFLOW", "5"),
+            "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower(),
+            "pool_recycle": os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"),
+        },
+    }
+
+    validate_db_pool_config(config)
+
+    return config
+
+
+def validate_db_pool_config(config):
+    pool_config = config["pool"]
+
+    if pool_config["pool_pre_ping"] not in ["true", "false"]:
+        logger.setLevel(logging.ERROR)
+        logger.error(
+            "Configuration error: pool pool_pre_ping must be 'true' or "
+            f"'false', got '{pool_config['pool_pre_ping']}'"
+        )
+        raise DatabaseConfigError(
+            "Configuration error: pool pool_pre_ping must be 'true' or "
+            f"'false', got '{pool_config['pool_pre_ping']}'"
+        )
+    pool_config["pool_pre_ping"] = pool_config["pool_pre_ping"] == "true"
+
+    for key, minimum in [
+        ("pool_size", 1),
+        ("max_overflow", 0),
+        ("pool_recycle", -1),
+    ]:
+        try:
+            pool_config[key] = int(pool_config[key])
+            if pool_config[key] < minimum:
+                raise ValueError
+        except ValueError:
+            logger.setLevel(logging.ERROR)
+            logger.error(
+                f"Configuration error: pool {key} must be an integer "
+                f">= {minimum}, got '{pool_config[key]}'"
+            )
+            raise DatabaseConfigError(
+                f"Configuration error: pool {key} must be an integer "
+                f">= {minimum}, got '{pool_config[key]}'"
+            )
@@ -0,0 +1,79 @@
+import os
+import logging
+from src.utils.logging_utils import setup_logger
+from typing import Any, Dict
+
+
+class ExtractConfigError(Exception):
+    pass
+
+
+# Configure the logger
+logger = setup_logger(__name__, "extract_data.log", level=logging.DEBUG)
+
+# Supported CSV parsing engines:
+# - c: pandas' default C parser
+# - pyarrow: pyarrow's multithreaded CSV reader
+# - chunked: the C parser reading the file in chunks of `chunk_size` rows
+CSV_ENGINES = ["c", "pyarrow", "chunked"]
+
+
+def load_extract_config() -> Dict[str, Dict[str, Any]]:
+    """
+    Load the extract configuration from environment variables
+    Set this with the appropriate values in the .env file or in the
+    deployment environment.
+    - EXTRACT_CSV_ENGINE: one of "c", "pyarrow" or "chunked" (default "c")
+    - EXTRACT_CHUNK_SIZE: rows per chunk for the chunked engine
+    (default 100000)
+    - EXTRACT_MAX_WORKERS: number of sources read concurrently; 1 reads
+    them one after another (default 1)
+    :return: Dictionary containing the extract parameters.
+    """
+
+    config = {
+        "extract": {
+            "csv_engine": os.getenv("EXTRACT_CSV_ENGINE", "c").lower(),
+            "chunk_size": os.getenv("EXTRACT_CHUNK_SIZE", "100000"),
+            "max_workers": os.getenv("EXTRACT_MAX_WORKERS", "1"),
+        },
+    }
+
+    validate_extract_config(config)
+
+    return config
+
+
+def validate_extract_config(config):
+    extract_config = config["extract"]
+
+    if extract_config["csv_engine"] not in CSV_ENGINES:
+        logger.setLevel(logging.ERROR)
+        logger.error(
+            f"Configuration error: extract csv_engine must be one of "
+            f"{CSV_ENGINES}, got '{extract_config['csv_engine']}'"
+        )
+        raise ExtractConfigError(
+            f"Configuration error: extract csv_engine must be one of "
+            f"{CSV_ENGINES}, got '{extract_config['csv_engine']}'"
+        )
+
+    for key in ["chunk_size", "max_workers"]:
+        validate_positive_integer(extract_config, key)
+
+
+def validate_positive_integer(extract_config, key):
+    try:
+        extract_config[key] = int(extract_config[key])
+        if extract_config[key] <= 0:
+            raise ValueError
+    except ValueError:
+        logger.setLevel(logging.ERROR)
+        logger.error(
+            f"Configuration error: extract {key} must be a positive "
+            f"integer, got '{extract_config[key]}'"
+        )
+        raise ExtractConfigError(
+            f"Configuration error: extract {key} must be a positive "
+            f"integer, got '{extract_config[key]}'"
+        )
@@ -0,0 +1,97 @@
+import os
+import logging
+from src.utils.logging_utils import setup_logger
+from typing import Any, Dict
+
+
+class LoadConfigError(Exception):
+    pass
+
+
+# Configure the logger
+logger = setup_logger(__name__, "load_data.log", level=logging.DEBUG)
+
+# Supported load modes:
+# - replace: drop and recreate the live table, then bulk load it
+# - swap: bulk load a staging table, index it and rename it over the
+#   live table in one short transaction
+# - merge: upsert the rows on each table's natural key, only rewriting
+#   rows whose content changed
+LOAD_MODES = ["replace", "swap", "merge"]
+
+
+def load_load_config() -> Dict[str, Dict[str, Any]]:
+    """
+    Load the load stage configuration from environment variables
+    Set this with the appropriate values in the .env file or in the
+    deployment environment.
+    - LOAD_COPY_BATCH_SIZE: rows serialised into the in-memory buffer per
+    write to the COPY stream (default 50000)
+    - LOAD_MODE: "replace", "swap" or "merge" (default "replace")
+    - LOAD_SWAP_RETENTION_HOURS: hours the previous table is kept after a
+    swap so the load can be rolled back; 0 drops it straight away
+    (default 24)
+    - LOAD_SWAP_LOCK_TIMEOUT_MS: longest the swap waits for the lock on
+    the live table before giving up and retrying (default 2000)
+    - LOAD_SWAP_RETRIES: attempts at the swap before failing (default 3)
+    - LOAD_MAX_WORKERS: number of tables loaded concurrently, each on
+    its own pooled connection; 1 loads them one after another (default 1)
+    :return: Dictionary containing the load parameters.
+    """
+
+    config = {
+        "load": {
+            "copy_batch_size": os.getenv("LOAD_COPY_BATCH_SIZE", "50000"),
+            "mode": os.getenv("LOAD_MODE", "replace").lower(),
+            "swap_retention_hours": os.getenv(
+                "LOAD_SWAP_RETENTION_HOURS", "24"
+            ),
+            "swap_lock_timeout_ms": os.getenv(
+                "LOAD_SWAP_LOCK_TIMEOUT_MS", "2000"
+            ),
+            "swap_retries": os.getenv("LOAD_SWAP_RETRIES", "3"),
+            "max_workers": os.getenv("LOAD_MAX_WORKERS", "1"),
+        },
+    }
+
+    validate_load_config(config)
+
+    return config
+
+
+def validate_load_config(config):
+    load_config = config["load"]
+
+    if load_config["mode"] not in LOAD_MODES:
+        logger.setLevel(logging.ERROR)
+        logger.error(
+            f"Configuration error: load mode must be one of {LOAD_MODES}, "
+            f"got '{load_config['mode']}'"
+        )
+        raise LoadConfigError(
+            f"Configuration error: load mode must be one of {LOAD_MODES}, "
+            f"got '{load_config['mode']}'"
+        )
+
+    validate_integer(load_config, "copy_batch_size", minimum=1)
+    validate_integer(load_config, "swap_retention_hours", minimum=0)
+    validate_integer(load_config, "swap_lock_timeout_ms", minimum=1)
+    validate_integer(load_config, "swap_retries", minimum=1)
+    validate_integer(load_config, "max_workers", minimum=1)
+
+
+def validate_integer(load_config, key, minimum):
+    try:
+        load_config[key] = int(load_config[key])
+        if load_config[key] < minimum:
+            raise ValueError
+    except ValueError:
+        logger.setLevel(logging.ERROR)
+        logger.error(
+            f"Configuration error: load {key} must be an integer "
+            f">= {minimum}, got '{load_config[key]}'"
+        )
+        raise LoadConfigError(
+            f"Configuration error: load {key} must be an integer "
+            f">= {minimum}, got '{load_config[key]}'"
+        )
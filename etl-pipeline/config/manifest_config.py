@@ -0,0 +1,22 @@
+import os
+from typing import Dict
+
+
+def load_manifest_config() -> Dict[str, Dict[str, str]]:
+    """
+    Load the run manifest configuration from environment variables
+    Set this with the appropriate values in the .env file or in the
+    deployment environment.
+    - RUN_MANIFEST_PATH: JSON file recording the fingerprints of the raw
+    inputs and produced artifacts of the last successful run
+    (default data/run_manifest.json)
+    :return: Dictionary containing the manifest parameters.
+    """
+
+    config = {
+        "manifest": {
+            "path": os.getenv("RUN_MANIFEST_PATH", "data/run_manifest.json"),
+        },
+    }
+
+    return config
@@ -0,0 +1,86 @@
+import os
+import logging
+from importlib.util import find_spec
+from src.utils.logging_utils import setup_logger
+from src.utils.profiling_utils import PROFILERS
+from typing import Any, Dict
+
+
+class PipelineConfigError(Exception):
+    pass
+
+
+# Configure the logger
+logger = setup_logger(__name__, "etl_pipeline.log", level=logging.DEBUG)
+
+
+def load_pipeline_config() -> Dict[str, Dict[str, Any]]:
+    """
+    Load the pipeline runner configuration from environment variables
+    Set this with the appropriate values in the .env file or in the
+    deployment environment.
+    - PIPELINE_MAX_WORKERS: number of processes running the independent
+    stages of run_etl (extracts, transforms and loads) at once; 1 runs
+    them one after another in the pipeline's process (default 1)
+    - PIPELINE_PROFILER: "none", "cprofile" or "pyinstrument" (needs the
+    pyinstrument package) to capture a profile of every stage that runs
+    next to the run report (default "none")
+    - PIPELINE_REPORT_DIR: directory of the JSON run reports and
+    profiles (default: the directory of the logs)
+    :return: Dictionary containing the pipeline parameters.
+    """
+
+    config = {
+        "pipeline": {
+            "max_workers": os.getenv("PIPELINE_MAX_WORKERS", "1"),
+            "profiler": os.getenv("PIPELINE_PROFILER", "none").lower(),
+            "report_dir": os.getenv("PIPELINE_REPORT_DIR") or None,
+        },
+    }
+
+    validate_pipeline_config(config)
+
+    return config
+
+
+def validate_pipeline_config(config):
+    pipeline_config = config["pipeline"]
+
+    try:
+        pipeline_config["max_workers"] = int(pipeline_config["max_workers"])
+        if pipeline_config["max_workers"] <= 0:
+            raise ValueError
+    except ValueError:
+        logger.setLevel(logging.ERROR)
+        logger.error(
+            "Configuration error: pipeline max_workers must be a positive "
+            f"integer, got '{pipeline_config['max_workers']}'"
+        )
+        raise PipelineConfigError(
+            "Configuration error: pipeline max_workers must be a positive "
+            f"integer, got '{pipeline_config['max_workers']}'"
+        )
+
+    profilers = ["none"] + list(PROFILERS)
+    if pipeline_config["profiler"] not in profilers:
+        logger.setLevel(logging.ERROR)
+        logger.error(
+            f"Configuration error: pipeline profiler must be one of "
+            f"{profilers}, got '{pipeline_config['profiler']}'"
+        )
+        raise PipelineConfigError(
+            f"Configuration error: pipeline profiler must be one of "
+            f"{profilers}, got '{pipeline_config['profiler']}'"
+        )
+
+    if (pipeline_config["profiler"] == "pyinstrument"
+            and find_spec("pyinstrument") is None):
+        logger.setLevel(logging.ERROR)
+        logger.error(
+            "Configuration error: pipeline profiler 'pyinstrument' needs "
+            "the pyinstrument package (pip install pyinstrument)"
+        )
+        raise PipelineConfigError(
+            "Configuration error: pipeline profiler 'pyinstrument' needs "
+            "the pyinstrument package (pip install pyinstrument)"
+        )
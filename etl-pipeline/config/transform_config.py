@@ -0,0 +1,94 @@
+import os
+import logging
+from src.utils.logging_utils import setup_logger
+from typing import Any, Dict
+
+
+class TransformConfigError(Exception):
+    pass
+
+
+# Configure the logger
+logger = setup_logger(__name__, "transform_data.log", level=logging.DEBUG)
+
+TRUE_VALUES = ["1", "true", "yes"]
+FALSE_VALUES = ["0", "false", "no"]
+
+
+def load_transform_config() -> Dict[str, Dict[str, Any]]:
+    """
+    Load the transform configuration from environment variables
+    Set this with the appropriate values in the .env file or in the
+    deployment environment.
+    - TRANSFORM_TEAM_STATS_PARITY_CHECK: also compute the team stats from
+    the merged boxscores/games frame and fail if they differ from the
+    game-level team stats (default false)
+    - TRANSFORM_PARTITION_CACHE: cache the player and team stats of each
+    year in the artifact directory and only recompute the years whose
+    rows changed (default true; needs ARTIFACT_FORMAT other than none)
+    - TRANSFORM_STREAMING: read the boxscores in chunks of
+    EXTRACT_CHUNK_SIZE rows and fold them into running player and team
+    aggregates instead of holding the whole file in memory (default false)
+    - TRANSFORM_MAX_WORKERS: number of processes running the independent
+    transform steps at once; 1 runs them one after another in the
+    pipeline's process (default 1)
+    :return: Dictionary containing the transform parameters.
+    """
+
+    config = {
+        "transform": {
+            "team_stats_parity_check": os.getenv(
+                "TRANSFORM_TEAM_STATS_PARITY_CHECK", "false"
+            ).lower(),
+            "partition_cache": os.getenv(
+                "TRANSFORM_PARTITION_CACHE", "true"
+            ).lower(),
+            "streaming": os.getenv("TRANSFORM_STREAMING", "false").lower(),
+            "max_workers": os.getenv("TRANSFORM_MAX_WORKERS", "1"),
+        },
+    }
+
+    validate_transform_config(config)
+
+    return config
+
+
+def validate_transform_config(config):
+    transform_config = config["transform"]
+
+    for key in ["team_stats_parity_check", "partition_cache", "streaming"]:
+        validate_boolean(transform_config, key)
+
+    validate_positive_integer(transform_config, "max_workers")
+
+
+def validate_boolean(transform_config, key):
+    value = transform_config[key]
+    if value not in TRUE_VALUES + FALSE_VALUES:
+        logger.setLevel(logging.ERROR)
+        logger.error(
+            f"Configuration error: transform {key} must be one of "
+            f"{TRUE_VALUES + FALSE_VALUES}, got '{value}'"
+        )
+        raise TransformConfigError(
+            f"Configuration error: transform {key} must be one of "
+            f"{TRUE_VALUES + FALSE_VALUES}, got '{value}'"
+        )
+    transform_config[key] = value in TRUE_VALUES
+
+
+def validate_positive_integer(transform_config, key):
+    try:
+        transform_config[key] = int(transform_config[key])
+        if transform_config[key] <= 0:
+            raise ValueError
+    except ValueError:
+        logger.setLevel(logging.ERROR)
+        logger.error(
+            f"Configuration error: transform {key} must be a positive "
+            f"integer, got '{transform_config[key]}'"
+        )
+        raise TransformConfigError(
+            f"Configuration error: transform {key} must be a positive "
+            f"integer, got '{transform_config[key]}'"
+        )
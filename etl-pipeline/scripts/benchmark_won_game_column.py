@@ -0,0 +1,65 @@
+import sys
+import timeit
+import numpy as np
+import pandas as pd
+from src.transform.transform_merged_boxscores_games import (
+    add_won_game_column,
+    determine_winner
+)
+
+# Roughly the size of the merged player-by-game frame
+DEFAULT_ROWS = 500_000
+REPEAT = 3
+
+
+def make_merged_frame(rows: int) -> pd.DataFrame:
+    """
+    Build a synthetic merged boxscores/games frame with the columns
+    used by the won_game computation.
+
+    Args:
+        rows (int): Number of rows to generate.
+
+    Returns:
+        pd.DataFrame: Synthetic merged frame.
+    """
+    rng = np.random.default_rng(0)
+    teams = np.array([f"Team {i}" for i in range(30)])
+    home_team = rng.choice(teams, rows)
+    away_team = rng.choice(teams, rows)
+    return pd.DataFrame({
+        "team_name": pd.Categorical(
+            np.where(rng.random(rows) < 0.5, home_team, away_team)
+        ),
+        "home_team": home_team,
+        "away_team": away_team,
+        "points_home": rng.integers(80, 130, rows, dtype="int16"),
+        "points_away": rng.integers(80, 130, rows, dtype="int16"),
+    })
+
+
+def add_won_game_column_apply(data: pd.DataFrame) -> pd.DataFrame:
+    # The original row-wise implementation
+    data["won_game"] = data.apply(determine_winner, axis=1)
+    return data
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    data = make_merged_frame(rows)
+
+    results = {}
+    for name, func in [
+        ("apply", add_won_game_column_apply),
+        ("vectorised", add_won_game_column),
+    ]:
+        results[name] = min(
+            timeit.repeat(lambda: func(data.copy()), number=1, repeat=REPEAT)
+        )
+        print(f"{name:>10}: {results[name]:.4f} seconds ({rows} rows)")
+
+    print(f"   speedup: {results['apply'] / results['vectorised']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import sys
+from functools import partial
+from config.env_config import setup_env
+from config.db_config import load_db_config
+from src.load.load_tables import record_table_rollback
+from src.utils.bulk_load_utils import restore_previous_table
+from src.utils.database_utils import get_db_connection
+from src.utils.logging_utils import setup_logger
+from src.utils.schema_utils import set_schema
+
+# Configure the logger
+logger = setup_logger("load_data", "load_data.log")
+
+
+def main():
+    """
+    Roll a table back to the version it had before the last swap load,
+    e.g. `python -m scripts.rollback_load prod aa_team_stats`. Only
+    possible within LOAD_SWAP_RETENTION_HOURS of the swap. The table's
+    load version is bumped in the same transaction, and its loaded years
+    are forgotten, so the next load replaces it in full.
+    """
+    try:
+        if len(sys.argv) != 3:
+            raise ValueError(
+                "Usage: python -m scripts.rollback_load <env> <table_name>"
+            )
+        setup_env(sys.argv[:2])
+        table_name = sys.argv[2]
+
+        connection = get_db_connection(load_db_config()["target_database"])
+        try:
+            restored = restore_previous_table(
+                connection,
+                table_name,
+                set_schema(),
+                before_commit=partial(record_table_rollback, table_name)
+            )
+        finally:
+            connection.close()
+
+        logger.info(f"Rolled {table_name} back to {restored}")
+    except Exception as e:
+        logger.error(f"Rollback failed: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
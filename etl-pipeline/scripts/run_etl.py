@@ -1,14 +1,51 @@
 import os
 import sys
+import timeit
+from datetime import datetime, timezone
+from functools import partial
 from config.env_config import setup_env
-from src.extract.extract import extract_data
-from src.transform.transform import transform_data
+from config.artifact_config import load_artifact_config
+from config.db_config import load_db_config
+from config.load_config import load_load_config
+from config.manifest_config import load_manifest_config
+from config.pipeline_config import PipelineConfigError, load_pipeline_config
+from config.transform_config import load_transform_config
+from src.extract.extract import EXTRACTORS, SOURCE_FILES
+from src.transform.transform import build_transform_graph
 from src.load.load_player_stats import load_player_stats
 from src.load.load_team_stats import load_team_stats
 from src.load.load_player_info_and_salaries import (
     load_player_info_and_salaries
 )
-from src.utils.logging_utils import setup_logger
+from src.load.load_tables import TABLE_LOADERS, load_tables_concurrently
+from src.utils.artifact_utils import (
+    background_artifact_writer,
+    get_artifact_path,
+    read_artifact
+)
+from src.utils.dag_utils import (
+    Graph,
+    NodeCache,
+    get_node_outputs,
+    get_target_frames,
+    run_graph,
+    select_upstream
+)
+from src.utils.database_utils import get_pool_status
+from src.utils.logging_utils import get_log_directory, setup_logger
+from src.utils.manifest_utils import (
+    check_stage,
+    fingerprint_code,
+    fingerprint_files,
+    load_manifest,
+    record_stage,
+    save_manifest
+)
+from src.utils.profiling_utils import (
+    ProfileSettings,
+    ProfilingError,
+    write_run_report
+)
 
 # Configure the logger
 log_base_path = os.getenv("LOG_BASE_PATH")
@@ -18,41 +55,448 @@ logger = setup_logger(
     base_path=log_base_path
 )
 
+# Command line flag that reruns every stage regardless of the manifest
+FORCE_FLAG = "--force"
+# Command line option naming the stages or frames to produce, e.g.
+# "--only team_stats"; the stages they depend on run too
+ONLY_FLAG = "--only"
+
+# The pipeline's code, whose fingerprint is part of every stage's key, so
+# a stage reruns once the code producing it changes
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CODE_DIRECTORIES = ["config", "scripts", "src"]
+
+# The frames loaded into the tables of TABLE_LOADERS, in the same order
+LOADED_FRAMES = ["player_stats", "team_stats", "merged_playerinfo_salaries"]
+
 
 def main():
+    report = start_run_report(sys.argv[1:])
     try:
         # Get the argument from the run_etl command and set up the environment
-        setup_env(sys.argv)
+        force, only, env_argv = parse_args(sys.argv)
+        setup_env(env_argv)
         env = os.getenv("ENV", "unknown")
 
         logger.info(f"Starting ETL pipeline in {env} environment")
 
-        logger.info("Beginning data extraction phase")
-        extracted_data = extract_data()
-        logger.info("Data extraction phase completed")
-        logger.info(
-            f"ETL pipeline completed successfully in {env} environment"
+        # The manifest records what each stage's last successful run
+        # consumed and produced, so unchanged stages can be skipped
+        manifest_path = load_manifest_config()["manifest"]["path"]
+        manifest = load_manifest(manifest_path)
+
+        graph = build_pipeline_graph(force)
+        keep = []
+        if only:
+            keep = get_target_frames(graph, only)
+            graph = select_upstream(graph, only)
+            logger.info(f"Running the stages needed for {only}: {list(graph)}")
+
+        frames = run_pipeline(
+            graph, manifest, manifest_path, force, report, keep
         )
-        logger.info("Beginning the data transformation phase")
-        transformed_data = transform_data(extracted_data)
-        logger.info("Data transformation phase completed")
-
-        logger.info("Beginning data loading phase")
-        # Load player stats into Pagila
-        load_player_stats(transformed_data[4])
-        # Load team stats into Pagila
-        load_team_stats(transformed_data[5])
-        # Load player info and salaries into Pagila
-        load_player_info_and_salaries(transformed_data[6])
-        logger.info("Data loading phase completed")
+
         logger.info(
             f"ETL pipeline completed successfully in {env} environment"
         )
 
-        return transformed_data
+        report["status"] = "succeeded"
+        return frames
     except Exception as e:
+        report["error"] = str(e)
         logger.error(f"ETL pipeline failed: {str(e)}")
         sys.exit(1)
+    finally:
+        save_run_report(report)
+
+
+def start_run_report(args):
+    """
+    Start the report of a run, completed by `run_pipeline` and written
+    by `save_run_report`.
+
+    Args:
+        args (List[str]): The command line arguments.
+
+    Returns:
+        Dict[str, Any]: The report.
+    """
+    started_at = datetime.now(timezone.utc)
+    return {
+        "run_id": started_at.strftime("%Y%m%dT%H%M%S%fZ"),
+        "started_at": started_at.isoformat(),
+        "args": list(args),
+        "status": "failed",
+        "error": None,
+        "start_time": timeit.default_timer(),
+        "stages": [],
+    }
+
+
+def get_report_dir():
+    report_dir = load_pipeline_config()["pipeline"]["report_dir"]
+    return report_dir or str(get_log_directory(log_base_path))
+
+
+def save_run_report(report):
+    """
+    Write the run report as JSON next to the logs, or in
+    PIPELINE_REPORT_DIR. A report that cannot be written is logged
+    rather than failing the run.
+
+    Args:
+        report (Dict[str, Any]): The report, see `start_run_report`.
+    """
+    report["finished_at"] = datetime.now(timezone.utc).isoformat()
+    report["wall_seconds"] = (
+        timeit.default_timer() - report.pop("start_time")
+    )
+    try:
+        report_path = write_run_report(report, get_report_dir())
+        logger.info(f"Run report written to {report_path}")
+    except (ProfilingError, PipelineConfigError) as e:
+        logger.error(f"Run report not written: {e}")
+
+
+def parse_args(argv):
+    """
+    Split the command line flags of run_etl from the environment name.
+
+    Args:
+        argv (List[str]): The command line, e.g.
+        ["run_etl", "test", "--only", "team_stats"].
+
+    Raises:
+        ValueError: If --only is not followed by a stage or frame name.
+
+    Returns:
+        Tuple[bool, List[str], List[str]]: Whether --force was given,
+        the stages or frames given to --only (comma separated or
+        repeated) and the remaining arguments for `setup_env`.
+    """
+    force = False
+    only = []
+    remaining = []
+    args = iter(argv)
+    for arg in args:
+        if arg == FORCE_FLAG:
+            force = True
+        elif arg == ONLY_FLAG:
+            value = next(args, None)
+            if not value or value.startswith("--"):
+                raise ValueError(
+                    f"{ONLY_FLAG} needs a stage or frame name, "
+                    f"e.g. {ONLY_FLAG} team_stats"
+                )
+            only.extend(name for name in value.split(",") if name)
+        else:
+            remaining.append(arg)
+    return force, only, remaining
+
+
+def get_target():
+    # The database the load stages write to, which they are cached on
+    target_db = load_db_config()["target_database"]
+    return (
+        f"{target_db['user']}@{target_db['host']}:{target_db['port']}"
+        f"/{target_db['dbname']}"
+    )
+
+
+def get_load_key():
+    # The load stages are also cached on how they write the tables
+    load_mode = load_load_config()["load"]["mode"]
+    return f"{get_target()}|mode:{load_mode}"
+
+
+def run_load(loader, *frames):
+    # Each process running loads has its own connection pool, so its
+    # status is logged by the process that ran the load, not the parent
+    loader(*frames)
+    target_db = load_db_config()["target_database"]
+    logger.info(f"Database pool status: {get_pool_status(target_db)}")
+
+
+def load_tables_together(player_stats, team_stats, player_info_and_salaries,
+                         max_workers):
+    # Load the three tables at once, committing only if all succeed
+    load_tables_concurrently(
+        dict(zip(
+            TABLE_LOADERS,
+            [player_stats, team_stats, player_info_and_salaries]
+        )),
+        max_workers
+    )
+
+
+def build_pipeline_graph(force) -> Graph:
+    """
+    Declare every stage of the pipeline and the frames it reads and
+    produces: one extract_* stage per raw CSV, the clean_*, merge_* and
+    get_*_stats stages of the transform, and the load_* stages.
+
+    Args:
+        force (bool): Whether --force was given.
+
+    Returns:
+        Graph: The stages, see `src.utils.dag_utils`.
+    """
+    streaming = load_transform_config()["transform"]["streaming"]
+    transform_graph = build_transform_graph(force, streaming)
+
+    # When streaming, nothing reads the extracted box scores
+    consumed = {
+        frame
+        for node in transform_graph.values()
+        for frame in node["inputs"]
+    }
+    graph = {
+        f"extract_{name}": {
+            "function": extractor,
+            "inputs": [],
+            "outputs": [name],
+        }
+        for name, extractor in EXTRACTORS.items()
+        if name in consumed
+    }
+    graph.update(transform_graph)
+
+    max_workers = load_load_config()["load"]["max_workers"]
+    if max_workers > 1:
+        graph["load_tables"] = {
+            "function": partial(
+                run_load,
+                partial(load_tables_together, max_workers=max_workers)
+            ),
+            "inputs": list(LOADED_FRAMES),
+            "outputs": [],
+            "key": get_load_key,
+        }
+    else:
+        for name, loader, frame in zip(
+            ["load_player_stats", "load_team_stats",
+             "load_player_info_and_salaries"],
+            [load_player_stats, load_team_stats,
+             load_player_info_and_salaries],
+            LOADED_FRAMES
+        ):
+            graph[name] = {
+                "function": partial(run_load, loader),
+                "inputs": [frame],
+                "outputs": [],
+                "key": get_load_key,
+            }
+
+    return graph
+
+
+def should_skip_stage(manifest, stage, inputs, force, key=""):
+    """
+    Decide whether a stage can be skipped and log the decision.
+
+    Args:
+        manifest (Dict[str, Any]): The run manifest.
+        stage (str): Name of the stage.
+        inputs (Dict[str, Optional[str]]): Current input hashes.
+        force (bool): Whether --force was given.
+        key (str): Anything else the stage's result depends on.
+
+    Returns:
+        bool: True if the stage's cached outputs can be reused.
+    """
+    if force:
+        logger.info(f"Running {stage} stage: {FORCE_FLAG} given")
+        return False
+
+    up_to_date, reason = check_stage(manifest, stage, inputs, key)
+    if up_to_date:
+        logger.info(f"Skipping {stage} stage: {reason}")
+    else:
+        logger.info(f"Running {stage} stage: {reason}")
+    return up_to_date
+
+
+class ManifestCache(NodeCache):
+    """
+    Skips the stages whose last successful run, as recorded in the run
+    manifest, read the same raw CSVs and artifacts and whose artifacts
+    are still on disk unchanged; their output is read back from the
+    artifacts when a stage that does run needs it.
+
+    The extract stages are not cached: the transform stages reading
+    their output are cached on the raw CSVs instead, and an extract
+    only runs when one of them does.
+    """
+
+    def __init__(self, graph, manifest, manifest_path, force,
+                 artifact_writer=None):
+        self.graph = graph
+        self.manifest = manifest
+        self.manifest_path = manifest_path
+        self.force = force
+        self.artifact_writer = artifact_writer
+        self.code_fingerprint = None
+        self.artifact_config = load_artifact_config()["artifacts"]
+        self.enabled = self.artifact_config["format"] != "none"
+        if not self.enabled:
+            logger.info(
+                "Running every stage: artifact writing is disabled, "
+                "so there are no cached outputs to reuse"
+            )
+
+    def get_artifact_path(self, frame):
+        return get_artifact_path(
+            frame,
+            self.artifact_config["format"],
+            self.artifact_config["directory"]
+        )
+
+    def get_input_hashes(self, name):
+        node = self.graph[name]
+        paths = [
+            SOURCE_FILES[frame] if frame in SOURCE_FILES
+            else self.get_artifact_path(frame)
+            for frame in node["inputs"]
+        ]
+        return fingerprint_files(self.manifest, paths + node.get("files", []))
+
+    def flush_artifacts(self):
+        # The artifacts of finished stages must be on disk to be hashed
+        if self.artifact_writer is not None:
+            self.artifact_writer.flush()
+
+    def get_key(self, name):
+        # A callable key is only evaluated once the stage is reached
+        key = self.graph[name].get("key", "")
+        key = key() if callable(key) else key
+        # The code is fingerprinted once per run
+        if self.code_fingerprint is None:
+            self.code_fingerprint = fingerprint_code(
+                self.manifest, PROJECT_DIR, CODE_DIRECTORIES
+            )
+        return f"{key}|code:{self.code_fingerprint}"
+
+    def is_cacheable(self, name):
+        return self.enabled and bool(self.graph[name]["inputs"])
+
+    def is_fresh(self, name):
+        self.flush_artifacts()
+        return should_skip_stage(
+            self.manifest,
+            name,
+            self.get_input_hashes(name),
+            self.force,
+            self.get_key(name)
+        )
+
+    def read(self, frame):
+        return read_artifact(frame)
+
+    def record(self, name):
+        self.flush_artifacts()
+        node = self.graph[name]
+        record_stage(
+            self.manifest,
+            name,
+            self.get_input_hashes(name),
+            [
+                self.get_artifact_path(frame)
+                for frame in get_node_outputs(name, node)
+            ],
+            self.get_key(name)
+        )
+        save_manifest(self.manifest, self.manifest_path)
+
+
+def run_pipeline(
+    graph, manifest, manifest_path, force, report=None, keep=None
+):
+    """
+    Run the stages of the pipeline in dependency order, skipping those
+    whose inputs are unchanged since their last successful run. With
+    PIPELINE_MAX_WORKERS above 1, independent stages run at the same
+    time in a process pool.
+
+    Each stage is recorded in the manifest as soon as it succeeds, so a
+    failed run resumes from the failed stage.
+
+    Args:
+        graph (Graph): The stages, see `build_pipeline_graph`.
+        manifest (Dict[str, Any]): The run manifest.
+        manifest_path (str): Path of the manifest JSON file.
+        force (bool): Whether --force was given.
+        report (Optional[Dict[str, Any]]): Run report to add the
+        measurements of every stage to, see `start_run_report`.
+        keep (Optional[List[str]]): Names of the frames to return; every
+        other frame is dropped once no stage left to run reads it.
+
+    Returns:
+        Dict[str, Any]: The frames to keep, by name.
+    """
+    pipeline_config = load_pipeline_config()["pipeline"]
+    max_workers = pipeline_config["max_workers"]
+
+    profile = None
+    if pipeline_config["profiler"] != "none" and report is not None:
+        profile = ProfileSettings(
+            pipeline_config["profiler"],
+            os.path.join(get_report_dir(), "profiles", report["run_id"])
+        )
+
+    logger.info(f"Running {len(graph)} stages (max_workers={max_workers})")
+    metrics = {}
+    cache = None
+    try:
+        # Intermediate artifacts are written in the background while the
+        # next stage runs
+        with background_artifact_writer() as artifact_writer:
+            cache = ManifestCache(
+                graph, manifest, manifest_path, force, artifact_writer
+            )
+            frames = run_graph(
+                graph, {}, max_workers, cache, profile, metrics, keep
+            )
+            if artifact_writer is not None:
+                artifact_writer.flush()
+    finally:
+        if report is not None:
+            report["max_workers"] = max_workers
+            report["profiler"] = pipeline_config["profiler"]
+            report["stages"] = get_stage_reports(graph, metrics, cache)
+    logger.info("All stages completed")
+
+    return frames
+
+
+def get_stage_reports(graph, metrics, cache):
+    """
+    List what each stage did for the run report.
+
+    Args:
+        graph (Graph): The stages.
+        metrics (Dict[str, Dict[str, Any]]): The stages' measurements,
+        see `run_graph`.
+        cache (Optional[ManifestCache]): The stages' cache, which knows
+        where their artifacts are.
+
+    Returns:
+        List[Dict[str, Any]]: The status of each stage ('ran', 'skipped'
+        or 'not run'), and for those that ran their measurements and the
+        size of the artifacts holding their outputs.
+    """
+    stages = []
+    for name, node in graph.items():
+        stage = {"stage": name, "status": "not run"}
+        stage.update(metrics.get(name, {}))
+        if stage["status"] == "ran":
+            stage["bytes_written"] = 0
+            if cache is not None and cache.enabled:
+                for frame in get_node_outputs(name, node):
+                    path = cache.get_artifact_path(frame)
+                    if os.path.exists(path):
+                        stage["bytes_written"] += os.path.getsize(path)
+        stages.append(stage)
+    return stages
 
 
 if __name__ == "__main__":
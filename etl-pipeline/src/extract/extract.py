@@ -1,35 +1,147 @@
-from src.extract.extract_boxscores import extract_boxscores
-from src.extract.extract_games import extract_games
-from src.extract.extract_playerinfo import extract_playerinfo
-from src.extract.extract_salaries import extract_salaries
+import timeit
+from concurrent.futures import (
+    FIRST_EXCEPTION,
+    ThreadPoolExecutor,
+    wait
+)
+from config.extract_config import load_extract_config
+from src.extract import (
+    extract_boxscores,
+    extract_games,
+    extract_playerinfo,
+    extract_salaries
+)
 from src.utils.logging_utils import setup_logger
 
 
 # Configure the logger
 logger = setup_logger("extract_data", "extract_data.log")
 
+# The extractors in the order of the tuple returned by extract_data()
+EXTRACTORS = {
+    "box_scores": extract_boxscores.extract_boxscores,
+    "games": extract_games.extract_games,
+    "player_info": extract_playerinfo.extract_playerinfo,
+    "salaries": extract_salaries.extract_salaries,
+}
 
-def extract_data():
+# The raw CSV each extractor reads
+SOURCE_FILES = {
+    "box_scores": extract_boxscores.FILE_PATH,
+    "games": extract_games.FILE_PATH,
+    "player_info": extract_playerinfo.FILE_PATH,
+    "salaries": extract_salaries.FILE_PATH,
+}
+
+
+def extract_data(skip=()):
     """
     Function which executes the extraction process
 
+    The sources are read one after another, or concurrently in a thread
+    pool when EXTRACT_MAX_WORKERS is greater than 1.
+
+    Args:
+        skip (Iterable[str]): Sources in EXTRACTORS not to read, e.g.
+        "box_scores" when the transform streams them from the raw CSV.
+
     Returns:
-        Tuple: A tuple containing all the extracted DataFrames
+        Tuple: A tuple containing all the extracted DataFrames, with None
+        for the skipped sources
     """
     try:
         logger.info("Starting data extraction process")
-        # Extract the box scores data
-        box_scores = extract_boxscores()
-        games = extract_games()
-        player_info = extract_playerinfo()
-        salaries = extract_salaries()
+        max_workers = load_extract_config()["extract"]["max_workers"]
+        start_time = timeit.default_timer()
 
+        names = [name for name in EXTRACTORS if name not in skip]
+        if max_workers > 1:
+            extracted = extract_sources_concurrently(max_workers, names)
+        else:
+            extracted = extract_sources_sequentially(names)
+
+        extract_execution_time = timeit.default_timer() - start_time
         logger.info(
-            "Data extraction completed successfully"
+            "Data extraction completed successfully in "
+            f"{extract_execution_time} seconds (max_workers={max_workers})"
         )
 
-        return (box_scores, games, player_info, salaries)
+        return tuple(extracted.get(name) for name in EXTRACTORS)
 
     except Exception as e:
         logger.error(f"Data extraction failed: {e}")
         raise
+
+
+def run_extractor(name):
+    """
+    Run a single extractor and log how long it took.
+
+    Args:
+        name (str): Name of the source in EXTRACTORS.
+
+    Returns:
+        pd.DataFrame: DataFrame containing the extracted source.
+    """
+    start_time = timeit.default_timer()
+    data = EXTRACTORS[name]()
+    logger.info(
+        f"Extracted {name} in {timeit.default_timer() - start_time} seconds"
+    )
+    return data
+
+
+def extract_sources_sequentially(names=None):
+    """
+    Extract every source one after another.
+
+    Args:
+        names (Optional[List[str]]): Sources to extract; all by default.
+
+    Returns:
+        Dict[str, pd.DataFrame]: The extracted DataFrames keyed by source.
+    """
+    if names is None:
+        names = list(EXTRACTORS)
+    return {name: run_extractor(name) for name in names}
+
+
+def extract_sources_concurrently(max_workers, names=None):
+    """
+    Extract every source in a thread pool. The CSV parsers release the
+    GIL while parsing, so the reads overlap and the wall time is close
+    to the slowest single source.
+
+    If a source fails, the sources that have not started yet are
+    cancelled and the first error is raised.
+
+    Args:
+        max_workers (int): Number of worker threads.
+        names (Optional[List[str]]): Sources to extract; all by default.
+
+    Raises:
+        Exception: The error raised by the first failing extractor.
+
+    Returns:
+        Dict[str, pd.DataFrame]: The extracted DataFrames keyed by source.
+    """
+    if names is None:
+        names = list(EXTRACTORS)
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers,
+        thread_name_prefix="extract"
+    )
+    try:
+        futures = {
+            name: executor.submit(run_extractor, name)
+            for name in names
+        }
+        done, _ = wait(futures.values(), return_when=FIRST_EXCEPTION)
+
+        for future in done:
+            if future.exception() is not None:
+                raise future.exception()
+
+        return {name: future.result() for name, future in futures.items()}
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -8,6 +8,8 @@ from src.utils.kaggle_utils import (
 import logging
 import timeit
 from src.utils.logging_utils import setup_logger, log_extract_success
+from src.utils.csv_reader_utils import read_source_csv
+from config.extract_config import load_extract_config
 
 # Define the file path for the box scores CSV file
 FILE_PATH = "data/raw/boxscore.csv"
@@ -19,6 +21,9 @@ TYPE = "BOX SCORES from KAGGLE"
 
 EXPECTED_PERFORMANCE = 1
 
+# Name of the source in the schema registry
+SOURCE = "boxscores"
+
 
 def extract_csvs():
     """
@@ -53,8 +58,14 @@ def extract_boxscores() -> pd.DataFrame:
     # Performance analysis
     start_time = timeit.default_timer()
     try:
-        # Read the downloaded CSV file
-        box_scores = pd.read_csv(FILE_PATH)
+        # Read the downloaded CSV file with the configured engine
+        extract_config = load_extract_config()["extract"]
+        box_scores = read_source_csv(
+            FILE_PATH,
+            SOURCE,
+            engine=extract_config["csv_engine"],
+            chunk_size=extract_config["chunk_size"]
+        )
         extract_boxscores_execution_time = timeit.default_timer() - start_time
 
         # Logging
@@ -64,6 +75,7 @@ def extract_boxscores() -> pd.DataFrame:
             box_scores.shape,
             extract_boxscores_execution_time,
             EXPECTED_PERFORMANCE,
+            extract_config["csv_engine"],
         )
         return box_scores
     except Exception as e:
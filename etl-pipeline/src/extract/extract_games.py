@@ -2,6 +2,8 @@ import pandas as pd
 import logging
 import timeit
 from src.utils.logging_utils import setup_logger, log_extract_success
+from src.utils.csv_reader_utils import read_source_csv
+from config.extract_config import load_extract_config
 
 # Define the file path for the games CSV file
 FILE_PATH = "data/raw/games.csv"
@@ -13,6 +15,9 @@ TYPE = "GAMES from KAGGLE"
 
 EXPECTED_PERFORMANCE = 1
 
+# Name of the source in the schema registry
+SOURCE = "games"
+
 
 def extract_games() -> pd.DataFrame:
     """
@@ -29,8 +34,14 @@ def extract_games() -> pd.DataFrame:
     # Performance analysis
     start_time = timeit.default_timer()
     try:
-        # Read the downloaded CSV file
-        games = pd.read_csv(FILE_PATH)
+        # Read the downloaded CSV file with the configured engine
+        extract_config = load_extract_config()["extract"]
+        games = read_source_csv(
+            FILE_PATH,
+            SOURCE,
+            engine=extract_config["csv_engine"],
+            chunk_size=extract_config["chunk_size"]
+        )
         extract_games_execution_time = timeit.default_timer() - start_time
 
         # Logging
@@ -40,6 +51,7 @@ def extract_games() -> pd.DataFrame:
             games.shape,
             extract_games_execution_time,
             EXPECTED_PERFORMANCE,
+            extract_config["csv_engine"],
         )
         return games
     except Exception as e:
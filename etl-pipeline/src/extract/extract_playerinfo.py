@@ -2,6 +2,8 @@ import pandas as pd
 import logging
 import timeit
 from src.utils.logging_utils import setup_logger, log_extract_success
+from src.utils.csv_reader_utils import read_source_csv
+from config.extract_config import load_extract_config
 
 # Define the file path for the player info CSV file
 FILE_PATH = "data/raw/player_info.csv"
@@ -13,6 +15,9 @@ TYPE = "PLAYER INFORMATION from KAGGLE"
 
 EXPECTED_PERFORMANCE = 1
 
+# Name of the source in the schema registry
+SOURCE = "player_info"
+
 
 def extract_playerinfo() -> pd.DataFrame:
     """
@@ -30,8 +35,14 @@ def extract_playerinfo() -> pd.DataFrame:
     start_time = timeit.default_timer()
 
     try:
-        # Read the downloaded CSV file
-        player_info = pd.read_csv(FILE_PATH)
+        # Read the downloaded CSV file with the configured engine
+        extract_config = load_extract_config()["extract"]
+        player_info = read_source_csv(
+            FILE_PATH,
+            SOURCE,
+            engine=extract_config["csv_engine"],
+            chunk_size=extract_config["chunk_size"]
+        )
         extract_playerinfo_execution_time = timeit.default_timer() - start_time
 
         # Logging
@@ -41,6 +52,7 @@ def extract_playerinfo() -> pd.DataFrame:
             player_info.shape,
             extract_playerinfo_execution_time,
             EXPECTED_PERFORMANCE,
+            extract_config["csv_engine"],
         )
         return player_info
     except Exception as e:
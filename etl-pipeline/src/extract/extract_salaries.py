@@ -2,6 +2,8 @@ import pandas as pd
 import logging
 import timeit
 from src.utils.logging_utils import setup_logger, log_extract_success
+from src.utils.csv_reader_utils import read_source_csv
+from config.extract_config import load_extract_config
 
 # Define the file path for the salaries CSV file
 FILE_PATH = "data/raw/salaries.csv"
@@ -13,6 +15,9 @@ TYPE = "SALARIES from KAGGLE"
 
 EXPECTED_PERFORMANCE = 1
 
+# Name of the source in the schema registry
+SOURCE = "salaries"
+
 
 def extract_salaries() -> pd.DataFrame:
     """
@@ -30,8 +35,14 @@ def extract_salaries() -> pd.DataFrame:
     start_time = timeit.default_timer()
 
     try:
-        # Read the downloaded CSV file
-        salaries = pd.read_csv(FILE_PATH)
+        # Read the downloaded CSV file with the configured engine
+        extract_config = load_extract_config()["extract"]
+        salaries = read_source_csv(
+            FILE_PATH,
+            SOURCE,
+            engine=extract_config["csv_engine"],
+            chunk_size=extract_config["chunk_size"]
+        )
         extract_salaries_execution_time = timeit.default_timer() - start_time
 
         # Logging
@@ -41,6 +52,7 @@ def extract_salaries() -> pd.DataFrame:
             salaries.shape,
             extract_salaries_execution_time,
             EXPECTED_PERFORMANCE,
+            extract_config["csv_engine"],
         )
         return salaries
     except Exception as e:
@@ -1,14 +1,27 @@
 import pandas as pd
 from sqlalchemy import Connection
+from sqlalchemy.exc import SQLAlchemyError
 from config.db_config import load_db_config, DatabaseConfigError
+from config.load_config import load_load_config, LoadConfigError
 from src.utils.database_utils import (
-    get_db_connection,
+    get_pooled_connection,
     DatabaseConnectionError,
     QueryExecutionError
 )
 from src.utils.table_exists_utils import log_table_action
+from src.utils.bulk_load_utils import (
+    BulkLoadError,
+    TableSwapError,
+    load_table
+)
+from src.utils.merge_load_utils import merge_table
+from src.utils.load_version_utils import record_load_versions
 from src.utils.logging_utils import setup_logger
 from src.utils.schema_utils import set_schema
+from src.utils.table_schema_utils import (
+    TableSchemaError,
+    get_table_schema
+)
 
 
 schema = set_schema()
@@ -18,52 +31,109 @@ logger = setup_logger("load_data", "load_data.log")
 
 TABLE_NAME = "aa_player_info_and_salaries"
 
+# Column types, primary key and indexes of the table
+TABLE_SCHEMA = get_table_schema(TABLE_NAME)
+
+# Columns of the secondary indexes built on the table after loading
+INDEXES = TABLE_SCHEMA["indexes"]
+
+# Columns identifying a row, which the merge load mode upserts on
+NATURAL_KEY = TABLE_SCHEMA["primary_key"]
+
 
 def create_player_info_and_salaries(
-    player_info_and_salaries: pd.DataFrame
-) -> None:
+    player_info_and_salaries: pd.DataFrame,
+    connection: Connection | None = None
+) -> bool:
     """
     Loads the player information and salaries DataFrame into the target
     database.
+    With LOAD_MODE=merge, the DataFrame is merged on NATURAL_KEY
+    instead of replacing the table.
+
+    When a connection is given, the load runs in the caller's
+    transaction: the caller commits or rolls back and closes the
+    connection, and in swap mode only the staging table is built so the
+    caller can swap it in.
+
+    Otherwise the table's load version is bumped in the transaction of
+    the load, so the dashboards see the new rows and the new version
+    together.
 
     Args:
         player_info_and_salaries (pd.DataFrame): DataFrame containing
         player info and salary data.
+        connection (Connection | None): Connection to load with;
+        one is checked out of the pool by default.
 
     Raises:
         QueryExecutionError: If there is an error connecting to the database,
         executing the SQL query, or with database configuration.
+
+    Returns:
+        bool: True if a staging table was built and is left for the
+        caller to swap in.
     """
     if player_info_and_salaries.empty:
         logger.warning("No data to load, DataFrame is empty.")
-        return
+        return False
 
-    connection: Connection | None = None
+    owns_connection = connection is None
+    swap_pending = False
     try:
-        # Get a connection to the pagila database
-        connection_details = load_db_config()["target_database"]
-        connection = get_db_connection(connection_details)
+        if owns_connection:
+            # Check out a connection to the pagila database from the pool
+            connection_details = load_db_config()["target_database"]
+            connection = get_pooled_connection(connection_details)
 
         # Check if table exists
-        table_exists = log_table_action(connection, TABLE_NAME)
-
-        # Load player info and salaries into pagila
-        player_info_and_salaries.to_sql(
-            TABLE_NAME,
-            con=connection,
-            schema=schema,
-            if_exists="replace",
-            index=False
-        )
+        load_mode = load_load_config()["load"]["mode"]
+        table_exists = log_table_action(connection, TABLE_NAME, load_mode)
+
+        if load_mode == "merge":
+            # Only apply the rows that were added, changed or removed
+            merge_table(
+                connection,
+                player_info_and_salaries,
+                TABLE_NAME,
+                schema,
+                NATURAL_KEY,
+                INDEXES
+            )
+            logger.info(f"Data successfully merged into {TABLE_NAME} table.")
+        else:
+            # Bulk load player info and salaries into pagila with COPY
+            load_table(
+                connection,
+                player_info_and_salaries,
+                TABLE_NAME,
+                schema,
+                INDEXES,
+                load_mode,
+                defer_swap=not owns_connection
+            )
+            swap_pending = load_mode == "swap" and not owns_connection
+
+            action = (
+                "staged for" if swap_pending
+                else "swapped into" if load_mode == "swap"
+                else "replaced with" if table_exists
+                else "created and loaded into"
+            )
+            logger.info(f"Data successfully {action} {TABLE_NAME} table.")
 
-        action = "replaced with" if table_exists else "created and loaded into"
-        logger.info(f"Data successfully {action} {TABLE_NAME} table.")
+        if owns_connection:
+            record_load_versions(connection, [TABLE_NAME], schema)
+            connection.commit()
 
-        connection.commit()
+        return swap_pending
 
     except DatabaseConfigError as e:
         logger.error(f"Target database not configured correctly: {e}")
         raise QueryExecutionError(f"Database configuration error: {e}")
+    except LoadConfigError as e:
+        logger.error(f"Load stage not configured correctly: {e}")
+        raise QueryExecutionError(f"Load configuration error: {e}")
     except DatabaseConnectionError as e:
         logger.error(
             "Failed to connect to the database"
@@ -71,9 +141,15 @@ def create_player_info_and_salaries(
             f" {e}"
         )
         raise QueryExecutionError(f"Database connection failed: {e}")
-    except pd.errors.DatabaseError as e:
+    except (
+        pd.errors.DatabaseError,
+        SQLAlchemyError,
+        BulkLoadError,
+        TableSchemaError,
+        TableSwapError
+    ) as e:
         logger.error(f"Failed to create player info and salaries table: {e}")
         raise QueryExecutionError(f"Failed to execute query: {e}")
     finally:
-        if connection and hasattr(connection, "close"):
+        if owns_connection and connection and hasattr(connection, "close"):
             connection.close()
@@ -1,14 +1,37 @@
 import pandas as pd
 from sqlalchemy import Connection
+from sqlalchemy.exc import SQLAlchemyError
 from config.db_config import load_db_config, DatabaseConfigError
+from config.load_config import load_load_config, LoadConfigError
+from config.transform_config import (
+    load_transform_config,
+    TransformConfigError
+)
 from src.utils.database_utils import (
-    get_db_connection,
+    get_pooled_connection,
     DatabaseConnectionError,
     QueryExecutionError
 )
 from src.utils.table_exists_utils import log_table_action
+from src.utils.bulk_load_utils import (
+    BulkLoadError,
+    TableSwapError,
+    has_declared_definition,
+    load_table
+)
+from src.utils.partition_load_utils import (
+    get_changed_partitions,
+    record_loaded_partitions,
+    replace_partitions
+)
+from src.utils.merge_load_utils import merge_table
+from src.utils.load_version_utils import record_load_versions
 from src.utils.logging_utils import setup_logger
 from src.utils.schema_utils import set_schema
+from src.utils.table_schema_utils import (
+    TableSchemaError,
+    get_table_schema
+)
 
 
 schema = set_schema()
@@ -18,58 +41,160 @@ logger = setup_logger("load_data", "load_data.log")
 
 TABLE_NAME = "aa_team_stats"
 
+# Column types, primary key and indexes of the table
+TABLE_SCHEMA = get_table_schema(TABLE_NAME)
 
-def create_team_stats(team_stats: pd.DataFrame) -> None:
+# Columns of the secondary indexes built on the table after loading
+INDEXES = TABLE_SCHEMA["indexes"]
+
+# Columns identifying a row, which the merge load mode upserts on
+NATURAL_KEY = TABLE_SCHEMA["primary_key"]
+
+
+def create_team_stats(
+    team_stats: pd.DataFrame,
+    connection: Connection | None = None
+) -> bool:
     """
     Loads team statistics into the target database.
 
+    In the replace mode with TRANSFORM_PARTITION_CACHE on, when the
+    table already exists with its declared definition and the years last
+    loaded into it are recorded, only the years whose rows changed since
+    are replaced; otherwise the whole table is replaced, or swapped in
+    with LOAD_MODE=swap. With LOAD_MODE=merge, the DataFrame is merged
+    on NATURAL_KEY instead.
+
+    When a connection is given, the load runs in the caller's
+    transaction: the caller commits or rolls back and closes the
+    connection, and in swap mode only the staging table is built so the
+    caller can swap it in. The caller also records the loaded years and
+    the load version, see `load_tables_concurrently`.
+
+    Otherwise the loaded years are recorded and the table's load version
+    is bumped in the transaction of the load, so the years of a failed
+    load are retried by the next run and the dashboards see the new rows
+    and the new version together.
+
     Args:
         team_stats (pd.DataFrame): DataFrame containing
         aggregated team statistics.
+        connection (Connection | None): Connection to load with;
+        one is checked out of the pool by default.
 
     Raises:
         QueryExecutionError: If there is an error connecting to the database,
         executing the SQL query, or with database configuration.
+
+    Returns:
+        bool: True if a staging table was built and is left for the
+        caller to swap in.
 """
     if team_stats.empty:
         logger.warning("No data to load, DataFrame is empty.")
-        return
+        return False
 
-    connection: Connection | None = None
+    owns_connection = connection is None
+    swap_pending = False
     try:
-        # Get a connection to the pagila database
-        connection_details = load_db_config()["target_database"]
-        connection = get_db_connection(connection_details)
+        if owns_connection:
+            # Check out a connection to the pagila database from the pool
+            connection_details = load_db_config()["target_database"]
+            connection = get_pooled_connection(connection_details)
 
         # Check if table exists
-        table_exists = log_table_action(connection, TABLE_NAME)
-
-        # Load team_stats into pagila
-        team_stats.to_sql(
-            TABLE_NAME,
-            con=connection,
-            schema=schema,
-            if_exists="replace",
-            index=False
+        load_mode = load_load_config()["load"]["mode"]
+        table_exists = log_table_action(connection, TABLE_NAME, load_mode)
+
+        # Single years are only rewritten in the replace mode with the
+        # partition cache on; swap and merge always load the whole frame.
+        # A table created before its definition was declared is rebuilt
+        # in full once, with its declared types, primary key and indexes.
+        replace_by_partition = (
+            table_exists
+            and load_mode == "replace"
+            and load_transform_config()["transform"]["partition_cache"]
+            and has_declared_definition(connection, TABLE_NAME, schema)
         )
+        changed_partitions = (
+            get_changed_partitions(connection, team_stats, TABLE_NAME, schema)
+            if replace_by_partition else None
+        )
+        if load_mode == "merge":
+            # Only apply the rows that were added, changed or removed
+            merge_table(
+                connection,
+                team_stats,
+                TABLE_NAME,
+                schema,
+                NATURAL_KEY,
+                INDEXES
+            )
+            logger.info(f"Data successfully merged into {TABLE_NAME} table.")
+        elif table_exists and changed_partitions is not None:
+            # Only rewrite the years that changed since the last load
+            replace_partitions(
+                connection,
+                team_stats,
+                TABLE_NAME,
+                schema,
+                changed_partitions
+            )
+            logger.info(f"Data successfully upserted into {TABLE_NAME} table.")
+        else:
+            # Bulk load team stats into pagila with COPY
+            load_table(
+                connection,
+                team_stats,
+                TABLE_NAME,
+                schema,
+                INDEXES,
+                load_mode,
+                defer_swap=not owns_connection
+            )
+            swap_pending = load_mode == "swap" and not owns_connection
+
+            action = (
+                "staged for" if swap_pending
+                else "swapped into" if load_mode == "swap"
+                else "replaced with" if table_exists
+                else "created and loaded into"
+            )
+            logger.info(f"Data successfully {action} {TABLE_NAME} table.")
 
-        action = "replaced with" if table_exists else "created and loaded into"
-        logger.info(f"Data successfully {action} {TABLE_NAME} table.")
+        if owns_connection:
+            record_loaded_partitions(
+                connection, team_stats, TABLE_NAME, schema
+            )
+            record_load_versions(connection, [TABLE_NAME], schema)
+            connection.commit()
 
-        connection.commit()
+        return swap_pending
 
     except DatabaseConfigError as e:
         logger.error(f"Target database not configured correctly: {e}")
         raise QueryExecutionError(f"Database configuration error: {e}")
+    except LoadConfigError as e:
+        logger.error(f"Load stage not configured correctly: {e}")
+        raise QueryExecutionError(f"Load configuration error: {e}")
+    except TransformConfigError as e:
+        logger.error(f"Transform stage not configured correctly: {e}")
+        raise QueryExecutionError(f"Transform configuration error: {e}")
     except DatabaseConnectionError as e:
         logger.error(
             "Failed to connect to the database when creating team stats table:"
             f" {e}"
         )
         raise QueryExecutionError(f"Database connection failed: {e}")
-    except pd.errors.DatabaseError as e:
+    except (
+        pd.errors.DatabaseError,
+        SQLAlchemyError,
+        BulkLoadError,
+        TableSchemaError,
+        TableSwapError
+    ) as e:
         logger.error(f"Failed to create team stats table: {e}")
         raise QueryExecutionError(f"Failed to execute query: {e}")
     finally:
-        if connection and hasattr(connection, "close"):
+        if owns_connection and connection and hasattr(connection, "close"):
             connection.close()
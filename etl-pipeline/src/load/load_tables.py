@@ -0,0 +1,363 @@
+import timeit
+import pandas as pd
+from functools import partial
+from concurrent.futures import (
+    FIRST_EXCEPTION,
+    ThreadPoolExecutor,
+    wait
+)
+from typing import Any, Dict, List, Optional
+from sqlalchemy import Connection
+from config.db_config import load_db_config
+from config.load_config import load_load_config
+from src.load import (
+    create_player_info_and_salaries,
+    create_player_stats,
+    create_team_stats
+)
+from src.utils.bulk_load_utils import (
+    drop_expired_backups,
+    swap_in_staging_tables
+)
+from src.utils.database_utils import get_pooled_connection
+from src.utils.load_version_utils import (
+    create_load_versions_table,
+    record_load_versions
+)
+from src.utils.logging_utils import setup_logger
+from src.utils.partition_load_utils import (
+    clear_loaded_partitions,
+    create_loaded_partitions_table,
+    record_loaded_partitions
+)
+from src.utils.schema_utils import set_schema
+
+
+class TableLoadError(Exception):
+    pass
+
+
+schema = set_schema()
+
+# Setup the logger
+logger = setup_logger("load_data", "load_data.log")
+
+# The loader of each table, in the order the tables are loaded
+TABLE_LOADERS = {
+    create_player_stats.TABLE_NAME: create_player_stats.create_player_stats,
+    create_team_stats.TABLE_NAME: create_team_stats.create_team_stats,
+    create_player_info_and_salaries.TABLE_NAME: (
+        create_player_info_and_salaries.create_player_info_and_salaries
+    ),
+}
+
+# Tables whose loaded years are recorded, so later loads only replace the
+# years that changed
+PARTITIONED_TABLES = [
+    create_player_stats.TABLE_NAME,
+    create_team_stats.TABLE_NAME,
+]
+
+
+def run_table_load(
+    table_name: str,
+    data: pd.DataFrame,
+    connection: Connection
+) -> Dict[str, Any]:
+    """
+    Load a single table in the transaction of the given connection and
+    log how long it took.
+
+    Args:
+        table_name (str): Name of the table in TABLE_LOADERS.
+        data (pd.DataFrame): Rows to load.
+        connection (Connection): Connection the table is loaded with.
+
+    Returns:
+        Dict[str, Any]: The load time in seconds and whether the table's
+        staging table still has to be swapped in.
+    """
+    start_time = timeit.default_timer()
+    swap_pending = TABLE_LOADERS[table_name](data, connection=connection)
+    seconds = timeit.default_timer() - start_time
+    logger.info(f"Loaded {table_name} in {seconds} seconds")
+    return {"seconds": seconds, "swap_pending": swap_pending}
+
+
+def load_tables_concurrently(
+    tables: Dict[str, Optional[pd.DataFrame]],
+    max_workers: int
+) -> Dict[str, float]:
+    """
+    Load several tables at once from a thread pool, each on its own
+    connection checked out of the shared pool. COPY spends its time in
+    the database server, so the loads overlap and the wall time is close
+    to the slowest single table.
+
+    Each table is loaded in its own transaction, and the transactions
+    are only committed once every table has loaded; if one fails, they
+    are all rolled back. Each table's rows are committed together with
+    its loaded years and its new load version, so these always describe
+    the rows the table holds and the dashboards refresh their caches.
+
+    In swap mode the workers only build the staging tables, which are
+    then swapped in together, with their loaded years and load versions,
+    in a single transaction. Otherwise the transactions of the workers
+    are committed one after another, as PostgreSQL cannot commit several
+    connections at once: if a commit fails, the tables committed before
+    it keep their new rows and the others are rolled back.
+
+    Args:
+        tables (Dict[str, Optional[pd.DataFrame]]): Rows to load keyed by
+        table name in TABLE_LOADERS; None or empty DataFrames are skipped.
+        max_workers (int): Number of worker threads.
+
+    Raises:
+        TableLoadError: If any table fails to load, in which case none of
+        the tables are changed, or if a commit fails, in which case only
+        the tables it names as committed are changed.
+        TableSwapError: If the staging tables cannot be swapped in, in
+        which case none of the staged tables are changed.
+
+    Returns:
+        Dict[str, float]: Seconds spent loading each table.
+    """
+    load_config = load_load_config()["load"]
+    connection_details = load_db_config()["target_database"]
+
+    tables_to_load = {}
+    for table_name, data in tables.items():
+        if data is None or data.empty:
+            logger.warning(
+                f"No data to load into {table_name} - "
+                "DataFrame is empty or None"
+            )
+        else:
+            tables_to_load[table_name] = data
+
+    # The loads only commit once they have all finished, so none of them
+    # may wait for another to commit
+    if tables_to_load:
+        create_load_record_tables(connection_details)
+
+    connections: Dict[str, Connection] = {}
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers,
+        thread_name_prefix="load"
+    )
+    try:
+        # Each load holds its connection until every table has loaded
+        for table_name in tables_to_load:
+            connections[table_name] = get_pooled_connection(
+                connection_details
+            )
+
+        futures = {
+            table_name: executor.submit(
+                run_table_load,
+                table_name,
+                data,
+                connections[table_name]
+            )
+            for table_name, data in tables_to_load.items()
+        }
+        wait(futures.values(), return_when=FIRST_EXCEPTION)
+
+        # Let the loads already running finish before rolling back
+        executor.shutdown(wait=True, cancel_futures=True)
+        errors = [
+            f"{table_name}: {future.exception()}"
+            for table_name, future in futures.items()
+            if not future.cancelled() and future.exception() is not None
+        ]
+        if errors:
+            for connection in connections.values():
+                connection.rollback()
+            logger.error(
+                "Load failed, no table was changed: " + "; ".join(errors)
+            )
+            raise TableLoadError(
+                "Load failed, no table was changed: " + "; ".join(errors)
+            )
+
+        results = {
+            table_name: future.result()
+            for table_name, future in futures.items()
+        }
+        staged_tables = [
+            table_name for table_name, result in results.items()
+            if result["swap_pending"]
+        ]
+
+        # Each table's loaded years and load version are written in the
+        # transaction that changes its rows
+        for table_name, connection in connections.items():
+            if table_name not in staged_tables:
+                record_table_load(
+                    connection, table_name, tables_to_load[table_name]
+                )
+        commit_connections(connections)
+
+        if staged_tables:
+            swap_in_staged_tables(
+                {
+                    table_name: tables_to_load[table_name]
+                    for table_name in staged_tables
+                },
+                load_config,
+                connection_details
+            )
+
+        return {
+            table_name: result["seconds"]
+            for table_name, result in results.items()
+        }
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        for connection in connections.values():
+            connection.close()
+
+
+def create_load_record_tables(connection_details: Dict[str, Any]) -> None:
+    """
+    Create the tables recording the load versions and the loaded
+    partitions unless they exist, and commit them on a connection of
+    their own. Loads that commit together then never create them, which
+    would make each load wait for the others' commit, so forever.
+
+    Args:
+        connection_details (Dict[str, Any]): Target database parameters.
+    """
+    connection = get_pooled_connection(connection_details)
+    try:
+        create_load_versions_table(connection, schema)
+        create_loaded_partitions_table(connection, schema)
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def record_table_load(
+    connection: Connection,
+    table_name: str,
+    data: pd.DataFrame
+) -> None:
+    """
+    Record the loaded years of a table, if it is partitioned, and bump
+    its load version, in the connection's current transaction.
+
+    Args:
+        connection (Connection): Connection of the transaction that
+        changes the table.
+        table_name (str): Name of the table.
+        data (pd.DataFrame): Rows loaded into the table.
+    """
+    if table_name in PARTITIONED_TABLES:
+        record_loaded_partitions(connection, data, table_name, schema)
+    record_load_versions(connection, [table_name], schema)
+
+
+def record_table_loads(
+    tables: Dict[str, pd.DataFrame],
+    connection: Connection
+) -> None:
+    """
+    Record the loads of several tables in one transaction, see
+    `record_table_load`.
+
+    Args:
+        tables (Dict[str, pd.DataFrame]): Rows loaded keyed by table name.
+        connection (Connection): Connection of the transaction that
+        changes the tables.
+    """
+    for table_name, data in tables.items():
+        record_table_load(connection, table_name, data)
+
+
+def record_table_rollback(table_name: str, connection: Connection) -> None:
+    """
+    Record the rollback of a table to an earlier version: its loaded
+    years are forgotten, as they no longer describe its rows, and its
+    load version is bumped, in the connection's current transaction.
+
+    Args:
+        table_name (str): Name of the table.
+        connection (Connection): Connection of the transaction that
+        rolls the table back.
+    """
+    if table_name in PARTITIONED_TABLES:
+        clear_loaded_partitions(connection, table_name, schema)
+    record_load_versions(connection, [table_name], schema)
+
+
+def commit_connections(connections: Dict[str, Connection]) -> None:
+    """
+    Commit the transaction of each table's load, one after another.
+
+    Args:
+        connections (Dict[str, Connection]): Connection of each table's
+        load, keyed by table name.
+
+    Raises:
+        TableLoadError: If a commit fails, naming the tables committed
+        before it; the transactions after it are rolled back.
+    """
+    committed: List[str] = []
+    for table_name, connection in connections.items():
+        try:
+            connection.commit()
+        except Exception as e:
+            for remaining in list(connections)[len(committed) + 1:]:
+                connections[remaining].rollback()
+            not_committed = [
+                name for name in connections if name not in committed
+            ]
+            message = (
+                f"Commit of {table_name} failed: {e}; committed "
+                f"{committed}, rolled back {not_committed}"
+            )
+            logger.error(message)
+            raise TableLoadError(message)
+        committed.append(table_name)
+
+
+def swap_in_staged_tables(
+    tables: Dict[str, pd.DataFrame],
+    load_config: Dict[str, Any],
+    connection_details: Dict[str, Any]
+) -> None:
+    """
+    Swap the staging tables built by the workers in together, recording
+    their loaded years and load versions in the same transaction, then
+    drop the backups that are past the rollback window.
+
+    Args:
+        tables (Dict[str, pd.DataFrame]): Rows loaded into each staging
+        table, keyed by the name of the live table.
+        load_config (Dict[str, Any]): The "load" section of the load
+        configuration.
+        connection_details (Dict[str, Any]): Target database parameters.
+
+    Raises:
+        TableSwapError: If the staging tables cannot be swapped in.
+    """
+    connection = get_pooled_connection(connection_details)
+    try:
+        swap_in_staging_tables(
+            connection,
+            list(tables),
+            schema,
+            load_config["swap_lock_timeout_ms"],
+            load_config["swap_retries"],
+            before_commit=partial(record_table_loads, tables)
+        )
+        for table_name in tables:
+            drop_expired_backups(
+                connection,
+                table_name,
+                schema,
+                load_config["swap_retention_hours"]
+            )
+        connection.commit()
+    finally:
+        connection.close()
@@ -1,14 +1,31 @@
 import pandas as pd
-import os
 from src.utils.trimming_whitespace_utils import trim_whitespaces
+from src.utils.artifact_utils import write_artifact
 
-FILE_PATH = "data/processed/cleaned_boxscores.csv"
-
-# Create directory if it does not exist
-os.makedirs(os.path.dirname(FILE_PATH), exist_ok=True)
+# Name of the intermediate artifact written to data/processed
+ARTIFACT_NAME = "cleaned_boxscores"
 
 
 def clean_boxscores(boxscores: pd.DataFrame) -> pd.DataFrame:
+    boxscores = clean_boxscore_rows(boxscores)
+
+    # Save the cleaned dataframe as an intermediate artifact
+    write_artifact(boxscores, ARTIFACT_NAME)
+    return boxscores
+
+
+def clean_boxscore_rows(boxscores: pd.DataFrame) -> pd.DataFrame:
+    """Apply the boxscore cleaning steps without writing the artifact.
+
+    Every step works row by row, so a chunk of the file can be cleaned
+    on its own.
+
+    Args:
+        boxscores (pd.DataFrame): Raw boxscores, or a chunk of them.
+
+    Returns:
+        pd.DataFrame: The cleaned boxscores.
+    """
     # Remove unnecessary columns
     boxscores = remove_unnecessary_columns(boxscores)
     # Change numeric values to 0 where there are any conditions,
@@ -27,8 +44,6 @@ def clean_boxscores(boxscores: pd.DataFrame) -> pd.DataFrame:
     # Calculate free throws percentage
     boxscores = calculate_free_throws_percentage(boxscores)
 
-    # Save the cleaned dataframe as a CSV
-    boxscores.to_csv(FILE_PATH, index=False)
     return boxscores
 
 
@@ -44,9 +59,12 @@ def remove_unnecessary_columns(boxcores: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: A DataFrame with unnecessary columns removed.
     """
     columns_to_drop = ["ORB", "DRB", "STL", "BLK", "TOV", "PF", "+/-"]
+    # The columns are already pruned at extract time by the source
+    # schema registry, so only drop the ones that are still present
     boxcores.drop(
         columns=columns_to_drop,
-        inplace=True
+        inplace=True,
+        errors="ignore"
     )
     return boxcores
 
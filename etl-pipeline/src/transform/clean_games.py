@@ -1,11 +1,9 @@
 import pandas as pd
-import os
 from src.utils.trimming_whitespace_utils import trim_whitespaces
+from src.utils.artifact_utils import write_artifact
 
-FILE_PATH = "data/processed/cleaned_games.csv"
-
-# Create directory if it does not exist
-os.makedirs(os.path.dirname(FILE_PATH), exist_ok=True)
+# Name of the intermediate artifact written to data/processed
+ARTIFACT_NAME = "cleaned_games"
 
 
 def clean_games(games: pd.DataFrame) -> pd.DataFrame:
@@ -21,8 +19,8 @@ def clean_games(games: pd.DataFrame) -> pd.DataFrame:
     games = filter_2016_to_2020(games)
     # Add year column
     games = add_year_column(games)
-    # Save the cleaned dataframe as a CSV
-    games.to_csv(FILE_PATH, index=False)
+    # Save the cleaned dataframe as an intermediate artifact
+    write_artifact(games, ARTIFACT_NAME)
 
     return games
 
@@ -66,8 +64,11 @@ def remove_unnecessary_columns(games: pd.DataFrame) -> pd.DataFrame:
         "isRegular",
         "seasonStartYear"
     ]
+    # Columns pruned at extract time by the source schema registry
+    # are skipped
     new_games = games.drop(
         columns=columns_to_drop,
+        errors="ignore"
     )
     return new_games
 
@@ -1,12 +1,10 @@
 import pandas as pd
-import os
 from src.utils.trimming_whitespace_utils import trim_whitespaces
 from src.utils.remove_special_characters_utils import remove_special_characters
+from src.utils.artifact_utils import write_artifact
 
-FILE_PATH = "data/processed/cleaned_playerinfo.csv"
-
-# Create directory if it does not exist
-os.makedirs(os.path.dirname(FILE_PATH), exist_ok=True)
+# Name of the intermediate artifact written to data/processed
+ARTIFACT_NAME = "cleaned_playerinfo"
 
 
 def clean_playerinfo(playerinfo: pd.DataFrame) -> pd.DataFrame:
@@ -26,8 +24,8 @@ def clean_playerinfo(playerinfo: pd.DataFrame) -> pd.DataFrame:
     playerinfo = trim_whitespaces(playerinfo)
     # Remove special characters from player names
     playerinfo = remove_special_characters(playerinfo)
-    # Save the cleaned dataframe as a CSV
-    playerinfo.to_csv(FILE_PATH, index=False)
+    # Save the cleaned dataframe as an intermediate artifact
+    write_artifact(playerinfo, ARTIFACT_NAME)
     return playerinfo
 
 
@@ -46,7 +44,13 @@ def remove_unnecessary_columns(playerinfo: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: A new DataFrame with the unnecessary columns removed.
     """
     columns_to_drop = ["Colleges", "From", "To"]
-    playerinfo = playerinfo.drop(columns=columns_to_drop, axis="columns")
+    # Columns pruned at extract time by the source schema registry
+    # are skipped
+    playerinfo = playerinfo.drop(
+        columns=columns_to_drop,
+        axis="columns",
+        errors="ignore"
+    )
 
     return playerinfo
 
@@ -1,12 +1,10 @@
 import pandas as pd
-import os
 from src.utils.trimming_whitespace_utils import trim_whitespaces
 from src.utils.remove_special_characters_utils import remove_special_characters
+from src.utils.artifact_utils import write_artifact
 
-FILE_PATH = "data/processed/cleaned_salaries.csv"
-
-# Create directory if it does not exist
-os.makedirs(os.path.dirname(FILE_PATH), exist_ok=True)
+# Name of the intermediate artifact written to data/processed
+ARTIFACT_NAME = "cleaned_salaries"
 
 
 def clean_salaries(salaries: pd.DataFrame) -> pd.DataFrame:
@@ -22,8 +20,8 @@ def clean_salaries(salaries: pd.DataFrame) -> pd.DataFrame:
     salaries = remove_special_characters(salaries)
     # Keep only salaries from 2015 to 2019
     salaries = filter_2015_to_2019(salaries)
-    # Save the cleaned dataframe as a CSV
-    salaries.to_csv(FILE_PATH, index=False)
+    # Save the cleaned dataframe as an intermediate artifact
+    write_artifact(salaries, ARTIFACT_NAME)
 
     return salaries
 
@@ -1,10 +1,8 @@
 import pandas as pd
-import os
+from src.utils.artifact_utils import write_artifact
 
-FILE_PATH = "data/processed/merged_boxscores_games.csv"
-
-# Create directory if it does not exist
-os.makedirs(os.path.dirname(FILE_PATH), exist_ok=True)
+# Name of the intermediate artifact written to data/processed
+ARTIFACT_NAME = "merged_boxscores_games"
 
 
 def merge_boxscores_games(
@@ -31,6 +29,6 @@ def merge_boxscores_games(
         how="inner"
     )
 
-    boxscores_and_games_df.to_csv(FILE_PATH, index=False)
+    write_artifact(boxscores_and_games_df, ARTIFACT_NAME)
 
     return boxscores_and_games_df
@@ -1,10 +1,13 @@
+import logging
 import pandas as pd
-import os
+from src.utils.artifact_utils import write_artifact
+from src.utils.logging_utils import setup_logger
 
-FILE_PATH = "data/processed/merged_playerinfo_salaries.csv"
+# Configure the logger
+logger = setup_logger(__name__, "transform_data.log", level=logging.DEBUG)
 
-# Create directory if it does not exist
-os.makedirs(os.path.dirname(FILE_PATH), exist_ok=True)
+# Name of the intermediate artifact written to data/processed
+ARTIFACT_NAME = "merged_playerinfo_salaries"
 
 
 def merge_playerinfo_salaries(
@@ -15,6 +18,11 @@ def merge_playerinfo_salaries(
     Merge the player information DataFrame with the salaries
     DataFrame on 'player_name'.
 
+    The result holds one row per player and season. Players who share a
+    name cannot be told apart by the merge, which pairs each of them
+    with every namesake's salaries, so no row is kept for a name and
+    season matching several rows, and the dropped names are logged.
+
     Args:
         playerinfo (pd.DataFrame): DataFrame containing player details
         such as height, weight, position, and birth date.
@@ -45,6 +53,22 @@ def merge_playerinfo_salaries(
         "inflation_adjusted_salary"
     ]]
 
-    player_info_and_salaries_df.to_csv(FILE_PATH, index=False)
+    ambiguous = player_info_and_salaries_df.duplicated(
+        subset=["player_name", "season_start_year"], keep=False
+    )
+    if ambiguous.any():
+        names = sorted(
+            player_info_and_salaries_df.loc[ambiguous, "player_name"].unique()
+        )
+        logger.setLevel(logging.WARNING)
+        logger.warning(
+            f"Dropping {int(ambiguous.sum())} rows of players sharing "
+            f"a name and season with another row: {names}"
+        )
+        player_info_and_salaries_df = player_info_and_salaries_df[
+            ~ambiguous
+        ]
+
+    write_artifact(player_info_and_salaries_df, ARTIFACT_NAME)
 
     return player_info_and_salaries_df
@@ -0,0 +1,265 @@
+import numpy as np
+import pandas as pd
+from typing import Iterable, Optional
+
+# Keys of the yearly player stats
+PLAYER_KEYS = ["player_name", "year"]
+
+# Boxscore columns averaged per game, and the decimals of each average
+AVERAGED_COLUMNS = {
+    "points": 1,
+    "assists": 1,
+    "total_rebounds": 1,
+    "field_goals_percentage": 2,
+    "three_point_percentage": 2,
+    "free_throws_percentage": 2,
+}
+
+# Boxscore columns totalled over the year
+TOTALLED_COLUMNS = ["three_pointers"]
+
+# Names of the finalized player stats columns
+PLAYER_STATS_COLUMNS = {
+    "points": "points_per_game",
+    "assists": "assists_per_game",
+    "total_rebounds": "rebounds_per_game",
+    "field_goals_percentage": "field_goal_pct_per_game",
+    "three_point_percentage": "three_point_pct_per_game",
+    "free_throws_percentage": "free_throws_pct_per_game",
+    "three_pointers": "total_three_pointers"
+}
+
+
+class PlayerStatsStateError(Exception):
+    pass
+
+
+def sum_column(column: str) -> str:
+    return f"{column}_sum"
+
+
+def compensation_column(column: str) -> str:
+    return f"{column}_compensation"
+
+
+def count_column(column: str) -> str:
+    return f"{column}_count"
+
+
+def get_state_columns() -> dict:
+    """
+    Columns of a player stats state, after the player keys.
+
+    Returns:
+        dict: The dtype of each column: a sum, its compensation and a
+        count per averaged column, then a sum per totalled column.
+    """
+    columns = {}
+    for column in AVERAGED_COLUMNS:
+        columns[sum_column(column)] = "float64"
+        columns[compensation_column(column)] = "float64"
+        columns[count_column(column)] = "int64"
+    for column in TOTALLED_COLUMNS:
+        columns[sum_column(column)] = "int64"
+    return columns
+
+
+def empty_player_stats_state() -> pd.DataFrame:
+    """
+    State of no boxscore rows, to fold the first rows into.
+
+    Returns:
+        pd.DataFrame: Empty state with the player keys and the state
+        columns.
+    """
+    return pd.DataFrame({
+        "player_name": pd.Series(dtype=object),
+        "year": pd.Series(dtype="int32"),
+        **{
+            column: pd.Series(dtype=dtype)
+            for column, dtype in get_state_columns().items()
+        },
+    })
+
+
+def fold_values(
+    codes: np.ndarray,
+    values: np.ndarray,
+    sums: np.ndarray,
+    compensations: np.ndarray,
+    counts: np.ndarray
+) -> None:
+    """
+    Add values to the running sums of their groups in place, in row
+    order and with the compensated summation `mean` uses, so each sum is
+    the one `mean` reaches after the same rows.
+
+    Args:
+        codes (np.ndarray): Group of each value.
+        values (np.ndarray): Values, missing ones being skipped.
+        sums (np.ndarray): Running sum of each group.
+        compensations (np.ndarray): Running compensation of each group.
+        counts (np.ndarray): Number of values summed in each group.
+    """
+    # The n-th value of every group is added in the n-th step, so each
+    # step updates every group at most once
+    order = np.argsort(codes, kind="stable")
+    starts = np.flatnonzero(np.diff(codes[order], prepend=-1))
+    ranks = np.arange(len(order)) - np.repeat(
+        starts, np.diff(np.append(starts, len(order)))
+    )
+    for rank in range(ranks.max() + 1 if len(ranks) else 0):
+        rows = order[ranks == rank]
+        rows = rows[~np.isnan(values[rows])]
+        groups = codes[rows]
+
+        y = values[rows] - compensations[groups]
+        t = sums[groups] + y
+        compensation = (t - sums[groups]) - y
+        compensation[np.isnan(compensation)] = 0
+        compensations[groups] = compensation
+        sums[groups] = t
+        counts[groups] += 1
+
+
+def build_player_stats_state(
+    data: pd.DataFrame,
+    state: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """
+    Fold boxscore rows into the aggregate state of each player and year:
+    the running sum and the number of non-missing values of every
+    averaged column, and the sum of every totalled column.
+
+    The rows are summed in order, as `mean` sums them, so folding the
+    chunks of a file one after another into the same state gives the
+    state of the whole file, and the averages are exactly those of
+    `mean` over it.
+
+    Args:
+        data (pd.DataFrame): Boxscore rows with the player keys and the
+        averaged and totalled columns.
+        state (Optional[pd.DataFrame]): State of the rows preceding
+        `data`, if any.
+
+    Returns:
+        pd.DataFrame: One row per player and year, sorted by the keys.
+    """
+    if state is None:
+        state = empty_player_stats_state()
+    data = data.dropna(subset=PLAYER_KEYS)
+
+    # Each chunk infers its own categories, so names are grouped as
+    # plain strings
+    keys = pd.concat(
+        [
+            state[PLAYER_KEYS].astype({"player_name": object}),
+            data[PLAYER_KEYS].astype({"player_name": object})
+        ],
+        ignore_index=True
+    )
+    grouped = keys.groupby(PLAYER_KEYS, sort=True)
+    codes = grouped.ngroup().to_numpy()
+    state_codes, row_codes = codes[:len(state)], codes[len(state):]
+
+    new_state = grouped.size().reset_index()[PLAYER_KEYS]
+    for column, dtype in get_state_columns().items():
+        values = np.zeros(len(new_state), dtype=dtype)
+        values[state_codes] = state[column].to_numpy()
+        new_state[column] = values
+
+    for column in AVERAGED_COLUMNS:
+        sums = new_state[sum_column(column)].to_numpy()
+        compensations = new_state[compensation_column(column)].to_numpy()
+        counts = new_state[count_column(column)].to_numpy()
+        fold_values(
+            row_codes,
+            data[column].to_numpy(dtype="float64"),
+            sums,
+            compensations,
+            counts
+        )
+        new_state[sum_column(column)] = sums
+        new_state[compensation_column(column)] = compensations
+        new_state[count_column(column)] = counts
+    for column in TOTALLED_COLUMNS:
+        totals = new_state[sum_column(column)].to_numpy()
+        np.add.at(
+            totals, row_codes, data[column].fillna(0).to_numpy("int64")
+        )
+        new_state[sum_column(column)] = totals
+
+    return new_state
+
+
+def combine_player_stats_states(
+    states: Iterable[pd.DataFrame]
+) -> pd.DataFrame:
+    """
+    Combine the states of different players or years, e.g. of the
+    partitions handled by different workers, into one state.
+
+    Running sums of the same player and year cannot be added up without
+    changing the averages `mean` gives, so the later rows of a player
+    and year are folded in with `build_player_stats_state` instead.
+
+    Args:
+        states (Iterable[pd.DataFrame]): States from
+        `build_player_stats_state` or from earlier combines.
+
+    Returns:
+        pd.DataFrame: The combined state, sorted by the keys.
+
+    Raises:
+        PlayerStatsStateError: If a player and year is in several
+        states.
+    """
+    combined = pd.concat(
+        [state.astype({"player_name": object}) for state in states],
+        ignore_index=True
+    )
+
+    repeated = combined.duplicated(PLAYER_KEYS)
+    if repeated.any():
+        examples = combined.loc[repeated, PLAYER_KEYS].head(3)
+        raise PlayerStatsStateError(
+            f"{repeated.sum()} player years are in several states, e.g. "
+            f"{list(examples.itertuples(index=False, name=None))}; fold "
+            f"their later rows with build_player_stats_state instead"
+        )
+
+    return combined.sort_values(PLAYER_KEYS, ignore_index=True)
+
+
+def finalize_player_stats_state(state: pd.DataFrame) -> pd.DataFrame:
+    """
+    Turn player stats states into the yearly player stats.
+
+    Every average is the running sum over the count, which is how `mean`
+    divides, so it rounds exactly as `mean` does.
+
+    Args:
+        state (pd.DataFrame): State from `build_player_stats_state` or
+        `combine_player_stats_states`.
+
+    Returns:
+        pd.DataFrame: DataFrame with aggregated player statistics per
+        year, including:
+        - points_per_game
+        - assists_per_game
+        - rebounds_per_game
+        - field_goal_pct_per_game
+        - three_point_pct_per_game
+        - free_throws_pct_per_game
+        - total_three_pointers
+    """
+    player_stats_df = state[PLAYER_KEYS].copy()
+    for column, decimals in AVERAGED_COLUMNS.items():
+        counts = state[count_column(column)]
+        player_stats_df[column] = (
+            state[sum_column(column)] / counts.where(counts > 0)
+        ).round(decimals)
+    for column in TOTALLED_COLUMNS:
+        player_stats_df[column] = state[sum_column(column)]
+
+    return player_stats_df.rename(columns=PLAYER_STATS_COLUMNS)
@@ -0,0 +1,115 @@
+import logging
+import pandas as pd
+from typing import Tuple
+from config.transform_config import load_transform_config
+from src.transform.clean_boxscores import clean_boxscore_rows
+from src.transform.player_stats_state import (
+    PLAYER_KEYS,
+    build_player_stats_state,
+    empty_player_stats_state,
+    finalize_player_stats_state
+)
+from src.transform.transform_merged_boxscores_games import (
+    PLAYER_STATS_ARTIFACT_NAME,
+    TEAM_STATS_ARTIFACT_NAME,
+    aggregate_team_wins,
+    get_team_wins_from_games
+)
+from src.utils.artifact_utils import write_artifact
+from src.utils.csv_reader_utils import iter_source_csv
+from src.utils.logging_utils import setup_logger
+from src.utils.partition_utils import aggregate_by_partition
+
+
+# Configure the logger
+logger = setup_logger(__name__, "transform_data.log", level=logging.DEBUG)
+
+
+def stream_boxscore_stats(
+    games: pd.DataFrame,
+    file_path: str,
+    chunk_size: int,
+    force: bool = False
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Compute the player and team stats while reading the raw boxscores in
+    chunks, so the whole file, its cleaned copy and its merge with the
+    games are never held in memory.
+
+    Each chunk is cleaned with the `clean_boxscores` steps, joined to the
+    games on 'game_id' and folded, in file order, into running
+    per-(player, year) sums and counts (see `player_stats_state`) and
+    into the set of teams playing each game. Peak memory is bounded by
+    the chunk size plus the games, the distinct players per year and the
+    distinct teams per game.
+
+    No cleaned boxscores or merged boxscores/games artifacts are written.
+
+    Args:
+        games (pd.DataFrame): Cleaned games DataFrame.
+        file_path (str): Path to the raw boxscores CSV.
+        chunk_size (int): Rows read per chunk.
+        force (bool): Recompute every year, ignoring the partition cache.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: The player stats and the team
+        stats, as `get_player_stats` and `get_team_stats_from_games`
+        return them.
+    """
+    game_years = games[["game_id", "year"]]
+    player_state = empty_player_stats_state()
+    team_games = pd.DataFrame({
+        "game_id": pd.Series(dtype="int64"),
+        "team_name": pd.Series(dtype=object),
+    })
+
+    chunks = 0
+    rows = 0
+    with iter_source_csv(file_path, "boxscores", chunk_size) as reader:
+        for chunk in reader:
+            chunks += 1
+            rows += len(chunk)
+            boxscores = clean_boxscore_rows(chunk)
+
+            # A game's players may be split across two chunks
+            team_games = pd.concat([
+                team_games,
+                boxscores[["game_id", "team_name"]]
+                .astype({"team_name": object})
+                .drop_duplicates()
+            ], ignore_index=True).drop_duplicates()
+
+            merged = pd.merge(boxscores, game_years, on="game_id", how="inner")
+            player_state = build_player_stats_state(merged, player_state)
+
+    logger.setLevel(logging.INFO)
+    logger.info(
+        f"Streamed {rows} boxscore rows in {chunks} chunks of up to "
+        f"{chunk_size} rows into {len(player_state)} player years and "
+        f"{len(team_games)} team games"
+    )
+
+    # The unchanged years are detected from the aggregate state, which
+    # the player stats are a function of
+    player_stats_df = aggregate_by_partition(
+        player_state,
+        PLAYER_STATS_ARTIFACT_NAME,
+        finalize_player_stats_state,
+        sort_by=PLAYER_KEYS,
+        force=force
+    )
+    write_artifact(player_stats_df, PLAYER_STATS_ARTIFACT_NAME)
+
+    team_stats_df = aggregate_team_wins(
+        get_team_wins_from_games(games, team_games),
+        force=force
+    )
+    if load_transform_config()["transform"]["team_stats_parity_check"]:
+        logger.setLevel(logging.WARNING)
+        logger.warning(
+            "Skipping the team stats parity check: the merged "
+            "boxscores/games frame is not built when streaming"
+        )
+    write_artifact(team_stats_df, TEAM_STATS_ARTIFACT_NAME)
+
+    return player_stats_df, team_stats_df
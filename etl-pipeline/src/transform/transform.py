@@ -1,91 +1,231 @@
 import pandas as pd
-from typing import Tuple
+from functools import partial
+from typing import List, Optional, Tuple
+from config.artifact_config import load_artifact_config
+from config.extract_config import load_extract_config
+from config.transform_config import load_transform_config
+from src.extract.extract import EXTRACTORS
+from src.extract.extract_boxscores import FILE_PATH as BOXSCORES_FILE_PATH
 from src.transform.clean_boxscores import clean_boxscores
 from src.transform.clean_games import clean_games
 from src.transform.clean_playerinfo import clean_playerinfo
 from src.transform.clean_salaries import clean_salaries
 from src.transform.merge_boxscores_games import merge_boxscores_games
 from src.transform.transform_merged_boxscores_games import get_player_stats
-from src.transform.transform_merged_boxscores_games import get_team_stats
+from src.transform.transform_merged_boxscores_games import (
+    get_team_stats_from_games
+)
 from src.transform.merge_playerinfo_salaries import merge_playerinfo_salaries
+from src.transform.stream_boxscores import stream_boxscore_stats
+from src.utils.artifact_utils import (
+    background_artifact_writer,
+    get_artifact_path,
+    read_artifact
+)
+from src.utils.dag_utils import Graph, run_graph
 from src.utils.logging_utils import setup_logger
 
 
 # Configure the logger
 logger = setup_logger("transform_data", "transform_data.log")
 
+# The artifacts holding the DataFrames returned by transform_data(),
+# in the order of the tuple
+TRANSFORMED_ARTIFACTS = [
+    "cleaned_boxscores",
+    "cleaned_games",
+    "cleaned_playerinfo",
+    "cleaned_salaries",
+    "player_stats",
+    "team_stats",
+    "merged_playerinfo_salaries",
+]
 
-def transform_data(data) -> Tuple[pd.DataFrame, pd.DataFrame]:
+
+def build_transform_graph(force=False, streaming=False) -> Graph:
+    """
+    Declare the transform steps and the frames each one depends on. The
+    box scores/games branch and the player info/salaries branch only
+    meet in the returned tuple, and the four cleaning steps depend on
+    nothing but their extracted source.
+
+    Args:
+        force (bool): Recompute the player and team stats of every year
+        instead of reusing the unchanged years from the partition cache
+        streaming (bool): Stream the box scores from the raw CSV instead
+        of cleaning and merging the extracted DataFrame
+
+    Returns:
+        Graph: The transform steps, see `src.utils.dag_utils`
+    """
+    graph = {
+        "clean_boxscores": {
+            "function": clean_boxscores,
+            "inputs": ["box_scores"],
+            "outputs": ["cleaned_boxscores"],
+        },
+        "clean_games": {
+            "function": clean_games,
+            "inputs": ["games"],
+            "outputs": ["cleaned_games"],
+        },
+        "clean_playerinfo": {
+            "function": clean_playerinfo,
+            "inputs": ["player_info"],
+            "outputs": ["cleaned_playerinfo"],
+        },
+        "clean_salaries": {
+            "function": clean_salaries,
+            "inputs": ["salaries"],
+            "outputs": ["cleaned_salaries"],
+        },
+        "merge_boxscores_games": {
+            "function": merge_boxscores_games,
+            "inputs": ["cleaned_boxscores", "cleaned_games"],
+            "outputs": ["merged_boxscores_games"],
+        },
+        "get_player_stats": {
+            "function": partial(get_player_stats, force=force),
+            "inputs": ["merged_boxscores_games"],
+            "outputs": ["player_stats"],
+        },
+        # Team stats at game level, without the player rows
+        "get_team_stats": {
+            "function": partial(get_team_stats_from_games, force=force),
+            "inputs": ["cleaned_games", "cleaned_boxscores"],
+            "outputs": ["team_stats"],
+        },
+        "merge_playerinfo_salaries": {
+            "function": merge_playerinfo_salaries,
+            "inputs": ["cleaned_playerinfo", "cleaned_salaries"],
+            "outputs": ["merged_playerinfo_salaries"],
+        },
+    }
+
+    if streaming:
+        for name in ["clean_boxscores", "merge_boxscores_games",
+                     "get_player_stats", "get_team_stats"]:
+            del graph[name]
+        # Fold the box scores into the stats chunk by chunk; the raw
+        # CSV it reads is listed so the stage can be cached on it
+        graph["stream_boxscore_stats"] = {
+            "function": partial(
+                stream_boxscore_stats,
+                file_path=BOXSCORES_FILE_PATH,
+                chunk_size=load_extract_config()["extract"]["chunk_size"],
+                force=force
+            ),
+            "inputs": ["cleaned_games"],
+            "outputs": ["player_stats", "team_stats"],
+            "files": [BOXSCORES_FILE_PATH],
+        }
+
+    return graph
+
+
+def transform_data(data, force=False) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     Function which executes the transformation process.
 
+    The steps declared by `build_transform_graph` run as soon as their
+    inputs are ready: one after another in this process, or with
+    TRANSFORM_MAX_WORKERS above 1, independent steps at the same time in
+    a process pool.
+
+    With TRANSFORM_STREAMING set, the box scores are not taken from
+    `data` but streamed from the raw CSV in chunks, and None is returned
+    in place of the cleaned box scores.
+
     Args:
         data: The tuple containing the extracted data gotten
         after executing extract_data()
+        force (bool): Recompute the player and team stats of every year
+        instead of reusing the unchanged years from the partition cache
 
     Returns:
         Tuple: A tuple containing all the transformed DataFrames
     """
     try:
         logger.info("Starting data transformation process...")
-        # Clean box scores data
-        logger.info("Cleaning box scores data...")
-        cleaned_boxscores = clean_boxscores(data[0])
-        logger.info("Box Scores data cleaned successfully.")
-
-        # Clean games data
-        logger.info("Cleaning games data...")
-        cleaned_games = clean_games(data[1])
-        logger.info("Games data cleaned successfully.")
-
-        # Clean player information data
-        logger.info("Cleaning player information data...")
-        cleaned_playerinfo = clean_playerinfo(data[2])
-        logger.info("Player Information data cleaned successfully.")
-
-        # Clean salaries data
-        logger.info("Cleaning salaries data...")
-        cleaned_salaries = clean_salaries(data[3])
-        logger.info("Salaries data cleaned successfully.")
-
-        # Enrich box scores and games data
-        logger.info("Merging box scores and games data...")
-        merged_boxscores_games = merge_boxscores_games(
-            cleaned_boxscores,
-            cleaned_games
-        )
-        logger.info("Data merged successfully.")
-
-        # Get player stats
-        logger.info("Extracting Player Stats...")
-        player_stats = get_player_stats(merged_boxscores_games)
-        logger.info("Player Stats successfully transformed.")
-
-        # Get team stats
-        logger.info("Extracting Team Stats...")
-        team_stats = get_team_stats(merged_boxscores_games)
-        logger.info("Team Stats successfully transformed.")
-
-        # Merge player info and salaries data
-        logger.info("Merging player information and salaries data...")
-        merged_playerinfo_salaries = merge_playerinfo_salaries(
-            cleaned_playerinfo,
-            cleaned_salaries
-        )
-        logger.info("Data merged successfully.")
+        transform_config = load_transform_config()["transform"]
+        graph = build_transform_graph(force, transform_config["streaming"])
+        sources = dict(zip(EXTRACTORS, data))
+
+        # Intermediate artifacts are written in the background while
+        # the next step runs
+        with background_artifact_writer() as artifact_writer:
+            frames = run_graph(
+                graph,
+                sources,
+                transform_config["max_workers"],
+                keep=TRANSFORMED_ARTIFACTS
+            )
+
+            # Wait for the artifacts and report any write errors
+            if artifact_writer is not None:
+                logger.info("Flushing intermediate artifacts...")
+                artifact_writer.flush()
+                logger.info("Intermediate artifacts written successfully.")
+
         logger.info(
             "Data transformation completed successfully."
         )
-        return (
-            cleaned_boxscores,
-            cleaned_games,
-            cleaned_playerinfo,
-            cleaned_salaries,
-            player_stats,
-            team_stats,
-            merged_playerinfo_salaries
-        )
+        return tuple(frames.get(name) for name in TRANSFORMED_ARTIFACTS)
 
     except Exception as e:
         logger.error(f"Data transformation failed: {e}")
         raise
+
+
+def get_transformed_artifact_names() -> List[str]:
+    """
+    Names of the artifacts holding the output of transform_data(). No
+    cleaned box scores artifact is written when streaming.
+
+    Returns:
+        List[str]: The artifact names, in the order of the tuple.
+    """
+    if load_transform_config()["transform"]["streaming"]:
+        return [
+            name for name in TRANSFORMED_ARTIFACTS
+            if name != "cleaned_boxscores"
+        ]
+    return list(TRANSFORMED_ARTIFACTS)
+
+
+def get_transformed_artifact_paths() -> Optional[List[str]]:
+    """
+    Paths of the artifacts holding the output of transform_data().
+
+    Returns:
+        Optional[List[str]]: The artifact paths, or None when artifact
+        writing is disabled.
+    """
+    artifact_config = load_artifact_config()["artifacts"]
+    if artifact_config["format"] == "none":
+        return None
+
+    return [
+        get_artifact_path(
+            name,
+            artifact_config["format"],
+            artifact_config["directory"]
+        )
+        for name in get_transformed_artifact_names()
+    ]
+
+
+def read_transformed_data() -> Tuple[Optional[pd.DataFrame], ...]:
+    """
+    Read the output of a previous transform_data() run back from its
+    artifacts.
+
+    Returns:
+        Tuple: A tuple containing all the transformed DataFrames, with
+        None for those a streaming run does not write
+    """
+    names = get_transformed_artifact_names()
+    return tuple(
+        read_artifact(name) if name in names else None
+        for name in TRANSFORMED_ARTIFACTS
+    )
@@ -1,12 +1,26 @@
+import logging
+import numpy as np
 import pandas as pd
-import os
+from config.transform_config import load_transform_config
+from src.transform.player_stats_state import (
+    build_player_stats_state,
+    finalize_player_stats_state
+)
+from src.utils.artifact_utils import write_artifact
+from src.utils.logging_utils import setup_logger
+from src.utils.partition_utils import aggregate_by_partition
 
-PLAYER_STATS_FILE_PATH = "data/processed/player_stats.csv"
-TEAM_STATS_FILE_PATH = "data/processed/team_stats.csv"
 
-# Create directory if it does not exist
-os.makedirs(os.path.dirname(PLAYER_STATS_FILE_PATH), exist_ok=True)
-os.makedirs(os.path.dirname(TEAM_STATS_FILE_PATH), exist_ok=True)
+class TeamStatsParityError(Exception):
+    pass
+
+
+# Configure the logger
+logger = setup_logger(__name__, "transform_data.log", level=logging.DEBUG)
+
+# Names of the intermediate artifacts written to data/processed
+PLAYER_STATS_ARTIFACT_NAME = "player_stats"
+TEAM_STATS_ARTIFACT_NAME = "team_stats"
 
 COLUMNS_TO_DROP = [
     "player_name",
@@ -27,7 +41,7 @@ COLUMNS_TO_DROP = [
 ]
 
 
-def get_player_stats(data: pd.DataFrame) -> pd.DataFrame:
+def calculate_player_stats(data: pd.DataFrame) -> pd.DataFrame:
     """
     Calculate per-year player statistics from boxscore data.
 
@@ -49,37 +63,42 @@ def get_player_stats(data: pd.DataFrame) -> pd.DataFrame:
         - free_throws_pct_per_game
         - total_three_pointers
     """
-    player_stats_df = (
-        data.groupby(["player_name", "year"])
-        .agg({
-            "points": "mean",
-            "assists": "mean",
-            "total_rebounds": "mean",
-            "field_goals_percentage": "mean",
-            "three_point_percentage": "mean",
-            "free_throws_percentage": "mean",
-            "three_pointers": "sum"
-        })
-        .round({
-            "points": 1,
-            "assists": 1,
-            "total_rebounds": 1,
-            "field_goals_percentage": 2,
-            "free_throws_percentage": 2,
-            "three_point_percentage": 2,
-        })
-        .reset_index()
-        .rename(columns={
-            "points": "points_per_game",
-            "assists": "assists_per_game",
-            "total_rebounds": "rebounds_per_game",
-            "field_goals_percentage": "field_goal_pct_per_game",
-            "three_point_percentage": "three_point_pct_per_game",
-            "free_throws_percentage": "free_throws_pct_per_game",
-            "three_pointers": "total_three_pointers"
-        })
+    # Built through the same state the streaming transform folds the
+    # chunks into, so both give the same stats
+    player_stats_df = finalize_player_stats_state(
+        build_player_stats_state(data)
+    )
+    return player_stats_df.astype(
+        {"player_name": data["player_name"].dtype}
+    )
+
+
+def get_player_stats(
+    data: pd.DataFrame,
+    force: bool = False
+) -> pd.DataFrame:
+    """
+    Calculate per-year player statistics from boxscore data, one year at
+    a time. Years whose rows are unchanged since the last run are read
+    back from the partition cache instead of being recomputed.
+
+    Args:
+        data (pd.DataFrame): DataFrame containing boxscore statistics,
+        see `calculate_player_stats`.
+        force (bool): Recompute every year, ignoring the cache.
+
+    Returns:
+        pd.DataFrame: DataFrame with aggregated player statistics per
+        year.
+    """
+    player_stats_df = aggregate_by_partition(
+        data,
+        PLAYER_STATS_ARTIFACT_NAME,
+        calculate_player_stats,
+        sort_by=["player_name", "year"],
+        force=force
     )
-    player_stats_df.to_csv(PLAYER_STATS_FILE_PATH, index=False)
+    write_artifact(player_stats_df, PLAYER_STATS_ARTIFACT_NAME)
 
     return player_stats_df
 
@@ -112,16 +131,40 @@ def add_won_game_column(data: pd.DataFrame) -> pd.DataFrame:
     """
     Add a column indicating whether the team won the game.
 
+    This is the vectorised equivalent of applying `determine_winner` to
+    every row: the home and away slots are matched with boolean masks and
+    the result is picked with `np.select`.
+
     Args:
         data (pd.DataFrame): DataFrame containing 'team_name', 'home_team',
                              'away_team', 'points_home', 'points_away'.
 
     Returns:
         pd.DataFrame: DataFrame with an added 'won_game' column
-        (1 = win, 0 = loss).
+        (1 = win, 0 = loss, NaN = team not found in the game).
     """
+    # Compare the team names as plain objects so categorical and string
+    # columns can be matched against each other
+    team_name = data["team_name"].to_numpy(dtype=object)
+    is_home_team = team_name == data["home_team"].to_numpy(dtype=object)
+    is_away_team = team_name == data["away_team"].to_numpy(dtype=object)
+
+    home_team_won = (data["points_home"] > data["points_away"]).to_numpy()
+    away_team_won = (data["points_away"] > data["points_home"]).to_numpy()
+
+    # The home slot takes precedence, as in determine_winner
+    won_game = np.select(
+        [is_home_team, is_away_team],
+        [home_team_won, away_team_won],
+        default=np.nan
+    )
+
+    # Like the row-wise version, keep integers unless a team was not found
+    if len(won_game) and not np.isnan(won_game).any():
+        won_game = won_game.astype("int64")
+
     # Column to represent game wins
-    data["won_game"] = data.apply(determine_winner, axis=1)
+    data["won_game"] = won_game
 
     return data
 
@@ -174,7 +217,7 @@ def get_total_number_of_wins(data: pd.DataFrame) -> pd.DataFrame:
     """
     # Count total number of wins a team has
     total_wins_df = (
-        data.groupby(["year", "team_name"])["won_game"]
+        data.groupby(["year", "team_name"], observed=True)["won_game"]
         .sum()
         .reset_index()
         .rename(columns={
@@ -198,7 +241,7 @@ def get_total_number_of_games_played(data: pd.DataFrame) -> pd.DataFrame:
     """
     # Count total number of games a team played every year
     games_played_df = (
-        data.groupby(["year", "team_name"])["won_game"]
+        data.groupby(["year", "team_name"], observed=True)["won_game"]
         .count()
         .reset_index()
         .rename(columns={
@@ -209,26 +252,17 @@ def get_total_number_of_games_played(data: pd.DataFrame) -> pd.DataFrame:
     return games_played_df
 
 
-def get_team_stats(data: pd.DataFrame) -> pd.DataFrame:
+def summarise_team_stats(team_wins_df: pd.DataFrame) -> pd.DataFrame:
     """
-    A DataFrame which contains all the stats relating to a team
-    per year.
+    Aggregate one row per team per game into the yearly team stats.
 
     Args:
-        data (pd.DataFrame): Input DataFrame.
+        team_wins_df (pd.DataFrame): DataFrame with one row per team per
+        game and the columns 'year', 'team_name' and 'won_game'.
 
     Returns:
         pd.DataFrame: DataFrame containing team statistics.
     """
-    # Column to represent game wins
-    data = add_won_game_column(data)
-
-    # Drop unnecessary columns
-    data = remove_unnecessary_columns(data)
-
-    # Drop duplicates
-    team_wins_df = remove_duplicates(data)
-
     # Count total number of wins a team has
     total_wins_df = get_total_number_of_wins(team_wins_df)
 
@@ -251,6 +285,223 @@ def get_team_stats(data: pd.DataFrame) -> pd.DataFrame:
         (team_stats_df["total_wins"] / team_stats_df["total_games"] * 100)
         .round(2)
     )
-    team_stats_df.to_csv(TEAM_STATS_FILE_PATH, index=False)
 
     return team_stats_df
+
+
+def get_team_wins_from_merged(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reduce the merged boxscores/games frame to one row per team per game
+    with a 'won_game' column.
+
+    Args:
+        data (pd.DataFrame): Merged boxscores/games DataFrame.
+
+    Returns:
+        pd.DataFrame: DataFrame with one row per team per game.
+    """
+    # Column to represent game wins
+    data = add_won_game_column(data)
+
+    # Drop unnecessary columns
+    data = remove_unnecessary_columns(data)
+
+    # Drop duplicates
+    return remove_duplicates(data)
+
+
+def get_team_stats(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    A DataFrame which contains all the stats relating to a team
+    per year.
+
+    Args:
+        data (pd.DataFrame): Input DataFrame.
+
+    Returns:
+        pd.DataFrame: DataFrame containing team statistics.
+    """
+    team_stats_df = summarise_team_stats(get_team_wins_from_merged(data))
+    write_artifact(team_stats_df, TEAM_STATS_ARTIFACT_NAME)
+
+    return team_stats_df
+
+
+def unpivot_game_results(games: pd.DataFrame) -> pd.DataFrame:
+    """
+    Turn each game into one row for the home team and one for the away
+    team, with a 'won_game' column.
+
+    Args:
+        games (pd.DataFrame): Cleaned games DataFrame with 'game_id',
+        'home_team', 'away_team', 'points_home' and 'points_away'.
+
+    Returns:
+        pd.DataFrame: DataFrame with the columns 'game_id', 'team_name'
+        and 'won_game'.
+    """
+    home_results = pd.DataFrame({
+        "game_id": games["game_id"].to_numpy(),
+        "team_name": games["home_team"].to_numpy(dtype=object),
+        "won_game": (
+            games["points_home"] > games["points_away"]
+        ).to_numpy(dtype="int64"),
+    })
+    away_results = pd.DataFrame({
+        "game_id": games["game_id"].to_numpy(),
+        "team_name": games["away_team"].to_numpy(dtype=object),
+        "won_game": (
+            games["points_away"] > games["points_home"]
+        ).to_numpy(dtype="int64"),
+    })
+
+    # The home slot takes precedence, as in determine_winner
+    return (
+        pd.concat([home_results, away_results], ignore_index=True)
+        .drop_duplicates(subset=["game_id", "team_name"], keep="first")
+    )
+
+
+def get_team_wins_from_games(
+    games: pd.DataFrame,
+    boxscores: pd.DataFrame
+) -> pd.DataFrame:
+    """
+    Build one row per team per game with a 'won_game' column straight
+    from the games, without joining every player row to its game.
+
+    The teams come from the boxscores, so a team's games are counted the
+    same way as in the merged frame: only games present in both sources,
+    and a missing 'won_game' when the boxscore team is neither the home
+    nor the away team.
+
+    Args:
+        games (pd.DataFrame): Cleaned games DataFrame.
+        boxscores (pd.DataFrame): Cleaned boxscores DataFrame.
+
+    Returns:
+        pd.DataFrame: DataFrame with the columns 'game_id', 'team_name',
+        'year' and 'won_game'.
+    """
+    team_games = boxscores[["game_id", "team_name"]].drop_duplicates()
+    team_games = pd.merge(
+        team_games,
+        games[["game_id", "year"]],
+        on="game_id",
+        how="inner"
+    )
+
+    game_results = unpivot_game_results(games)
+    won_game = pd.merge(
+        team_games[["game_id", "team_name"]].astype({"team_name": object}),
+        game_results,
+        on=["game_id", "team_name"],
+        how="left"
+    )["won_game"]
+
+    # Keep integers unless a team was not found, as in the merged path
+    if len(won_game) and won_game.notna().all():
+        won_game = won_game.astype("int64")
+    team_games["won_game"] = won_game.to_numpy()
+
+    return team_games
+
+
+def aggregate_team_wins(
+    team_wins: pd.DataFrame,
+    force: bool = False
+) -> pd.DataFrame:
+    """
+    Aggregate one row per team per game into the yearly team stats, one
+    year at a time, reusing the unchanged years from the partition cache.
+
+    Args:
+        team_wins (pd.DataFrame): DataFrame with the columns 'game_id',
+        'team_name', 'year' and 'won_game', see
+        `get_team_wins_from_games`.
+        force (bool): Recompute every year, ignoring the cache.
+
+    Returns:
+        pd.DataFrame: DataFrame containing team statistics.
+    """
+    return aggregate_by_partition(
+        team_wins,
+        TEAM_STATS_ARTIFACT_NAME,
+        summarise_team_stats,
+        sort_by=["year", "team_name"],
+        force=force
+    )
+
+
+def get_team_stats_from_games(
+    games: pd.DataFrame,
+    boxscores: pd.DataFrame,
+    force: bool = False
+) -> pd.DataFrame:
+    """
+    A DataFrame which contains all the stats relating to a team per year,
+    computed at game level from the cleaned games and a light set of
+    teams per game from the cleaned boxscores.
+
+    This gives the same result as `get_team_stats` on the merged
+    boxscores/games frame. With TRANSFORM_TEAM_STATS_PARITY_CHECK set,
+    both are computed and compared.
+
+    The stats are aggregated one year at a time; years whose team games
+    are unchanged since the last run are read back from the partition
+    cache.
+
+    Args:
+        games (pd.DataFrame): Cleaned games DataFrame.
+        boxscores (pd.DataFrame): Cleaned boxscores DataFrame.
+        force (bool): Recompute every year, ignoring the cache.
+
+    Raises:
+        TeamStatsParityError: If the parity check is enabled and the two
+        paths disagree.
+
+    Returns:
+        pd.DataFrame: DataFrame containing team statistics.
+    """
+    team_stats_df = aggregate_team_wins(
+        get_team_wins_from_games(games, boxscores),
+        force=force
+    )
+
+    if load_transform_config()["transform"]["team_stats_parity_check"]:
+        check_team_stats_parity(team_stats_df, games, boxscores)
+
+    write_artifact(team_stats_df, TEAM_STATS_ARTIFACT_NAME)
+
+    return team_stats_df
+
+
+def check_team_stats_parity(
+    team_stats_df: pd.DataFrame,
+    games: pd.DataFrame,
+    boxscores: pd.DataFrame
+) -> None:
+    """
+    Compare the game-level team stats against the team stats computed
+    from the merged boxscores/games frame.
+
+    Args:
+        team_stats_df (pd.DataFrame): Game-level team stats.
+        games (pd.DataFrame): Cleaned games DataFrame.
+        boxscores (pd.DataFrame): Cleaned boxscores DataFrame.
+
+    Raises:
+        TeamStatsParityError: If the two results differ.
+    """
+    merged = pd.merge(boxscores, games, on="game_id", how="inner")
+    expected_df = summarise_team_stats(get_team_wins_from_merged(merged))
+
+    try:
+        pd.testing.assert_frame_equal(team_stats_df, expected_df)
+    except AssertionError as e:
+        logger.setLevel(logging.ERROR)
+        logger.error(f"Team stats parity check failed: {e}")
+        raise TeamStatsParityError(f"Team stats parity check failed: {e}")
+
+    logger.setLevel(logging.INFO)
+    logger.info("Team stats parity check passed")
@@ -0,0 +1,286 @@
+import os
+import logging
+import threading
+import pandas as pd
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from config.artifact_config import load_artifact_config
+from src.utils.logging_utils import setup_logger
+
+
+class ArtifactError(Exception):
+    pass
+
+
+# Configure the logger
+logger = setup_logger(__name__, "transform_data.log", level=logging.DEBUG)
+
+# File extension used for each artifact format
+ARTIFACT_EXTENSIONS = {
+    "csv": ".csv",
+    "parquet": ".parquet",
+    "feather": ".feather",
+}
+
+# Background writer that write_artifact() hands artifacts to, if any
+_active_writer: Optional["BackgroundArtifactWriter"] = None
+
+
+def get_artifact_path(
+    name: str,
+    artifact_format: str,
+    directory: str
+) -> str:
+    """
+    Build the path of an intermediate artifact.
+
+    Args:
+        name (str): Name of the artifact, e.g. "cleaned_boxscores".
+        artifact_format (str): One of "csv", "parquet" or "feather".
+        directory (str): Directory holding the artifacts.
+
+    Returns:
+        str: Path of the artifact file.
+    """
+    return os.path.join(directory, name + ARTIFACT_EXTENSIONS[artifact_format])
+
+
+def write_artifact(data: pd.DataFrame, name: str) -> Optional[str]:
+    """
+    Persist an intermediate DataFrame in the configured artifact format.
+
+    While a background artifact writer is active (see
+    `background_artifact_writer`), a snapshot of the DataFrame is queued
+    and written off the critical path; otherwise it is written in-line.
+
+    Args:
+        data (pd.DataFrame): DataFrame to persist.
+        name (str): Name of the artifact, e.g. "cleaned_boxscores".
+
+    Raises:
+        ArtifactError: If the artifact cannot be written in-line.
+
+    Returns:
+        Optional[str]: Path of the artifact, or None when artifact
+        writing is disabled.
+    """
+    artifact_config = load_artifact_config()["artifacts"]
+    artifact_format = artifact_config["format"]
+
+    if artifact_format == "none":
+        return None
+
+    file_path = get_artifact_path(
+        name,
+        artifact_format,
+        artifact_config["directory"]
+    )
+
+    if _active_writer is not None:
+        _active_writer.submit(data, name, file_path, artifact_config)
+    else:
+        write_artifact_file(data, name, file_path, artifact_config)
+
+    return file_path
+
+
+def write_artifact_file(
+    data: pd.DataFrame,
+    name: str,
+    file_path: str,
+    artifact_config: Dict[str, Any]
+) -> None:
+    """
+    Write an intermediate DataFrame to disk.
+
+    Args:
+        data (pd.DataFrame): DataFrame to persist.
+        name (str): Name of the artifact, e.g. "cleaned_boxscores".
+        file_path (str): Path of the artifact file.
+        artifact_config (Dict[str, Any]): The "artifacts" section of the
+        artifact configuration.
+
+    Raises:
+        ArtifactError: If the artifact cannot be written.
+    """
+    artifact_format = artifact_config["format"]
+    compression = artifact_config["compression"]
+    os.makedirs(artifact_config["directory"], exist_ok=True)
+
+    try:
+        if artifact_format == "csv":
+            data.to_csv(file_path, index=False)
+        elif artifact_format == "parquet":
+            data.to_parquet(
+                file_path,
+                index=False,
+                compression=None if compression == "none" else compression,
+                write_statistics=artifact_config["statistics"]
+            )
+        else:
+            # Feather can only store a default RangeIndex
+            data.reset_index(drop=True).to_feather(
+                file_path,
+                compression=(
+                    "uncompressed" if compression == "none" else compression
+                )
+            )
+    except (OSError, ValueError, TypeError, ImportError) as e:
+        logger.setLevel(logging.ERROR)
+        logger.error(f"Failed to write artifact {file_path}: {e}")
+        raise ArtifactError(f"Failed to write artifact {file_path}: {e}")
+
+    logger.setLevel(logging.DEBUG)
+    logger.debug(f"Artifact {name} written to {file_path}")
+
+
+class BackgroundArtifactWriter:
+    """
+    Writes intermediate artifacts from a pool of worker threads.
+
+    At most `max_pending` artifacts may be queued or in flight; further
+    submissions block until a slot frees up, which bounds the memory held
+    by snapshots. Errors are collected and reported by `flush`.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="artifact-writer"
+        )
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.pending: List[Tuple[str, Future]] = []
+
+    def submit(
+        self,
+        data: pd.DataFrame,
+        name: str,
+        file_path: str,
+        artifact_config: Dict[str, Any]
+    ) -> Future:
+        # Block while the queue is full
+        self.slots.acquire()
+        try:
+            # Snapshot the frame; later transform steps mutate in place
+            snapshot = data.copy()
+            future = self.executor.submit(
+                write_artifact_file,
+                snapshot,
+                name,
+                file_path,
+                artifact_config
+            )
+        except Exception:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        self.pending.append((name, future))
+        return future
+
+    def flush(self) -> None:
+        """
+        Wait for every queued artifact to be written.
+
+        Raises:
+            ArtifactError: If any artifact failed to be written.
+        """
+        pending, self.pending = self.pending, []
+        errors = [
+            f"{name}: {future.exception()}"
+            for name, future in pending
+            if future.exception() is not None
+        ]
+        if errors:
+            logger.setLevel(logging.ERROR)
+            logger.error(f"Failed to write artifacts: {'; '.join(errors)}")
+            raise ArtifactError(
+                f"Failed to write artifacts: {'; '.join(errors)}"
+            )
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+
+
+@contextmanager
+def background_artifact_writer() -> Iterator[
+    Optional[BackgroundArtifactWriter]
+]:
+    """
+    Route `write_artifact` calls to a background writer for the duration
+    of the block. The writer is sized by ARTIFACT_WRITER_WORKERS and
+    ARTIFACT_WRITER_QUEUE_SIZE; with 0 workers, or with artifact writing
+    disabled, artifacts are written in-line and None is yielded.
+
+    Call `flush()` on the yielded writer to wait for the writes and
+    surface their errors. On exit the writer waits for in-flight writes
+    before shutting down.
+
+    Yields:
+        Optional[BackgroundArtifactWriter]: The active writer, if any.
+    """
+    global _active_writer
+
+    artifact_config = load_artifact_config()["artifacts"]
+    if (artifact_config["writer_workers"] == 0
+            or artifact_config["format"] == "none"):
+        yield None
+        return
+
+    writer = BackgroundArtifactWriter(
+        artifact_config["writer_workers"],
+        artifact_config["writer_queue_size"]
+    )
+    _active_writer = writer
+    try:
+        yield writer
+    finally:
+        _active_writer = None
+        writer.close()
+
+
+def read_artifact(
+    name: str,
+    columns: Optional[List[str]] = None,
+    artifact_format: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Read an intermediate artifact back into a DataFrame. Parquet and
+    Feather artifacts keep their dtypes and can be read column by column
+    without re-parsing any text.
+
+    Args:
+        name (str): Name of the artifact, e.g. "cleaned_boxscores".
+        columns (Optional[List[str]]): Columns to read; all by default.
+        artifact_format (Optional[str]): Format to read; defaults to the
+        configured artifact format.
+
+    Raises:
+        ArtifactError: If artifact writing is disabled or the artifact
+        does not exist.
+
+    Returns:
+        pd.DataFrame: The artifact's data.
+    """
+    artifact_config = load_artifact_config()["artifacts"]
+    artifact_format = artifact_format or artifact_config["format"]
+
+    if artifact_format not in ARTIFACT_EXTENSIONS:
+        raise ArtifactError(
+            f"Cannot read artifact {name}: artifact format is "
+            f"'{artifact_format}'"
+        )
+
+    file_path = get_artifact_path(
+        name,
+        artifact_format,
+        artifact_config["directory"]
+    )
+    if not os.path.exists(file_path):
+        raise ArtifactError(f"Artifact not found: {file_path}")
+
+    if artifact_format == "csv":
+        return pd.read_csv(file_path, usecols=columns)
+    if artifact_format == "parquet":
+        return pd.read_parquet(file_path, columns=columns)
+    return pd.read_feather(file_path, columns=columns)
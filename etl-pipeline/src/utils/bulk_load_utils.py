@@ -0,0 +1,747 @@
+import io
+import time
+import timeit
+import uuid
+import psycopg
+import pandas as pd
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Sequence
+from sqlalchemy import Connection, text
+from sqlalchemy.exc import OperationalError
+from config.load_config import load_load_config
+from src.utils.logging_utils import setup_logger
+from src.utils.table_schema_utils import (
+    build_create_table_statement,
+    conform_to_table_schema,
+    find_table_schema
+)
+
+
+class BulkLoadError(Exception):
+    pass
+
+
+class TableSwapError(Exception):
+    pass
+
+
+# Setup the logger
+logger = setup_logger("load_data", "load_data.log")
+
+# Marker for missing values in the COPY stream, so empty strings are
+# loaded as empty strings rather than NULL
+NULL_MARKER = "\\N"
+
+# Names of the tables used by the swap load mode: the new data is
+# loaded into "<table>_staging" and the previous table is kept as
+# "<table>_bak_<UTC timestamp>" for the rollback window
+STAGING_SUFFIX = "_staging"
+BACKUP_INFIX = "_bak_"
+BACKUP_TIMESTAMP_FORMAT = "%Y%m%d%H%M%S"
+
+# PostgreSQL truncates identifiers longer than this
+MAX_IDENTIFIER_LENGTH = 63
+
+
+def create_empty_table(
+    connection: Connection,
+    data: pd.DataFrame,
+    table_name: str,
+    schema: str
+) -> None:
+    """
+    (Re)create a table without inserting any rows. Tables registered in
+    TABLE_SCHEMAS are created with their declared column types; any
+    other table gets the columns and types pandas would give the
+    DataFrame.
+
+    Args:
+        connection (Connection): Active SQLAlchemy database connection.
+        data (pd.DataFrame): DataFrame the table is created for.
+        table_name (str): Name of the table; a staging table is created
+        from the definition of its live table.
+        schema (str): Schema of the table.
+    """
+    table_schema = find_table_schema(table_name.removesuffix(STAGING_SUFFIX))
+    if table_schema is None:
+        data.head(0).to_sql(
+            table_name,
+            con=connection,
+            schema=schema,
+            if_exists="replace",
+            index=False
+        )
+        return
+
+    connection.execute(
+        text(f'DROP TABLE IF EXISTS "{schema}"."{table_name}"')
+    )
+    connection.execute(text(
+        build_create_table_statement(table_schema, table_name, schema)
+    ))
+
+
+def conform_rows(data: pd.DataFrame, table_name: str) -> pd.DataFrame:
+    """
+    Conform a DataFrame to the definition registered for a table, if
+    any (see `conform_to_table_schema`).
+
+    Args:
+        data (pd.DataFrame): Rows to load.
+        table_name (str): Name of the table or of its staging table.
+
+    Raises:
+        TableSchemaError: If the rows do not fit the declared types.
+
+    Returns:
+        pd.DataFrame: The rows to load.
+    """
+    base_table_name = table_name.removesuffix(STAGING_SUFFIX)
+    table_schema = find_table_schema(base_table_name)
+    if table_schema is None:
+        return data
+    return conform_to_table_schema(data, base_table_name, table_schema)
+
+
+def copy_dataframe(
+    connection: Connection,
+    data: pd.DataFrame,
+    table_name: str,
+    schema: str,
+    batch_size: Optional[int] = None
+) -> int:
+    """
+    Append the rows of a DataFrame to an existing table with
+    `COPY ... FROM STDIN`. Rows are serialised to CSV in batches through
+    an in-memory buffer and streamed to the server, in the connection's
+    current transaction.
+
+    Args:
+        connection (Connection): Active SQLAlchemy database connection.
+        data (pd.DataFrame): Rows to load; its columns must exist in the
+        table.
+        table_name (str): Name of the table.
+        schema (str): Schema of the table.
+        batch_size (Optional[int]): Rows per batch; defaults to
+        LOAD_COPY_BATCH_SIZE.
+
+    Raises:
+        BulkLoadError: If the COPY fails.
+
+    Returns:
+        int: Number of rows loaded.
+    """
+    if batch_size is None:
+        batch_size = load_load_config()["load"]["copy_batch_size"]
+
+    columns = ", ".join(f'"{column}"' for column in data.columns)
+    statement = (
+        f'COPY "{schema}"."{table_name}" ({columns}) FROM STDIN '
+        f"WITH (FORMAT csv, NULL '{NULL_MARKER}')"
+    )
+
+    start_time = timeit.default_timer()
+    try:
+        driver_connection = connection.connection.driver_connection
+        with driver_connection.cursor() as cursor:
+            with cursor.copy(statement) as copy:
+                for start in range(0, len(data), batch_size):
+                    buffer = io.StringIO()
+                    data.iloc[start:start + batch_size].to_csv(
+                        buffer,
+                        header=False,
+                        index=False,
+                        na_rep=NULL_MARKER
+                    )
+                    copy.write(buffer.getvalue())
+    except psycopg.Error as e:
+        logger.error(f"Failed to copy rows into {table_name}: {e}")
+        raise BulkLoadError(f"Failed to copy rows into {table_name}: {e}")
+
+    execution_time = timeit.default_timer() - start_time
+    rows_per_second = len(data) / execution_time if execution_time else 0
+    logger.info(
+        f"Copied {len(data)} rows into {table_name} in "
+        f"{execution_time:.3f} seconds ({rows_per_second:.0f} rows/sec, "
+        f"batch size {batch_size})"
+    )
+
+    return len(data)
+
+
+def create_indexes(
+    connection: Connection,
+    table_name: str,
+    schema: str,
+    indexes: Sequence[Sequence[str]]
+) -> None:
+    """
+    Create a b-tree index on a table for each group of columns.
+
+    Index names get a random suffix so a staging table's indexes never
+    clash with those of the live table it replaces.
+
+    Args:
+        connection (Connection): Active SQLAlchemy database connection.
+        table_name (str): Name of the table.
+        schema (str): Schema of the table.
+        indexes (Sequence[Sequence[str]]): Columns of each index.
+    """
+    suffix = uuid.uuid4().hex[:8]
+    base_table_name = table_name.removesuffix(STAGING_SUFFIX)
+    for columns in indexes:
+        prefix = f"ix_{base_table_name}_{'_'.join(columns)}"
+        prefix = prefix[:MAX_IDENTIFIER_LENGTH - len(suffix) - 1]
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        connection.execute(text(
+            f'CREATE INDEX "{prefix}_{suffix}" '
+            f'ON "{schema}"."{table_name}" ({column_list})'
+        ))
+
+
+def add_primary_key(
+    connection: Connection,
+    table_name: str,
+    schema: str
+) -> None:
+    """
+    Add the primary key declared in TABLE_SCHEMAS to a table; tables
+    without a definition are left unchanged.
+
+    Like the secondary indexes, the key's name gets a random suffix so a
+    staging table's key never clashes with that of the live table.
+
+    Args:
+        connection (Connection): Active SQLAlchemy database connection.
+        table_name (str): Name of the table or of its staging table.
+        schema (str): Schema of the table.
+    """
+    base_table_name = table_name.removesuffix(STAGING_SUFFIX)
+    table_schema = find_table_schema(base_table_name)
+    if table_schema is None:
+        return
+
+    suffix = uuid.uuid4().hex[:8]
+    prefix = f"pk_{base_table_name}"
+    prefix = prefix[:MAX_IDENTIFIER_LENGTH - len(suffix) - 1]
+    column_list = ", ".join(
+        f'"{column}"' for column in table_schema["primary_key"]
+    )
+    connection.execute(text(
+        f'ALTER TABLE "{schema}"."{table_name}" '
+        f'ADD CONSTRAINT "{prefix}_{suffix}" PRIMARY KEY ({column_list})'
+    ))
+
+
+def has_primary_key(
+    connection: Connection,
+    table_name: str,
+    schema: str
+) -> bool:
+    return bool(connection.execute(
+        text(
+            "SELECT EXISTS (SELECT FROM pg_index "
+            "WHERE indrelid = to_regclass(:qualified_name) "
+            "AND indisprimary)"
+        ),
+        {"qualified_name": f'"{schema}"."{table_name}"'}
+    ).scalar())
+
+
+def has_declared_definition(
+    connection: Connection,
+    table_name: str,
+    schema: str
+) -> bool:
+    """
+    Check that a live table has the columns, column types and primary
+    key declared for it in TABLE_SCHEMAS. Tables created before their
+    definition was declared, e.g. by `DataFrame.to_sql`, do not.
+
+    Args:
+        connection (Connection): Active SQLAlchemy database connection.
+        table_name (str): Name of the table.
+        schema (str): Schema of the table.
+
+    Returns:
+        bool: False if the table differs from its declared definition;
+        True if it matches or no definition is declared.
+    """
+    table_schema = find_table_schema(table_name)
+    if table_schema is None:
+        return True
+
+    columns = connection.execute(
+        text(
+            "SELECT column_name, data_type FROM information_schema.columns "
+            "WHERE table_schema = :schema AND table_name = :table_name "
+            "ORDER BY ordinal_position"
+        ),
+        {"schema": schema, "table_name": table_name}
+    ).all()
+    declared_columns = [
+        (column, column_type.lower())
+        for column, column_type in table_schema["columns"].items()
+    ]
+    if [tuple(column) for column in columns] != declared_columns:
+        return False
+    return has_primary_key(connection, table_name, schema)
+
+
+def replace_table(
+    connection: Connection,
+    data: pd.DataFrame,
+    table_name: str,
+    schema: str,
+    indexes: Sequence[Sequence[str]] = ()
+) -> int:
+    """
+    Replace a table with the rows of a DataFrame: the table is recreated
+    empty, the rows are bulk loaded with COPY and the primary key and
+    indexes are built.
+
+    Args:
+        connection (Connection): Active SQLAlchemy database connection.
+        data (pd.DataFrame): Rows to load.
+        table_name (str): Name of the table.
+        schema (str): Schema of the table.
+        indexes (Sequence[Sequence[str]]): Columns of each index.
+
+    Raises:
+        BulkLoadError: If the COPY fails.
+        TableSchemaError: If the rows do not fit the declared column
+        types of the table.
+
+    Returns:
+        int: Number of rows loaded.
+    """
+    data = conform_rows(data, table_name)
+    create_empty_table(connection, data, table_name, schema)
+    rows = copy_dataframe(connection, data, table_name, schema)
+    add_primary_key(connection, table_name, schema)
+    create_indexes(connection, table_name, schema, indexes)
+    return rows
+
+
+def load_table(
+    connection: Connection,
+    data: pd.DataFrame,
+    table_name: str,
+    schema: str,
+    indexes: Sequence[Sequence[str]] = (),
+    load_mode: str = "replace",
+    defer_swap: bool = False
+) -> int:
+    """
+    Load a DataFrame as the full content of a table with the given load
+    mode: "replace" rewrites the live table in place, "swap" loads a
+    staging table and swaps it in (see `swap_table`).
+
+    Args:
+        connection (Connection): Active SQLAlchemy database connection.
+        data (pd.DataFrame): Rows to load.
+        table_name (str): Name of the table.
+        schema (str): Schema of the table.
+        indexes (Sequence[Sequence[str]]): Columns of each index.
+        load_mode (str): One of "replace" or "swap".
+        defer_swap (bool): In swap mode, only build the staging table and
+        leave the swap to the caller (see `swap_in_staging_tables`).
+
+    Raises:
+        BulkLoadError: If the COPY fails.
+        TableSchemaError: If the rows do not fit the declared column
+        types of the table.
+        TableSwapError: If the staging table cannot be swapped in.
+
+    Returns:
+        int: Number of rows loaded.
+    """
+    if load_mode == "swap" and defer_swap:
+        return build_staging_table(
+            connection, data, table_name, schema, indexes
+        )
+    if load_mode == "swap":
+        return swap_table(connection, data, table_name, schema, indexes)
+    return replace_table(connection, data, table_name, schema, indexes)
+
+
+def table_exists_in_schema(
+    connection: Connection,
+    table_name: str,
+    schema: str
+) -> bool:
+    return bool(connection.execute(
+        text("SELECT to_regclass(:qualified_name) IS NOT NULL"),
+        {"qualified_name": f'"{schema}"."{table_name}"'}
+    ).scalar())
+
+
+def swap_table(
+    connection: Connection,
+    data: pd.DataFrame,
+    table_name: str,
+    schema: str,
+    indexes: Sequence[Sequence[str]] = ()
+) -> int:
+    """
+    Load a DataFrame into a staging table and swap it in for the live
+    table.
+
+    The staging table is bulk loaded, indexed, analysed and committed
+    while readers keep querying the live table. The swap itself is two
+    `ALTER TABLE ... RENAME` statements in one transaction. Its lock is
+    only held for the renames, and the swap gives up after
+    LOAD_SWAP_LOCK_TIMEOUT_MS instead of queueing readers behind it
+    when a long query holds the live table. The previous table is kept
+    as "<table>_bak_<timestamp>" for LOAD_SWAP_RETENTION_HOURS.
+
+    Args:
+        connection (Connection): Active SQLAlchemy database connection.
+        data (pd.DataFrame): Rows to load.
+        table_name (str): Name of the live table.
+        schema (str): Schema of the table.
+        indexes (Sequence[Sequence[str]]): Columns of each index.
+
+    Raises:
+        BulkLoadError: If the COPY fails.
+        TableSwapError: If the staging table cannot be swapped in.
+
+    Returns:
+        int: Number of rows loaded.
+    """
+    load_config = load_load_config()["load"]
+
+    rows = build_staging_table(connection, data, table_name, schema, indexes)
+    swap_in_staging_table(
+        connection,
+        table_name,
+        schema,
+        load_config["swap_lock_timeout_ms"],
+        load_config["swap_retries"]
+    )
+    drop_expired_backups(
+        connection,
+        table_name,
+        schema,
+        load_config["swap_retention_hours"]
+    )
+    connection.commit()
+
+    return rows
+
+
+def build_staging_table(
+    connection: Connection,
+    data: pd.DataFrame,
+    table_name: str,
+    schema: str,
+    indexes: Sequence[Sequence[str]] = ()
+) -> int:
+    """
+    Bulk load, key, index, analyse and commit the staging table of a
+    live table, without touching the live table.
+
+    Args:
+        connection (Connection): Active SQLAlchemy database connection.
+        data (pd.DataFrame): Rows to load.
+        table_name (str): Name of the live table.
+        schema (str): Schema of the table.
+        indexes (Sequence[Sequence[str]]): Columns of each index.
+
+    Raises:
+        BulkLoadError: If the COPY fails.
+        TableSchemaError: If the rows do not fit the declared column
+        types of the table.
+
+    Returns:
+        int: Number of rows loaded.
+    """
+    staging_table_name = f"{table_name}{STAGING_SUFFIX}"
+
+    # Build the new table next to the live one
+    connection.execute(
+        text(f'DROP TABLE IF EXISTS "{schema}"."{staging_table_name}"')
+    )
+    data = conform_rows(data, staging_table_name)
+    create_empty_table(connection, data, staging_table_name, schema)
+    rows = copy_dataframe(connection, data, staging_table_name, schema)
+    add_primary_key(connection, staging_table_name, schema)
+    create_indexes(connection, staging_table_name, schema, indexes)
+    connection.execute(text(f'ANALYZE "{schema}"."{staging_table_name}"'))
+    connection.commit()
+
+    return rows
+
+
+def swap_in_staging_table(
+    connection: Connection,
+    table_name: str,
+    schema: str,
+    lock_timeout_ms: int,
+    retries: int
+) -> Optional[str]:
+    """
+    Rename the live table to a backup and the staging table to the live
+    name in one transaction, retrying when the live table's lock cannot
+    be taken within the lock timeout.
+
+    Args:
+        connection (Connection): Active SQLAlchemy database connection.
+        table_name (str): Name of the live table.
+        schema (str): Schema of the table.
+        lock_timeout_ms (int): Longest wait for the lock per attempt.
+        retries (int): Number of attempts.
+
+    Raises:
+        TableSwapError: If every attempt timed out.
+
+    Returns:
+        Optional[str]: Name of the backup table, or None if there was no
+        live table yet.
+    """
+    return swap_in_staging_tables(
+        connection, [table_name], schema, lock_timeout_ms, retries
+    )[table_name]
+
+
+def swap_in_staging_tables(
+    connection: Connection,
+    table_names: Sequence[str],
+    schema: str,
+    lock_timeout_ms: int,
+    retries: int,
+    before_commit: Optional[Callable[[Connection], None]] = None
+) -> Dict[str, Optional[str]]:
+    """
+    Swap the staging tables of several live tables in at once. Every
+    rename happens in the same transaction, so readers see either all of
+    the previous tables or all of the new ones.
+
+    Args:
+        connection (Connection): Active SQLAlchemy database connection.
+        table_names (Sequence[str]): Names of the live tables.
+        schema (str): Schema of the tables.
+        lock_timeout_ms (int): Longest wait for the locks per attempt.
+        retries (int): Number of attempts.
+        before_commit (Optional[Callable[[Connection], None]]): Called
+        with the connection after the renames of each attempt, to write
+        more changes in the transaction of the swap.
+
+    Raises:
+        TableSwapError: If every attempt timed out.
+
+    Returns:
+        Dict[str, Optional[str]]: Name of the backup table of each live
+        table, or None if there was no live table yet.
+    """
+    staging_table_names = ", ".join(
+        f"{table_name}{STAGING_SUFFIX}" for table_name in table_names
+    )
+    live_table_names = ", ".join(table_names)
+
+    for attempt in range(1, retries + 1):
+        backups: Dict[str, Optional[str]] = {}
+        try:
+            connection.execute(
+                text(f"SET LOCAL lock_timeout = {int(lock_timeout_ms)}")
+            )
+            for table_name in table_names:
+                backups[table_name] = rename_staging_table(
+                    connection, table_name, schema
+                )
+            if before_commit is not None:
+                before_commit(connection)
+            connection.commit()
+        except OperationalError as e:
+            connection.rollback()
+            if not isinstance(e.orig, psycopg.errors.LockNotAvailable):
+                raise
+            if attempt == retries:
+                logger.error(
+                    f"Failed to swap {staging_table_names} into "
+                    f"{live_table_names} after {retries} attempts: {e}"
+                )
+                raise TableSwapError(
+                    f"Failed to swap {staging_table_names} into "
+                    f"{live_table_names} after {retries} attempts: {e}"
+                )
+            logger.warning(
+                f"Timed out waiting for the lock on {live_table_names} "
+                f"(attempt {attempt} of {retries}), retrying..."
+            )
+            time.sleep(attempt)
+            continue
+
+        for table_name, backup_table_name in backups.items():
+            staging_table_name = f"{table_name}{STAGING_SUFFIX}"
+            if backup_table_name is not None:
+                logger.info(
+                    f"Swapped {staging_table_name} into {table_name}; the "
+                    f"previous table is kept as {backup_table_name}"
+                )
+            else:
+                logger.info(f"Renamed {staging_table_name} to {table_name}")
+        return backups
+
+
+def rename_staging_table(
+    connection: Connection,
+    table_name: str,
+    schema: str
+) -> Optional[str]:
+    """
+    Rename the live table to a backup and its staging table to the live
+    name, in the caller's transaction.
+
+    Args:
+        connection (Connection): Active SQLAlchemy database connection.
+        table_name (str): Name of the live table.
+        schema (str): Schema of the table.
+
+    Returns:
+        Optional[str]: Name of the backup table, or None if there was no
+        live table yet.
+    """
+    staging_table_name = f"{table_name}{STAGING_SUFFIX}"
+    backup_table_name = (
+        f"{table_name}{BACKUP_INFIX}"
+        f"{datetime.now(timezone.utc):{BACKUP_TIMESTAMP_FORMAT}}"
+    )
+
+    live_table_exists = table_exists_in_schema(connection, table_name, schema)
+    if live_table_exists:
+        connection.execute(text(
+            f'ALTER TABLE "{schema}"."{table_name}" '
+            f'RENAME TO "{backup_table_name}"'
+        ))
+    connection.execute(text(
+        f'ALTER TABLE "{schema}"."{staging_table_name}" '
+        f'RENAME TO "{table_name}"'
+    ))
+
+    return backup_table_name if live_table_exists else None
+
+
+def list_backup_tables(
+    connection: Connection,
+    table_name: str,
+    schema: str
+) -> List[str]:
+    """
+    List the backup tables kept by previous swaps, oldest first.
+
+    Args:
+        connection (Connection): Active SQLAlchemy database connection.
+        table_name (str): Name of the live table.
+        schema (str): Schema of the table.
+
+    Returns:
+        List[str]: Names of the backup tables.
+    """
+    prefix = f"{table_name}{BACKUP_INFIX}"
+    names = connection.execute(
+        text(
+            "SELECT table_name FROM information_schema.tables "
+            "WHERE table_schema = :schema "
+            "AND left(table_name, :length) = :prefix"
+        ),
+        {"schema": schema, "length": len(prefix), "prefix": prefix}
+    ).scalars().all()
+
+    # The timestamp suffix sorts chronologically
+    return sorted(
+        name for name in names
+        if name[len(prefix):].isdigit()
+    )
+
+
+def drop_expired_backups(
+    connection: Connection,
+    table_name: str,
+    schema: str,
+    retention_hours: int
+) -> List[str]:
+    """
+    Drop the backup tables older than the rollback window.
+
+    Args:
+        connection (Connection): Active SQLAlchemy database connection.
+        table_name (str): Name of the live table.
+        schema (str): Schema of the table.
+        retention_hours (int): Hours a backup is kept for.
+
+    Returns:
+        List[str]: Names of the dropped tables.
+    """
+    prefix = f"{table_name}{BACKUP_INFIX}"
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=retention_hours)
+
+    dropped = []
+    for backup_table_name in list_backup_tables(
+        connection, table_name, schema
+    ):
+        created_at = datetime.strptime(
+            backup_table_name[len(prefix):], BACKUP_TIMESTAMP_FORMAT
+        ).replace(tzinfo=timezone.utc)
+        if created_at <= cutoff:
+            connection.execute(
+                text(f'DROP TABLE "{schema}"."{backup_table_name}"')
+            )
+            dropped.append(backup_table_name)
+
+    if dropped:
+        logger.info(f"Dropped expired backups of {table_name}: {dropped}")
+    return dropped
+
+
+def restore_previous_table(
+    connection: Connection,
+    table_name: str,
+    schema: str,
+    before_commit: Optional[Callable[[Connection], None]] = None
+) -> str:
+    """
+    Roll back the last swap: the most recent backup becomes the live
+    table again, and the current live table is kept as a backup, so the
+    rollback can itself be undone within the rollback window.
+
+    Args:
+        connection (Connection): Active SQLAlchemy database connection.
+        table_name (str): Name of the live table.
+        schema (str): Schema of the table.
+        before_commit (Optional[Callable[[Connection], None]]): Called
+        with the connection after the renames, to write more changes in
+        the transaction of the rollback.
+
+    Raises:
+        TableSwapError: If there is no backup to restore.
+
+    Returns:
+        str: Name of the restored backup table.
+    """
+    backups = list_backup_tables(connection, table_name, schema)
+    if not backups:
+        raise TableSwapError(f"No backup of {table_name} to restore")
+
+    restored_table_name = backups[-1]
+    current_backup_name = (
+        f"{table_name}{BACKUP_INFIX}"
+        f"{datetime.now(timezone.utc):{BACKUP_TIMESTAMP_FORMAT}}"
+    )
+    connection.execute(text(
+        f'ALTER TABLE "{schema}"."{table_name}" '
+        f'RENAME TO "{current_backup_name}"'
+    ))
+    connection.execute(text(
+        f'ALTER TABLE "{schema}"."{restored_table_name}" '
+        f'RENAME TO "{table_name}"'
+    ))
+    if before_commit is not None:
+        before_commit(connection)
+    connection.commit()
+
+    logger.info(
+        f"Restored {restored_table_name} as {table_name}; the replaced "
+        f"table is kept as {current_backup_name}"
+    )
+    return restored_table_name
@@ -0,0 +1,92 @@
+import pandas as pd
+from src.utils.source_schema_utils import (
+    get_read_csv_kwargs,
+    get_source_schema
+)
+
+
+def read_source_csv(
+    file_path: str,
+    source: str,
+    engine: str = "c",
+    chunk_size: int = 100000
+) -> pd.DataFrame:
+    """
+    Read a raw source CSV with the given parsing engine, applying the
+    schema registered for the source.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        source (str): Name of the source in the schema registry.
+        engine (str): "c" for pandas' default parser, "pyarrow" for the
+        multithreaded pyarrow reader or "chunked" to read the file in
+        chunks with the C parser.
+        chunk_size (int): Rows per chunk when the engine is "chunked".
+
+    Raises:
+        ValueError: If the engine is not supported.
+
+    Returns:
+        pd.DataFrame: DataFrame containing the source data.
+    """
+    read_csv_kwargs = get_read_csv_kwargs(source)
+
+    if engine == "c":
+        return pd.read_csv(file_path, engine="c", **read_csv_kwargs)
+    if engine == "pyarrow":
+        return pd.read_csv(file_path, engine="pyarrow", **read_csv_kwargs)
+    if engine == "chunked":
+        return read_source_csv_chunks(file_path, source, chunk_size)
+
+    raise ValueError(f"Unsupported CSV engine: {engine}")
+
+
+def iter_source_csv(file_path: str, source: str, chunk_size: int):
+    """
+    Iterate over a raw source CSV in chunks, applying the schema
+    registered for the source.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        source (str): Name of the source in the schema registry.
+        chunk_size (int): Rows per chunk.
+
+    Returns:
+        Iterator[pd.DataFrame]: Iterator over the chunks of the file.
+    """
+    return pd.read_csv(
+        file_path,
+        chunksize=chunk_size,
+        **get_read_csv_kwargs(source)
+    )
+
+
+def read_source_csv_chunks(
+    file_path: str,
+    source: str,
+    chunk_size: int
+) -> pd.DataFrame:
+    """
+    Read a raw source CSV chunk by chunk and combine the chunks into a
+    single DataFrame.
+
+    Each chunk infers its own categories, so categorical columns are
+    re-encoded once the chunks have been combined.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        source (str): Name of the source in the schema registry.
+        chunk_size (int): Rows per chunk.
+
+    Returns:
+        pd.DataFrame: DataFrame containing the source data.
+    """
+    with iter_source_csv(file_path, source, chunk_size) as reader:
+        data = pd.concat(list(reader), ignore_index=True)
+
+    categorical_columns = get_source_schema(source)["categorical"]
+    if categorical_columns:
+        data = data.astype({column: "category"
+                            for column in categorical_columns})
+
+    return data
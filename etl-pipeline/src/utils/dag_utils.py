@@ -0,0 +1,603 @@
+import logging
+import multiprocessing
+import pandas as pd
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    wait
+)
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from src.utils import artifact_utils
+from src.utils.logging_utils import setup_logger
+from src.utils.profiling_utils import (
+    ProfileSettings,
+    count_rows,
+    format_metrics,
+    profile_call
+)
+from src.utils.shared_frame_utils import (
+    SharedFrame,
+    read_shared_frame,
+    unlink_shared_frame,
+    write_shared_frame
+)
+
+
+class GraphError(Exception):
+    pass
+
+
+# Configure the logger
+logger = setup_logger(__name__, "transform_data.log", level=logging.DEBUG)
+
+# A graph maps the name of each node to:
+# - function: called with the node's inputs as positional arguments; must
+#   be picklable (a module-level function or a functools.partial of one)
+#   to run in a worker process
+# - inputs: names of the frames passed to the function, produced by other
+#   nodes or given to `run_graph`
+# - outputs: names of the frames the function returns, as a tuple when
+#   there are several; defaults to the node's own name
+# - files: paths of files the function reads besides its inputs, for a
+#   cache to fingerprint (optional, not used by the runner)
+# - key: anything else a cache should check the node's outputs against,
+#   or a function returning it (optional, not used by the runner)
+Graph = Dict[str, Dict[str, Any]]
+
+
+def get_node_outputs(name: str, node: Dict[str, Any]) -> List[str]:
+    return list(node.get("outputs", [name]))
+
+
+def sort_graph(graph: Graph, sources: List[str]) -> List[str]:
+    """
+    Order the nodes of a graph so every node comes after the nodes it
+    depends on.
+
+    Args:
+        graph (Graph): The nodes of the graph.
+        sources (List[str]): Names of the frames given to the graph.
+
+    Raises:
+        GraphError: If an input is produced by no node and is not a
+        source, or if the nodes depend on each other in a cycle.
+
+    Returns:
+        List[str]: The node names in dependency order, ties in the order
+        of the graph.
+    """
+    available = set(sources)
+    produced = {
+        output
+        for name, node in graph.items()
+        for output in get_node_outputs(name, node)
+    }
+    for name, node in graph.items():
+        missing = [
+            frame for frame in node["inputs"]
+            if frame not in produced and frame not in available
+        ]
+        if missing:
+            raise GraphError(f"Node {name} has unknown inputs: {missing}")
+
+    order = []
+    remaining = dict(graph)
+    while remaining:
+        ready = [
+            name for name, node in remaining.items()
+            if all(frame in available for frame in node["inputs"])
+        ]
+        if not ready:
+            raise GraphError(
+                f"Nodes depend on each other in a cycle: {list(remaining)}"
+            )
+        for name in ready:
+            order.append(name)
+            available.update(get_node_outputs(name, remaining.pop(name)))
+
+    return order
+
+
+def select_upstream(graph: Graph, targets: List[str]) -> Graph:
+    """
+    Narrow a graph down to some nodes and the nodes they depend on,
+    directly or not.
+
+    Args:
+        graph (Graph): The nodes of the graph.
+        targets (List[str]): Names of the nodes to keep, or of frames
+        whose producing nodes to keep.
+
+    Raises:
+        GraphError: If a target is neither a node nor a frame produced
+        by one.
+
+    Returns:
+        Graph: The selected nodes, in the order of the graph.
+    """
+    producers = {
+        output: name
+        for name, node in graph.items()
+        for output in get_node_outputs(name, node)
+    }
+
+    selected = set()
+    stack = []
+    for target in targets:
+        if target in graph:
+            stack.append(target)
+        elif target in producers:
+            stack.append(producers[target])
+        else:
+            raise GraphError(f"Unknown node or frame: {target}")
+
+    while stack:
+        name = stack.pop()
+        if name in selected:
+            continue
+        selected.add(name)
+        stack.extend(
+            producers[frame]
+            for frame in graph[name]["inputs"]
+            if frame in producers
+        )
+
+    return {name: node for name, node in graph.items() if name in selected}
+
+
+def get_target_frames(graph: Graph, targets: List[str]) -> List[str]:
+    """
+    Names of the frames some targets stand for.
+
+    Args:
+        graph (Graph): The nodes of the graph.
+        targets (List[str]): Names of nodes, standing for their outputs,
+        or of frames, as `select_upstream` takes them.
+
+    Returns:
+        List[str]: The frame names, in the order of the targets.
+    """
+    frames = []
+    for target in targets:
+        if target in graph:
+            frames += get_node_outputs(target, graph[target])
+        else:
+            frames.append(target)
+    return list(dict.fromkeys(frames))
+
+
+def collect_outputs(
+    name: str,
+    node: Dict[str, Any],
+    result: Any
+) -> Dict[str, Any]:
+    outputs = get_node_outputs(name, node)
+    if not outputs:
+        return {}
+    if len(outputs) == 1:
+        return {outputs[0]: result}
+    return dict(zip(outputs, result))
+
+
+def log_node_metrics(name: str, metrics: Dict[str, Any]) -> None:
+    logger.setLevel(logging.INFO)
+    logger.info(
+        f"Node {name} completed in {metrics['wall_seconds']} seconds "
+        f"({metrics['where']}): {format_metrics(metrics)}"
+    )
+
+
+class NodeCache:
+    """
+    Lets `run_graph` skip the nodes whose outputs from an earlier run
+    are still valid. This base class caches nothing, so every node runs.
+
+    A cacheable node is checked once every cacheable node it depends on
+    has run or been skipped; if it is fresh it is skipped and its
+    outputs are only read back if a node that does run needs them. A
+    node that is not cacheable, e.g. one reading a source file, runs
+    only when a node that runs needs its outputs, or when nothing
+    depends on it; `is_fresh` must therefore be able to tell whether
+    such a node's outputs changed without running it.
+    """
+
+    def is_cacheable(self, name: str) -> bool:
+        return False
+
+    def is_fresh(self, name: str) -> bool:
+        return False
+
+    def read(self, frame: str) -> Any:
+        raise GraphError(f"No cached value of frame {frame}")
+
+    def record(self, name: str) -> None:
+        pass
+
+
+class GraphScheduler:
+    """
+    Tracks which nodes of a graph run, are skipped or are not needed,
+    and which are ready, for the in-line and process pool runners.
+    The measurements of the nodes that ran and the nodes that were
+    skipped are collected in `metrics`.
+
+    A frame is held in `frames` until no node left to run reads it,
+    unless it is one of the frames to `keep`.
+    """
+
+    # Node states that are final
+    SETTLED = ("done", "skipped", "unneeded")
+
+    def __init__(
+        self,
+        graph: Graph,
+        sources: Dict[str, Any],
+        cache: Optional[NodeCache] = None,
+        metrics: Optional[Dict[str, Dict[str, Any]]] = None,
+        keep: Optional[List[str]] = None
+    ):
+        self.graph = graph
+        self.keep = list(keep or [])
+        self.metrics = {} if metrics is None else metrics
+        self.order = sort_graph(graph, list(sources))
+        self.cache = cache or NodeCache()
+        self.frames = dict(sources)
+        # Outputs of skipped nodes that no running node has read yet
+        self.deferred = set()
+        self.state = dict.fromkeys(self.order, "pending")
+        self.producers = {
+            output: name
+            for name in self.order
+            for output in get_node_outputs(name, graph[name])
+        }
+        self.consumers = {
+            name: [
+                other for other in self.order
+                if any(
+                    self.producers.get(frame) == name
+                    for frame in graph[other]["inputs"]
+                )
+            ]
+            for name in self.order
+        }
+
+    @property
+    def finished(self) -> bool:
+        return all(state in self.SETTLED for state in self.state.values())
+
+    def get_unfinished(self) -> List[str]:
+        return [
+            name for name in self.order
+            if self.state[name] not in self.SETTLED
+        ]
+
+    def decide(self) -> None:
+        # Deciding a node may decide the non-cacheable nodes it needs
+        changed = True
+        while changed:
+            changed = False
+            for name in self.order:
+                if self.state[name] != "pending":
+                    continue
+                state = self.decide_node(name)
+                if state is not None:
+                    self.state[name] = state
+                    changed = True
+                if state == "skipped":
+                    self.deferred.update(
+                        get_node_outputs(name, self.graph[name])
+                    )
+                    self.metrics[name] = {"status": "skipped"}
+
+    def decide_node(self, name: str) -> Optional[str]:
+        if self.cache.is_cacheable(name):
+            upstream = [
+                self.producers[frame]
+                for frame in self.graph[name]["inputs"]
+                if frame in self.producers
+            ]
+            if any(
+                self.state[node] not in self.SETTLED
+                for node in upstream
+                if self.cache.is_cacheable(node)
+            ):
+                return None
+            return "skipped" if self.cache.is_fresh(name) else "wanted"
+
+        states = [self.state[node] for node in self.consumers[name]]
+        if not states or any(
+            state in ("wanted", "running", "done") for state in states
+        ):
+            return "wanted"
+        if all(state in self.SETTLED for state in states):
+            return "unneeded"
+        return None
+
+    def ready(self) -> List[str]:
+        """
+        Decide what can be decided and list the nodes to run whose
+        inputs are available, in dependency order.
+        """
+        self.decide()
+        return [
+            name for name in self.order
+            if self.state[name] == "wanted"
+            and all(
+                frame in self.frames or frame in self.deferred
+                for frame in self.graph[name]["inputs"]
+            )
+        ]
+
+    def start(self, name: str) -> List[Any]:
+        """Mark a ready node as running and return its inputs."""
+        for frame in self.graph[name]["inputs"]:
+            if frame in self.deferred:
+                self.frames[frame] = self.cache.read(frame)
+                self.deferred.discard(frame)
+        self.state[name] = "running"
+        return [self.frames[frame] for frame in self.graph[name]["inputs"]]
+
+    def complete(
+        self,
+        name: str,
+        outputs: Dict[str, Any],
+        metrics: Dict[str, Any]
+    ) -> None:
+        self.frames.update(outputs)
+        self.state[name] = "done"
+        self.metrics[name] = {"status": "ran", **metrics}
+        log_node_metrics(name, metrics)
+        if self.cache.is_cacheable(name):
+            self.cache.record(name)
+        self.release_unused_frames()
+
+    def release_unused_frames(self) -> None:
+        """Drop the frames no node left to run reads, except kept ones."""
+        needed = set(self.keep)
+        needed.update(
+            frame
+            for name in self.get_unfinished()
+            for frame in self.graph[name]["inputs"]
+        )
+        for frame in [frame for frame in self.frames if frame not in needed]:
+            del self.frames[frame]
+
+    def get_kept_frames(self) -> Dict[str, Any]:
+        """
+        The frames to keep, once the graph is finished. Those of skipped
+        nodes that no node read are read back from the cache.
+        """
+        for frame in self.keep:
+            if frame in self.deferred:
+                self.frames[frame] = self.cache.read(frame)
+                self.deferred.discard(frame)
+        return {
+            frame: self.frames[frame]
+            for frame in self.keep
+            if frame in self.frames
+        }
+
+    def check_progress(self, running: bool) -> None:
+        if not running and not self.finished:
+            raise GraphError(
+                f"Nodes cannot be scheduled: {self.get_unfinished()}"
+            )
+
+
+def run_graph(
+    graph: Graph,
+    sources: Dict[str, Any],
+    max_workers: int = 1,
+    cache: Optional[NodeCache] = None,
+    profile: Optional[ProfileSettings] = None,
+    metrics: Optional[Dict[str, Dict[str, Any]]] = None,
+    keep: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Run the nodes of a graph once their inputs are available and log
+    how long each node took, see `profiling_utils.profile_call`.
+
+    A frame is dropped as soon as no node left to run reads it, so only
+    the frames to keep outlive the nodes reading them.
+
+    With one worker the nodes run one after another in this process.
+    With more, nodes whose inputs are ready run at the same time in a
+    process pool; the frames are handed to and from the workers as
+    Arrow streams in shared memory rather than pickled.
+
+    Args:
+        graph (Graph): The nodes of the graph.
+        sources (Dict[str, Any]): Frames given to the graph, by name.
+        max_workers (int): Number of worker processes.
+        cache (Optional[NodeCache]): Decides which nodes can reuse their
+        outputs of an earlier run; by default every node runs.
+        profile (Optional[ProfileSettings]): Also capture a profile of
+        each node that runs.
+        metrics (Optional[Dict[str, Dict[str, Any]]]): Filled with the
+        status ('ran' or 'skipped') of the nodes, by name, and the
+        measurements of those that ran, as they finish.
+        keep (Optional[List[str]]): Names of the frames to return; by
+        default none are.
+
+    Raises:
+        GraphError: If the graph is invalid.
+        Exception: The error raised by the first failing node.
+
+    Returns:
+        Dict[str, Any]: The frames to keep that were given, produced or
+        can be read back from the cache, by name.
+    """
+    scheduler = GraphScheduler(graph, sources, cache, metrics, keep)
+    if max_workers > 1:
+        return run_graph_in_processes(scheduler, max_workers, profile)
+
+    while True:
+        ready = scheduler.ready()
+        if scheduler.finished:
+            return scheduler.get_kept_frames()
+        scheduler.check_progress(bool(ready))
+        name = ready[0]
+        node = graph[name]
+        result, node_metrics = profile_call(
+            name, node["function"], scheduler.start(name), profile
+        )
+        outputs = collect_outputs(name, node, result)
+        node_metrics.update(
+            rows_out=count_rows(list(outputs.values())),
+            where="inline"
+        )
+        scheduler.complete(name, outputs, node_metrics)
+
+
+def init_worker() -> None:
+    """
+    Set up a worker process. A background artifact writer inherited from
+    the parent would have no threads in the worker, so it is cleared and
+    the workers write their artifacts in-line.
+    """
+    artifact_utils._active_writer = None
+
+
+def run_node_in_worker(
+    name: str,
+    function: Callable[..., Any],
+    inputs: List[Optional[SharedFrame]],
+    outputs: List[str],
+    profile: Optional[ProfileSettings] = None
+) -> Tuple[Dict[str, Optional[SharedFrame]], Dict[str, Any]]:
+    """
+    Run a node in a worker process, reading its inputs from and writing
+    its outputs to shared memory.
+
+    Returns:
+        Tuple[Dict[str, Optional[SharedFrame]], Dict[str, Any]]: Handles
+        of the outputs by name, None for outputs that are None, and the
+        node's measurements.
+    """
+    arguments = [
+        None if frame is None else read_shared_frame(frame)
+        for frame in inputs
+    ]
+    result, metrics = profile_call(name, function, arguments, profile)
+    results = collect_outputs(name, {"outputs": outputs}, result)
+    metrics.update(
+        rows_out=count_rows(list(results.values())),
+        where="worker process"
+    )
+
+    shared = {}
+    try:
+        for output, data in results.items():
+            if data is not None and not isinstance(data, pd.DataFrame):
+                raise GraphError(
+                    f"Node {name} returned a {type(data).__name__} for "
+                    f"{output}; only DataFrames can leave a worker"
+                )
+            shared[output] = (
+                None if data is None else write_shared_frame(data)
+            )
+    except Exception:
+        for frame in shared.values():
+            if frame is not None:
+                unlink_shared_frame(frame)
+        raise
+
+    return shared, metrics
+
+
+def run_graph_in_processes(
+    scheduler: GraphScheduler,
+    max_workers: int,
+    profile: Optional[ProfileSettings] = None
+) -> Dict[str, Any]:
+    """
+    Run the nodes of a graph in a process pool, see `run_graph`.
+
+    A frame is copied to shared memory the first time a worker needs
+    it, and the block is freed once no node left to run reads it.
+    """
+    graph = scheduler.graph
+    shared: Dict[str, Optional[SharedFrame]] = {}
+    running: Dict[Future, str] = {}
+
+    def share(frame: str) -> Optional[SharedFrame]:
+        if frame not in shared:
+            data = scheduler.frames[frame]
+            shared[frame] = (
+                None if data is None else write_shared_frame(data)
+            )
+        return shared[frame]
+
+    def release_unused_frames() -> None:
+        needed = {
+            frame
+            for name in scheduler.get_unfinished()
+            for frame in graph[name]["inputs"]
+        }
+        for frame in [frame for frame in shared if frame not in needed]:
+            if shared[frame] is not None:
+                unlink_shared_frame(shared[frame])
+            del shared[frame]
+
+    # Spawned workers start without the parent's threads and locks
+    executor = ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker
+    )
+    try:
+        while True:
+            ready = scheduler.ready()
+            if scheduler.finished:
+                return scheduler.get_kept_frames()
+            scheduler.check_progress(bool(ready or running))
+
+            for name in ready:
+                node = graph[name]
+                scheduler.start(name)
+                future = executor.submit(
+                    run_node_in_worker,
+                    name,
+                    node["function"],
+                    [share(frame) for frame in node["inputs"]],
+                    get_node_outputs(name, node),
+                    profile
+                )
+                running[future] = name
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                if future.exception() is not None:
+                    logger.setLevel(logging.ERROR)
+                    logger.error(
+                        f"Node {name} failed: {future.exception()}"
+                    )
+                    raise future.exception()
+
+                outputs, node_metrics = future.result()
+                results = {}
+                for output, frame in outputs.items():
+                    # The worker's blocks are read once and freed
+                    if frame is None:
+                        results[output] = None
+                        continue
+                    try:
+                        results[output] = read_shared_frame(frame)
+                    finally:
+                        unlink_shared_frame(frame)
+                scheduler.complete(name, results, node_metrics)
+
+            release_unused_frames()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        # Free the outputs of nodes that finished after a failure
+        for future, name in running.items():
+            if not future.cancelled() and future.exception() is None:
+                for frame in future.result()[0].values():
+                    if frame is not None:
+                        unlink_shared_frame(frame)
+        for frame in shared.values():
+            if frame is not None:
+                unlink_shared_frame(frame)
@@ -1,10 +1,13 @@
-from sqlalchemy import create_engine
+from sqlalchemy import Connection, Engine, create_engine
 from sqlalchemy.exc import (
     ArgumentError,
     OperationalError,
     SQLAlchemyError
 )
 import logging
+import threading
+from typing import Any, Dict, Tuple
+from config.db_config import load_db_pool_config
 from src.utils.logging_utils import setup_logger
 
 
@@ -19,8 +22,14 @@ class QueryExecutionError(Exception):
 # Setup the logger
 logger = setup_logger(__name__, "database.log", level=logging.DEBUG)
 
+CONNECTION_PARAMS = ["dbname", "user", "password", "host", "port"]
 
-def create_db_engine(connection_params):
+# Process-wide pooled engines, keyed by connection and pool parameters
+_engines: Dict[Tuple, Engine] = {}
+_engines_lock = threading.Lock()
+
+
+def create_db_engine(connection_params, **engine_options):
     """
     Creates a SQLAlchemy database engine for connecting to a PostgreSQL
     database.
@@ -33,6 +42,8 @@ def create_db_engine(connection_params):
             - password (str): Password.
             - host (str): Host address.
             - port (str or int): Port number.
+        **engine_options: Extra keyword arguments for `create_engine`,
+        e.g. the pool settings.
 
     Raises:
         ValueError: If a required connection parameter (except password) is
@@ -47,13 +58,14 @@ def create_db_engine(connection_params):
         database.
     """
     try:
-        for param in ["dbname", "user", "password", "host", "port"]:
+        for param in CONNECTION_PARAMS:
             if not param == "password" and not connection_params.get(param):
                 raise ValueError(f"{param} not provided.")
         engine = create_engine(
             f"postgresql+psycopg://{connection_params['user']}"
             f":{connection_params['password']}@{connection_params['host']}"
-            f":{connection_params['port']}/{connection_params['dbname']}"
+            f":{connection_params['port']}/{connection_params['dbname']}",
+            **engine_options
         )
         logger.setLevel(logging.INFO)
         logger.info("Successfully created the database engine.")
@@ -117,3 +129,92 @@ def get_db_connection(connection_params):
         )
     except Exception as e:
         raise Exception(f"An error occurred: {e}")
+
+
+def get_pooled_engine(connection_params) -> Engine:
+    """
+    Returns the process-wide pooled engine for the connection parameters,
+    creating it on first use. The pool is sized and tuned by
+    DB_POOL_SIZE, DB_POOL_MAX_OVERFLOW, DB_POOL_PRE_PING and
+    DB_POOL_RECYCLE_SECONDS.
+
+    Args:
+        connection_params (dict): Dictionary containing database connection
+        parameters, see `create_db_engine`.
+
+    Raises:
+        DatabaseConnectionError: If the engine cannot be created.
+
+    Returns:
+        Engine: The shared SQLAlchemy Engine.
+    """
+    pool_config = load_db_pool_config()["pool"]
+    key = tuple(
+        str(connection_params.get(param)) for param in CONNECTION_PARAMS
+    ) + tuple(sorted(pool_config.items()))
+
+    with _engines_lock:
+        if key not in _engines:
+            _engines[key] = create_db_engine(connection_params, **pool_config)
+        return _engines[key]
+
+
+def get_pooled_connection(connection_params) -> Connection:
+    """
+    Checks out a connection from the shared pooled engine. Closing the
+    connection returns it to the pool instead of disconnecting.
+
+    Args:
+        connection_params (dict): Dictionary containing database connection
+        parameters, see `create_db_engine`.
+
+    Raises:
+        DatabaseConnectionError: If the connection cannot be established.
+
+    Returns:
+        Connection: An active database connection.
+    """
+    engine = get_pooled_engine(connection_params)
+    try:
+        return engine.connect()
+    except OperationalError as e:
+        logger.setLevel(logging.ERROR)
+        logger.error(f"Operational error when connecting to the database: {e}")
+        raise DatabaseConnectionError(
+            f"Operational error when connecting to the database: {e}"
+        )
+    except SQLAlchemyError as e:
+        logger.setLevel(logging.ERROR)
+        logger.error(f"Failed to connect to the database: {e}")
+        raise DatabaseConnectionError(
+            f"Failed to connect to the database: {e}"
+        )
+
+
+def get_pool_status(connection_params) -> Dict[str, Any]:
+    """
+    Describe the state of the shared pool for the connection parameters.
+
+    Args:
+        connection_params (dict): Dictionary containing database connection
+        parameters, see `create_db_engine`.
+
+    Returns:
+        Dict[str, Any]: The pool size and the number of connections
+        checked in, checked out and opened beyond the pool size.
+    """
+    pool = get_pooled_engine(connection_params).pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+
+
+def dispose_pooled_engines() -> None:
+    """Close every pooled connection and forget the shared engines."""
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
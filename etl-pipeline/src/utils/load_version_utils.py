@@ -0,0 +1,74 @@
+from typing import Sequence
+from sqlalchemy import Connection, text
+from src.utils.bulk_load_utils import table_exists_in_schema
+from src.utils.logging_utils import setup_logger
+
+
+# Setup the logger
+logger = setup_logger("load_data", "load_data.log")
+
+# Table holding one row per loaded table, with a version bumped by every
+# load. The dashboards poll it to tell when their cached tables are stale.
+LOAD_VERSIONS_TABLE = "aa_load_versions"
+
+
+def create_load_versions_table(connection: Connection, schema: str) -> None:
+    """
+    Create the load versions table unless it already exists. Only when
+    it is missing do loads running at once on other connections wait for
+    each other, on an advisory lock held until their transaction ends,
+    so creating it cannot race. Loads committed together create it
+    beforehand (see `load_tables_concurrently`), as they would otherwise
+    wait on each other's lock forever.
+
+    Args:
+        connection (Connection): Active SQLAlchemy database connection.
+        schema (str): Schema of the table.
+    """
+    if table_exists_in_schema(connection, LOAD_VERSIONS_TABLE, schema):
+        return
+
+    connection.execute(
+        text("SELECT pg_advisory_xact_lock(hashtext(:lock_name))"),
+        {"lock_name": f"{schema}.{LOAD_VERSIONS_TABLE}"}
+    )
+    connection.execute(text(
+        f'CREATE TABLE IF NOT EXISTS "{schema}"."{LOAD_VERSIONS_TABLE}" ('
+        '"table_name" TEXT PRIMARY KEY, '
+        '"version" BIGINT NOT NULL, '
+        '"loaded_at" TIMESTAMPTZ NOT NULL)'
+    ))
+
+
+def record_load_versions(
+    connection: Connection,
+    table_names: Sequence[str],
+    schema: str
+) -> None:
+    """
+    Bump the load version of the given tables, in the connection's
+    current transaction, so the new versions become visible together
+    with the rows they describe. The versions table is created on first
+    use, see `create_load_versions_table`.
+
+    Args:
+        connection (Connection): Active SQLAlchemy database connection.
+        table_names (Sequence[str]): Names of the tables just loaded.
+        schema (str): Schema of the tables.
+    """
+    if not table_names:
+        return
+
+    create_load_versions_table(connection, schema)
+    connection.execute(
+        text(
+            f'INSERT INTO "{schema}"."{LOAD_VERSIONS_TABLE}" '
+            '("table_name", "version", "loaded_at") '
+            'VALUES (:table_name, 1, now()) '
+            'ON CONFLICT ("table_name") DO UPDATE SET '
+            f'"version" = "{LOAD_VERSIONS_TABLE}"."version" + 1, '
+            '"loaded_at" = EXCLUDED."loaded_at"'
+        ),
+        [{"table_name": table_name} for table_name in table_names]
+    )
+    logger.info(f"Recorded new load versions of {list(table_names)}.")
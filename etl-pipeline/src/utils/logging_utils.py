@@ -10,6 +10,11 @@ def _ensure_log_directory(base_path=None):
     return log_directory
 
 
+def get_log_directory(base_path=None):
+    """Directory the log files, and files kept next to them, go to."""
+    return _ensure_log_directory(base_path)
+
+
 def _create_formatter():
     """Create a standard log formatter."""
     return logging.Formatter(
@@ -49,11 +54,15 @@ def setup_logger(name, log_file, level=logging.DEBUG, base_path=None):
     return logger
 
 
-def log_extract_success(logger, type, shape, execution_time, expected_rate):
+def log_extract_success(
+    logger, type, shape, execution_time, expected_rate, engine=None
+):
     logger.setLevel(logging.INFO)
     logger.info(f"Data extraction successful for {type}!")
     logger.info(f"Extracted {shape[0]} rows " f"and {shape[1]} columns")
     logger.info(f"Execution time: {execution_time} seconds")
+    if engine:
+        logger.info(f"CSV engine: {engine}")
 
     if execution_time / shape[0] <= expected_rate:
         logger.info(
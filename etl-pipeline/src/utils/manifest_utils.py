@@ -0,0 +1,277 @@
+import os
+import json
+import hashlib
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional, Tuple
+from src.utils.logging_utils import setup_logger
+
+
+class ManifestError(Exception):
+    pass
+
+
+# Configure the logger
+logger = setup_logger(__name__, "etl_pipeline.log", level=logging.DEBUG)
+
+MANIFEST_VERSION = 1
+
+# Bytes read at a time while hashing a file
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def empty_manifest() -> Dict[str, Any]:
+    return {"version": MANIFEST_VERSION, "files": {}, "stages": {}}
+
+
+def load_manifest(manifest_path: str) -> Dict[str, Any]:
+    """
+    Read the run manifest. A missing, unreadable or outdated manifest is
+    treated as empty, so every stage runs.
+
+    Args:
+        manifest_path (str): Path of the manifest JSON file.
+
+    Returns:
+        Dict[str, Any]: The manifest, with the keys 'version', 'files'
+        (fingerprint of every file seen, keyed by path) and 'stages'
+        (inputs and outputs of the last successful run of each stage).
+    """
+    if not os.path.exists(manifest_path):
+        return empty_manifest()
+
+    try:
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+    except (OSError, ValueError) as e:
+        logger.setLevel(logging.WARNING)
+        logger.warning(
+            f"Ignoring unreadable run manifest {manifest_path}: {e}"
+        )
+        return empty_manifest()
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        logger.setLevel(logging.WARNING)
+        logger.warning(f"Ignoring outdated run manifest {manifest_path}")
+        return empty_manifest()
+
+    return manifest
+
+
+def save_manifest(manifest: Dict[str, Any], manifest_path: str) -> None:
+    """
+    Write the run manifest. The file is replaced atomically so an
+    interrupted run never leaves a truncated manifest behind.
+
+    Args:
+        manifest (Dict[str, Any]): The manifest to write.
+        manifest_path (str): Path of the manifest JSON file.
+
+    Raises:
+        ManifestError: If the manifest cannot be written.
+    """
+    directory = os.path.dirname(manifest_path)
+    temporary_path = f"{manifest_path}.tmp"
+    try:
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(temporary_path, "w") as manifest_file:
+            json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+        os.replace(temporary_path, manifest_path)
+    except OSError as e:
+        logger.setLevel(logging.ERROR)
+        logger.error(f"Failed to write run manifest {manifest_path}: {e}")
+        raise ManifestError(
+            f"Failed to write run manifest {manifest_path}: {e}"
+        )
+
+
+def hash_file(file_path: str) -> str:
+    """
+    Compute the SHA-256 digest of a file's content.
+
+    Args:
+        file_path (str): Path of the file.
+
+    Returns:
+        str: Hex digest of the file's content.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def fingerprint_file(
+    file_path: str,
+    previous: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Fingerprint a file by content hash, size and modification time.
+
+    The content is only re-hashed when the size or modification time
+    differ from the previous fingerprint, so unchanged multi-GB inputs
+    cost a stat() call.
+
+    Args:
+        file_path (str): Path of the file.
+        previous (Optional[Dict[str, Any]]): The file's last fingerprint.
+
+    Returns:
+        Optional[Dict[str, Any]]: The fingerprint ('sha256', 'size' and
+        'mtime_ns'), or None if the file does not exist.
+    """
+    if not os.path.exists(file_path):
+        return None
+
+    stat = os.stat(file_path)
+    if (previous is not None
+            and previous["size"] == stat.st_size
+            and previous["mtime_ns"] == stat.st_mtime_ns):
+        return dict(previous)
+
+    return {
+        "sha256": hash_file(file_path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+def fingerprint_files(
+    manifest: Dict[str, Any],
+    file_paths: Iterable[str]
+) -> Dict[str, Optional[str]]:
+    """
+    Fingerprint files, reusing and refreshing the fingerprints cached in
+    the manifest.
+
+    Args:
+        manifest (Dict[str, Any]): The run manifest.
+        file_paths (Iterable[str]): Paths of the files.
+
+    Returns:
+        Dict[str, Optional[str]]: Content hash of each file keyed by
+        path, None for files that do not exist.
+    """
+    hashes = {}
+    for file_path in file_paths:
+        fingerprint = fingerprint_file(
+            file_path,
+            manifest["files"].get(file_path)
+        )
+        if fingerprint is None:
+            manifest["files"].pop(file_path, None)
+            hashes[file_path] = None
+        else:
+            manifest["files"][file_path] = fingerprint
+            hashes[file_path] = fingerprint["sha256"]
+    return hashes
+
+
+def fingerprint_code(
+    manifest: Dict[str, Any],
+    root: str,
+    directories: Iterable[str]
+) -> str:
+    """
+    Fingerprint the Python source under some directories, so the stages
+    it produces are rerun once it changes, e.g. after a deploy changing
+    a transform or a table definition.
+
+    Args:
+        manifest (Dict[str, Any]): The run manifest, whose cached file
+        fingerprints are reused and refreshed.
+        root (str): Directory the directories are relative to.
+        directories (Iterable[str]): Directories holding the source.
+
+    Returns:
+        str: Hex digest of the relative path and content hash of every
+        `.py` file, in sorted order.
+    """
+    paths = sorted(
+        os.path.join(dirpath, filename)
+        for directory in directories
+        for dirpath, _, filenames in os.walk(os.path.join(root, directory))
+        for filename in filenames
+        if filename.endswith(".py")
+    )
+    digest = hashlib.sha256()
+    for path, file_hash in fingerprint_files(manifest, paths).items():
+        digest.update(f"{os.path.relpath(path, root)}:{file_hash}\n".encode())
+    return digest.hexdigest()
+
+
+def check_stage(
+    manifest: Dict[str, Any],
+    stage: str,
+    inputs: Dict[str, Optional[str]],
+    key: str = ""
+) -> Tuple[bool, str]:
+    """
+    Decide whether a stage can be skipped: its last successful run had
+    the same input hashes and key, and every output it produced is
+    still on disk unchanged.
+
+    Args:
+        manifest (Dict[str, Any]): The run manifest.
+        stage (str): Name of the stage.
+        inputs (Dict[str, Optional[str]]): Current input hashes.
+        key (str): Anything else the stage's result depends on, e.g.
+        the target database or the fingerprint of the code.
+
+    Returns:
+        Tuple[bool, str]: Whether the stage is up to date, and why.
+    """
+    recorded = manifest["stages"].get(stage)
+    if recorded is None:
+        return False, "no previous run recorded"
+
+    missing = [path for path, digest in inputs.items() if digest is None]
+    if missing:
+        return False, f"missing inputs: {', '.join(missing)}"
+
+    if recorded["key"] != key:
+        return False, "stage configuration changed"
+
+    changed = [
+        path for path in sorted(set(inputs) | set(recorded["inputs"]))
+        if inputs.get(path) != recorded["inputs"].get(path)
+    ]
+    if changed:
+        return False, f"inputs changed: {', '.join(changed)}"
+
+    outputs = fingerprint_files(manifest, recorded["outputs"])
+    stale = [
+        path for path, digest in outputs.items()
+        if digest != recorded["outputs"][path]
+    ]
+    if stale:
+        return False, f"outputs missing or modified: {', '.join(stale)}"
+
+    return True, f"inputs unchanged since {recorded['completed_at']}"
+
+
+def record_stage(
+    manifest: Dict[str, Any],
+    stage: str,
+    inputs: Dict[str, Optional[str]],
+    outputs: Iterable[str] = (),
+    key: str = ""
+) -> None:
+    """
+    Record a successful run of a stage in the manifest.
+
+    Args:
+        manifest (Dict[str, Any]): The run manifest.
+        stage (str): Name of the stage.
+        inputs (Dict[str, Optional[str]]): Input hashes the stage ran on.
+        outputs (Iterable[str]): Paths of the files the stage produced.
+        key (str): Anything else the stage's result depends on.
+    """
+    manifest["stages"][stage] = {
+        "inputs": dict(inputs),
+        "outputs": fingerprint_files(manifest, outputs),
+        "key": key,
+        "completed_at": datetime.now(timezone.utc).isoformat(),
+    }
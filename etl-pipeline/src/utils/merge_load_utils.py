@@ -0,0 +1,182 @@
+import pandas as pd
+from typing import Dict, Sequence
+from sqlalchemy import Connection, text
+from src.utils.bulk_load_utils import (
+    MAX_IDENTIFIER_LENGTH,
+    add_primary_key,
+    conform_rows,
+    copy_dataframe,
+    create_empty_table,
+    create_indexes,
+    has_primary_key,
+    table_exists_in_schema
+)
+from src.utils.logging_utils import setup_logger
+from src.utils.table_schema_utils import check_key
+
+
+# Setup the logger
+logger = setup_logger("load_data", "load_data.log")
+
+# Column holding a hash of every other column of the row, so unchanged
+# rows can be skipped without comparing them column by column
+ROW_HASH_COLUMN = "row_hash"
+
+# Temporary table the incoming rows are copied into before the merge
+MERGE_SUFFIX = "_merge"
+
+
+def add_row_hash(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add the row hash column to a copy of a DataFrame. The hash is a
+    signed 64-bit integer so it fits a PostgreSQL BIGINT.
+
+    Args:
+        data (pd.DataFrame): Rows to hash.
+
+    Returns:
+        pd.DataFrame: The rows with the row hash column added.
+    """
+    data = data.drop(columns=ROW_HASH_COLUMN, errors="ignore")
+    hashes = pd.util.hash_pandas_object(data, index=False)
+    return data.assign(**{ROW_HASH_COLUMN: hashes.to_numpy().view("int64")})
+
+
+def create_unique_index(
+    connection: Connection,
+    table_name: str,
+    schema: str,
+    natural_key: Sequence[str]
+) -> None:
+    """
+    Create the unique index on the natural key of a table, unless it
+    already exists. `INSERT ... ON CONFLICT` needs it to find the row a
+    new row conflicts with.
+
+    Args:
+        connection (Connection): Active SQLAlchemy database connection.
+        table_name (str): Name of the table.
+        schema (str): Schema of the table.
+        natural_key (Sequence[str]): Columns identifying a row.
+    """
+    index_name = f"ux_{table_name}_{'_'.join(natural_key)}"
+    column_list = ", ".join(f'"{column}"' for column in natural_key)
+    connection.execute(text(
+        f'CREATE UNIQUE INDEX IF NOT EXISTS '
+        f'"{index_name[:MAX_IDENTIFIER_LENGTH]}" '
+        f'ON "{schema}"."{table_name}" ({column_list})'
+    ))
+
+
+def merge_table(
+    connection: Connection,
+    data: pd.DataFrame,
+    table_name: str,
+    schema: str,
+    natural_key: Sequence[str],
+    indexes: Sequence[Sequence[str]] = ()
+) -> Dict[str, int]:
+    """
+    Merge a DataFrame into a table on its natural key, in the
+    connection's current transaction. The rows are copied into a
+    temporary table and applied with `INSERT ... ON CONFLICT DO UPDATE`,
+    which only rewrites rows whose row hash changed; rows whose key is no
+    longer in the DataFrame are deleted. A table that does not exist yet
+    is created, bulk loaded and keyed.
+
+    The table's columns must already match the DataFrame's; a change of
+    columns needs a full load with LOAD_MODE=replace.
+
+    Args:
+        connection (Connection): Active SQLAlchemy database connection.
+        data (pd.DataFrame): Full content of the table.
+        table_name (str): Name of the table.
+        schema (str): Schema of the table.
+        natural_key (Sequence[str]): Columns identifying a row.
+        indexes (Sequence[Sequence[str]]): Columns of each index built
+        when the table is created.
+
+    Raises:
+        BulkLoadError: If the COPY fails.
+        TableSchemaError: If rows have a missing or duplicate natural
+        key, or do not fit the declared column types of the table.
+
+    Returns:
+        Dict[str, int]: Number of rows inserted, updated, deleted and
+        left unchanged.
+    """
+    check_key(data, table_name, natural_key)
+    data = conform_rows(data, table_name)
+    table_exists = table_exists_in_schema(connection, table_name, schema)
+
+    if not table_exists:
+        create_empty_table(connection, data, table_name, schema)
+    # Tables loaded by the other load modes have no row hash yet; their
+    # rows all count as changed on the first merge
+    connection.execute(text(
+        f'ALTER TABLE "{schema}"."{table_name}" '
+        f'ADD COLUMN IF NOT EXISTS "{ROW_HASH_COLUMN}" BIGINT'
+    ))
+    data = add_row_hash(data)
+
+    if not table_exists:
+        rows = copy_dataframe(connection, data, table_name, schema)
+        add_primary_key(connection, table_name, schema)
+        if not has_primary_key(connection, table_name, schema):
+            create_unique_index(connection, table_name, schema, natural_key)
+        create_indexes(connection, table_name, schema, indexes)
+        logger.info(f"Created {table_name} with {rows} rows.")
+        return {"inserted": rows, "updated": 0, "deleted": 0, "unchanged": 0}
+
+    # ON CONFLICT needs a unique index on the natural key; tables with a
+    # declared primary key already have one
+    if not has_primary_key(connection, table_name, schema):
+        create_unique_index(connection, table_name, schema, natural_key)
+
+    merge_table_name = f"{table_name}{MERGE_SUFFIX}"
+    connection.execute(text(
+        f'CREATE TEMPORARY TABLE "{merge_table_name}" '
+        f'(LIKE "{schema}"."{table_name}") ON COMMIT DROP'
+    ))
+    copy_dataframe(connection, data, merge_table_name, "pg_temp")
+
+    columns = ", ".join(f'"{column}"' for column in data.columns)
+    key_columns = ", ".join(f'"{column}"' for column in natural_key)
+    updates = ", ".join(
+        f'"{column}" = EXCLUDED."{column}"'
+        for column in data.columns
+        if column not in natural_key
+    )
+    key_matches = " AND ".join(
+        f'live."{column}" = new."{column}"' for column in natural_key
+    )
+
+    deleted = connection.execute(text(
+        f'DELETE FROM "{schema}"."{table_name}" AS live '
+        f'WHERE NOT EXISTS (SELECT 1 FROM "pg_temp"."{merge_table_name}" '
+        f'AS new WHERE {key_matches})'
+    )).rowcount
+
+    # xmax is 0 for freshly inserted rows and set for updated ones
+    inserted_flags = connection.execute(text(
+        f'INSERT INTO "{schema}"."{table_name}" AS live ({columns}) '
+        f'SELECT {columns} FROM "pg_temp"."{merge_table_name}" '
+        f'ON CONFLICT ({key_columns}) DO UPDATE SET {updates} '
+        f'WHERE live."{ROW_HASH_COLUMN}" '
+        f'IS DISTINCT FROM EXCLUDED."{ROW_HASH_COLUMN}" '
+        f'RETURNING (xmax = 0) AS inserted'
+    )).scalars().all()
+
+    inserted = sum(bool(flag) for flag in inserted_flags)
+    counts = {
+        "inserted": inserted,
+        "updated": len(inserted_flags) - inserted,
+        "deleted": deleted,
+        "unchanged": len(data) - len(inserted_flags),
+    }
+    logger.info(
+        f"Merged {len(data)} rows into {table_name}: "
+        f"{counts['inserted']} inserted, {counts['updated']} updated, "
+        f"{counts['deleted']} deleted, {counts['unchanged']} unchanged."
+    )
+    return counts
@@ -0,0 +1,212 @@
+import pandas as pd
+from typing import Dict, List, Optional
+from sqlalchemy import Connection, bindparam, text
+from src.utils.bulk_load_utils import (
+    conform_rows,
+    copy_dataframe,
+    table_exists_in_schema
+)
+from src.utils.logging_utils import setup_logger
+from src.utils.partition_utils import hash_partitions
+
+
+# Setup the logger
+logger = setup_logger("load_data", "load_data.log")
+
+# Table holding the hash of every partition of a table as it was last
+# loaded. It is written in the transaction of the load, so it always
+# describes the rows the database holds, even after a failed load.
+LOADED_PARTITIONS_TABLE = "aa_loaded_partitions"
+
+
+def create_loaded_partitions_table(
+    connection: Connection,
+    schema: str
+) -> None:
+    """
+    Create the loaded partitions table unless it already exists. Only
+    when it is missing do loads running at once on other connections
+    wait for each other, on an advisory lock held until their
+    transaction ends, so creating it cannot race. Loads committed
+    together create it beforehand (see `load_tables_concurrently`), as
+    they would otherwise wait on each other's lock forever.
+
+    Args:
+        connection (Connection): Active SQLAlchemy database connection.
+        schema (str): Schema of the table.
+    """
+    if table_exists_in_schema(connection, LOADED_PARTITIONS_TABLE, schema):
+        return
+
+    connection.execute(
+        text("SELECT pg_advisory_xact_lock(hashtext(:lock_name))"),
+        {"lock_name": f"{schema}.{LOADED_PARTITIONS_TABLE}"}
+    )
+    connection.execute(text(
+        f'CREATE TABLE IF NOT EXISTS "{schema}"."{LOADED_PARTITIONS_TABLE}" ('
+        '"table_name" TEXT NOT NULL, '
+        '"partition" INTEGER NOT NULL, '
+        '"partition_hash" TEXT NOT NULL, '
+        'PRIMARY KEY ("table_name", "partition"))'
+    ))
+
+
+def get_changed_partitions(
+    connection: Connection,
+    data: pd.DataFrame,
+    table_name: str,
+    schema: str,
+    partition_column: str = "year"
+) -> Optional[List[int]]:
+    """
+    Compare the partitions of a DataFrame with those last loaded into a
+    table.
+
+    Args:
+        connection (Connection): Active SQLAlchemy database connection.
+        data (pd.DataFrame): Full DataFrame for the table.
+        table_name (str): Name of the table.
+        schema (str): Schema of the table.
+        partition_column (str): Column holding the partition key.
+
+    Returns:
+        Optional[List[int]]: The partitions whose rows changed, were
+        added or were removed since the last load, or None when no load
+        of the table was recorded, so it must be loaded in full.
+    """
+    create_loaded_partitions_table(connection, schema)
+    loaded: Dict[int, str] = dict(connection.execute(
+        text(
+            'SELECT "partition", "partition_hash" '
+            f'FROM "{schema}"."{LOADED_PARTITIONS_TABLE}" '
+            'WHERE "table_name" = :table_name'
+        ),
+        {"table_name": table_name}
+    ).all())
+    if not loaded:
+        return None
+
+    partition_hashes = hash_partitions(data, partition_column)
+    changed = [
+        partition for partition, digest in partition_hashes.items()
+        if loaded.get(partition) != digest
+    ]
+    removed = [
+        partition for partition in loaded
+        if partition not in partition_hashes
+    ]
+    return sorted(changed + removed)
+
+
+def record_loaded_partitions(
+    connection: Connection,
+    data: pd.DataFrame,
+    table_name: str,
+    schema: str,
+    partition_column: str = "year"
+) -> None:
+    """
+    Record the partitions of a DataFrame as loaded into a table, in the
+    connection's current transaction, so they are only recorded if the
+    load commits.
+
+    Args:
+        connection (Connection): Active SQLAlchemy database connection.
+        data (pd.DataFrame): Full DataFrame just loaded into the table.
+        table_name (str): Name of the table.
+        schema (str): Schema of the table.
+        partition_column (str): Column holding the partition key.
+    """
+    clear_loaded_partitions(connection, table_name, schema)
+    partition_hashes = hash_partitions(data, partition_column)
+    if partition_hashes:
+        connection.execute(
+            text(
+                f'INSERT INTO "{schema}"."{LOADED_PARTITIONS_TABLE}" '
+                '("table_name", "partition", "partition_hash") '
+                'VALUES (:table_name, :partition, :partition_hash)'
+            ),
+            [
+                {
+                    "table_name": table_name,
+                    "partition": partition,
+                    "partition_hash": digest
+                }
+                for partition, digest in partition_hashes.items()
+            ]
+        )
+
+
+def clear_loaded_partitions(
+    connection: Connection,
+    table_name: str,
+    schema: str
+) -> None:
+    """
+    Forget the partitions recorded as loaded into a table, in the
+    connection's current transaction, so its next load is a full one.
+
+    Args:
+        connection (Connection): Active SQLAlchemy database connection.
+        table_name (str): Name of the table.
+        schema (str): Schema of the table.
+    """
+    create_loaded_partitions_table(connection, schema)
+    connection.execute(
+        text(
+            f'DELETE FROM "{schema}"."{LOADED_PARTITIONS_TABLE}" '
+            'WHERE "table_name" = :table_name'
+        ),
+        {"table_name": table_name}
+    )
+
+
+def replace_partitions(
+    connection: Connection,
+    data: pd.DataFrame,
+    table_name: str,
+    schema: str,
+    partitions: List[int],
+    partition_column: str = "year"
+) -> None:
+    """
+    Replace the rows of the given partitions of an existing table: the
+    partitions are deleted and the matching rows of the DataFrame are
+    bulk loaded with COPY, in the connection's current transaction. Rows
+    of other partitions are left untouched.
+
+    Args:
+        connection (Connection): Active SQLAlchemy database connection.
+        data (pd.DataFrame): Full DataFrame for the table.
+        table_name (str): Name of the table.
+        schema (str): Schema of the table.
+        partitions (List[int]): Partitions to replace.
+        partition_column (str): Column holding the partition key.
+
+    Raises:
+        BulkLoadError: If the COPY fails.
+        TableSchemaError: If the rows do not fit the declared column
+        types of the table.
+    """
+    if not partitions:
+        logger.info(f"No changed partitions to load into {table_name}.")
+        return
+
+    partitions = [int(partition) for partition in partitions]
+    connection.execute(
+        text(
+            f'DELETE FROM "{schema}"."{table_name}" '
+            f'WHERE "{partition_column}" IN :partitions'
+        ).bindparams(bindparam("partitions", expanding=True)),
+        {"partitions": partitions}
+    )
+
+    rows = conform_rows(
+        data[data[partition_column].isin(partitions)],
+        table_name
+    )
+    copy_dataframe(connection, rows, table_name, schema)
+    logger.info(
+        f"Replaced {partition_column} partitions {partitions} of "
+        f"{table_name} with {len(rows)} rows."
+    )
@@ -0,0 +1,251 @@
+import os
+import json
+import hashlib
+import logging
+import pandas as pd
+from typing import Any, Callable, Dict, List
+from config.artifact_config import load_artifact_config
+from config.transform_config import load_transform_config
+from src.utils.artifact_utils import (
+    get_artifact_path,
+    read_artifact,
+    write_artifact_file
+)
+from src.utils.logging_utils import setup_logger
+
+
+class PartitionCacheError(Exception):
+    pass
+
+
+# Configure the logger
+logger = setup_logger(__name__, "transform_data.log", level=logging.DEBUG)
+
+
+def hash_partitions(
+    data: pd.DataFrame,
+    partition_column: str = "year"
+) -> Dict[int, str]:
+    """
+    Hash the rows of each partition of a DataFrame.
+
+    Every row is hashed once and the row hashes of each partition are
+    digested together, so a partition's hash changes whenever one of its
+    rows, their order or the set of columns changes.
+
+    Args:
+        data (pd.DataFrame): DataFrame to partition.
+        partition_column (str): Column holding the partition key.
+
+    Returns:
+        Dict[int, str]: Hex digest of each partition, keyed by partition
+        in ascending order.
+    """
+    row_hashes = pd.util.hash_pandas_object(data, index=False).to_numpy()
+    columns = ",".join(map(str, data.columns)).encode()
+
+    partition_hashes = {}
+    groups = data.groupby(partition_column, sort=True).indices
+    for partition, positions in groups.items():
+        digest = hashlib.sha256(columns)
+        digest.update(row_hashes[positions].tobytes())
+        partition_hashes[int(partition)] = digest.hexdigest()
+
+    return partition_hashes
+
+
+def get_partition_artifact_name(name: str, partition: int) -> str:
+    return f"{name}_{partition}"
+
+
+def get_partition_index_path(name: str, directory: str) -> str:
+    return os.path.join(directory, f"{name}_partitions.json")
+
+
+def load_partition_index(name: str, directory: str) -> Dict[str, str]:
+    """
+    Read the hashes of the cached partitions of an artifact.
+
+    Args:
+        name (str): Name of the partitioned artifact.
+        directory (str): Directory holding the artifacts.
+
+    Returns:
+        Dict[str, str]: Hash of each cached partition keyed by partition;
+        empty if nothing is cached or the index cannot be read.
+    """
+    index_path = get_partition_index_path(name, directory)
+    if not os.path.exists(index_path):
+        return {}
+
+    try:
+        with open(index_path) as index_file:
+            return json.load(index_file)
+    except (OSError, ValueError) as e:
+        logger.setLevel(logging.WARNING)
+        logger.warning(
+            f"Ignoring unreadable partition index {index_path}: {e}"
+        )
+        return {}
+
+
+def save_partition_index(
+    name: str,
+    directory: str,
+    index: Dict[str, str]
+) -> None:
+    """
+    Write the hashes of the cached partitions of an artifact.
+
+    Args:
+        name (str): Name of the partitioned artifact.
+        directory (str): Directory holding the artifacts.
+        index (Dict[str, str]): Hash of each cached partition.
+
+    Raises:
+        PartitionCacheError: If the index cannot be written.
+    """
+    index_path = get_partition_index_path(name, directory)
+    temporary_path = f"{index_path}.tmp"
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with open(temporary_path, "w") as index_file:
+            json.dump(index, index_file, indent=2, sort_keys=True)
+        os.replace(temporary_path, index_path)
+    except OSError as e:
+        logger.setLevel(logging.ERROR)
+        logger.error(f"Failed to write partition index {index_path}: {e}")
+        raise PartitionCacheError(
+            f"Failed to write partition index {index_path}: {e}"
+        )
+
+
+def aggregate_by_partition(
+    data: pd.DataFrame,
+    name: str,
+    aggregate: Callable[[pd.DataFrame], pd.DataFrame],
+    sort_by: List[str],
+    partition_column: str = "year",
+    force: bool = False
+) -> pd.DataFrame:
+    """
+    Aggregate a DataFrame one partition at a time, reusing the cached
+    result of every partition whose rows have not changed since the
+    last run.
+
+    `aggregate` must group by `partition_column` (among other keys), so
+    aggregating each partition on its own gives the same rows as
+    aggregating the whole DataFrame.
+
+    Which partitions the load rewrites is decided by the load itself,
+    from the partitions recorded in the database by the last load that
+    committed, not from what this function recomputed.
+
+    Args:
+        data (pd.DataFrame): DataFrame to aggregate.
+        name (str): Name of the aggregated artifact, e.g. "player_stats".
+        aggregate (Callable[[pd.DataFrame], pd.DataFrame]): Aggregation
+        applied to each partition.
+        sort_by (List[str]): Columns giving the row order of the result,
+        i.e. the group keys of `aggregate`.
+        partition_column (str): Column holding the partition key.
+        force (bool): Recompute every partition, ignoring the cache.
+
+    Returns:
+        pd.DataFrame: The aggregated DataFrame.
+    """
+    artifact_config = load_artifact_config()["artifacts"]
+    use_cache = (
+        artifact_config["format"] != "none"
+        and load_transform_config()["transform"]["partition_cache"]
+    )
+    directory = artifact_config["directory"]
+
+    partition_hashes = hash_partitions(data, partition_column)
+    cached = (
+        load_partition_index(name, directory)
+        if use_cache and not force else {}
+    )
+
+    results = []
+    changed = []
+    for partition, digest in partition_hashes.items():
+        artifact_name = get_partition_artifact_name(name, partition)
+        file_path = get_artifact_path(
+            artifact_name,
+            artifact_config["format"],
+            directory
+        ) if use_cache else None
+
+        if (cached.get(str(partition)) == digest
+                and os.path.exists(file_path)):
+            results.append(read_artifact(artifact_name))
+            continue
+
+        result = aggregate(data[data[partition_column] == partition])
+        if use_cache:
+            write_artifact_file(
+                result,
+                artifact_name,
+                file_path,
+                artifact_config
+            )
+        results.append(result)
+        changed.append(partition)
+
+    removed = [
+        int(partition) for partition in cached
+        if int(partition) not in partition_hashes
+    ]
+    if use_cache:
+        save_partition_index(
+            name,
+            directory,
+            {str(partition): digest
+             for partition, digest in partition_hashes.items()}
+        )
+
+    logger.setLevel(logging.INFO)
+    logger.info(
+        f"{name}: recomputed partitions {changed}, reused "
+        f"{len(partition_hashes) - len(changed)}, dropped {removed}"
+    )
+
+    if results:
+        aggregated = combine_partitions(results, data, sort_by)
+    else:
+        # Nothing to aggregate; keep the columns of the aggregation
+        aggregated = aggregate(data)
+
+    return aggregated
+
+
+def combine_partitions(
+    results: List[pd.DataFrame],
+    data: pd.DataFrame,
+    sort_by: List[str]
+) -> pd.DataFrame:
+    """
+    Concatenate aggregated partitions into the row order and key dtypes
+    that aggregating the whole DataFrame would give.
+
+    Args:
+        results (List[pd.DataFrame]): Aggregated partitions, fresh or
+        read back from the cache.
+        data (pd.DataFrame): The DataFrame that was aggregated.
+        sort_by (List[str]): Group keys of the aggregation.
+
+    Returns:
+        pd.DataFrame: The combined DataFrame.
+    """
+    combined = pd.concat(results, ignore_index=True)
+
+    # Cached partitions may come back with plain string or int64 keys
+    key_dtypes: Dict[str, Any] = {
+        column: data[column].dtype
+        for column in sort_by
+        if column in data.columns
+    }
+    combined = combined.astype(key_dtypes)
+
+    return combined.sort_values(sort_by).reset_index(drop=True)
@@ -0,0 +1,185 @@
+import cProfile
+import json
+import os
+import sys
+import timeit
+import time
+import pandas as pd
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, where the peak RSS is not reported
+    resource = None
+
+
+class ProfilingError(Exception):
+    pass
+
+
+# Supported profilers, and the extension of the file each one writes
+PROFILERS = {
+    "cprofile": ".prof",
+    "pyinstrument": ".html",
+}
+
+
+class ProfileSettings(NamedTuple):
+    """
+    Where and how to capture a profile of each stage. Pickled to the
+    worker processes along with the stages.
+    """
+    profiler: str
+    directory: str
+
+
+def get_peak_rss() -> Optional[int]:
+    """
+    Peak resident set size of this process so far.
+
+    Returns:
+        Optional[int]: The peak RSS in bytes, or None where the platform
+        does not report it.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def count_rows(frames: List[Any]) -> int:
+    return sum(
+        len(frame) for frame in frames if isinstance(frame, pd.DataFrame)
+    )
+
+
+def get_profile_path(settings: ProfileSettings, name: str) -> str:
+    return os.path.join(
+        settings.directory, name + PROFILERS[settings.profiler]
+    )
+
+
+def run_with_profiler(
+    function: Callable[..., Any],
+    arguments: List[Any],
+    settings: ProfileSettings,
+    profile_path: str
+) -> Any:
+    os.makedirs(settings.directory, exist_ok=True)
+
+    if settings.profiler == "cprofile":
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(function, *arguments)
+        finally:
+            profiler.dump_stats(profile_path)
+
+    try:
+        from pyinstrument import Profiler
+    except ImportError as e:
+        raise ProfilingError(f"pyinstrument is not installed: {e}")
+
+    profiler = Profiler()
+    profiler.start()
+    try:
+        return function(*arguments)
+    finally:
+        profiler.stop()
+        with open(profile_path, "w") as file:
+            file.write(profiler.output_html())
+
+
+def profile_call(
+    name: str,
+    function: Callable[..., Any],
+    arguments: List[Any],
+    settings: Optional[ProfileSettings] = None
+) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Call a stage's function and measure it.
+
+    The CPU time and peak RSS are those of the whole process, so a stage
+    run in-line is also charged for background threads, e.g. artifact
+    writers, and its peak RSS delta is only how far it raised the
+    process's high-water mark. In a worker process they are the stage's
+    own.
+
+    Args:
+        name (str): Name of the stage.
+        function (Callable[..., Any]): The stage's function.
+        arguments (List[Any]): The stage's inputs.
+        settings (Optional[ProfileSettings]): Also capture a profile of
+        the call; none by default.
+
+    Returns:
+        Tuple[Any, Dict[str, Any]]: The function's result, and the wall
+        and CPU seconds, the peak RSS delta in bytes, the rows of the
+        DataFrames in the inputs and the profile's path.
+    """
+    peak_rss_before = get_peak_rss()
+    cpu_start = time.process_time()
+    start_time = timeit.default_timer()
+
+    profile_path = None
+    if settings is None:
+        result = function(*arguments)
+    else:
+        profile_path = get_profile_path(settings, name)
+        result = run_with_profiler(
+            function, arguments, settings, profile_path
+        )
+
+    metrics = {
+        "wall_seconds": timeit.default_timer() - start_time,
+        "cpu_seconds": time.process_time() - cpu_start,
+        "peak_rss_delta_bytes": (
+            None if peak_rss_before is None
+            else get_peak_rss() - peak_rss_before
+        ),
+        "rows_in": count_rows(arguments),
+        "profile": profile_path,
+    }
+    return result, metrics
+
+
+def format_metrics(metrics: Dict[str, Any]) -> str:
+    """
+    Describe a stage's measurements in one line for the logs.
+    """
+    description = (
+        f"cpu {metrics['cpu_seconds']:.3f} seconds, "
+        f"rows in {metrics['rows_in']}, rows out {metrics['rows_out']}"
+    )
+    if metrics["peak_rss_delta_bytes"] is not None:
+        description += (
+            f", peak RSS +{metrics['peak_rss_delta_bytes'] / 2 ** 20:.1f} MiB"
+        )
+    return description
+
+
+def write_run_report(report: Dict[str, Any], directory: str) -> str:
+    """
+    Write a run report as JSON, named after the run.
+
+    Args:
+        report (Dict[str, Any]): The report, with a 'run_id'.
+        directory (str): Directory of the reports.
+
+    Raises:
+        ProfilingError: If the report cannot be written.
+
+    Returns:
+        str: Path of the report.
+    """
+    report_path = os.path.join(
+        directory, f"run_report_{report['run_id']}.json"
+    )
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with open(report_path, "w") as file:
+            json.dump(report, file, indent=2, default=str)
+    except OSError as e:
+        raise ProfilingError(f"Failed to write run report {report_path}: {e}")
+    return report_path
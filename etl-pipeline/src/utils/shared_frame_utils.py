@@ -0,0 +1,122 @@
+import json
+import pandas as pd
+import pyarrow as pa
+from multiprocessing import shared_memory
+from typing import Any, Dict, NamedTuple, Optional
+
+
+class SharedFrameError(Exception):
+    pass
+
+
+# Schema metadata key holding the DataFrame's attrs, which Arrow does not
+# carry
+ATTRS_METADATA_KEY = b"etl_attrs"
+
+
+class SharedFrame(NamedTuple):
+    """
+    Handle of a DataFrame written to a shared memory block as an Arrow
+    IPC stream. Only the handle is pickled between processes.
+    """
+    name: str
+    size: int
+
+
+def write_shared_frame(data: pd.DataFrame) -> SharedFrame:
+    """
+    Write a DataFrame to a new shared memory block as an Arrow IPC
+    stream. The caller owns the block and must `unlink_shared_frame` it
+    once every reader is done.
+
+    Args:
+        data (pd.DataFrame): DataFrame to share.
+
+    Raises:
+        SharedFrameError: If the DataFrame cannot be converted to Arrow.
+
+    Returns:
+        SharedFrame: Handle of the block.
+    """
+    try:
+        table = pa.Table.from_pandas(data)
+    except (pa.ArrowException, TypeError, ValueError) as e:
+        raise SharedFrameError(f"Cannot share DataFrame via Arrow: {e}")
+
+    if data.attrs:
+        metadata = dict(table.schema.metadata or {})
+        metadata[ATTRS_METADATA_KEY] = json.dumps(data.attrs).encode()
+        table = table.replace_schema_metadata(metadata)
+
+    # Measure the stream first so it is written straight into the block
+    sink = pa.MockOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    size = sink.size()
+
+    block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    try:
+        write_stream(table, block.buf)
+    except Exception:
+        block.close()
+        block.unlink()
+        raise
+    block.close()
+
+    return SharedFrame(block.name, size)
+
+
+def write_stream(table: pa.Table, buffer: memoryview) -> None:
+    # The Arrow writers point into the block, which cannot be closed
+    # while they are alive, so they are kept local to this call
+    stream = pa.FixedSizeBufferWriter(pa.py_buffer(buffer))
+    with pa.ipc.new_stream(stream, table.schema) as writer:
+        writer.write_table(table)
+    stream.close()
+
+
+def read_shared_frame(frame: SharedFrame) -> pd.DataFrame:
+    """
+    Read a DataFrame back from a shared memory block, which stays in
+    place for other readers.
+
+    Args:
+        frame (SharedFrame): Handle of the block.
+
+    Returns:
+        pd.DataFrame: The shared DataFrame, with its attrs.
+    """
+    # Copy the stream out of the block first: pandas may keep pointing
+    # at Arrow buffers, and the block cannot be closed while it does
+    block = shared_memory.SharedMemory(name=frame.name)
+    try:
+        stream = bytes(block.buf[:frame.size])
+    finally:
+        block.close()
+
+    table = pa.ipc.open_stream(pa.py_buffer(stream)).read_all()
+    data = table.to_pandas()
+
+    metadata = table.schema.metadata or {}
+    attrs: Optional[Dict[str, Any]] = None
+    if ATTRS_METADATA_KEY in metadata:
+        attrs = json.loads(metadata[ATTRS_METADATA_KEY])
+
+    if attrs:
+        data.attrs.update(attrs)
+    return data
+
+
+def unlink_shared_frame(frame: SharedFrame) -> None:
+    """
+    Free the shared memory block of a DataFrame.
+
+    Args:
+        frame (SharedFrame): Handle of the block.
+    """
+    try:
+        block = shared_memory.SharedMemory(name=frame.name)
+    except FileNotFoundError:
+        return
+    block.close()
+    block.unlink()
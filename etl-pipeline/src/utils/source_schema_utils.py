@@ -0,0 +1,146 @@
+from typing import Any, Dict
+
+
+class SourceSchemaError(Exception):
+    pass
+
+
+# Per-source read schema for the raw Kaggle CSVs.
+# - usecols: only the columns the transform stage actually uses
+# - dtype: compact dtypes for columns that are always clean in the raw file
+# - categorical: low-cardinality text columns stored as pandas categoricals
+# - parse_dates: columns parsed into datetime64 while reading
+# The box score stat columns (FG, PTS, ...) are read as text because rows
+# for players that did not play hold strings such as "Did Not Play"; the
+# explicit dtype keeps every engine and chunk from inferring its own type.
+SOURCE_SCHEMAS: Dict[str, Dict[str, Any]] = {
+    "boxscores": {
+        "usecols": [
+            "game_id",
+            "teamName",
+            "playerName",
+            "MP",
+            "FG",
+            "FGA",
+            "3P",
+            "3PA",
+            "FT",
+            "FTA",
+            "TRB",
+            "AST",
+            "PTS",
+            "isStarter"
+        ],
+        "dtype": {
+            "game_id": "int32",
+            "MP": "object",
+            "FG": "object",
+            "FGA": "object",
+            "3P": "object",
+            "3PA": "object",
+            "FT": "object",
+            "FTA": "object",
+            "TRB": "object",
+            "AST": "object",
+            "PTS": "object",
+            "isStarter": "int8"
+        },
+        "categorical": ["teamName", "playerName"],
+        "parse_dates": []
+    },
+    "games": {
+        "usecols": [
+            "awayTeam",
+            "pointsAway",
+            "homeTeam",
+            "pointsHome",
+            "datetime",
+            "isRegular",
+            "game_id"
+        ],
+        "dtype": {
+            "pointsAway": "int16",
+            "pointsHome": "int16",
+            "isRegular": "int8",
+            "game_id": "int32"
+        },
+        "categorical": [],
+        "parse_dates": ["datetime"]
+    },
+    "player_info": {
+        "usecols": [
+            "playerName",
+            "Pos",
+            "Ht",
+            "Wt",
+            "birthDate"
+        ],
+        "dtype": {
+            "Wt": "float64"
+        },
+        "categorical": [],
+        "parse_dates": []
+    },
+    "salaries": {
+        "usecols": [
+            "playerName",
+            "seasonStartYear",
+            "salary",
+            "inflationAdjSalary"
+        ],
+        "dtype": {
+            "seasonStartYear": "int16"
+        },
+        "categorical": [],
+        "parse_dates": []
+    },
+}
+
+
+def get_source_schema(source: str) -> Dict[str, Any]:
+    """
+    Look up the read schema registered for a raw data source.
+
+    Args:
+        source (str): Name of the source, e.g. "boxscores" or "games".
+
+    Raises:
+        SourceSchemaError: If no schema is registered for the source.
+
+    Returns:
+        Dict[str, Any]: The registered schema for the source.
+    """
+    if source not in SOURCE_SCHEMAS:
+        raise SourceSchemaError(f"No schema registered for source: {source}")
+    return SOURCE_SCHEMAS[source]
+
+
+def get_read_csv_kwargs(source: str) -> Dict[str, Any]:
+    """
+    Build the keyword arguments for `pd.read_csv` from the schema
+    registered for a raw data source.
+
+    Categorical columns are folded into the dtype mapping so the file is
+    parsed once straight into its compact representation.
+
+    Args:
+        source (str): Name of the source, e.g. "boxscores" or "games".
+
+    Returns:
+        Dict[str, Any]: Keyword arguments (usecols, dtype and
+        parse_dates) to pass to `pd.read_csv`.
+    """
+    schema = get_source_schema(source)
+
+    dtype = dict(schema["dtype"])
+    for column in schema["categorical"]:
+        dtype[column] = "category"
+
+    read_csv_kwargs = {
+        "usecols": list(schema["usecols"]),
+        "dtype": dtype
+    }
+    if schema["parse_dates"]:
+        read_csv_kwargs["parse_dates"] = list(schema["parse_dates"])
+
+    return read_csv_kwargs
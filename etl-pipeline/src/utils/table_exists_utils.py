@@ -6,17 +6,24 @@ from src.utils.logging_utils import setup_logger
 logger = setup_logger("load_data", "load_data.log")
 
 
-def log_table_action(connection: Connection, table_name: str) -> bool:
+def log_table_action(
+    connection: Connection,
+    table_name: str,
+    load_mode: str = "replace"
+) -> bool:
     """
     Check if a table exists in the connected database and log the action.
     Executes a query against `information_schema.tables` to determine if
     the specified table already exists in the database.
     Logs whether the table will be replaced (if it exists) or created
-    (if it does not exist).
+    (if it does not exist), or with the swap load mode, whether a
+    staging table will be swapped in for it, or with the merge load mode,
+    whether the rows will be merged into it.
 
     Args:
         connection (Connection): Active SQLAlchemy database connection.
         table_name (str): The name of the table to check.
+        load_mode (str): The load mode, "replace", "swap" or "merge".
 
     Returns:
         table_exists (bool): True if the table exists, False otherwise.
@@ -32,7 +39,18 @@ def log_table_action(connection: Connection, table_name: str) -> bool:
 
     table_exists = bool(result) if result is not None else False
 
-    if table_exists:
+    if load_mode == "swap":
+        if table_exists:
+            logger.info(
+                f"Swapping a staging table in for {table_name} table..."
+            )
+        else:
+            logger.info(
+                f"Creating new {table_name} table from a staging table..."
+            )
+    elif load_mode == "merge" and table_exists:
+        logger.info(f"Merging data into {table_name} table...")
+    elif table_exists:
         logger.info(f"Replacing data in {table_name} table...")
     else:
         logger.info(f"Creating new {table_name} table...")
@@ -0,0 +1,205 @@
+import pandas as pd
+from typing import Any, Dict, Optional, Sequence
+from src.utils.logging_utils import setup_logger
+
+
+class TableSchemaError(Exception):
+    pass
+
+
+# Setup the logger
+logger = setup_logger("load_data", "load_data.log")
+
+# Definition of each table the load stage writes.
+# - columns: the PostgreSQL type of every column, in table order
+# - primary_key: the columns identifying a row; also the natural key the
+#   merge load mode upserts on
+# - indexes: secondary b-tree indexes for the dashboard filters; lookups
+#   on the leading primary key column use the primary key's index
+# Years and game counts fit a SMALLINT and the per-game stats are stored
+# as REAL. The salary and birth date columns stay TEXT because the
+# dashboards parse their formatted strings.
+TABLE_SCHEMAS: Dict[str, Dict[str, Any]] = {
+    "aa_player_stats": {
+        "columns": {
+            "player_name": "TEXT",
+            "year": "SMALLINT",
+            "points_per_game": "REAL",
+            "assists_per_game": "REAL",
+            "rebounds_per_game": "REAL",
+            "field_goal_pct_per_game": "REAL",
+            "three_point_pct_per_game": "REAL",
+            "free_throws_pct_per_game": "REAL",
+            "total_three_pointers": "INTEGER"
+        },
+        "primary_key": ("player_name", "year"),
+        "indexes": [("year",)]
+    },
+    "aa_team_stats": {
+        "columns": {
+            "year": "SMALLINT",
+            "team_name": "TEXT",
+            "total_games": "SMALLINT",
+            "total_wins": "SMALLINT",
+            "total_losses": "SMALLINT",
+            "win_pct": "REAL"
+        },
+        "primary_key": ("year", "team_name"),
+        "indexes": [("team_name",)]
+    },
+    "aa_player_info_and_salaries": {
+        "columns": {
+            "season_start_year": "SMALLINT",
+            "player_name": "TEXT",
+            "position": "TEXT",
+            "height": "TEXT",
+            "weight": "REAL",
+            "birth_date": "TEXT",
+            "weight_kg": "REAL",
+            "height_m": "REAL",
+            "salary": "TEXT",
+            "inflation_adjusted_salary": "TEXT"
+        },
+        "primary_key": ("player_name", "season_start_year"),
+        "indexes": [("season_start_year",)]
+    },
+}
+
+# Column types whose values must be written without a decimal point
+INTEGER_TYPES = ["SMALLINT", "INTEGER", "BIGINT"]
+
+
+def get_table_schema(table_name: str) -> Dict[str, Any]:
+    """
+    Look up the definition registered for a table.
+
+    Args:
+        table_name (str): Name of the table, e.g. "aa_team_stats".
+
+    Raises:
+        TableSchemaError: If no definition is registered for the table.
+
+    Returns:
+        Dict[str, Any]: The registered definition of the table.
+    """
+    if table_name not in TABLE_SCHEMAS:
+        raise TableSchemaError(f"No schema registered for table: {table_name}")
+    return TABLE_SCHEMAS[table_name]
+
+
+def find_table_schema(table_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up the definition registered for a table, if any.
+
+    Args:
+        table_name (str): Name of the table, e.g. "aa_team_stats".
+
+    Returns:
+        Optional[Dict[str, Any]]: The registered definition of the
+        table, or None for tables created from the DataFrame's dtypes.
+    """
+    return TABLE_SCHEMAS.get(table_name)
+
+
+def build_create_table_statement(
+    table_schema: Dict[str, Any],
+    table_name: str,
+    schema: str
+) -> str:
+    """
+    Build the `CREATE TABLE` statement for a table definition. The
+    primary key columns are NOT NULL; the key itself is added once the
+    rows are loaded, so its index is built in one pass.
+
+    Args:
+        table_schema (Dict[str, Any]): Definition of the table.
+        table_name (str): Name of the table to create, which may differ
+        from the registered name, e.g. for a staging table.
+        schema (str): Schema of the table.
+
+    Returns:
+        str: The `CREATE TABLE` statement.
+    """
+    column_definitions = ", ".join(
+        f'"{column}" {column_type}'
+        + (" NOT NULL" if column in table_schema["primary_key"] else "")
+        for column, column_type in table_schema["columns"].items()
+    )
+    return f'CREATE TABLE "{schema}"."{table_name}" ({column_definitions})'
+
+
+def check_key(
+    data: pd.DataFrame,
+    table_name: str,
+    key: Sequence[str]
+) -> None:
+    """
+    Check that every row has a complete key and no two rows share one.
+    Rows are never dropped here: rows a key cannot hold must be dealt
+    with by the transform that produces the table.
+
+    Args:
+        data (pd.DataFrame): Rows to load.
+        table_name (str): Name of the table, for the error message.
+        key (Sequence[str]): Columns identifying a row.
+
+    Raises:
+        TableSchemaError: If rows have a missing or duplicate key.
+    """
+    key = list(key)
+    missing_key = data[key].isna().any(axis=1)
+    duplicate_key = data.duplicated(subset=key, keep=False) & ~missing_key
+
+    if missing_key.any() or duplicate_key.any():
+        examples = data.loc[duplicate_key, key].drop_duplicates().head(3)
+        raise TableSchemaError(
+            f"Cannot load {table_name}: {int(missing_key.sum())} rows "
+            f"have a missing and {int(duplicate_key.sum())} rows a "
+            f"duplicate {key} key, e.g. "
+            f"{examples.to_dict('records')}"
+        )
+
+
+def conform_to_table_schema(
+    data: pd.DataFrame,
+    table_name: str,
+    table_schema: Dict[str, Any]
+) -> pd.DataFrame:
+    """
+    Make a DataFrame's rows loadable into a table definition. Rows must
+    fit the primary key, see `check_key`. Integer columns that went
+    through NaN hold floats such as "12.0", which PostgreSQL rejects for
+    an integer column, so they are converted to pandas' nullable
+    integers.
+
+    Args:
+        data (pd.DataFrame): Rows to load.
+        table_name (str): Name of the table, for logging.
+        table_schema (Dict[str, Any]): Definition of the table.
+
+    Raises:
+        TableSchemaError: If rows violate the primary key or an integer
+        column holds fractional values.
+
+    Returns:
+        pd.DataFrame: The rows, with the same attrs.
+    """
+    if set(table_schema["primary_key"]) <= set(data.columns):
+        check_key(data, table_name, table_schema["primary_key"])
+
+    conversions = {}
+    for column, column_type in table_schema["columns"].items():
+        if (column_type in INTEGER_TYPES
+                and column in data.columns
+                and pd.api.types.is_float_dtype(data[column])):
+            values = data[column].dropna()
+            if not values.eq(values.round()).all():
+                raise TableSchemaError(
+                    f"Column {column} is {column_type} but holds "
+                    "fractional values"
+                )
+            conversions[column] = "Int64"
+
+    if not conversions:
+        return data
+    return data.astype(conversions)
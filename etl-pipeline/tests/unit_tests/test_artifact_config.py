@@ -0,0 +1,49 @@
+import os
+import pytest
+from config.artifact_config import load_artifact_config, ArtifactConfigError
+
+
+def test_load_artifact_config_defaults(mocker):
+    mocker.patch.dict(os.environ, {}, clear=True)
+
+    config = load_artifact_config()
+
+    assert config['artifacts']['format'] == 'csv'
+    assert config['artifacts']['statistics'] is False
+    assert config['artifacts']['directory'] == 'data/processed'
+
+
+@pytest.mark.parametrize("artifact_format,compression", [
+    ("parquet", "snappy"),
+    ("feather", "zstd"),
+])
+def test_load_artifact_config_default_compression(
+    mocker, artifact_format, compression
+):
+    mocker.patch.dict(
+        os.environ, {'ARTIFACT_FORMAT': artifact_format}, clear=True
+    )
+
+    config = load_artifact_config()
+
+    assert config['artifacts']['compression'] == compression
+
+
+def test_load_artifact_config_invalid_format(mocker):
+    mocker.patch.dict(os.environ, {'ARTIFACT_FORMAT': 'xlsx'})
+
+    with pytest.raises(ArtifactConfigError, match="format must be one of"):
+        load_artifact_config()
+
+
+def test_load_artifact_config_invalid_compression(mocker):
+    mocker.patch.dict(os.environ, {
+        'ARTIFACT_FORMAT': 'feather',
+        'ARTIFACT_COMPRESSION': 'snappy'
+    })
+
+    with pytest.raises(
+        ArtifactConfigError,
+        match="feather artifacts compression must be one of"
+    ):
+        load_artifact_config()
@@ -0,0 +1,125 @@
+import pandas as pd
+import pytest
+from src.utils.artifact_utils import (
+    ArtifactError,
+    background_artifact_writer,
+    read_artifact,
+    write_artifact
+)
+
+
+@pytest.fixture
+def sample_dataframe():
+    # Filtered frames keep a non-default index
+    return pd.DataFrame({
+        "year": [2016, 2017, 2018],
+        "team_name": pd.Categorical(["LAL", "BOS", "LAL"]),
+        "win_pct": [50.0, 62.5, None]
+    }, index=[3, 5, 9])
+
+
+@pytest.fixture
+def artifact_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("ARTIFACT_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.parametrize("artifact_format,compression", [
+    ("parquet", "snappy"),
+    ("parquet", "zstd"),
+    ("feather", "zstd"),
+    ("feather", "none"),
+])
+def test_write_and_read_columnar_artifact(
+    sample_dataframe,
+    artifact_dir,
+    monkeypatch,
+    artifact_format,
+    compression
+):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setenv("ARTIFACT_FORMAT", artifact_format)
+    monkeypatch.setenv("ARTIFACT_COMPRESSION", compression)
+    monkeypatch.setenv("ARTIFACT_STATISTICS", "true")
+
+    file_path = write_artifact(sample_dataframe, "team_stats")
+
+    assert file_path == str(artifact_dir / f"team_stats.{artifact_format}")
+    df = read_artifact("team_stats")
+    pd.testing.assert_frame_equal(
+        df, sample_dataframe.reset_index(drop=True)
+    )
+    assert read_artifact("team_stats", columns=["year"]).columns == ["year"]
+
+
+def test_write_csv_artifact(sample_dataframe, artifact_dir, monkeypatch):
+    monkeypatch.setenv("ARTIFACT_FORMAT", "csv")
+
+    write_artifact(sample_dataframe, "team_stats")
+
+    df = read_artifact("team_stats")
+    assert (artifact_dir / "team_stats.csv").exists()
+    assert df["year"].tolist() == [2016, 2017, 2018]
+
+
+def test_write_artifact_disabled(sample_dataframe, artifact_dir, monkeypatch):
+    monkeypatch.setenv("ARTIFACT_FORMAT", "none")
+
+    assert write_artifact(sample_dataframe, "team_stats") is None
+    assert list(artifact_dir.iterdir()) == []
+    with pytest.raises(ArtifactError, match="Cannot read artifact"):
+        read_artifact("team_stats")
+
+
+def test_read_missing_artifact(artifact_dir, monkeypatch):
+    monkeypatch.setenv("ARTIFACT_FORMAT", "parquet")
+
+    with pytest.raises(ArtifactError, match="Artifact not found"):
+        read_artifact("missing")
+
+
+def test_background_writer_writes_snapshot(
+    sample_dataframe, artifact_dir, monkeypatch
+):
+    monkeypatch.setenv("ARTIFACT_FORMAT", "csv")
+    monkeypatch.setenv("ARTIFACT_WRITER_WORKERS", "2")
+
+    with background_artifact_writer() as writer:
+        assert writer is not None
+        write_artifact(sample_dataframe, "team_stats")
+        # Later steps mutating the frame must not leak into the artifact
+        sample_dataframe["year"] = 0
+        writer.flush()
+
+    assert read_artifact("team_stats")["year"].tolist() == [2016, 2017, 2018]
+
+
+def test_background_writer_reports_errors(
+    sample_dataframe, artifact_dir, monkeypatch, mocker
+):
+    monkeypatch.setenv("ARTIFACT_FORMAT", "csv")
+    monkeypatch.setenv("ARTIFACT_WRITER_WORKERS", "1")
+    mocker.patch(
+        "src.utils.artifact_utils.pd.DataFrame.to_csv",
+        side_effect=OSError("Disk full")
+    )
+
+    with background_artifact_writer() as writer:
+        write_artifact(sample_dataframe, "team_stats")
+        with pytest.raises(
+            ArtifactError,
+            match="Failed to write artifacts: team_stats: .*Disk full"
+        ):
+            writer.flush()
+
+
+def test_background_writer_disabled_writes_inline(
+    sample_dataframe, artifact_dir, monkeypatch
+):
+    monkeypatch.setenv("ARTIFACT_FORMAT", "csv")
+    monkeypatch.setenv("ARTIFACT_WRITER_WORKERS", "0")
+
+    with background_artifact_writer() as writer:
+        assert writer is None
+        write_artifact(sample_dataframe, "team_stats")
+        assert (artifact_dir / "team_stats.csv").exists()
@@ -0,0 +1,451 @@
+import psycopg
+import pytest
+import pandas as pd
+from unittest.mock import MagicMock, patch
+from sqlalchemy.exc import OperationalError
+from src.utils.bulk_load_utils import (
+    copy_dataframe,
+    drop_expired_backups,
+    has_declared_definition,
+    load_table,
+    replace_table,
+    restore_previous_table,
+    swap_in_staging_table,
+    swap_in_staging_tables,
+    swap_table,
+    BulkLoadError,
+    TableSwapError
+)
+from src.utils.table_schema_utils import TableSchemaError
+
+
+@pytest.fixture
+def sample_dataframe():
+    return pd.DataFrame({
+        "team_name": ["Atlanta Hawks", "", None],
+        "win_pct": [50.5, None, 12.25],
+    })
+
+
+@pytest.fixture
+def mock_copy():
+    connection = MagicMock()
+    cursor = connection.connection.driver_connection.cursor.return_value
+    copy = cursor.__enter__.return_value.copy
+    return connection, copy
+
+
+def test_copy_dataframe_streams_batches(mock_copy, sample_dataframe):
+    connection, copy = mock_copy
+
+    rows = copy_dataframe(
+        connection, sample_dataframe, "aa_team_stats", "public", batch_size=2
+    )
+
+    assert rows == 3
+    statement = copy.call_args.args[0]
+    assert statement == (
+        'COPY "public"."aa_team_stats" ("team_name", "win_pct") FROM STDIN '
+        "WITH (FORMAT csv, NULL '\\N')"
+    )
+    writes = copy.return_value.__enter__.return_value.write.call_args_list
+    assert [call.args[0] for call in writes] == [
+        "Atlanta Hawks,50.5\n,\\N\n",
+        "\\N,12.25\n",
+    ]
+
+
+def test_copy_dataframe_default_batch_size(
+    mocker, mock_copy, sample_dataframe
+):
+    connection, copy = mock_copy
+    mocker.patch.dict("os.environ", {"LOAD_COPY_BATCH_SIZE": "10"})
+
+    copy_dataframe(connection, sample_dataframe, "aa_team_stats", "public")
+
+    writes = copy.return_value.__enter__.return_value.write.call_args_list
+    assert len(writes) == 1
+
+
+def test_copy_dataframe_logs_rows_per_second(mock_copy, sample_dataframe):
+    connection, _ = mock_copy
+
+    with patch("src.utils.bulk_load_utils.logger") as mock_logger:
+        copy_dataframe(
+            connection, sample_dataframe, "aa_team_stats", "public"
+        )
+
+    assert "rows/sec" in mock_logger.info.call_args.args[0]
+
+
+def test_copy_dataframe_error(mock_copy, sample_dataframe):
+    connection, copy = mock_copy
+    copy.side_effect = psycopg.errors.UndefinedTable("no such table")
+
+    with pytest.raises(BulkLoadError, match="no such table"):
+        copy_dataframe(
+            connection, sample_dataframe, "aa_team_stats", "public"
+        )
+
+
+def test_replace_table(mocker, sample_dataframe):
+    connection = MagicMock()
+    mock_copy_dataframe = mocker.patch(
+        "src.utils.bulk_load_utils.copy_dataframe", return_value=3
+    )
+
+    # Tables without a definition are created from the DataFrame's dtypes
+    with patch.object(pd.DataFrame, "to_sql") as mock_to_sql:
+        rows = replace_table(
+            connection, sample_dataframe, "scratch_stats", "public"
+        )
+
+    assert rows == 3
+    mock_to_sql.assert_called_once_with(
+        "scratch_stats",
+        con=connection,
+        schema="public",
+        if_exists="replace",
+        index=False
+    )
+    mock_copy_dataframe.assert_called_once_with(
+        connection, sample_dataframe, "scratch_stats", "public"
+    )
+
+
+def executed_sql(connection):
+    return [
+        str(call.args[0]) for call in connection.execute.call_args_list
+    ]
+
+
+def test_replace_table_builds_indexes(mocker, sample_dataframe):
+    connection = MagicMock()
+    mocker.patch("src.utils.bulk_load_utils.copy_dataframe")
+
+    with patch.object(pd.DataFrame, "to_sql"):
+        replace_table(
+            connection,
+            sample_dataframe,
+            "scratch_stats",
+            "public",
+            [("team_name",), ("team_name", "win_pct")]
+        )
+
+    statements = executed_sql(connection)
+    assert len(statements) == 2
+    assert statements[0].startswith(
+        'CREATE INDEX "ix_scratch_stats_team_name_'
+    )
+    assert statements[1].endswith(
+        'ON "public"."scratch_stats" ("team_name", "win_pct")'
+    )
+
+
+def test_replace_table_uses_table_definition(mocker):
+    connection = MagicMock()
+    mock_copy_dataframe = mocker.patch(
+        "src.utils.bulk_load_utils.copy_dataframe"
+    )
+    data = pd.DataFrame({
+        "year": [2017, 2018],
+        "team_name": ["Atlanta Hawks", "Boston Celtics"],
+        "total_games": [82.0, None],
+        "total_wins": [43, 55],
+        "total_losses": [39, 27],
+        "win_pct": [52.44, 67.07],
+    })
+
+    replace_table(
+        connection, data, "aa_team_stats", "public", [("team_name",)]
+    )
+
+    statements = executed_sql(connection)
+    assert statements[0] == 'DROP TABLE IF EXISTS "public"."aa_team_stats"'
+    assert statements[1] == (
+        'CREATE TABLE "public"."aa_team_stats" ("year" SMALLINT NOT NULL, '
+        '"team_name" TEXT NOT NULL, "total_games" SMALLINT, '
+        '"total_wins" SMALLINT, "total_losses" SMALLINT, "win_pct" REAL)'
+    )
+    assert statements[2].startswith(
+        'ALTER TABLE "public"."aa_team_stats" ADD CONSTRAINT '
+        '"pk_aa_team_stats_'
+    )
+    assert statements[2].endswith('PRIMARY KEY ("year", "team_name")')
+    assert statements[3].startswith('CREATE INDEX "ix_aa_team_stats_team_')
+    # The counts are written as integers
+    rows = mock_copy_dataframe.call_args.args[1]
+    assert len(rows) == 2
+    assert str(rows["total_games"].dtype) == "Int64"
+
+
+def test_replace_table_rejects_duplicate_key(mocker):
+    connection = MagicMock()
+    mock_copy_dataframe = mocker.patch(
+        "src.utils.bulk_load_utils.copy_dataframe"
+    )
+    data = pd.DataFrame({
+        "year": [2017, 2017],
+        "team_name": ["Atlanta Hawks", "Atlanta Hawks"],
+        "total_wins": [40, 43],
+    })
+
+    with pytest.raises(TableSchemaError, match="Atlanta Hawks"):
+        replace_table(connection, data, "aa_team_stats", "public")
+
+    mock_copy_dataframe.assert_not_called()
+
+
+def test_load_table_dispatches_on_mode(mocker, sample_dataframe):
+    mock_replace = mocker.patch("src.utils.bulk_load_utils.replace_table")
+    mock_swap = mocker.patch("src.utils.bulk_load_utils.swap_table")
+    connection = MagicMock()
+
+    load_table(connection, sample_dataframe, "aa_team_stats", "public")
+    load_table(
+        connection, sample_dataframe, "aa_team_stats", "public", (), "swap"
+    )
+
+    mock_replace.assert_called_once()
+    mock_swap.assert_called_once()
+
+
+def test_load_table_defers_swap(mocker, sample_dataframe):
+    mock_build = mocker.patch(
+        "src.utils.bulk_load_utils.build_staging_table"
+    )
+    mock_swap = mocker.patch("src.utils.bulk_load_utils.swap_table")
+    connection = MagicMock()
+
+    load_table(
+        connection, sample_dataframe, "aa_team_stats", "public", (), "swap",
+        defer_swap=True
+    )
+
+    mock_build.assert_called_once_with(
+        connection, sample_dataframe, "aa_team_stats", "public", ()
+    )
+    mock_swap.assert_not_called()
+
+
+def test_swap_table(mocker, sample_dataframe):
+    connection = MagicMock()
+    # The live table exists and there are no older backups
+    connection.execute.return_value.scalar.return_value = True
+    connection.execute.return_value.scalars.return_value.all.return_value = []
+    mock_copy = mocker.patch("src.utils.bulk_load_utils.copy_dataframe")
+
+    swap_table(
+        connection,
+        sample_dataframe,
+        "aa_team_stats",
+        "public",
+        [("team_name",)]
+    )
+
+    # Rows go into the staging table, never the live one
+    assert mock_copy.call_args.args[2] == "aa_team_stats_staging"
+    statements = executed_sql(connection)
+    assert statements[0] == (
+        'DROP TABLE IF EXISTS "public"."aa_team_stats_staging"'
+    )
+    assert statements[2].startswith(
+        'CREATE TABLE "public"."aa_team_stats_staging"'
+    )
+    assert 'ALTER TABLE "public"."aa_team_stats_staging"' in statements[3]
+    assert 'ON "public"."aa_team_stats_staging"' in statements[4]
+    assert statements[6] == "SET LOCAL lock_timeout = 2000"
+    assert statements[8].startswith(
+        'ALTER TABLE "public"."aa_team_stats" RENAME TO "aa_team_stats_bak_'
+    )
+    assert statements[9] == (
+        'ALTER TABLE "public"."aa_team_stats_staging" '
+        'RENAME TO "aa_team_stats"'
+    )
+
+
+def lock_timeout_error():
+    return OperationalError(
+        "ALTER TABLE", {}, psycopg.errors.LockNotAvailable("lock timeout")
+    )
+
+
+def test_swap_in_staging_table_retries_on_lock_timeout(mocker):
+    mocker.patch("src.utils.bulk_load_utils.time.sleep")
+    mocker.patch(
+        "src.utils.bulk_load_utils.table_exists_in_schema",
+        return_value=True
+    )
+    connection = MagicMock()
+    connection.execute.side_effect = [
+        None, lock_timeout_error(), None, None, None
+    ]
+
+    backup = swap_in_staging_table(
+        connection, "aa_team_stats", "public", 100, 3
+    )
+
+    assert backup.startswith("aa_team_stats_bak_")
+    connection.rollback.assert_called_once()
+    connection.commit.assert_called_once()
+
+
+def test_swap_in_staging_table_gives_up(mocker):
+    mocker.patch("src.utils.bulk_load_utils.time.sleep")
+    mocker.patch(
+        "src.utils.bulk_load_utils.table_exists_in_schema",
+        return_value=True
+    )
+    connection = MagicMock()
+    connection.execute.side_effect = [None, lock_timeout_error()] * 2
+
+    with pytest.raises(TableSwapError, match="after 2 attempts"):
+        swap_in_staging_table(connection, "aa_team_stats", "public", 100, 2)
+
+
+def test_swap_in_staging_tables_in_one_transaction(mocker):
+    mocker.patch(
+        "src.utils.bulk_load_utils.table_exists_in_schema",
+        side_effect=[True, False]
+    )
+    connection = MagicMock()
+
+    backups = swap_in_staging_tables(
+        connection, ["aa_team_stats", "aa_player_stats"], "public", 100, 3
+    )
+
+    assert backups["aa_team_stats"].startswith("aa_team_stats_bak_")
+    assert backups["aa_player_stats"] is None
+    statements = executed_sql(connection)
+    assert statements[0] == "SET LOCAL lock_timeout = 100"
+    assert statements[-1] == (
+        'ALTER TABLE "public"."aa_player_stats_staging" '
+        'RENAME TO "aa_player_stats"'
+    )
+    connection.commit.assert_called_once()
+
+
+def test_swap_in_staging_tables_writes_before_commit(mocker):
+    mocker.patch(
+        "src.utils.bulk_load_utils.table_exists_in_schema",
+        return_value=True
+    )
+    connection = MagicMock()
+    before_commit = MagicMock(
+        side_effect=lambda _: connection.commit.assert_not_called()
+    )
+
+    swap_in_staging_tables(
+        connection, ["aa_team_stats"], "public", 100, 3,
+        before_commit=before_commit
+    )
+
+    before_commit.assert_called_once_with(connection)
+    connection.commit.assert_called_once()
+
+
+def test_drop_expired_backups(mocker):
+    mocker.patch(
+        "src.utils.bulk_load_utils.list_backup_tables",
+        return_value=[
+            "aa_team_stats_bak_20000101000000",
+            "aa_team_stats_bak_29990101000000",
+        ]
+    )
+    connection = MagicMock()
+
+    dropped = drop_expired_backups(
+        connection, "aa_team_stats", "public", 24
+    )
+
+    assert dropped == ["aa_team_stats_bak_20000101000000"]
+    assert executed_sql(connection) == [
+        'DROP TABLE "public"."aa_team_stats_bak_20000101000000"'
+    ]
+
+
+def test_restore_previous_table(mocker):
+    mocker.patch(
+        "src.utils.bulk_load_utils.list_backup_tables",
+        return_value=[
+            "aa_team_stats_bak_20240101000000",
+            "aa_team_stats_bak_20240102000000",
+        ]
+    )
+    connection = MagicMock()
+
+    restored = restore_previous_table(connection, "aa_team_stats", "public")
+
+    assert restored == "aa_team_stats_bak_20240102000000"
+    statements = executed_sql(connection)
+    assert statements[1] == (
+        'ALTER TABLE "public"."aa_team_stats_bak_20240102000000" '
+        'RENAME TO "aa_team_stats"'
+    )
+    connection.commit.assert_called_once()
+
+
+def test_restore_previous_table_writes_before_commit(mocker):
+    mocker.patch(
+        "src.utils.bulk_load_utils.list_backup_tables",
+        return_value=["aa_team_stats_bak_20240101000000"]
+    )
+    connection = MagicMock()
+    before_commit = MagicMock(
+        side_effect=lambda _: connection.commit.assert_not_called()
+    )
+
+    restore_previous_table(
+        connection, "aa_team_stats", "public", before_commit=before_commit
+    )
+
+    # Called after both renames, in the rollback's transaction
+    before_commit.assert_called_once_with(connection)
+    assert len(executed_sql(connection)) == 2
+    connection.commit.assert_called_once()
+
+
+def test_restore_previous_table_without_backup(mocker):
+    mocker.patch(
+        "src.utils.bulk_load_utils.list_backup_tables", return_value=[]
+    )
+
+    with pytest.raises(TableSwapError, match="No backup"):
+        restore_previous_table(MagicMock(), "aa_team_stats", "public")
+
+
+DECLARED_TEAM_STATS_COLUMNS = [
+    ("year", "smallint"),
+    ("team_name", "text"),
+    ("total_games", "smallint"),
+    ("total_wins", "smallint"),
+    ("total_losses", "smallint"),
+    ("win_pct", "real"),
+]
+
+
+@pytest.mark.parametrize("columns, primary_key, expected", [
+    (DECLARED_TEAM_STATS_COLUMNS, True, True),
+    # Created by to_sql: pandas types and no primary key
+    ([(column, "bigint" if column_type == "smallint" else column_type)
+      for column, column_type in DECLARED_TEAM_STATS_COLUMNS], False, False),
+    (DECLARED_TEAM_STATS_COLUMNS, False, False),
+])
+def test_has_declared_definition(mocker, columns, primary_key, expected):
+    connection = MagicMock()
+    connection.execute.return_value.all.return_value = columns
+    mocker.patch(
+        "src.utils.bulk_load_utils.has_primary_key",
+        return_value=primary_key
+    )
+
+    assert has_declared_definition(
+        connection, "aa_team_stats", "public"
+    ) is expected
+
+
+def test_has_declared_definition_without_definition():
+    connection = MagicMock()
+
+    assert has_declared_definition(connection, "other_table", "public")
+    connection.execute.assert_not_called()
@@ -146,14 +146,14 @@ def test_calculate_free_throws_percentage():
     assert df.loc[1, "free_throws_percentage"] == 0
 
 
-def test_clean_boxscores_runs(sample_boxscores, tmp_path):
-    # Override FILE_PATH temporarily
-    import src.transform.clean_boxscores as cb
-    cb.FILE_PATH = tmp_path / "cleaned.csv"
+def test_clean_boxscores_runs(sample_boxscores, tmp_path, monkeypatch):
+    # Write the artifacts to a temporary directory
+    monkeypatch.setenv("ARTIFACT_DIR", str(tmp_path))
+    monkeypatch.setenv("ARTIFACT_FORMAT", "csv")
 
     df = clean_boxscores(sample_boxscores.copy())
     # Check if CSV is saved
-    assert cb.FILE_PATH.exists()
+    assert (tmp_path / "cleaned_boxscores.csv").exists()
     # Check some columns exist after cleaning
     assert "field_goals_percentage" not in df.columns or \
         "field_goals_percentage" in df.columns
@@ -111,14 +111,14 @@ def test_change_date_format():
     assert result["date_time"].dtype == object
 
 
-def test_clean_games_runs(sample_games, tmp_path):
-    # Override FILE_PATH temporarily
-    import src.transform.clean_games as cb
-    cb.FILE_PATH = tmp_path / "cleaned.csv"
+def test_clean_games_runs(sample_games, tmp_path, monkeypatch):
+    # Write the artifacts to a temporary directory
+    monkeypatch.setenv("ARTIFACT_DIR", str(tmp_path))
+    monkeypatch.setenv("ARTIFACT_FORMAT", "csv")
 
     df = clean_games(sample_games.copy())
     # Check if CSV is saved
-    assert cb.FILE_PATH.exists()
+    assert (tmp_path / "cleaned_games.csv").exists()
     # Check some columns exist after cleaning
     assert "game_id" not in df.columns or \
         "game_id" in df.columns
@@ -96,14 +96,14 @@ def test_height_to_metres():
     assert height_to_metres(None) is None
 
 
-def test_clean_playerinfo_runs(sample_playerinfo, tmp_path):
-    # Override FILE_PATH temporarily
-    import src.transform.clean_playerinfo as cb
-    cb.FILE_PATH = tmp_path / "cleaned.csv"
+def test_clean_playerinfo_runs(sample_playerinfo, tmp_path, monkeypatch):
+    # Write the artifacts to a temporary directory
+    monkeypatch.setenv("ARTIFACT_DIR", str(tmp_path))
+    monkeypatch.setenv("ARTIFACT_FORMAT", "csv")
 
     df = clean_playerinfo(sample_playerinfo.copy())
     # Check if CSV is saved
-    assert cb.FILE_PATH.exists()
+    assert (tmp_path / "cleaned_playerinfo.csv").exists()
     # Check some columns exist after cleaning
     assert "player_name" not in df.columns or \
         "player_name" in df.columns
@@ -72,14 +72,14 @@ def test_convert_year_to_numeric():
     assert pd.api.types.is_integer_dtype(result["season_start_year"])
 
 
-def test_clean_salaries_runs(sample_salaries, tmp_path):
-    # Override FILE_PATH temporarily
-    import src.transform.clean_salaries as cb
-    cb.FILE_PATH = tmp_path / "cleaned.csv"
+def test_clean_salaries_runs(sample_salaries, tmp_path, monkeypatch):
+    # Write the artifacts to a temporary directory
+    monkeypatch.setenv("ARTIFACT_DIR", str(tmp_path))
+    monkeypatch.setenv("ARTIFACT_FORMAT", "csv")
 
     df = clean_salaries(sample_salaries.copy())
     # Check if CSV is saved
-    assert cb.FILE_PATH.exists()
+    assert (tmp_path / "cleaned_salaries.csv").exists()
     # Check some columns exist after cleaning
     assert "player_name" not in df.columns or \
         "player_name" in df.columns
@@ -3,8 +3,10 @@ import pandas as pd
 from unittest.mock import Mock, patch
 from src.load.create_player_info_and_salaries import (
     create_player_info_and_salaries,
+    INDEXES,
     TABLE_NAME
 )
+from sqlalchemy.exc import SQLAlchemyError
 from config.db_config import DatabaseConfigError
 from src.utils.database_utils import (
     DatabaseConnectionError,
@@ -39,7 +41,7 @@ def test_create_player_info_and_salaries_empty_df(empty_dataframe):
 
 
 @patch("src.load.create_player_info_and_salaries.log_table_action")
-@patch("src.load.create_player_info_and_salaries.get_db_connection")
+@patch("src.load.create_player_info_and_salaries.get_pooled_connection")
 @patch("src.load.create_player_info_and_salaries.load_db_config")
 def test_create_player_info_and_salaries_new_table(
     mock_load_config,
@@ -62,18 +64,24 @@ def test_create_player_info_and_salaries_new_table(
     mock_get_connection.return_value = mock_connection
     mock_log_action.return_value = False
 
-    with patch.object(sample_dataframe, "to_sql") as mock_to_sql:
+    with patch(
+        "src.load.create_player_info_and_salaries.load_table"
+    ) as mock_load_table:
         with patch(
             "src.load.create_player_info_and_salaries.logger"
         ) as mock_logger:
             create_player_info_and_salaries(sample_dataframe)
-    mock_log_action.assert_called_once_with(mock_connection, TABLE_NAME)
-    mock_to_sql.assert_called_once_with(
+    mock_log_action.assert_called_once_with(
+        mock_connection, TABLE_NAME, "replace"
+    )
+    mock_load_table.assert_called_once_with(
+        mock_connection,
+        sample_dataframe,
         TABLE_NAME,
-        con=mock_connection,
-        schema="public",
-        if_exists="replace",
-        index=False
+        "public",
+        INDEXES,
+        "replace",
+        defer_swap=False
     )
     # Check that success message was logged
     success_calls = [call for call in mock_logger.info.call_args_list
@@ -98,7 +106,7 @@ def test_create_player_info_and_salaries_database_config_error(
         create_player_info_and_salaries(sample_dataframe)
 
 
-@patch('src.load.create_player_info_and_salaries.get_db_connection')
+@patch('src.load.create_player_info_and_salaries.get_pooled_connection')
 @patch('src.load.create_player_info_and_salaries.load_db_config')
 def test_create_player_info_and_salaries_connection_error(
     mock_load_config,
@@ -127,7 +135,7 @@ def test_create_player_info_and_salaries_connection_error(
 
 
 @patch('src.load.create_player_info_and_salaries.log_table_action')
-@patch('src.load.create_player_info_and_salaries.get_db_connection')
+@patch('src.load.create_player_info_and_salaries.get_pooled_connection')
 @patch('src.load.create_player_info_and_salaries.load_db_config')
 def test_create_player_info_and_salaries_database_error(
     mock_load_config,
@@ -150,16 +158,14 @@ def test_create_player_info_and_salaries_database_error(
     mock_get_connection.return_value = mock_connection
     mock_log_action.return_value = False
 
-    with patch.object(
-        sample_dataframe,
-        'to_sql',
-        side_effect=pd.errors.DatabaseError("SQL error")
-    ):
+    # The table is created from its declared definition before the rows
+    # are copied
+    mock_connection.execute.side_effect = SQLAlchemyError("SQL error")
 
-        with pytest.raises(
-            QueryExecutionError,
-            match="Failed to execute query"
-        ):
-            create_player_info_and_salaries(sample_dataframe)
+    with pytest.raises(
+        QueryExecutionError,
+        match="Failed to execute query"
+    ):
+        create_player_info_and_salaries(sample_dataframe)
 
-        mock_connection.close.assert_called_once()
+    mock_connection.close.assert_called_once()
@@ -3,8 +3,11 @@ import pandas as pd
 from unittest.mock import Mock, patch
 from src.load.create_player_stats import (
     create_player_stats,
+    INDEXES,
+    NATURAL_KEY,
     TABLE_NAME
 )
+from sqlalchemy.exc import SQLAlchemyError
 from config.db_config import DatabaseConfigError
 from src.utils.database_utils import (
     DatabaseConnectionError,
@@ -27,6 +30,29 @@ def empty_dataframe():
     return pd.DataFrame()
 
 
+# The live table has its declared definition unless a test says otherwise
+@pytest.fixture(autouse=True)
+def declared_definition(mocker):
+    return mocker.patch(
+        "src.load.create_player_stats.has_declared_definition",
+        return_value=True
+    )
+
+
+# The years last loaded are read from and recorded in the database
+@pytest.fixture(autouse=True)
+def loaded_partitions(mocker):
+    return {
+        "changed": mocker.patch(
+            "src.load.create_player_stats.get_changed_partitions",
+            return_value=None
+        ),
+        "record": mocker.patch(
+            "src.load.create_player_stats.record_loaded_partitions"
+        ),
+    }
+
+
 def test_create_player_stats_empty_df(empty_dataframe):
     with patch(
         "src.load.create_player_stats.logger"
@@ -39,7 +65,7 @@ def test_create_player_stats_empty_df(empty_dataframe):
 
 
 @patch("src.load.create_player_stats.log_table_action")
-@patch("src.load.create_player_stats.get_db_connection")
+@patch("src.load.create_player_stats.get_pooled_connection")
 @patch("src.load.create_player_stats.load_db_config")
 def test_create_player_stats_new_table(
     mock_load_config,
@@ -62,18 +88,24 @@ def test_create_player_stats_new_table(
     mock_get_connection.return_value = mock_connection
     mock_log_action.return_value = False
 
-    with patch.object(sample_dataframe, "to_sql") as mock_to_sql:
+    with patch(
+        "src.load.create_player_stats.load_table"
+    ) as mock_load_table:
         with patch(
             "src.load.create_player_stats.logger"
         ) as mock_logger:
             create_player_stats(sample_dataframe)
-    mock_log_action.assert_called_once_with(mock_connection, TABLE_NAME)
-    mock_to_sql.assert_called_once_with(
+    mock_log_action.assert_called_once_with(
+        mock_connection, TABLE_NAME, "replace"
+    )
+    mock_load_table.assert_called_once_with(
+        mock_connection,
+        sample_dataframe,
         TABLE_NAME,
-        con=mock_connection,
-        schema="public",
-        if_exists="replace",
-        index=False
+        "public",
+        INDEXES,
+        "replace",
+        defer_swap=False
     )
     # Check that success message was logged
     success_calls = [call for call in mock_logger.info.call_args_list
@@ -98,7 +130,7 @@ def test_create_player_stats_database_config_error(
         create_player_stats(sample_dataframe)
 
 
-@patch('src.load.create_player_stats.get_db_connection')
+@patch('src.load.create_player_stats.get_pooled_connection')
 @patch('src.load.create_player_stats.load_db_config')
 def test_create_player_stats_connection_error(
     mock_load_config,
@@ -127,7 +159,7 @@ def test_create_player_stats_connection_error(
 
 
 @patch('src.load.create_player_stats.log_table_action')
-@patch('src.load.create_player_stats.get_db_connection')
+@patch('src.load.create_player_stats.get_pooled_connection')
 @patch('src.load.create_player_stats.load_db_config')
 def test_create_player_stats_database_error(
     mock_load_config,
@@ -150,16 +182,51 @@ def test_create_player_stats_database_error(
     mock_get_connection.return_value = mock_connection
     mock_log_action.return_value = False
 
-    with patch.object(
-        sample_dataframe,
-        'to_sql',
-        side_effect=pd.errors.DatabaseError("SQL error")
+    # The table is created from its declared definition before the rows
+    # are copied
+    mock_connection.execute.side_effect = SQLAlchemyError("SQL error")
+
+    with pytest.raises(
+        QueryExecutionError,
+        match="Failed to execute query"
     ):
+        create_player_stats(sample_dataframe)
 
-        with pytest.raises(
-            QueryExecutionError,
-            match="Failed to execute query"
-        ):
-            create_player_stats(sample_dataframe)
+    mock_connection.close.assert_called_once()
+
+
+@patch("src.load.create_player_stats.load_table")
+@patch("src.load.create_player_stats.merge_table")
+@patch("src.load.create_player_stats.load_load_config")
+@patch("src.load.create_player_stats.log_table_action")
+@patch("src.load.create_player_stats.get_pooled_connection")
+@patch("src.load.create_player_stats.load_db_config")
+def test_create_player_stats_merge_mode(
+    mock_load_config,
+    mock_get_connection,
+    mock_log_action,
+    mock_load_load_config,
+    mock_merge_table,
+    mock_load_table,
+    loaded_partitions,
+    sample_dataframe
+):
+    # Test that the merge mode upserts on the natural key
+    mock_connection = Mock()
+    mock_get_connection.return_value = mock_connection
+    mock_log_action.return_value = True
+    mock_load_load_config.return_value = {"load": {"mode": "merge"}}
+    loaded_partitions["changed"].return_value = [2016]
 
-        mock_connection.close.assert_called_once()
+    create_player_stats(sample_dataframe)
+
+    mock_merge_table.assert_called_once_with(
+        mock_connection,
+        sample_dataframe,
+        TABLE_NAME,
+        "public",
+        NATURAL_KEY,
+        INDEXES
+    )
+    mock_load_table.assert_not_called()
+    mock_connection.commit.assert_called_once()
@@ -3,8 +3,10 @@ import pandas as pd
 from unittest.mock import Mock, patch
 from src.load.create_team_stats import (
     create_team_stats,
+    INDEXES,
     TABLE_NAME
 )
+from sqlalchemy.exc import SQLAlchemyError
 from config.db_config import DatabaseConfigError
 from src.utils.database_utils import (
     DatabaseConnectionError,
@@ -27,6 +29,29 @@ def empty_dataframe():
     return pd.DataFrame()
 
 
+# The live table has its declared definition unless a test says otherwise
+@pytest.fixture(autouse=True)
+def declared_definition(mocker):
+    return mocker.patch(
+        "src.load.create_team_stats.has_declared_definition",
+        return_value=True
+    )
+
+
+# The years last loaded are read from and recorded in the database
+@pytest.fixture(autouse=True)
+def loaded_partitions(mocker):
+    return {
+        "changed": mocker.patch(
+            "src.load.create_team_stats.get_changed_partitions",
+            return_value=None
+        ),
+        "record": mocker.patch(
+            "src.load.create_team_stats.record_loaded_partitions"
+        ),
+    }
+
+
 def test_create_team_stats_empty_df(empty_dataframe):
     with patch(
         "src.load.create_team_stats.logger"
@@ -39,7 +64,7 @@ def test_create_team_stats_empty_df(empty_dataframe):
 
 
 @patch("src.load.create_team_stats.log_table_action")
-@patch("src.load.create_team_stats.get_db_connection")
+@patch("src.load.create_team_stats.get_pooled_connection")
 @patch("src.load.create_team_stats.load_db_config")
 def test_create_team_stats_new_table(
     mock_load_config,
@@ -62,18 +87,24 @@ def test_create_team_stats_new_table(
     mock_get_connection.return_value = mock_connection
     mock_log_action.return_value = False
 
-    with patch.object(sample_dataframe, "to_sql") as mock_to_sql:
+    with patch(
+        "src.load.create_team_stats.load_table"
+    ) as mock_load_table:
         with patch(
             "src.load.create_team_stats.logger"
         ) as mock_logger:
             create_team_stats(sample_dataframe)
-    mock_log_action.assert_called_once_with(mock_connection, TABLE_NAME)
-    mock_to_sql.assert_called_once_with(
+    mock_log_action.assert_called_once_with(
+        mock_connection, TABLE_NAME, "replace"
+    )
+    mock_load_table.assert_called_once_with(
+        mock_connection,
+        sample_dataframe,
         TABLE_NAME,
-        con=mock_connection,
-        schema="public",
-        if_exists="replace",
-        index=False
+        "public",
+        INDEXES,
+        "replace",
+        defer_swap=False
     )
     # Check that success message was logged
     success_calls = [call for call in mock_logger.info.call_args_list
@@ -98,7 +129,7 @@ def test_create_team_stats_database_config_error(
         create_team_stats(sample_dataframe)
 
 
-@patch('src.load.create_team_stats.get_db_connection')
+@patch('src.load.create_team_stats.get_pooled_connection')
 @patch('src.load.create_team_stats.load_db_config')
 def test_create_team_stats_connection_error(
     mock_load_config,
@@ -127,7 +158,7 @@ def test_create_team_stats_connection_error(
 
 
 @patch('src.load.create_team_stats.log_table_action')
-@patch('src.load.create_team_stats.get_db_connection')
+@patch('src.load.create_team_stats.get_pooled_connection')
 @patch('src.load.create_team_stats.load_db_config')
 def test_create_team_stats_database_error(
     mock_load_config,
@@ -150,16 +181,215 @@ def test_create_team_stats_database_error(
     mock_get_connection.return_value = mock_connection
     mock_log_action.return_value = False
 
-    with patch.object(
-        sample_dataframe,
-        'to_sql',
-        side_effect=pd.errors.DatabaseError("SQL error")
+    # The table is created from its declared definition before the rows
+    # are copied
+    mock_connection.execute.side_effect = SQLAlchemyError("SQL error")
+
+    with pytest.raises(
+        QueryExecutionError,
+        match="Failed to execute query"
     ):
+        create_team_stats(sample_dataframe)
 
-        with pytest.raises(
-            QueryExecutionError,
-            match="Failed to execute query"
-        ):
-            create_team_stats(sample_dataframe)
+    mock_connection.close.assert_called_once()
+
+
+@patch("src.load.create_team_stats.replace_partitions")
+@patch("src.load.create_team_stats.log_table_action")
+@patch("src.load.create_team_stats.get_pooled_connection")
+@patch("src.load.create_team_stats.load_db_config")
+def test_create_team_stats_replaces_changed_partitions(
+    mock_load_config,
+    mock_get_connection,
+    mock_log_action,
+    mock_replace_partitions,
+    loaded_partitions,
+    sample_dataframe
+):
+    # Test that only the recomputed years are rewritten
+    mock_connection = Mock()
+    mock_get_connection.return_value = mock_connection
+    mock_log_action.return_value = True
+    loaded_partitions["changed"].return_value = [2016]
+
+    with patch.object(sample_dataframe, "to_sql") as mock_to_sql:
+        create_team_stats(sample_dataframe)
+
+    mock_to_sql.assert_not_called()
+    mock_replace_partitions.assert_called_once_with(
+        mock_connection,
+        sample_dataframe,
+        TABLE_NAME,
+        "public",
+        [2016]
+    )
+    mock_connection.commit.assert_called_once()
+    mock_connection.close.assert_called_once()
+    loaded_partitions["record"].assert_called_once_with(
+        mock_connection, sample_dataframe, TABLE_NAME, "public"
+    )
+
+
+@patch("src.load.create_team_stats.replace_partitions")
+@patch("src.load.create_team_stats.log_table_action")
+@patch("src.load.create_team_stats.get_pooled_connection")
+@patch("src.load.create_team_stats.load_db_config")
+def test_create_team_stats_failed_load_records_no_partitions(
+    mock_load_config,
+    mock_get_connection,
+    mock_log_action,
+    mock_replace_partitions,
+    loaded_partitions,
+    sample_dataframe
+):
+    # Test that the years of a failed load are retried by the next run
+    mock_connection = Mock()
+    mock_get_connection.return_value = mock_connection
+    mock_log_action.return_value = True
+    loaded_partitions["changed"].return_value = [2016]
+    mock_replace_partitions.side_effect = SQLAlchemyError("COPY failed")
+
+    with pytest.raises(QueryExecutionError):
+        create_team_stats(sample_dataframe)
+
+    loaded_partitions["record"].assert_not_called()
+    mock_connection.commit.assert_not_called()
 
-        mock_connection.close.assert_called_once()
+
+@patch("src.load.create_team_stats.record_load_versions")
+@patch("src.load.create_team_stats.replace_partitions")
+@patch("src.load.create_team_stats.log_table_action")
+@patch("src.load.create_team_stats.get_pooled_connection")
+@patch("src.load.create_team_stats.load_db_config")
+def test_create_team_stats_records_load_version(
+    mock_load_config,
+    mock_get_connection,
+    mock_log_action,
+    mock_replace_partitions,
+    mock_record_versions,
+    loaded_partitions,
+    sample_dataframe
+):
+    # Test that the load version is bumped before the load commits
+    mock_connection = Mock()
+    mock_connection.commit.side_effect = (
+        lambda: mock_record_versions.assert_called_once_with(
+            mock_connection, [TABLE_NAME], "public"
+        )
+    )
+    mock_get_connection.return_value = mock_connection
+    mock_log_action.return_value = True
+    loaded_partitions["changed"].return_value = [2016]
+
+    create_team_stats(sample_dataframe)
+
+    mock_connection.commit.assert_called_once()
+
+
+@patch("src.load.create_team_stats.load_load_config")
+@patch("src.load.create_team_stats.log_table_action")
+@patch("src.load.create_team_stats.get_pooled_connection")
+def test_create_team_stats_with_callers_connection(
+    mock_get_connection,
+    mock_log_action,
+    mock_load_load_config,
+    loaded_partitions,
+    sample_dataframe
+):
+    # Test that the caller's transaction is left open in swap mode
+    mock_load_load_config.return_value = {"load": {"mode": "swap"}}
+    mock_log_action.return_value = True
+    connection = Mock()
+
+    with patch(
+        "src.load.create_team_stats.load_table"
+    ) as mock_load_table:
+        swap_pending = create_team_stats(sample_dataframe, connection)
+
+    assert swap_pending
+    mock_get_connection.assert_not_called()
+    mock_load_table.assert_called_once_with(
+        connection,
+        sample_dataframe,
+        TABLE_NAME,
+        "public",
+        INDEXES,
+        "swap",
+        defer_swap=True
+    )
+    connection.commit.assert_not_called()
+    connection.close.assert_not_called()
+    # The caller records the loaded years and the load version when it
+    # commits
+    connection.execute.assert_not_called()
+    loaded_partitions["record"].assert_not_called()
+
+
+@pytest.mark.parametrize("load_mode, partition_cache", [
+    ("swap", "true"),
+    ("replace", "false"),
+])
+@patch("src.load.create_team_stats.replace_partitions")
+@patch("src.load.create_team_stats.load_table")
+@patch("src.load.create_team_stats.log_table_action")
+@patch("src.load.create_team_stats.get_pooled_connection")
+@patch("src.load.create_team_stats.load_db_config")
+def test_create_team_stats_loads_whole_table(
+    mock_load_config,
+    mock_get_connection,
+    mock_log_action,
+    mock_load_table,
+    mock_replace_partitions,
+    monkeypatch,
+    loaded_partitions,
+    sample_dataframe,
+    load_mode,
+    partition_cache
+):
+    # Test that single years are only replaced in the replace mode with
+    # the partition cache on
+    monkeypatch.setenv("LOAD_MODE", load_mode)
+    monkeypatch.setenv("TRANSFORM_PARTITION_CACHE", partition_cache)
+    mock_connection = Mock()
+    mock_get_connection.return_value = mock_connection
+    mock_log_action.return_value = True
+    loaded_partitions["changed"].return_value = [2016]
+
+    create_team_stats(sample_dataframe)
+
+    loaded_partitions["changed"].assert_not_called()
+    mock_replace_partitions.assert_not_called()
+    assert mock_load_table.call_args.args[5] == load_mode
+    loaded_partitions["record"].assert_called_once()
+
+
+@patch("src.load.create_team_stats.replace_partitions")
+@patch("src.load.create_team_stats.load_table")
+@patch("src.load.create_team_stats.log_table_action")
+@patch("src.load.create_team_stats.get_pooled_connection")
+@patch("src.load.create_team_stats.load_db_config")
+def test_create_team_stats_rebuilds_undeclared_table(
+    mock_load_config,
+    mock_get_connection,
+    mock_log_action,
+    mock_load_table,
+    mock_replace_partitions,
+    declared_definition,
+    loaded_partitions,
+    sample_dataframe
+):
+    # Test that a table created without its declared definition, e.g. by
+    # to_sql, is rebuilt in full instead of having years replaced
+    mock_connection = Mock()
+    mock_get_connection.return_value = mock_connection
+    mock_log_action.return_value = True
+    declared_definition.return_value = False
+    loaded_partitions["changed"].return_value = [2016]
+
+    create_team_stats(sample_dataframe)
+
+    declared_definition.assert_called_once_with(
+        mock_connection, TABLE_NAME, "public"
+    )
+    mock_replace_partitions.assert_not_called()
+    mock_load_table.assert_called_once()
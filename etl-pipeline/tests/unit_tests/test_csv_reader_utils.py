@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+from src.utils.csv_reader_utils import read_source_csv
+
+
+@pytest.fixture
+def boxscores_csv(tmp_path):
+    data = pd.DataFrame({
+        "game_id": [1, 1, 2, 2, 3],
+        "teamName": ["LAL", "BOS", "LAL", "BOS", "MIA"],
+        "playerName": ["A", "B", "C", "D", "E"],
+        "MP": ["30:00", "Did Not Play", "20:00", "10:00", "12:00"],
+        "FG": ["1", "Did Not Play", "2", "3", "4"],
+        "FGA": ["2", "Did Not Play", "3", "4", "5"],
+        "3P": ["0", "Did Not Play", "1", "1", "1"],
+        "3PA": ["1", "Did Not Play", "1", "2", "2"],
+        "FT": ["0", "Did Not Play", "1", "1", "1"],
+        "FTA": ["0", "Did Not Play", "1", "1", "1"],
+        "ORB": [1, 1, 1, 1, 1],
+        "TRB": ["3", "Did Not Play", "4", "5", "6"],
+        "AST": ["1", "Did Not Play", "2", "3", "4"],
+        "PTS": ["2", "Did Not Play", "6", "8", "10"],
+        "+/-": [0, 0, 0, 0, 0],
+        "isStarter": [1, 0, 1, 0, 1]
+    })
+    file_path = tmp_path / "boxscore.csv"
+    data.to_csv(file_path, index=False)
+    return file_path
+
+
+@pytest.mark.parametrize("engine", ["c", "pyarrow", "chunked"])
+def test_read_source_csv_engines_agree(boxscores_csv, engine):
+    pytest.importorskip("pyarrow")
+    expected = read_source_csv(boxscores_csv, "boxscores", engine="c")
+
+    df = read_source_csv(
+        boxscores_csv,
+        "boxscores",
+        engine=engine,
+        chunk_size=2
+    )
+
+    pd.testing.assert_frame_equal(df, expected)
+    assert "ORB" not in df.columns
+    assert df["teamName"].dtype == "category"
+
+
+def test_read_source_csv_unsupported_engine(boxscores_csv):
+    with pytest.raises(ValueError, match="Unsupported CSV engine: python"):
+        read_source_csv(boxscores_csv, "boxscores", engine="python")
@@ -0,0 +1,306 @@
+import pandas as pd
+import pytest
+from functools import partial
+from src.utils.dag_utils import (
+    GraphError,
+    GraphScheduler,
+    NodeCache,
+    get_target_frames,
+    init_worker,
+    run_graph,
+    select_upstream,
+    sort_graph
+)
+from src.utils import artifact_utils
+
+
+def add_column(data, name, value):
+    return data.assign(**{name: value})
+
+
+def make_column(data, name, value):
+    return pd.DataFrame({name: value}, index=data.index)
+
+
+def join_frames(left, right):
+    return pd.concat([left, right], axis=1)
+
+
+def split_frame(data):
+    return data[["a"]], data[["b"]]
+
+
+def fail(data):
+    raise ValueError("node failed")
+
+
+class DictCache(NodeCache):
+    # Caches every node but "source_reader", whose output is fresh when
+    # the "source" entry is unchanged
+    def __init__(self, cached, fresh):
+        self.cached = cached
+        self.fresh = fresh
+        self.recorded = []
+
+    def is_cacheable(self, name):
+        return name != "source_reader"
+
+    def is_fresh(self, name):
+        return name in self.fresh
+
+    def read(self, frame):
+        return self.cached[frame]
+
+    def record(self, name):
+        self.recorded.append(name)
+
+
+@pytest.fixture
+def graph():
+    return {
+        "joined": {
+            "function": join_frames,
+            "inputs": ["with_a", "with_b"],
+        },
+        "with_a": {
+            "function": partial(add_column, name="a", value=1),
+            "inputs": ["source"],
+        },
+        "with_b": {
+            "function": partial(make_column, name="b", value=2),
+            "inputs": ["source"],
+        },
+        "split": {
+            "function": split_frame,
+            "inputs": ["joined"],
+            "outputs": ["only_a", "only_b"],
+        },
+    }
+
+
+def test_sort_graph_puts_dependencies_first(graph):
+    order = sort_graph(graph, ["source"])
+
+    assert order == ["with_a", "with_b", "joined", "split"]
+
+
+def test_sort_graph_unknown_input(graph):
+    graph["joined"]["inputs"].append("missing")
+
+    with pytest.raises(GraphError, match="unknown inputs"):
+        sort_graph(graph, ["source"])
+
+
+def test_sort_graph_cycle():
+    graph = {
+        "a": {"function": join_frames, "inputs": ["b", "source"]},
+        "b": {"function": join_frames, "inputs": ["a", "source"]},
+    }
+
+    with pytest.raises(GraphError, match="cycle"):
+        sort_graph(graph, ["source"])
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_run_graph(graph, max_workers):
+    source = pd.DataFrame({"x": [1, 2]}, index=[4, 6])
+
+    frames = run_graph(
+        graph,
+        {"source": source},
+        max_workers,
+        keep=["joined", "only_b", "source"]
+    )
+
+    assert list(frames) == ["joined", "only_b", "source"]
+    expected = pd.DataFrame(
+        {"x": [1, 2], "a": [1, 1], "b": [2, 2]},
+        index=[4, 6]
+    )
+    pd.testing.assert_frame_equal(frames["joined"], expected)
+    pd.testing.assert_frame_equal(
+        frames["only_b"], pd.DataFrame({"b": [2, 2]}, index=[4, 6])
+    )
+    assert frames["source"] is source
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_run_graph_raises_node_error(graph, max_workers):
+    graph["with_b"]["function"] = fail
+
+    with pytest.raises(ValueError, match="node failed"):
+        run_graph(graph, {"source": pd.DataFrame({"x": [1]})}, max_workers)
+
+
+def test_run_graph_logs_node_timings(mocker, graph):
+    mock_logger = mocker.patch("src.utils.dag_utils.logger")
+
+    run_graph(graph, {"source": pd.DataFrame({"x": [1]})})
+
+    messages = [call.args[0] for call in mock_logger.info.call_args_list]
+    assert [message.split()[1] for message in messages] == [
+        "with_a", "with_b", "joined", "split"
+    ]
+
+
+def test_init_worker_clears_the_background_writer(mocker):
+    mocker.patch.object(artifact_utils, "_active_writer", mocker.Mock())
+
+    init_worker()
+
+    assert artifact_utils._active_writer is None
+
+
+def test_select_upstream_keeps_dependencies(graph):
+    selected = select_upstream(graph, ["joined"])
+
+    assert list(selected) == ["joined", "with_a", "with_b"]
+
+
+def test_select_upstream_by_frame_name(graph):
+    selected = select_upstream(graph, ["only_b"])
+
+    assert list(selected) == list(graph)
+
+
+def test_select_upstream_unknown_target(graph):
+    with pytest.raises(GraphError, match="Unknown node or frame"):
+        select_upstream(graph, ["missing"])
+
+
+def test_run_graph_node_without_outputs(graph):
+    sink = []
+    graph["sink"] = {
+        "function": lambda data: sink.append(len(data)),
+        "inputs": ["joined"],
+        "outputs": [],
+    }
+
+    frames = run_graph(graph, {"source": pd.DataFrame({"x": [1, 2]})})
+
+    assert sink == [2]
+    assert "sink" not in frames
+
+
+@pytest.fixture
+def cached_graph(graph):
+    source = pd.DataFrame({"x": [1, 2]})
+    graph["source_reader"] = {
+        "function": lambda: source,
+        "inputs": [],
+        "outputs": ["source"],
+    }
+    return graph
+
+
+def test_run_graph_skips_fresh_nodes(mocker, cached_graph):
+    reader = mocker.Mock(side_effect=cached_graph["source_reader"]["function"])
+    cached_graph["source_reader"]["function"] = reader
+    cached_a = pd.DataFrame({"x": [1, 2], "a": [9, 9]})
+    cache = DictCache({"with_a": cached_a}, fresh={"with_a"})
+
+    frames = run_graph(cached_graph, {}, cache=cache, keep=["joined"])
+
+    # with_b is stale, so the source is read; with_a is read back
+    reader.assert_called_once()
+    assert frames["joined"]["a"].tolist() == [9, 9]
+    assert cache.recorded == ["with_b", "joined", "split"]
+
+
+def test_run_graph_runs_nothing_when_all_fresh(mocker, cached_graph):
+    reader = mocker.Mock()
+    cached_graph["source_reader"]["function"] = reader
+    cache = DictCache({}, fresh={"with_a", "with_b", "joined", "split"})
+
+    frames = run_graph(cached_graph, {}, cache=cache)
+
+    # Nothing runs and no cached frame is read back
+    reader.assert_not_called()
+    assert frames == {}
+    assert cache.recorded == []
+
+
+def test_run_graph_reads_back_kept_frames_of_skipped_nodes(cached_graph):
+    cached_a = pd.DataFrame({"a": [9, 9]})
+    cache = DictCache(
+        {"only_a": cached_a}, fresh={"with_a", "with_b", "joined", "split"}
+    )
+
+    frames = run_graph(cached_graph, {}, cache=cache, keep=["only_a"])
+
+    assert frames == {"only_a": cached_a}
+
+
+@pytest.mark.parametrize("keep, held_by_split", [
+    ([], {"joined"}),
+    (["with_a"], {"joined", "with_a"}),
+])
+def test_run_graph_drops_frames_no_node_reads(
+    mocker, graph, keep, held_by_split
+):
+    held = {}
+    start = GraphScheduler.start
+
+    def record_frames(scheduler, name):
+        held[name] = set(scheduler.frames)
+        return start(scheduler, name)
+
+    mocker.patch.object(GraphScheduler, "start", record_frames)
+
+    frames = run_graph(
+        graph, {"source": pd.DataFrame({"x": [1, 2]})}, keep=keep
+    )
+
+    # The source is dropped once with_a and with_b have read it
+    assert held["with_b"] == {"source", "with_a"}
+    assert held["joined"] == {"with_a", "with_b"}
+    assert held["split"] == held_by_split
+    assert list(frames) == keep
+
+
+def test_get_target_frames(graph):
+    frames = get_target_frames(graph, ["split", "joined", "only_a"])
+
+    assert frames == ["only_a", "only_b", "joined"]
+
+
+def test_run_graph_checks_nodes_after_their_dependencies(cached_graph):
+    checked = []
+
+    class OrderCache(DictCache):
+        def is_fresh(self, name):
+            checked.append((name, list(self.recorded)))
+            return False
+
+    run_graph(cached_graph, {}, cache=OrderCache({}, fresh=set()))
+
+    # joined is only checked once with_a and with_b have rerun
+    assert ("joined", ["with_a", "with_b"]) in checked
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_run_graph_collects_metrics(graph, max_workers):
+    metrics = {}
+
+    run_graph(
+        graph,
+        {"source": pd.DataFrame({"x": [1, 2]})},
+        max_workers,
+        metrics=metrics
+    )
+
+    assert set(metrics) == set(graph)
+    assert metrics["split"]["status"] == "ran"
+    assert metrics["split"]["rows_in"] == 2
+    assert metrics["split"]["rows_out"] == 4
+    assert metrics["split"]["wall_seconds"] >= 0
+
+
+def test_run_graph_reports_skipped_nodes(cached_graph):
+    metrics = {}
+    cache = DictCache({}, fresh={"with_a", "with_b", "joined", "split"})
+
+    run_graph(cached_graph, {}, cache=cache, metrics=metrics)
+
+    assert metrics["split"] == {"status": "skipped"}
+    assert "source_reader" not in metrics
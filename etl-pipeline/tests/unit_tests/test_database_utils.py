@@ -4,7 +4,11 @@ from sqlalchemy.exc import ArgumentError, OperationalError, SQLAlchemyError
 from src.utils.database_utils import (
     create_db_engine,
     DatabaseConnectionError,
+    dispose_pooled_engines,
     get_db_connection,
+    get_pool_status,
+    get_pooled_connection,
+    get_pooled_engine,
 )
 
 
@@ -192,3 +196,78 @@ def test_create_db_engine_exception_catch(
 
     assert message in str(excinfo.value)
     mock_logger.error.assert_called_once_with(str(excinfo.value))
+
+
+@pytest.fixture
+def pooled_engines():
+    dispose_pooled_engines()
+    yield
+    dispose_pooled_engines()
+
+
+def test_get_pooled_engine_is_cached_per_params(
+    mocker, pooled_engines, test_connection_parameters
+):
+    mocker.patch.dict(
+        "os.environ", {"DB_POOL_SIZE": "3", "DB_POOL_RECYCLE_SECONDS": "60"}
+    )
+
+    engine = get_pooled_engine(test_connection_parameters)
+    same_engine = get_pooled_engine(dict(test_connection_parameters))
+    other_engine = get_pooled_engine(
+        {**test_connection_parameters, "dbname": "other_db"}
+    )
+
+    assert engine is same_engine
+    assert engine is not other_engine
+    assert engine.pool.size() == 3
+    assert engine.pool._recycle == 60
+    assert engine.pool._pre_ping is True
+
+
+def test_get_pooled_connection(
+    mocker, pooled_engines, test_connection_parameters
+):
+    mock_engine = MagicMock()
+    mock_create_engine = mocker.patch(
+        "src.utils.database_utils.create_db_engine", return_value=mock_engine
+    )
+
+    first = get_pooled_connection(test_connection_parameters)
+    second = get_pooled_connection(test_connection_parameters)
+
+    mock_create_engine.assert_called_once_with(
+        test_connection_parameters,
+        pool_size=5,
+        max_overflow=5,
+        pool_pre_ping=True,
+        pool_recycle=1800
+    )
+    assert first == second == mock_engine.connect.return_value
+    assert mock_engine.connect.call_count == 2
+
+
+def test_get_pooled_connection_failure(
+    mocker, pooled_engines, mock_logger, test_connection_parameters
+):
+    mock_engine = MagicMock()
+    mock_engine.connect.side_effect = OperationalError(
+        "connect", None, Exception("refused")
+    )
+    mocker.patch(
+        "src.utils.database_utils.create_db_engine", return_value=mock_engine
+    )
+
+    with pytest.raises(DatabaseConnectionError, match="refused"):
+        get_pooled_connection(test_connection_parameters)
+
+
+def test_get_pool_status(pooled_engines, test_connection_parameters):
+    status = get_pool_status(test_connection_parameters)
+
+    assert status == {
+        "size": 5,
+        "checked_in": 0,
+        "checked_out": 0,
+        "overflow": -5,
+    }
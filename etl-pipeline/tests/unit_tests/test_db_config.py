@@ -1,6 +1,10 @@
 import os
 import pytest
-from config.db_config import load_db_config, DatabaseConfigError
+from config.db_config import (
+    load_db_config,
+    load_db_pool_config,
+    DatabaseConfigError
+)
 
 
 def test_load_db_config(mocker):
@@ -72,3 +76,28 @@ def test_load_db_config_missing_env_var_errors(mocker, env_var):
         f"Configuration error: target_database {config_key} is set to 'error'"
     )):
         load_db_config()
+
+
+def test_load_db_pool_config_defaults(mocker):
+    mocker.patch.dict(os.environ, {}, clear=True)
+
+    config = load_db_pool_config()
+
+    assert config["pool"] == {
+        "pool_size": 5,
+        "max_overflow": 5,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+    }
+
+
+@pytest.mark.parametrize("env", [
+    {"DB_POOL_SIZE": "0"},
+    {"DB_POOL_MAX_OVERFLOW": "lots"},
+    {"DB_POOL_PRE_PING": "maybe"},
+])
+def test_load_db_pool_config_invalid(mocker, env):
+    mocker.patch.dict(os.environ, env)
+
+    with pytest.raises(DatabaseConfigError, match="Configuration error"):
+        load_db_pool_config()
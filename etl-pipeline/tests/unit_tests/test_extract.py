@@ -1,6 +1,8 @@
+import os
 import pytest
 import pandas as pd
 from scripts.run_etl import main
+from src.extract.extract import extract_data, EXTRACTORS
 
 
 @pytest.fixture
@@ -24,8 +26,9 @@ def mock_extract_data(mocker):
 
 def test_main_handles_extraction_error(mock_logger, mock_setup_env, mocker):
     """Test ETL pipeline handles extraction errors"""
-    mocker.patch(
-        "scripts.run_etl.extract_data", side_effect=Exception("Extract failed")
+    mocker.patch.dict(
+        "scripts.run_etl.EXTRACTORS",
+        {"box_scores": mocker.Mock(side_effect=Exception("Extract failed"))}
     )
 
     with pytest.raises(SystemExit):
@@ -34,3 +37,52 @@ def test_main_handles_extraction_error(mock_logger, mock_setup_env, mocker):
     mock_logger.error.assert_called_once_with(
         "ETL pipeline failed: Extract failed"
     )
+
+
+@pytest.fixture
+def mock_extractors(mocker):
+    extractors = {
+        "box_scores": mocker.Mock(return_value=pd.DataFrame({"a": [1]})),
+        "games": mocker.Mock(return_value=pd.DataFrame({"b": [2]})),
+        "player_info": mocker.Mock(return_value=pd.DataFrame({"c": [3]})),
+        "salaries": mocker.Mock(return_value=pd.DataFrame({"d": [4]})),
+    }
+    mocker.patch.dict("src.extract.extract.EXTRACTORS", extractors)
+    return extractors
+
+
+@pytest.mark.parametrize("max_workers", ["1", "4"])
+def test_extract_data_returns_sources_in_order(
+    mocker, mock_extractors, max_workers
+):
+    mocker.patch.dict(os.environ, {"EXTRACT_MAX_WORKERS": max_workers})
+
+    extracted = extract_data()
+
+    assert len(extracted) == 4
+    for df, name in zip(extracted, EXTRACTORS):
+        pd.testing.assert_frame_equal(
+            df, mock_extractors[name].return_value
+        )
+        mock_extractors[name].assert_called_once()
+
+
+def test_extract_data_concurrent_failure(mocker, mock_extractors):
+    mocker.patch.dict(os.environ, {"EXTRACT_MAX_WORKERS": "4"})
+    mock_extractors["games"].side_effect = Exception("Games failed")
+
+    with pytest.raises(Exception, match="Games failed"):
+        extract_data()
+
+
+@pytest.mark.parametrize("max_workers", ["1", "4"])
+def test_extract_data_skips_sources(mocker, mock_extractors, max_workers):
+    mocker.patch.dict(os.environ, {"EXTRACT_MAX_WORKERS": max_workers})
+
+    extracted = extract_data(skip=["box_scores"])
+
+    assert extracted[0] is None
+    mock_extractors["box_scores"].assert_not_called()
+    pd.testing.assert_frame_equal(
+        extracted[1], mock_extractors["games"].return_value
+    )
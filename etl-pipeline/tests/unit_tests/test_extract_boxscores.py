@@ -6,10 +6,12 @@ from src.extract.extract_boxscores import (
     KaggleConnectionError,
     extract_csvs,
     extract_boxscores,
+    SOURCE,
     TYPE,
     FILE_PATH,
     EXPECTED_PERFORMANCE
 )
+from src.utils.source_schema_utils import get_read_csv_kwargs
 import logging
 
 
@@ -32,7 +34,7 @@ def test_extract_boxscores_csv_to_dataframe(mocker):
                          "Golden State Warriors"]
         }
     )
-    mocker.patch(
+    mock_read_csv = mocker.patch(
         "src.extract.extract_boxscores.pd.read_csv", return_value=mock_df
     )
 
@@ -40,6 +42,9 @@ def test_extract_boxscores_csv_to_dataframe(mocker):
 
     assert isinstance(df, pd.DataFrame)
     pd.testing.assert_frame_equal(df, mock_df)
+    mock_read_csv.assert_called_once_with(
+        FILE_PATH, engine="c", **get_read_csv_kwargs(SOURCE)
+    )
 
 
 def test_log_extract_success_boxscores(
@@ -69,7 +74,12 @@ def test_log_extract_success_boxscores(
     df = extract_boxscores()
 
     mock_log_extract_success.assert_called_once_with(
-        mock_logger, TYPE, df.shape, mock_execution_time, EXPECTED_PERFORMANCE
+        mock_logger,
+        TYPE,
+        df.shape,
+        mock_execution_time,
+        EXPECTED_PERFORMANCE,
+        "c",
     )
 
 
@@ -0,0 +1,42 @@
+import os
+import pytest
+from config.extract_config import load_extract_config, ExtractConfigError
+
+
+def test_load_extract_config_defaults(mocker):
+    mocker.patch.dict(os.environ, {}, clear=True)
+
+    config = load_extract_config()
+
+    assert config['extract']['csv_engine'] == 'c'
+    assert config['extract']['chunk_size'] == 100000
+
+
+def test_load_extract_config_from_env(mocker):
+    mocker.patch.dict(os.environ, {
+        'EXTRACT_CSV_ENGINE': 'PyArrow',
+        'EXTRACT_CHUNK_SIZE': '5000'
+    })
+
+    config = load_extract_config()
+
+    assert config['extract']['csv_engine'] == 'pyarrow'
+    assert config['extract']['chunk_size'] == 5000
+
+
+def test_load_extract_config_invalid_engine(mocker):
+    mocker.patch.dict(os.environ, {'EXTRACT_CSV_ENGINE': 'python'})
+
+    with pytest.raises(ExtractConfigError, match="csv_engine must be one of"):
+        load_extract_config()
+
+
+@pytest.mark.parametrize("chunk_size", ["0", "-10", "abc"])
+def test_load_extract_config_invalid_chunk_size(mocker, chunk_size):
+    mocker.patch.dict(os.environ, {'EXTRACT_CHUNK_SIZE': chunk_size})
+
+    with pytest.raises(
+        ExtractConfigError,
+        match="chunk_size must be a positive integer"
+    ):
+        load_extract_config()
@@ -64,7 +64,12 @@ def test_log_extract_success_salaries(
     df = extract_salaries()
 
     mock_log_extract_success.assert_called_once_with(
-        mock_logger, TYPE, df.shape, mock_execution_time, EXPECTED_PERFORMANCE
+        mock_logger,
+        TYPE,
+        df.shape,
+        mock_execution_time,
+        EXPECTED_PERFORMANCE,
+        "c",
     )
 
 
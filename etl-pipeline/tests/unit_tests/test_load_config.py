@@ -0,0 +1,34 @@
+import os
+import pytest
+from config.load_config import load_load_config, LoadConfigError
+
+
+def test_load_load_config_defaults(mocker):
+    mocker.patch.dict(os.environ, {}, clear=True)
+
+    config = load_load_config()
+
+    assert config['load']['copy_batch_size'] == 50000
+    assert config['load']['max_workers'] == 1
+
+
+@pytest.mark.parametrize("batch_size", ["0", "-5", "many"])
+def test_load_load_config_invalid_batch_size(mocker, batch_size):
+    mocker.patch.dict(os.environ, {'LOAD_COPY_BATCH_SIZE': batch_size})
+
+    with pytest.raises(LoadConfigError, match="must be an integer >= 1"):
+        load_load_config()
+
+
+@pytest.mark.parametrize("max_workers", ["0", "two"])
+def test_load_load_config_invalid_max_workers(mocker, max_workers):
+    mocker.patch.dict(os.environ, {'LOAD_MAX_WORKERS': max_workers})
+
+    with pytest.raises(LoadConfigError, match="max_workers"):
+        load_load_config()
+
+
+def test_load_load_config_merge_mode(mocker):
+    mocker.patch.dict(os.environ, {'LOAD_MODE': 'Merge'})
+
+    assert load_load_config()['load']['mode'] == 'merge'
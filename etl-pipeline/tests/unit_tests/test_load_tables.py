@@ -0,0 +1,332 @@
+import re
+import threading
+import pytest
+import pandas as pd
+from unittest.mock import MagicMock
+from src.load.load_tables import (
+    create_load_record_tables,
+    load_tables_concurrently,
+    record_table_rollback,
+    TableLoadError
+)
+from src.utils.database_utils import QueryExecutionError
+from src.utils.load_version_utils import LOAD_VERSIONS_TABLE
+from src.utils.partition_load_utils import (
+    LOADED_PARTITIONS_TABLE,
+    get_changed_partitions
+)
+
+# Longest wait on a lock or on the other worker before a test fails
+# instead of hanging
+WAIT_SECONDS = 5
+
+
+@pytest.fixture
+def loaders(mocker):
+    mocker.patch(
+        "src.load.load_tables.load_db_config",
+        return_value={"target_database": {"dbname": "test_db"}}
+    )
+    connections = []
+
+    def get_connection(connection_details):
+        connections.append(MagicMock())
+        return connections[-1]
+
+    mocker.patch(
+        "src.load.load_tables.get_pooled_connection",
+        side_effect=get_connection
+    )
+    mocker.patch("src.load.load_tables.create_load_record_tables")
+    table_loaders = {
+        "aa_player_stats": MagicMock(return_value=False),
+        "aa_team_stats": MagicMock(return_value=False),
+    }
+    mocker.patch("src.load.load_tables.TABLE_LOADERS", table_loaders)
+    return table_loaders, connections
+
+
+@pytest.fixture
+def tables():
+    return {
+        "aa_player_stats": pd.DataFrame({"year": [2017], "a": [1]}),
+        "aa_team_stats": pd.DataFrame({"year": [2017], "a": [2]}),
+    }
+
+
+def test_load_tables_concurrently_commits_every_table(loaders, tables):
+    table_loaders, connections = loaders
+
+    timings = load_tables_concurrently(tables, max_workers=2)
+
+    assert set(timings) == set(tables)
+    # Each table is loaded on its own connection
+    assert len(connections) == 2
+    for table_name, loader in table_loaders.items():
+        assert loader.call_args.args[0] is tables[table_name]
+        assert loader.call_args.kwargs["connection"] in connections
+    for connection in connections:
+        connection.commit.assert_called_once()
+        connection.rollback.assert_not_called()
+        connection.close.assert_called_once()
+
+
+def test_load_tables_concurrently_skips_empty_tables(loaders, tables):
+    table_loaders, connections = loaders
+    tables["aa_team_stats"] = None
+
+    load_tables_concurrently(tables, max_workers=2)
+
+    table_loaders["aa_team_stats"].assert_not_called()
+    assert len(connections) == 1
+
+
+def test_load_tables_concurrently_rolls_back_on_failure(loaders, tables):
+    table_loaders, connections = loaders
+    table_loaders["aa_team_stats"].side_effect = QueryExecutionError(
+        "COPY failed"
+    )
+
+    with pytest.raises(TableLoadError, match="aa_team_stats: COPY failed"):
+        load_tables_concurrently(tables, max_workers=2)
+
+    for connection in connections:
+        connection.commit.assert_not_called()
+        connection.rollback.assert_called_once()
+        connection.close.assert_called_once()
+
+
+def test_load_tables_concurrently_swaps_staged_tables(
+    mocker, loaders, tables
+):
+    table_loaders, connections = loaders
+    # Only player stats built a staging table
+    table_loaders["aa_player_stats"].return_value = True
+    mock_swap = mocker.patch("src.load.load_tables.swap_in_staging_tables")
+    mocker.patch("src.load.load_tables.drop_expired_backups")
+    mock_record = mocker.patch("src.load.load_tables.record_table_load")
+
+    load_tables_concurrently(tables, max_workers=2)
+
+    # One extra connection swaps the staging tables in
+    assert len(connections) == 3
+    assert mock_swap.call_args.args[1] == ["aa_player_stats"]
+    for connection in connections:
+        connection.commit.assert_called_once()
+    # The staged table's load is recorded in the swap's transaction
+    assert [call.args[1] for call in mock_record.call_args_list] == [
+        "aa_team_stats"
+    ]
+    mock_swap.call_args.kwargs["before_commit"](connections[2])
+    mock_record.assert_called_with(
+        connections[2], "aa_player_stats", tables["aa_player_stats"]
+    )
+
+
+def test_load_tables_concurrently_records_load_versions(
+    mocker, loaders, tables
+):
+    _, connections = loaders
+    mock_versions = mocker.patch("src.load.load_tables.record_load_versions")
+    mock_partitions = mocker.patch(
+        "src.load.load_tables.record_loaded_partitions"
+    )
+
+    load_tables_concurrently(tables, max_workers=2)
+
+    # Each table's load is recorded on the connection that loaded it
+    recorded = {
+        call.args[1][0]: call.args[0]
+        for call in mock_versions.call_args_list
+    }
+    assert sorted(recorded) == ["aa_player_stats", "aa_team_stats"]
+    assert recorded["aa_player_stats"] is not recorded["aa_team_stats"]
+    for call in mock_partitions.call_args_list:
+        connection, data, table_name, _ = call.args
+        assert connection is recorded[table_name]
+        assert data is tables[table_name]
+
+
+def test_load_tables_concurrently_names_committed_tables(
+    mocker, loaders, tables
+):
+    _, connections = loaders
+
+    def get_connection(connection_details):
+        connections.append(MagicMock())
+        # The commit of the second table fails
+        if len(connections) == 2:
+            connections[-1].commit.side_effect = RuntimeError("lost")
+        return connections[-1]
+
+    mocker.patch(
+        "src.load.load_tables.get_pooled_connection",
+        side_effect=get_connection
+    )
+
+    with pytest.raises(
+        TableLoadError,
+        match=r"Commit of aa_team_stats failed: lost; committed "
+        r"\['aa_player_stats'\], rolled back \['aa_team_stats'\]"
+    ):
+        load_tables_concurrently(tables, max_workers=2)
+
+    connections[0].commit.assert_called_once()
+    for connection in connections:
+        connection.close.assert_called_once()
+
+
+def test_load_tables_concurrently_failure_records_no_versions(
+    mocker, loaders, tables
+):
+    table_loaders, _ = loaders
+    table_loaders["aa_team_stats"].side_effect = QueryExecutionError(
+        "COPY failed"
+    )
+    mock_record = mocker.patch("src.load.load_tables.record_load_versions")
+
+    with pytest.raises(TableLoadError):
+        load_tables_concurrently(tables, max_workers=2)
+
+    mock_record.assert_not_called()
+
+
+class FakeDatabase:
+    """
+    The tables and the transaction-scoped advisory locks of a database,
+    shared by the connections of a test.
+    """
+    def __init__(self, tables=()):
+        self.tables = set(tables)
+        self.locks = {}
+        self.guard = threading.Lock()
+
+
+class FakeConnection:
+    """
+    Connection to a FakeDatabase: created tables become visible to other
+    connections on commit, and advisory locks are held until the
+    transaction ends, as in PostgreSQL.
+    """
+    def __init__(self, database):
+        self.database = database
+        self.created = set()
+        self.held_locks = []
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        result = MagicMock()
+        result.all.return_value = []
+        if "to_regclass" in sql:
+            table_name = params["qualified_name"].split(".")[-1].strip('"')
+            result.scalar.return_value = (
+                table_name in self.database.tables | self.created
+            )
+        elif "pg_advisory_xact_lock" in sql:
+            with self.database.guard:
+                lock = self.database.locks.setdefault(
+                    params["lock_name"], threading.Lock()
+                )
+            if lock not in self.held_locks:
+                if not lock.acquire(timeout=WAIT_SECONDS):
+                    raise TimeoutError(
+                        f"Waited on the lock {params['lock_name']} held by "
+                        "an uncommitted transaction"
+                    )
+                self.held_locks.append(lock)
+        elif "CREATE TABLE" in sql:
+            self.created.add(re.search(r'\."(\w+)"', sql).group(1))
+        return result
+
+    def end_transaction(self):
+        for lock in self.held_locks:
+            lock.release()
+        self.held_locks = []
+
+    def commit(self):
+        self.database.tables |= self.created
+        self.created = set()
+        self.end_transaction()
+
+    def rollback(self):
+        self.created = set()
+        self.end_transaction()
+
+    def close(self):
+        self.rollback()
+
+
+@pytest.mark.parametrize("existing_tables", [
+    [],
+    [LOAD_VERSIONS_TABLE, LOADED_PARTITIONS_TABLE],
+])
+def test_load_tables_concurrently_workers_do_not_wait_on_each_other(
+    mocker, existing_tables
+):
+    database = FakeDatabase(existing_tables)
+    mocker.patch(
+        "src.load.load_tables.load_db_config",
+        return_value={"target_database": {"dbname": "test_db"}}
+    )
+    mocker.patch(
+        "src.load.load_tables.get_pooled_connection",
+        side_effect=lambda connection_details: FakeConnection(database)
+    )
+    # Both workers are inside their transactions at the same time
+    both_loading = threading.Barrier(2, timeout=WAIT_SECONDS)
+
+    def make_loader(table_name):
+        def load(data, connection):
+            get_changed_partitions(connection, data, table_name, "public")
+            both_loading.wait()
+            return False
+        return load
+
+    mocker.patch("src.load.load_tables.TABLE_LOADERS", {
+        table_name: make_loader(table_name)
+        for table_name in ["aa_player_stats", "aa_team_stats"]
+    })
+    tables = {
+        "aa_player_stats": pd.DataFrame({"year": [2017], "points": [1]}),
+        "aa_team_stats": pd.DataFrame({"year": [2017], "wins": [2]}),
+    }
+
+    timings = load_tables_concurrently(tables, max_workers=2)
+
+    assert set(timings) == set(tables)
+    assert {LOAD_VERSIONS_TABLE, LOADED_PARTITIONS_TABLE} <= database.tables
+
+
+def test_create_load_record_tables(mocker):
+    database = FakeDatabase()
+    connection = FakeConnection(database)
+    mocker.patch(
+        "src.load.load_tables.get_pooled_connection",
+        return_value=connection
+    )
+
+    create_load_record_tables({"dbname": "test_db"})
+
+    # Committed, so the loads find them and take no lock
+    assert database.tables == {LOAD_VERSIONS_TABLE, LOADED_PARTITIONS_TABLE}
+    assert connection.held_locks == []
+
+
+@pytest.mark.parametrize("table_name, cleared", [
+    ("aa_team_stats", True),
+    ("aa_player_info_and_salaries", False),
+])
+def test_record_table_rollback(mocker, table_name, cleared):
+    mocker.patch("src.load.load_tables.schema", "public")
+    mock_clear = mocker.patch("src.load.load_tables.clear_loaded_partitions")
+    mock_versions = mocker.patch("src.load.load_tables.record_load_versions")
+    connection = MagicMock()
+
+    record_table_rollback(table_name, connection)
+
+    # The loaded years of a partitioned table no longer match its rows
+    assert mock_clear.called == cleared
+    if cleared:
+        mock_clear.assert_called_once_with(connection, table_name, "public")
+    mock_versions.assert_called_once_with(connection, [table_name], "public")
+    connection.commit.assert_not_called()
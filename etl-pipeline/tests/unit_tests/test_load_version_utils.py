@@ -0,0 +1,51 @@
+from unittest.mock import Mock
+from src.utils.load_version_utils import (
+    LOAD_VERSIONS_TABLE,
+    record_load_versions
+)
+
+
+def test_record_load_versions():
+    connection = Mock()
+    # The versions table does not exist yet
+    connection.execute.return_value.scalar.return_value = False
+
+    record_load_versions(
+        connection, ["aa_player_stats", "aa_team_stats"], "public"
+    )
+
+    exists, lock, create, upsert = connection.execute.call_args_list
+    assert "to_regclass" in str(exists.args[0])
+    assert "pg_advisory_xact_lock" in str(lock.args[0])
+    assert lock.args[1] == {"lock_name": f"public.{LOAD_VERSIONS_TABLE}"}
+    assert (
+        f'CREATE TABLE IF NOT EXISTS "public"."{LOAD_VERSIONS_TABLE}"'
+        in str(create.args[0])
+    )
+    statement, params = upsert.args
+    assert f'"version" = "{LOAD_VERSIONS_TABLE}"."version" + 1' in str(
+        statement
+    )
+    assert params == [
+        {"table_name": "aa_player_stats"},
+        {"table_name": "aa_team_stats"},
+    ]
+
+
+def test_record_load_versions_existing_table_takes_no_lock():
+    connection = Mock()
+    connection.execute.return_value.scalar.return_value = True
+
+    record_load_versions(connection, ["aa_player_stats"], "public")
+
+    exists, upsert = connection.execute.call_args_list
+    assert "to_regclass" in str(exists.args[0])
+    assert "INSERT INTO" in str(upsert.args[0])
+
+
+def test_record_load_versions_nothing_loaded():
+    connection = Mock()
+
+    record_load_versions(connection, [], "public")
+
+    connection.execute.assert_not_called()
@@ -95,3 +95,14 @@ def test_log_extract_success_exceeds_expected_rate():
     mock_logger.warning.assert_called_once_with(
         "Execution time per row exceeds 0.01: 0.05 seconds"
     )
+
+
+def test_log_extract_success_logs_csv_engine():
+    mock_logger = MagicMock()
+
+    log_extract_success(
+        mock_logger, "test_data", (1000, 5), 1.0, 0.002, "pyarrow"
+    )
+
+    assert mock_logger.info.call_count == 5
+    mock_logger.info.assert_any_call("CSV engine: pyarrow")
@@ -0,0 +1,124 @@
+import os
+import pytest
+from src.utils.manifest_utils import (
+    check_stage,
+    empty_manifest,
+    fingerprint_code,
+    fingerprint_file,
+    fingerprint_files,
+    load_manifest,
+    record_stage,
+    save_manifest,
+    ManifestError
+)
+
+
+@pytest.fixture
+def raw_file(tmp_path):
+    file_path = tmp_path / "games.csv"
+    file_path.write_text("game_id,points\n1,100\n")
+    return str(file_path)
+
+
+def test_fingerprint_file_missing(tmp_path):
+    assert fingerprint_file(str(tmp_path / "missing.csv")) is None
+
+
+def test_fingerprint_file_reuses_hash_when_size_and_mtime_match(
+    mocker, raw_file
+):
+    previous = fingerprint_file(raw_file)
+    mock_hash = mocker.patch("src.utils.manifest_utils.hash_file")
+
+    assert fingerprint_file(raw_file, previous) == previous
+    mock_hash.assert_not_called()
+
+
+def test_fingerprint_file_rehashes_when_mtime_changes(raw_file):
+    previous = fingerprint_file(raw_file)
+    stat = os.stat(raw_file)
+    os.utime(raw_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    fingerprint = fingerprint_file(raw_file, previous)
+
+    assert fingerprint["mtime_ns"] != previous["mtime_ns"]
+    assert fingerprint["sha256"] == previous["sha256"]
+
+
+def test_save_and_load_manifest(tmp_path, raw_file):
+    manifest_path = str(tmp_path / "data" / "run_manifest.json")
+    manifest = empty_manifest()
+    fingerprint_files(manifest, [raw_file])
+
+    save_manifest(manifest, manifest_path)
+
+    assert load_manifest(manifest_path) == manifest
+
+
+def test_load_manifest_missing_or_corrupt(tmp_path):
+    manifest_path = tmp_path / "run_manifest.json"
+    assert load_manifest(str(manifest_path)) == empty_manifest()
+
+    manifest_path.write_text("{not json")
+    assert load_manifest(str(manifest_path)) == empty_manifest()
+
+
+def test_save_manifest_error(mocker, tmp_path):
+    mocker.patch("builtins.open", side_effect=OSError("Disk full"))
+
+    with pytest.raises(ManifestError, match="Disk full"):
+        save_manifest(empty_manifest(), str(tmp_path / "run_manifest.json"))
+
+
+def test_check_stage(tmp_path, raw_file):
+    output_path = tmp_path / "team_stats.csv"
+    output_path.write_text("year,team_name\n")
+    manifest = empty_manifest()
+    inputs = fingerprint_files(manifest, [raw_file])
+
+    assert check_stage(manifest, "transform", inputs) == (
+        False, "no previous run recorded"
+    )
+
+    record_stage(manifest, "transform", inputs, [str(output_path)], "key")
+
+    assert check_stage(manifest, "transform", inputs, "key")[0] is True
+    assert check_stage(manifest, "transform", inputs, "other") == (
+        False, "stage configuration changed"
+    )
+
+    output_path.write_text("year,team_name\n2017,LAL\n")
+    up_to_date, reason = check_stage(manifest, "transform", inputs, "key")
+    assert up_to_date is False
+    assert reason.startswith("outputs missing or modified")
+
+
+def test_check_stage_inputs_changed(raw_file):
+    manifest = empty_manifest()
+    record_stage(
+        manifest, "transform", fingerprint_files(manifest, [raw_file])
+    )
+
+    with open(raw_file, "a") as file:
+        file.write("2,90\n")
+    inputs = fingerprint_files(manifest, [raw_file])
+
+    assert check_stage(manifest, "transform", inputs) == (
+        False, f"inputs changed: {raw_file}"
+    )
+
+
+def test_fingerprint_code(tmp_path):
+    source = tmp_path / "src" / "transform"
+    source.mkdir(parents=True)
+    (source / "clean.py").write_text("VALUE = 1\n")
+    manifest = empty_manifest()
+
+    fingerprint = fingerprint_code(manifest, str(tmp_path), ["src"])
+    # Only Python files count
+    (source / "notes.txt").write_text("notes\n")
+    assert fingerprint_code(manifest, str(tmp_path), ["src"]) == fingerprint
+
+    (source / "clean.py").write_text("VALUE = 2\n")
+    os.utime(source / "clean.py", ns=(0, 0))
+    assert fingerprint_code(manifest, str(tmp_path), ["src"]) != fingerprint
@@ -0,0 +1,137 @@
+import pandas as pd
+from unittest.mock import MagicMock
+from src.utils.merge_load_utils import (
+    add_row_hash,
+    merge_table,
+    ROW_HASH_COLUMN
+)
+
+
+def sample_stats():
+    return pd.DataFrame({
+        "year": [2017, 2017, 2018],
+        "team_name": ["Atlanta Hawks", "Boston Celtics", "Atlanta Hawks"],
+        "wins": [43, 55, 24],
+    })
+
+
+def executed_sql(connection):
+    return [
+        str(call.args[0]) for call in connection.execute.call_args_list
+    ]
+
+
+def test_add_row_hash_changes_only_with_the_row():
+    data = sample_stats()
+    changed = data.assign(wins=[43, 55, 25])
+
+    hashes = add_row_hash(data)[ROW_HASH_COLUMN]
+    changed_hashes = add_row_hash(changed)[ROW_HASH_COLUMN]
+
+    assert hashes.dtype == "int64"
+    assert hashes.tolist()[:2] == changed_hashes.tolist()[:2]
+    assert hashes.iloc[2] != changed_hashes.iloc[2]
+    # Rehashing ignores a stale hash column
+    assert add_row_hash(add_row_hash(data)).equals(add_row_hash(data))
+
+
+def test_merge_table_creates_missing_table(mocker):
+    mocker.patch(
+        "src.utils.merge_load_utils.table_exists_in_schema",
+        return_value=False
+    )
+    mock_copy = mocker.patch(
+        "src.utils.merge_load_utils.copy_dataframe", return_value=3
+    )
+    connection = MagicMock()
+    # The declared primary key doubles as the merge's unique index
+    connection.execute.return_value.scalar.return_value = True
+
+    counts = merge_table(
+        connection,
+        sample_stats(),
+        "aa_team_stats",
+        "public",
+        ("year", "team_name"),
+        [("team_name",)]
+    )
+
+    assert counts == {
+        "inserted": 3, "updated": 0, "deleted": 0, "unchanged": 0
+    }
+    assert ROW_HASH_COLUMN in mock_copy.call_args.args[1].columns
+    statements = executed_sql(connection)
+    assert statements[1].startswith('CREATE TABLE "public"."aa_team_stats"')
+    assert statements[2].endswith('ADD COLUMN IF NOT EXISTS "row_hash" BIGINT')
+    assert "PRIMARY KEY" in statements[3]
+    assert not any("CREATE UNIQUE INDEX" in sql for sql in statements)
+
+
+def test_merge_table_adds_unique_index_without_primary_key(mocker):
+    mocker.patch(
+        "src.utils.merge_load_utils.table_exists_in_schema",
+        return_value=True
+    )
+    mocker.patch(
+        "src.utils.merge_load_utils.has_primary_key",
+        return_value=False
+    )
+    mocker.patch("src.utils.merge_load_utils.copy_dataframe")
+    connection = MagicMock()
+
+    merge_table(
+        connection,
+        sample_stats(),
+        "aa_team_stats",
+        "public",
+        ("year", "team_name")
+    )
+
+    assert executed_sql(connection)[1] == (
+        'CREATE UNIQUE INDEX IF NOT EXISTS "ux_aa_team_stats_year_team_name"'
+        ' ON "public"."aa_team_stats" ("year", "team_name")'
+    )
+
+
+def test_merge_table_upserts_changed_rows(mocker):
+    mocker.patch(
+        "src.utils.merge_load_utils.table_exists_in_schema",
+        return_value=True
+    )
+    mocker.patch(
+        "src.utils.merge_load_utils.has_primary_key",
+        return_value=True
+    )
+    mock_copy = mocker.patch("src.utils.merge_load_utils.copy_dataframe")
+    connection = MagicMock()
+    connection.execute.return_value.rowcount = 1
+    # One row inserted, one updated, one unchanged
+    connection.execute.return_value.scalars.return_value.all.return_value = [
+        True, False
+    ]
+
+    counts = merge_table(
+        connection,
+        sample_stats(),
+        "aa_team_stats",
+        "public",
+        ("year", "team_name")
+    )
+
+    assert counts == {
+        "inserted": 1, "updated": 1, "deleted": 1, "unchanged": 1
+    }
+    assert mock_copy.call_args.args[2:] == ("aa_team_stats_merge", "pg_temp")
+    statements = executed_sql(connection)
+    assert statements[0].endswith('ADD COLUMN IF NOT EXISTS "row_hash" BIGINT')
+    assert statements[1] == (
+        'CREATE TEMPORARY TABLE "aa_team_stats_merge" '
+        '(LIKE "public"."aa_team_stats") ON COMMIT DROP'
+    )
+    assert statements[2].startswith('DELETE FROM "public"."aa_team_stats"')
+    assert 'ON CONFLICT ("year", "team_name") DO UPDATE SET' in statements[3]
+    assert '"wins" = EXCLUDED."wins"' in statements[3]
+    assert (
+        'WHERE live."row_hash" IS DISTINCT FROM EXCLUDED."row_hash"'
+        in statements[3]
+    )
@@ -0,0 +1,42 @@
+import pandas as pd
+import pytest
+from src.transform.merge_playerinfo_salaries import merge_playerinfo_salaries
+
+
+# Sample dataframes for testing
+@pytest.fixture
+def sample_playerinfo():
+    return pd.DataFrame({
+        "player_name": ["LeBron James", "Tony Mitchell", "Tony Mitchell"],
+        "position": ["F", "F", "G"],
+        "height": ["6-8", "6-6", "6-4"],
+        "weight": [250.0, 235.0, 185.0],
+        "birth_date": ["1984-12-30", "1992-04-07", "1989-07-12"],
+        "weight_kg": [113.4, 106.6, 83.9],
+        "height_m": [2.03, 1.98, 1.93],
+    })
+
+
+@pytest.fixture
+def sample_salaries():
+    return pd.DataFrame({
+        "player_name": ["LeBron James", "Tony Mitchell"],
+        "season_start_year": [2013, 2013],
+        "salary": ["19067500", "788872"],
+        "inflation_adjusted_salary": ["21640000", "895000"],
+    })
+
+
+def test_merge_playerinfo_salaries_drops_ambiguous_namesakes(
+    sample_playerinfo, sample_salaries, tmp_path, monkeypatch
+):
+    # Write the artifacts to a temporary directory
+    monkeypatch.setenv("ARTIFACT_DIR", str(tmp_path))
+    monkeypatch.setenv("ARTIFACT_FORMAT", "csv")
+
+    df = merge_playerinfo_salaries(sample_playerinfo, sample_salaries)
+
+    # Neither namesake can be matched to the salary, so neither is kept
+    assert df["player_name"].tolist() == ["LeBron James"]
+    assert df["position"].tolist() == ["F"]
+    assert df["salary"].tolist() == ["19067500"]
@@ -0,0 +1,127 @@
+import pandas as pd
+import pytest
+from unittest.mock import Mock, patch
+from src.utils.partition_load_utils import (
+    LOADED_PARTITIONS_TABLE,
+    clear_loaded_partitions,
+    create_loaded_partitions_table,
+    get_changed_partitions,
+    record_loaded_partitions,
+    replace_partitions
+)
+from src.utils.partition_utils import hash_partitions
+
+
+def test_replace_partitions():
+    connection = Mock()
+    data = pd.DataFrame({"year": [2017, 2018, 2019], "wins": [1, 2, 3]})
+
+    with patch(
+        "src.utils.partition_load_utils.copy_dataframe"
+    ) as mock_copy:
+        replace_partitions(
+            connection, data, "aa_team_stats", "public", [2018, 2019]
+        )
+
+    statement, params = connection.execute.call_args.args
+    assert 'DELETE FROM "public"."aa_team_stats"' in str(statement)
+    assert params == {"partitions": [2018, 2019]}
+    rows = mock_copy.call_args.args[1]
+    assert rows["year"].tolist() == [2018, 2019]
+    assert mock_copy.call_args.args[2:] == ("aa_team_stats", "public")
+
+
+def test_replace_partitions_nothing_changed():
+    connection = Mock()
+    data = pd.DataFrame({"year": [2017], "wins": [1]})
+
+    with patch(
+        "src.utils.partition_load_utils.copy_dataframe"
+    ) as mock_copy:
+        replace_partitions(connection, data, "aa_team_stats", "public", [])
+
+    connection.execute.assert_not_called()
+    mock_copy.assert_not_called()
+
+
+def test_get_changed_partitions():
+    data = pd.DataFrame({"year": [2017, 2018, 2019], "wins": [1, 2, 3]})
+    hashes = hash_partitions(data)
+    connection = Mock()
+    # 2018 was loaded with other rows and 2016 no longer exists
+    connection.execute.return_value.all.return_value = [
+        (2016, "removed"),
+        (2017, hashes[2017]),
+        (2018, "stale"),
+        (2019, hashes[2019]),
+    ]
+
+    changed = get_changed_partitions(
+        connection, data, "aa_team_stats", "public"
+    )
+
+    assert changed == [2016, 2018]
+    statement, params = connection.execute.call_args.args
+    assert f'FROM "public"."{LOADED_PARTITIONS_TABLE}"' in str(statement)
+    assert params == {"table_name": "aa_team_stats"}
+
+
+def test_get_changed_partitions_nothing_recorded():
+    data = pd.DataFrame({"year": [2017], "wins": [1]})
+    connection = Mock()
+    connection.execute.return_value.all.return_value = []
+
+    assert get_changed_partitions(
+        connection, data, "aa_team_stats", "public"
+    ) is None
+
+
+def test_record_loaded_partitions():
+    data = pd.DataFrame({"year": [2017, 2018], "wins": [1, 2]})
+    hashes = hash_partitions(data)
+    connection = Mock()
+
+    record_loaded_partitions(connection, data, "aa_team_stats", "public")
+
+    delete, insert = connection.execute.call_args_list[-2:]
+    assert f'DELETE FROM "public"."{LOADED_PARTITIONS_TABLE}"' in str(
+        delete.args[0]
+    )
+    assert insert.args[1] == [
+        {
+            "table_name": "aa_team_stats",
+            "partition": year,
+            "partition_hash": hashes[year]
+        }
+        for year in [2017, 2018]
+    ]
+
+
+def test_clear_loaded_partitions():
+    connection = Mock()
+    connection.execute.return_value.scalar.return_value = True
+
+    clear_loaded_partitions(connection, "aa_team_stats", "public")
+
+    delete = connection.execute.call_args_list[-1]
+    assert f'DELETE FROM "public"."{LOADED_PARTITIONS_TABLE}"' in str(
+        delete.args[0]
+    )
+    assert delete.args[1] == {"table_name": "aa_team_stats"}
+
+
+@pytest.mark.parametrize("exists, statements", [
+    (False, ["to_regclass", "pg_advisory_xact_lock", "CREATE TABLE"]),
+    (True, ["to_regclass"]),
+])
+def test_create_loaded_partitions_table(exists, statements):
+    connection = Mock()
+    connection.execute.return_value.scalar.return_value = exists
+
+    create_loaded_partitions_table(connection, "public")
+
+    # The lock is only taken to create a missing table
+    executed = [str(call.args[0]) for call in connection.execute.call_args_list]
+    assert len(executed) == len(statements)
+    for sql, statement in zip(executed, statements):
+        assert statement in sql
@@ -0,0 +1,131 @@
+import pytest
+import pandas as pd
+from src.utils.partition_utils import (
+    aggregate_by_partition,
+    hash_partitions
+)
+
+
+@pytest.fixture
+def artifact_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("ARTIFACT_DIR", str(tmp_path))
+    monkeypatch.setenv("ARTIFACT_FORMAT", "csv")
+    return tmp_path
+
+
+@pytest.fixture
+def boxscores():
+    return pd.DataFrame({
+        "player_name": pd.Categorical(["b", "a", "b", "a", "c"]),
+        "year": pd.Series([2017, 2017, 2018, 2018, 2019], dtype="int32"),
+        "points": [10, 20, 30, 40, 50],
+    })
+
+
+def sum_points(data):
+    return (
+        data.groupby(["player_name", "year"], observed=True)["points"]
+        .sum()
+        .reset_index()
+    )
+
+
+def test_hash_partitions_only_changes_touched_partition(boxscores):
+    before = hash_partitions(boxscores)
+
+    changed = boxscores.copy()
+    changed.loc[2, "points"] = 31
+    after = hash_partitions(changed)
+
+    assert list(before) == [2017, 2018, 2019]
+    assert before[2017] == after[2017]
+    assert before[2018] != after[2018]
+    assert before[2019] == after[2019]
+
+
+def test_aggregate_by_partition_matches_full_aggregation(
+    artifact_dir, boxscores
+):
+    result = aggregate_by_partition(
+        boxscores, "player_points", sum_points, ["player_name", "year"]
+    )
+
+    pd.testing.assert_frame_equal(result, sum_points(boxscores))
+    assert (artifact_dir / "player_points_2018.csv").exists()
+    assert (artifact_dir / "player_points_partitions.json").exists()
+
+
+def test_aggregate_by_partition_reuses_unchanged_partitions(
+    mocker, artifact_dir, boxscores
+):
+    aggregate_by_partition(
+        boxscores, "player_points", sum_points, ["player_name", "year"]
+    )
+    changed = boxscores.copy()
+    changed.loc[2, "points"] = 31
+    aggregate = mocker.Mock(side_effect=sum_points)
+
+    result = aggregate_by_partition(
+        changed, "player_points", aggregate, ["player_name", "year"]
+    )
+
+    aggregate.assert_called_once()
+    assert aggregate.call_args.args[0]["year"].unique().tolist() == [2018]
+    pd.testing.assert_frame_equal(result, sum_points(changed))
+
+
+def test_aggregate_by_partition_drops_removed_partitions(
+    artifact_dir, boxscores
+):
+    aggregate_by_partition(
+        boxscores, "player_points", sum_points, ["player_name", "year"]
+    )
+
+    result = aggregate_by_partition(
+        boxscores[boxscores["year"] != 2019],
+        "player_points",
+        sum_points,
+        ["player_name", "year"]
+    )
+
+    assert result["year"].unique().tolist() == [2017, 2018]
+
+
+@pytest.mark.parametrize("env", [
+    {"ARTIFACT_FORMAT": "none"},
+    {"TRANSFORM_PARTITION_CACHE": "false"},
+])
+def test_aggregate_by_partition_without_cache(
+    mocker, monkeypatch, artifact_dir, boxscores, env
+):
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
+    aggregate = mocker.Mock(side_effect=sum_points)
+
+    aggregate_by_partition(
+        boxscores, "player_points", aggregate, ["player_name", "year"]
+    )
+    result = aggregate_by_partition(
+        boxscores, "player_points", aggregate, ["player_name", "year"]
+    )
+
+    assert aggregate.call_count == 6
+    pd.testing.assert_frame_equal(result, sum_points(boxscores))
+    assert not (artifact_dir / "player_points_partitions.json").exists()
+
+
+def test_aggregate_by_partition_force(mocker, artifact_dir, boxscores):
+    aggregate_by_partition(
+        boxscores, "player_points", sum_points, ["player_name", "year"]
+    )
+    aggregate = mocker.Mock(side_effect=sum_points)
+
+    aggregate_by_partition(
+        boxscores,
+        "player_points",
+        aggregate,
+        ["player_name", "year"],
+        force=True
+    )
+
+    assert aggregate.call_count == 3
@@ -0,0 +1,55 @@
+import os
+import pytest
+from config.pipeline_config import (
+    load_pipeline_config,
+    PipelineConfigError
+)
+
+
+def test_load_pipeline_config_defaults(mocker):
+    mocker.patch.dict(os.environ, {}, clear=True)
+
+    config = load_pipeline_config()
+
+    assert config['pipeline']['max_workers'] == 1
+    assert config['pipeline']['profiler'] == 'none'
+    assert config['pipeline']['report_dir'] is None
+
+
+def test_load_pipeline_config_max_workers(mocker):
+    mocker.patch.dict(os.environ, {'PIPELINE_MAX_WORKERS': '4'})
+
+    config = load_pipeline_config()
+
+    assert config['pipeline']['max_workers'] == 4
+
+
+@pytest.mark.parametrize("value", ["0", "-1", "many"])
+def test_load_pipeline_config_invalid_max_workers(mocker, value):
+    mocker.patch.dict(os.environ, {'PIPELINE_MAX_WORKERS': value})
+
+    with pytest.raises(PipelineConfigError, match="positive integer"):
+        load_pipeline_config()
+
+
+def test_load_pipeline_config_profiler(mocker):
+    mocker.patch.dict(os.environ, {'PIPELINE_PROFILER': 'cProfile'})
+
+    config = load_pipeline_config()
+
+    assert config['pipeline']['profiler'] == 'cprofile'
+
+
+def test_load_pipeline_config_invalid_profiler(mocker):
+    mocker.patch.dict(os.environ, {'PIPELINE_PROFILER': 'perf'})
+
+    with pytest.raises(PipelineConfigError, match="must be one of"):
+        load_pipeline_config()
+
+
+def test_load_pipeline_config_pyinstrument_not_installed(mocker):
+    mocker.patch.dict(os.environ, {'PIPELINE_PROFILER': 'pyinstrument'})
+    mocker.patch("config.pipeline_config.find_spec", return_value=None)
+
+    with pytest.raises(PipelineConfigError, match="pip install pyinstrument"):
+        load_pipeline_config()
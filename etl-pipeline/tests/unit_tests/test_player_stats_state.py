@@ -0,0 +1,182 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.transform.player_stats_state import (
+    PlayerStatsStateError,
+    build_player_stats_state,
+    combine_player_stats_states,
+    empty_player_stats_state,
+    finalize_player_stats_state
+)
+
+
+def make_boxscores(rows, seed=0):
+    rng = np.random.default_rng(seed)
+
+    def percentage(made, attempted):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = pd.Series(made / attempted * 100).round(2)
+        values[attempted == 0] = 0
+        return values
+
+    attempted = rng.integers(0, 15, (3, rows))
+    made = rng.integers(0, attempted + 1)
+    return pd.DataFrame({
+        "player_name": pd.Categorical(
+            rng.choice(["A", "B", "C", "D"], rows)
+        ),
+        "year": rng.choice([2017, 2018], rows).astype("int32"),
+        "points": rng.integers(0, 40, rows),
+        "assists": rng.integers(0, 12, rows),
+        "total_rebounds": rng.integers(0, 15, rows),
+        "field_goals_percentage": percentage(made[0], attempted[0]),
+        "three_point_percentage": percentage(made[1], attempted[1]),
+        "free_throws_percentage": percentage(made[2], attempted[2]),
+        "three_pointers": made[1],
+    })
+
+
+def calculate_with_mean(data):
+    # The per-column means the state replaces
+    return (
+        data.groupby(["player_name", "year"], observed=True)
+        .agg({
+            "points": "mean",
+            "assists": "mean",
+            "total_rebounds": "mean",
+            "field_goals_percentage": "mean",
+            "three_point_percentage": "mean",
+            "free_throws_percentage": "mean",
+            "three_pointers": "sum"
+        })
+        .round({
+            "points": 1,
+            "assists": 1,
+            "total_rebounds": 1,
+            "field_goals_percentage": 2,
+            "three_point_percentage": 2,
+            "free_throws_percentage": 2,
+        })
+        .reset_index()
+        .rename(columns={
+            "points": "points_per_game",
+            "assists": "assists_per_game",
+            "total_rebounds": "rebounds_per_game",
+            "field_goals_percentage": "field_goal_pct_per_game",
+            "three_point_percentage": "three_point_pct_per_game",
+            "free_throws_percentage": "free_throws_pct_per_game",
+            "three_pointers": "total_three_pointers"
+        })
+        .astype({"player_name": object})
+    )
+
+
+def make_tied_boxscores(rows, seed=0):
+    # Many players with two-decimal percentages, so some averages lie
+    # halfway between two hundredths and round by the last bits of the
+    # float sums
+    data = make_boxscores(rows, seed)
+    rng = np.random.default_rng(seed)
+    data["player_name"] = pd.Categorical(
+        rng.integers(0, 300, rows).astype(str)
+    )
+    data.loc[rng.random(rows) < 0.05, "three_point_percentage"] = np.nan
+    return data
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_finalize_matches_means(seed):
+    data = make_boxscores(200, seed)
+
+    result = finalize_player_stats_state(build_player_stats_state(data))
+
+    pd.testing.assert_frame_equal(result, calculate_with_mean(data))
+
+
+@pytest.mark.parametrize("shuffle", [False, True])
+def test_finalize_matches_means_on_ties(shuffle):
+    data = make_tied_boxscores(20000)
+    if shuffle:
+        data = data.sample(frac=1, random_state=0)
+
+    result = finalize_player_stats_state(build_player_stats_state(data))
+
+    pd.testing.assert_frame_equal(result, calculate_with_mean(data))
+
+
+def test_state_keeps_compensated_sums():
+    data = make_boxscores(3).assign(
+        player_name="A",
+        year=2017,
+        field_goals_percentage=[0.1, 0.2, 0.3]
+    )
+
+    state = build_player_stats_state(data)
+
+    # Plain float addition would give 0.6000000000000001
+    assert state["field_goals_percentage_sum"].tolist() == [0.6]
+    assert state["field_goals_percentage_compensation"].dtype == "float64"
+    assert state["field_goals_percentage_count"].tolist() == [3]
+    assert state["three_pointers_sum"].dtype == "int64"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 128])
+def test_folded_chunks_match_whole(chunk_size):
+    data = make_tied_boxscores(300)
+
+    state = empty_player_stats_state()
+    for start in range(0, len(data), chunk_size):
+        state = build_player_stats_state(
+            data.iloc[start:start + chunk_size], state
+        )
+
+    pd.testing.assert_frame_equal(state, build_player_stats_state(data))
+    pd.testing.assert_frame_equal(
+        finalize_player_stats_state(state),
+        calculate_with_mean(data)
+    )
+
+
+def test_combined_years_match_whole():
+    data = make_tied_boxscores(2000)
+
+    # Years are disjoint, so their states may be combined in any order
+    states = [
+        build_player_stats_state(data[data["year"] == year])
+        for year in [2018, 2017]
+    ]
+    combined = combine_player_stats_states(
+        [empty_player_stats_state()] + states
+    )
+
+    pd.testing.assert_frame_equal(
+        finalize_player_stats_state(combined),
+        calculate_with_mean(data)
+    )
+
+
+def test_combine_rejects_repeated_player_years():
+    data = make_boxscores(200)
+
+    with pytest.raises(PlayerStatsStateError, match="player years"):
+        combine_player_stats_states([
+            build_player_stats_state(data.iloc[:100]),
+            build_player_stats_state(data.iloc[100:])
+        ])
+
+
+def test_finalize_empty_state():
+    result = finalize_player_stats_state(empty_player_stats_state())
+
+    assert result.empty
+    assert list(result.columns) == [
+        "player_name",
+        "year",
+        "points_per_game",
+        "assists_per_game",
+        "rebounds_per_game",
+        "field_goal_pct_per_game",
+        "three_point_pct_per_game",
+        "free_throws_pct_per_game",
+        "total_three_pointers"
+    ]
@@ -0,0 +1,97 @@
+import json
+import pstats
+import pandas as pd
+import pytest
+from src.utils.profiling_utils import (
+    ProfileSettings,
+    ProfilingError,
+    format_metrics,
+    profile_call,
+    write_run_report
+)
+
+
+def concat_frames(left, right):
+    return pd.concat([left, right])
+
+
+@pytest.fixture
+def frames():
+    return [pd.DataFrame({"a": [1, 2]}), pd.DataFrame({"a": [3]})]
+
+
+def test_profile_call_measures(frames):
+    result, metrics = profile_call("concat", concat_frames, frames)
+
+    assert len(result) == 3
+    assert metrics["rows_in"] == 3
+    assert metrics["wall_seconds"] >= 0
+    assert metrics["cpu_seconds"] >= 0
+    assert metrics["peak_rss_delta_bytes"] >= 0
+    assert metrics["profile"] is None
+
+
+def test_profile_call_without_resource(mocker, frames):
+    mocker.patch("src.utils.profiling_utils.resource", None)
+
+    _, metrics = profile_call("concat", concat_frames, frames)
+
+    assert metrics["peak_rss_delta_bytes"] is None
+
+
+def test_profile_call_captures_cprofile(tmp_path, frames):
+    settings = ProfileSettings("cprofile", str(tmp_path / "profiles"))
+
+    result, metrics = profile_call("concat", concat_frames, frames, settings)
+
+    assert len(result) == 3
+    assert metrics["profile"] == str(tmp_path / "profiles" / "concat.prof")
+    stats = pstats.Stats(metrics["profile"])
+    assert any(
+        function == "concat_frames" for _, _, function in stats.stats
+    )
+
+
+def test_profile_call_raises_function_error(tmp_path):
+    settings = ProfileSettings("cprofile", str(tmp_path))
+
+    def fail():
+        raise ValueError("stage failed")
+
+    with pytest.raises(ValueError, match="stage failed"):
+        profile_call("fail", fail, [], settings)
+    # The profile of the failed call is kept
+    assert (tmp_path / "fail.prof").exists()
+
+
+def test_format_metrics():
+    description = format_metrics({
+        "cpu_seconds": 1.23456,
+        "rows_in": 10,
+        "rows_out": 4,
+        "peak_rss_delta_bytes": 3 * 2 ** 20,
+    })
+
+    assert description == (
+        "cpu 1.235 seconds, rows in 10, rows out 4, peak RSS +3.0 MiB"
+    )
+
+
+def test_write_run_report(tmp_path):
+    report = {"run_id": "20261018T000000Z", "stages": [{"stage": "a"}]}
+
+    report_path = write_run_report(report, str(tmp_path / "reports"))
+
+    assert report_path == str(
+        tmp_path / "reports" / "run_report_20261018T000000Z.json"
+    )
+    with open(report_path) as file:
+        assert json.load(file) == report
+
+
+def test_write_run_report_error(tmp_path):
+    blocker = tmp_path / "reports"
+    blocker.write_text("not a directory")
+
+    with pytest.raises(ProfilingError, match="Failed to write run report"):
+        write_run_report({"run_id": "1"}, str(blocker))
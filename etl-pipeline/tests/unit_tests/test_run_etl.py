@@ -0,0 +1,321 @@
+import json
+import pytest
+import pandas as pd
+from scripts.run_etl import main, parse_args
+from src.utils.artifact_utils import write_artifact
+
+
+def make_stage(output, value):
+    # A transform stage writing its artifact like the real ones do
+    def stage(data):
+        result = pd.DataFrame({"a": [value] * len(data)})
+        write_artifact(result, output)
+        return result
+    return stage
+
+
+@pytest.fixture
+def pipeline(mocker, tmp_path, monkeypatch):
+    raw_file = tmp_path / "games.csv"
+    raw_file.write_text("game_id\n1\n")
+    monkeypatch.setenv("ARTIFACT_DIR", str(tmp_path / "processed"))
+    monkeypatch.setenv("ARTIFACT_FORMAT", "csv")
+    monkeypatch.setenv(
+        "RUN_MANIFEST_PATH", str(tmp_path / "run_manifest.json")
+    )
+    monkeypatch.setenv("PIPELINE_REPORT_DIR", str(tmp_path / "reports"))
+    (tmp_path / "processed").mkdir()
+    mocker.patch("scripts.run_etl.setup_env")
+    mocker.patch("scripts.run_etl.get_pool_status")
+    mocker.patch(
+        "scripts.run_etl.SOURCE_FILES", {"games": str(raw_file)}
+    )
+    mocker.patch(
+        "scripts.run_etl.load_db_config",
+        return_value={"target_database": {
+            "dbname": "nba", "user": "user", "host": "localhost",
+            "port": "5432"
+        }}
+    )
+
+    extract = mocker.Mock(
+        side_effect=lambda: pd.read_csv(raw_file)
+    )
+    mocker.patch("scripts.run_etl.EXTRACTORS", {"games": extract})
+
+    # The cleaned games only depend on the number of games
+    clean = mocker.Mock(
+        side_effect=lambda games: make_stage("cleaned_games", 0)(
+            games.head(1)
+        )
+    )
+    stats = {
+        output: mocker.Mock(side_effect=make_stage(output, value))
+        for value, output in enumerate(
+            ["player_stats", "team_stats", "merged_playerinfo_salaries"],
+            start=4
+        )
+    }
+    transform_graph = {
+        "clean_games": {
+            "function": clean,
+            "inputs": ["games"],
+            "outputs": ["cleaned_games"],
+        },
+    }
+    for output, function in stats.items():
+        transform_graph[f"get_{output}"] = {
+            "function": function,
+            "inputs": ["cleaned_games"],
+            "outputs": [output],
+        }
+    mocker.patch(
+        "scripts.run_etl.build_transform_graph",
+        return_value=transform_graph
+    )
+
+    return {
+        "raw_file": raw_file,
+        "reports": tmp_path / "reports",
+        "extract": extract,
+        "clean": clean,
+        "team_stats": stats["team_stats"],
+        "logger": mocker.patch("scripts.run_etl.logger"),
+        "load": mocker.patch("scripts.run_etl.load_player_stats"),
+        "team": mocker.patch("scripts.run_etl.load_team_stats"),
+        "info": mocker.patch(
+            "scripts.run_etl.load_player_info_and_salaries"
+        ),
+    }
+
+
+def get_info_messages(pipeline):
+    return [call.args[0] for call in pipeline["logger"].info.call_args_list]
+
+
+def test_main_skips_unchanged_stages(mocker, pipeline):
+    mocker.patch("sys.argv", ["run_etl", "test"])
+    main()
+    main()
+
+    pipeline["extract"].assert_called_once()
+    pipeline["clean"].assert_called_once()
+    pipeline["load"].assert_called_once()
+    assert pipeline["load"].call_args.args[0]["a"].tolist() == [4]
+    info_messages = get_info_messages(pipeline)
+    assert any(
+        message.startswith("Skipping clean_games stage")
+        for message in info_messages
+    )
+    assert any(
+        message.startswith("Skipping load_team_stats stage")
+        for message in info_messages
+    )
+
+
+def test_main_reruns_when_raw_input_changes(mocker, pipeline):
+    mocker.patch("sys.argv", ["run_etl", "test"])
+    main()
+    pipeline["raw_file"].write_text("game_id\n1\n2\n")
+    main()
+
+    assert pipeline["extract"].call_count == 2
+    assert pipeline["clean"].call_count == 2
+    # The cleaned games are unchanged, so nothing after them reruns
+    pipeline["team_stats"].assert_called_once()
+    pipeline["load"].assert_called_once()
+
+
+def test_main_reads_back_skipped_stage_outputs(mocker, pipeline):
+    mocker.patch("sys.argv", ["run_etl", "test"])
+    main()
+    # Loading into another database reruns only the loads
+    mocker.patch(
+        "scripts.run_etl.load_db_config",
+        return_value={"target_database": {
+            "dbname": "nba_copy", "user": "user", "host": "localhost",
+            "port": "5432"
+        }}
+    )
+    main()
+
+    pipeline["clean"].assert_called_once()
+    pipeline["team_stats"].assert_called_once()
+    assert pipeline["team"].call_count == 2
+    assert pipeline["team"].call_args.args[0]["a"].tolist() == [5]
+
+
+def test_main_reruns_every_stage_when_code_changes(mocker, pipeline):
+    mocker.patch("sys.argv", ["run_etl", "test"])
+    mocker.patch("scripts.run_etl.fingerprint_code", return_value="v1")
+    main()
+    # A deploy changed the pipeline's code
+    mocker.patch("scripts.run_etl.fingerprint_code", return_value="v2")
+    main()
+
+    assert pipeline["clean"].call_count == 2
+    assert pipeline["team_stats"].call_count == 2
+    assert pipeline["team"].call_count == 2
+
+
+def test_main_reruns_loads_when_load_mode_changes(
+    mocker, monkeypatch, pipeline
+):
+    mocker.patch("sys.argv", ["run_etl", "test"])
+    main()
+    monkeypatch.setenv("LOAD_MODE", "swap")
+    main()
+
+    pipeline["clean"].assert_called_once()
+    assert pipeline["team"].call_count == 2
+
+
+def test_main_force_reruns_every_stage(mocker, pipeline):
+    mocker.patch("sys.argv", ["run_etl", "test"])
+    main()
+    mocker.patch("sys.argv", ["run_etl", "test", "--force"])
+    main()
+
+    assert pipeline["clean"].call_count == 2
+    assert pipeline["load"].call_count == 2
+    pipeline["logger"].info.assert_any_call(
+        "Running clean_games stage: --force given"
+    )
+
+
+def test_main_only_runs_upstream_stages(mocker, pipeline):
+    mocker.patch("sys.argv", ["run_etl", "test", "--only", "team_stats"])
+    frames = main()
+
+    pipeline["clean"].assert_called_once()
+    pipeline["team_stats"].assert_called_once()
+    pipeline["load"].assert_not_called()
+    pipeline["team"].assert_not_called()
+    # Only the frames asked for are returned
+    assert list(frames) == ["team_stats"]
+    assert frames["team_stats"]["a"].tolist() == [5]
+
+
+def test_main_resumes_after_a_failed_stage(mocker, pipeline):
+    mocker.patch("sys.argv", ["run_etl", "test"])
+    pipeline["team"].side_effect = RuntimeError("connection lost")
+    with pytest.raises(SystemExit):
+        main()
+    pipeline["team"].side_effect = None
+    main()
+
+    pipeline["clean"].assert_called_once()
+    pipeline["load"].assert_called_once()
+    assert pipeline["team"].call_count == 2
+
+
+def test_main_loads_tables_concurrently(mocker, monkeypatch, pipeline):
+    monkeypatch.setenv("LOAD_MAX_WORKERS", "3")
+    mock_load_tables = mocker.patch(
+        "scripts.run_etl.load_tables_concurrently"
+    )
+    mocker.patch("sys.argv", ["run_etl", "test"])
+    main()
+
+    pipeline["load"].assert_not_called()
+    tables, max_workers = mock_load_tables.call_args.args
+    assert list(tables) == [
+        "aa_player_stats",
+        "aa_team_stats",
+        "aa_player_info_and_salaries"
+    ]
+    assert tables["aa_team_stats"]["a"].tolist() == [5]
+    assert max_workers == 3
+
+
+def read_reports(pipeline):
+    reports = []
+    for report_path in sorted(pipeline["reports"].glob("run_report_*.json")):
+        with open(report_path) as file:
+            reports.append(json.load(file))
+    return reports
+
+
+def test_main_writes_run_report(mocker, pipeline):
+    mocker.patch("sys.argv", ["run_etl", "test"])
+    main()
+    main()
+
+    first, second = read_reports(pipeline)
+    assert first["status"] == "succeeded"
+    stages = {stage["stage"]: stage for stage in first["stages"]}
+    assert list(stages) == [
+        "extract_games",
+        "clean_games",
+        "get_player_stats",
+        "get_team_stats",
+        "get_merged_playerinfo_salaries",
+        "load_player_stats",
+        "load_team_stats",
+        "load_player_info_and_salaries",
+    ]
+    assert stages["clean_games"]["status"] == "ran"
+    assert stages["clean_games"]["rows_in"] == 1
+    assert stages["clean_games"]["rows_out"] == 1
+    assert stages["clean_games"]["bytes_written"] == len("a\n0\n")
+    assert stages["load_team_stats"]["bytes_written"] == 0
+    assert stages["clean_games"]["cpu_seconds"] >= 0
+    # Nothing changed, so the second run only skips stages
+    assert {stage["status"] for stage in second["stages"]} == {
+        "skipped", "not run"
+    }
+
+
+def test_main_writes_report_of_failed_run(mocker, pipeline):
+    mocker.patch("sys.argv", ["run_etl", "test"])
+    pipeline["team"].side_effect = RuntimeError("connection lost")
+    with pytest.raises(SystemExit):
+        main()
+
+    report, = read_reports(pipeline)
+    assert report["status"] == "failed"
+    assert report["error"] == "connection lost"
+    statuses = {stage["stage"]: stage["status"] for stage in report["stages"]}
+    assert statuses["load_player_stats"] == "ran"
+    assert statuses["load_team_stats"] == "not run"
+
+
+def test_main_captures_stage_profiles(mocker, monkeypatch, pipeline):
+    monkeypatch.setenv("PIPELINE_PROFILER", "cprofile")
+    mocker.patch("sys.argv", ["run_etl", "test", "--only", "cleaned_games"])
+    main()
+
+    report, = read_reports(pipeline)
+    profile_dir = pipeline["reports"] / "profiles" / report["run_id"]
+    assert sorted(path.name for path in profile_dir.iterdir()) == [
+        "clean_games.prof", "extract_games.prof"
+    ]
+
+
+def test_parse_args():
+    force, only, argv = parse_args(
+        ["run_etl", "test", "--only", "team_stats,player_stats", "--force"]
+    )
+
+    assert force is True
+    assert only == ["team_stats", "player_stats"]
+    assert argv == ["run_etl", "test"]
+
+
+def test_parse_args_only_needs_a_name():
+    with pytest.raises(ValueError, match="needs a stage or frame name"):
+        parse_args(["run_etl", "test", "--only"])
+
+
+def test_main_logs_pool_status_of_each_load(mocker, pipeline):
+    mock_pool_status = mocker.patch(
+        "scripts.run_etl.get_pool_status", return_value={"size": 5}
+    )
+    mocker.patch("sys.argv", ["run_etl", "test"])
+    main()
+
+    # Logged by the process that ran each load stage
+    assert mock_pool_status.call_count == 3
+    pipeline["logger"].info.assert_any_call(
+        "Database pool status: {'size': 5}"
+    )
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+from multiprocessing import shared_memory
+from src.utils.shared_frame_utils import (
+    read_shared_frame,
+    unlink_shared_frame,
+    write_shared_frame
+)
+
+
+def test_shared_frame_round_trip_keeps_dtypes_index_and_attrs():
+    data = pd.DataFrame({
+        "team_name": pd.Categorical(["LAL", "BOS", "LAL"]),
+        "year": np.array([2017, 2017, 2018], dtype="int32"),
+        "win_pct": [50.0, np.nan, 25.5],
+        "player_name": ["A", None, "C"],
+        "date_time": pd.to_datetime(["2017-01-01"] * 3),
+    }, index=[3, 5, 8])
+    data.attrs["changed_partitions"] = [2017, 2018]
+
+    frame = write_shared_frame(data)
+    try:
+        result = read_shared_frame(frame)
+        # The block stays readable until it is unlinked
+        again = read_shared_frame(frame)
+    finally:
+        unlink_shared_frame(frame)
+
+    pd.testing.assert_frame_equal(result, data)
+    pd.testing.assert_frame_equal(again, data)
+    assert result.attrs == {"changed_partitions": [2017, 2018]}
+
+
+def test_read_shared_frame_is_writable():
+    frame = write_shared_frame(pd.DataFrame({"points": range(5)}))
+    try:
+        result = read_shared_frame(frame)
+    finally:
+        unlink_shared_frame(frame)
+
+    result.loc[result["points"] > 2, "points"] = 0
+
+    assert result["points"].tolist() == [0, 1, 2, 0, 0]
+
+
+def test_unlink_shared_frame_frees_the_block():
+    frame = write_shared_frame(pd.DataFrame({"a": [1]}))
+
+    unlink_shared_frame(frame)
+    # Unlinking twice is harmless
+    unlink_shared_frame(frame)
+
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=frame.name)
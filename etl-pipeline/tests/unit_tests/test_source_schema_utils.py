@@ -0,0 +1,41 @@
+import pytest
+from src.utils.source_schema_utils import (
+    SOURCE_SCHEMAS,
+    SourceSchemaError,
+    get_source_schema,
+    get_read_csv_kwargs
+)
+
+
+def test_get_source_schema_unknown_source():
+    with pytest.raises(
+        SourceSchemaError,
+        match="No schema registered for source: unknown"
+    ):
+        get_source_schema("unknown")
+
+
+def test_get_read_csv_kwargs_boxscores_prunes_columns():
+    kwargs = get_read_csv_kwargs("boxscores")
+
+    for column in ["ORB", "DRB", "STL", "BLK", "TOV", "PF", "+/-"]:
+        assert column not in kwargs["usecols"]
+    assert kwargs["dtype"]["teamName"] == "category"
+    assert kwargs["dtype"]["playerName"] == "category"
+    assert kwargs["dtype"]["game_id"] == "int32"
+    assert "parse_dates" not in kwargs
+
+
+def test_get_read_csv_kwargs_games_parses_dates():
+    kwargs = get_read_csv_kwargs("games")
+
+    assert kwargs["parse_dates"] == ["datetime"]
+    assert "attendance" not in kwargs["usecols"]
+
+
+def test_get_read_csv_kwargs_does_not_mutate_registry():
+    kwargs = get_read_csv_kwargs("boxscores")
+    kwargs["dtype"]["extra"] = "int8"
+
+    assert "extra" not in SOURCE_SCHEMAS["boxscores"]["dtype"]
+    assert "teamName" not in SOURCE_SCHEMAS["boxscores"]["dtype"]
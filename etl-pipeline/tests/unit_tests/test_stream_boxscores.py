@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.transform.clean_boxscores import clean_boxscores
+from src.transform.player_stats_state import (
+    build_player_stats_state,
+    finalize_player_stats_state
+)
+from src.transform.stream_boxscores import stream_boxscore_stats
+from src.transform.transform_merged_boxscores_games import (
+    calculate_player_stats,
+    get_team_stats_from_games
+)
+from src.utils.csv_reader_utils import read_source_csv
+
+STAT_COLUMNS = ["FG", "FGA", "3P", "3PA", "FT", "FTA", "TRB", "AST", "PTS"]
+
+
+@pytest.fixture
+def no_artifacts(monkeypatch):
+    monkeypatch.setenv("ARTIFACT_FORMAT", "none")
+
+
+@pytest.fixture
+def cleaned_games():
+    return pd.DataFrame({
+        "game_id": [1, 2, 3, 4],
+        "home_team": ["LAL", "BOS", "LAL", "MIA"],
+        "away_team": ["BOS", "LAL", "MIA", "BOS"],
+        "points_home": [100, 95, 90, 101],
+        "points_away": [90, 99, 90, 99],
+        "year": pd.Series([2017, 2017, 2018, 2018], dtype="int32"),
+    })
+
+
+@pytest.fixture
+def boxscores_file(tmp_path):
+    # Game 5 has no matching game and some players did not play
+    rng = np.random.default_rng(0)
+    rows = []
+    for game_id, teams in [(1, ["LAL", "BOS"]), (2, ["BOS", "LAL"]),
+                           (3, ["LAL", "MIA"]), (4, ["MIA", "BOS"]),
+                           (5, ["GSW", "LAL"])]:
+        for team in teams:
+            for player in range(3):
+                row = {
+                    "game_id": game_id,
+                    "teamName": team,
+                    "playerName": f"{team} Player {player}",
+                    "MP": "20:00",
+                    "isStarter": int(player == 0),
+                }
+                attempts = rng.integers(0, 12, 3)
+                for made, attempted, value in zip(
+                    ["FG", "3P", "FT"], ["FGA", "3PA", "FTA"], attempts
+                ):
+                    row[attempted] = int(value)
+                    row[made] = int(rng.integers(0, value + 1))
+                row["TRB"] = int(rng.integers(0, 12))
+                row["AST"] = int(rng.integers(0, 10))
+                row["PTS"] = 2 * row["FG"] + row["3P"] + row["FT"]
+                if player == 2 and game_id % 2:
+                    row.update(dict.fromkeys(STAT_COLUMNS, "Did Not Play"))
+                    row["MP"] = "Did Not Play"
+                rows.append(row)
+
+    file_path = tmp_path / "boxscore.csv"
+    pd.DataFrame(rows).to_csv(file_path, index=False)
+    return str(file_path)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_stream_boxscore_stats_matches_batch_path(
+    no_artifacts, cleaned_games, boxscores_file, chunk_size
+):
+    boxscores = clean_boxscores(read_source_csv(boxscores_file, "boxscores"))
+    merged = pd.merge(boxscores, cleaned_games, on="game_id", how="inner")
+    expected_player_stats = finalize_player_stats_state(
+        build_player_stats_state(merged)
+    )
+    expected_team_stats = get_team_stats_from_games(cleaned_games, boxscores)
+
+    player_stats, team_stats = stream_boxscore_stats(
+        cleaned_games, boxscores_file, chunk_size
+    )
+
+    pd.testing.assert_frame_equal(
+        player_stats,
+        expected_player_stats,
+        check_categorical=False,
+        check_dtype=False
+    )
+    pd.testing.assert_frame_equal(
+        player_stats,
+        calculate_player_stats(merged),
+        check_categorical=False,
+        check_dtype=False
+    )
+    pd.testing.assert_frame_equal(
+        team_stats,
+        expected_team_stats,
+        check_categorical=False,
+        check_dtype=False
+    )
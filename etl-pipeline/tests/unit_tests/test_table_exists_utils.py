@@ -37,3 +37,18 @@ def test_log_table_action_table_does_not_exist():
     mock_logger.info.assert_called_once_with(
         "Creating new test_table table..."
     )
+
+
+def test_log_table_action_swap_mode():
+    mock_connection = Mock()
+    mock_connection.execute.return_value.scalar.return_value = True
+
+    with patch(
+        'src.utils.table_exists_utils.logger'
+    ) as mock_logger:
+        result = log_table_action(mock_connection, "test_table", "swap")
+
+    assert result is True
+    mock_logger.info.assert_called_once_with(
+        "Swapping a staging table in for test_table table..."
+    )
@@ -0,0 +1,73 @@
+import pytest
+import pandas as pd
+from src.utils.table_schema_utils import (
+    check_key,
+    conform_to_table_schema,
+    get_table_schema,
+    TableSchemaError
+)
+
+
+def test_get_table_schema():
+    table_schema = get_table_schema("aa_player_stats")
+
+    assert table_schema["columns"]["year"] == "SMALLINT"
+    assert table_schema["primary_key"] == ("player_name", "year")
+
+
+def test_get_table_schema_unknown_table():
+    with pytest.raises(TableSchemaError, match="aa_unknown"):
+        get_table_schema("aa_unknown")
+
+
+def test_check_key():
+    data = pd.DataFrame({
+        "year": [2017, 2018],
+        "team_name": ["Atlanta Hawks", "Atlanta Hawks"],
+    })
+
+    check_key(data, "aa_team_stats", ["year", "team_name"])
+
+
+@pytest.mark.parametrize("years, message", [
+    ([2017, 2017, 2018], "0 rows have a missing and 2 rows a duplicate"),
+    ([2017, None, 2018], "1 rows have a missing and 0 rows a duplicate"),
+])
+def test_check_key_rejects_violations(years, message):
+    data = pd.DataFrame({
+        "year": years,
+        "team_name": ["Atlanta Hawks"] * 3,
+        "total_wins": [40, 43, 55],
+    })
+
+    with pytest.raises(TableSchemaError, match=message):
+        check_key(data, "aa_team_stats", ["year", "team_name"])
+
+
+def test_conform_to_table_schema_keeps_attrs():
+    data = pd.DataFrame({
+        "player_name": ["LeBron James", "Stephen Curry"],
+        "year": [2017, 2017],
+        "total_three_pointers": [120.0, None],
+    })
+    data.attrs["changed_partitions"] = [2017]
+
+    rows = conform_to_table_schema(
+        data, "aa_player_stats", get_table_schema("aa_player_stats")
+    )
+
+    assert rows["total_three_pointers"].tolist() == [120, pd.NA]
+    assert rows.attrs["changed_partitions"] == [2017]
+
+
+def test_conform_to_table_schema_rejects_fractions():
+    data = pd.DataFrame({
+        "player_name": ["LeBron James"],
+        "year": [2017],
+        "total_three_pointers": [120.5],
+    })
+
+    with pytest.raises(TableSchemaError, match="fractional"):
+        conform_to_table_schema(
+            data, "aa_player_stats", get_table_schema("aa_player_stats")
+        )
@@ -42,7 +42,7 @@ def test_main_handles_transformation_error(
 ):
     """Test ETL Pipeline handles transformation errors"""
     mocker.patch(
-        "scripts.run_etl.transform_data",
+        "scripts.run_etl.build_transform_graph",
         side_effect=Exception("Transformation failed")
     )
 
@@ -0,0 +1,57 @@
+import os
+import pytest
+from config.transform_config import (
+    load_transform_config,
+    TransformConfigError
+)
+
+
+def test_load_transform_config_defaults(mocker):
+    mocker.patch.dict(os.environ, {}, clear=True)
+
+    config = load_transform_config()
+
+    assert config['transform']['team_stats_parity_check'] is False
+    assert config['transform']['partition_cache'] is True
+    assert config['transform']['streaming'] is False
+    assert config['transform']['max_workers'] == 1
+
+
+@pytest.mark.parametrize("value,expected", [
+    ("true", True),
+    ("1", True),
+    ("No", False),
+])
+def test_load_transform_config_parity_check(mocker, value, expected):
+    mocker.patch.dict(
+        os.environ, {'TRANSFORM_TEAM_STATS_PARITY_CHECK': value}
+    )
+
+    config = load_transform_config()
+
+    assert config['transform']['team_stats_parity_check'] is expected
+
+
+def test_load_transform_config_invalid_boolean(mocker):
+    mocker.patch.dict(
+        os.environ, {'TRANSFORM_TEAM_STATS_PARITY_CHECK': 'maybe'}
+    )
+
+    with pytest.raises(TransformConfigError, match="must be one of"):
+        load_transform_config()
+
+
+def test_load_transform_config_streaming(mocker):
+    mocker.patch.dict(os.environ, {'TRANSFORM_STREAMING': 'true'})
+
+    config = load_transform_config()
+
+    assert config['transform']['streaming'] is True
+
+
+@pytest.mark.parametrize("value", ["0", "two"])
+def test_load_transform_config_invalid_max_workers(mocker, value):
+    mocker.patch.dict(os.environ, {'TRANSFORM_MAX_WORKERS': value})
+
+    with pytest.raises(TransformConfigError, match="positive integer"):
+        load_transform_config()
@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.transform.transform_merged_boxscores_games import (
+    COLUMNS_TO_DROP,
+    add_won_game_column,
+    determine_winner,
+    get_team_stats_from_games,
+    get_team_wins_from_merged,
+    summarise_team_stats,
+    TeamStatsParityError
+)
+
+
+def make_games(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    teams = np.array(["LAL", "BOS", "MIA", "GSW"])
+    return pd.DataFrame({
+        "team_name": rng.choice(teams, rows),
+        "home_team": rng.choice(teams[:2], rows),
+        "away_team": rng.choice(teams[1:3], rows),
+        "points_home": rng.integers(90, 100, rows),
+        "points_away": rng.integers(90, 100, rows),
+    })
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_add_won_game_column_matches_determine_winner(seed):
+    data = make_games(500, seed)
+    expected = data.apply(determine_winner, axis=1)
+
+    result = add_won_game_column(data.copy())["won_game"]
+
+    pd.testing.assert_series_equal(result, expected, check_names=False)
+
+
+def test_add_won_game_column_categorical_team_names():
+    data = make_games(200)
+    expected = data.apply(determine_winner, axis=1)
+    data["team_name"] = data["team_name"].astype("category")
+
+    result = add_won_game_column(data)["won_game"]
+
+    pd.testing.assert_series_equal(result, expected, check_names=False)
+
+
+def test_add_won_game_column_team_not_found_is_nan():
+    data = pd.DataFrame({
+        "team_name": ["LAL", "BOS", "MIA", "LAL"],
+        "home_team": ["LAL", "LAL", "LAL", "BOS"],
+        "away_team": ["BOS", "BOS", "BOS", "LAL"],
+        "points_home": [100, 100, 100, 90],
+        "points_away": [90, 90, 90, 90],
+    })
+
+    result = add_won_game_column(data)["won_game"]
+
+    assert result.iloc[:2].tolist() == [1, 0]
+    assert np.isnan(result.iloc[2])
+    # A tie is a loss for both teams
+    assert result.iloc[3] == 0
+
+
+def test_add_won_game_column_all_found_is_integer():
+    data = pd.DataFrame({
+        "team_name": ["LAL", "BOS"],
+        "home_team": ["LAL", "LAL"],
+        "away_team": ["BOS", "BOS"],
+        "points_home": [100, 100],
+        "points_away": [90, 90],
+    })
+
+    result = add_won_game_column(data)["won_game"]
+
+    assert result.dtype == "int64"
+    assert result.tolist() == [1, 0]
+
+
+@pytest.fixture
+def cleaned_games():
+    return pd.DataFrame({
+        "game_id": [1, 2, 3, 4],
+        "home_team": ["LAL", "BOS", "LAL", "MIA"],
+        "away_team": ["BOS", "LAL", "MIA", "BOS"],
+        "points_home": [100, 95, 90, 101],
+        "points_away": [90, 99, 90, 99],
+        "date_time": pd.to_datetime(
+            ["2017-01-01", "2017-02-01", "2018-01-01", "2018-02-01"]
+        ),
+        "year": [2017, 2017, 2018, 2018],
+    })
+
+
+@pytest.fixture
+def cleaned_boxscores():
+    # Game 4 lists a player for a team that did not play in it and
+    # game 5 has no matching game
+    boxscores = pd.DataFrame({
+        "game_id": [1, 1, 1, 2, 2, 3, 3, 4, 4, 5],
+        "team_name": pd.Categorical(
+            ["LAL", "LAL", "BOS", "BOS", "LAL", "LAL", "MIA", "MIA", "GSW",
+             "GSW"]
+        ),
+    })
+    for column in COLUMNS_TO_DROP:
+        boxscores[column] = range(len(boxscores))
+    return boxscores
+
+
+@pytest.fixture
+def no_artifacts(monkeypatch):
+    monkeypatch.setenv("ARTIFACT_FORMAT", "none")
+
+
+def test_get_team_stats_from_games_matches_merged_path(
+    no_artifacts, cleaned_games, cleaned_boxscores
+):
+    merged = pd.merge(
+        cleaned_boxscores, cleaned_games, on="game_id", how="inner"
+    )
+    expected = summarise_team_stats(get_team_wins_from_merged(merged))
+
+    result = get_team_stats_from_games(cleaned_games, cleaned_boxscores)
+
+    pd.testing.assert_frame_equal(result, expected)
+    gsw = result[result["team_name"] == "GSW"].iloc[0]
+    assert gsw["total_games"] == 0
+
+
+def test_get_team_stats_from_games_all_teams_found(
+    no_artifacts, cleaned_games, cleaned_boxscores
+):
+    boxscores = cleaned_boxscores[cleaned_boxscores["team_name"] != "GSW"]
+
+    result = get_team_stats_from_games(cleaned_games, boxscores)
+
+    assert result["total_wins"].dtype == "int64"
+    assert result.set_index(["year", "team_name"])["total_wins"].to_dict() \
+        == {
+            (2017, "BOS"): 0,
+            (2017, "LAL"): 2,
+            (2018, "LAL"): 0,
+            (2018, "MIA"): 1,
+        }
+
+
+def test_get_team_stats_from_games_parity_check_passes(
+    no_artifacts, monkeypatch, cleaned_games, cleaned_boxscores
+):
+    monkeypatch.setenv("TRANSFORM_TEAM_STATS_PARITY_CHECK", "true")
+
+    get_team_stats_from_games(cleaned_games, cleaned_boxscores)
+
+
+def test_get_team_stats_from_games_parity_check_fails(
+    no_artifacts, monkeypatch, mocker, cleaned_games, cleaned_boxscores
+):
+    monkeypatch.setenv("TRANSFORM_TEAM_STATS_PARITY_CHECK", "true")
+    mocker.patch(
+        "src.transform.transform_merged_boxscores_games.add_won_game_column",
+        side_effect=lambda data: data.assign(won_game=1)
+    )
+
+    with pytest.raises(TeamStatsParityError):
+        get_team_stats_from_games(cleaned_games, cleaned_boxscores)
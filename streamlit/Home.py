@@ -1,14 +1,20 @@
 import streamlit as st
 import pandas as pd
 from pathlib import Path
-from sqlalchemy import create_engine
-from utils.load_sql_query_utils import load_table
+from utils.database_utils import get_engine
+from utils.load_sql_query_utils import (
+    add_refresh_button,
+    load_lookup,
+    load_options,
+    load_table
+)
 import plotly.express as px
 import seaborn as sns
 import matplotlib.pyplot as plt
 
 
-FILE_NAME = "team_stats.sql"
+WIN_PCTS_FILE_NAME = "team_win_pcts.sql"
+BY_YEAR_FILE_NAME = "team_stats_by_year.sql"
 # Set the page title and layout size
 st.set_page_config(
     page_title="HoopMetrics",
@@ -31,20 +37,17 @@ st.markdown(
 )
 
 
-# Load database credentials from secrets.toml
-db_config = st.secrets["database"]
+# The engine and its connection pool are shared by every rerun and page
+engine = get_engine()
 
-engine = create_engine(
-    f"postgresql+psycopg2://{db_config['SOURCE_DB_USER']}:"
-    f"{db_config['SOURCE_DB_PASSWORD']}@"
-    f"{db_config['SOURCE_DB_HOST']}:"
-    f"{db_config['SOURCE_DB_PORT']}/{db_config['SOURCE_DB_NAME']}"
-)
+# Drop the cached tables on request, before they are read below
+add_refresh_button()
 
-team_stats_df = load_table(FILE_NAME, engine)
+# Win percentage of every team in every year, for the heatmap
+team_win_pcts_df = load_table(WIN_PCTS_FILE_NAME, engine)
 
 # Get the years
-years = sorted(team_stats_df["year"].unique())
+years = load_options(WIN_PCTS_FILE_NAME, engine, "year")
 
 st.markdown(
     "<h3 style='font-size:32px; color:#60b4ff;'>"
@@ -59,46 +62,44 @@ selected_year = st.selectbox(
     help="Choose a year (stats shown are for the calendar year not season)"
 )
 
-# Filter teams based on selected year
-teams_for_year = team_stats_df.loc[
-    team_stats_df["year"] == selected_year, "team_name"
-].unique()
+# Only fetch the stats of the selected year, indexed by team in the
+# sorted order of the dropdown
+team_stats_by_team = load_lookup(
+    BY_YEAR_FILE_NAME, engine, "team_name", {"year": selected_year}
+)
 
 # Add dropdown for team selection
 selected_team = st.selectbox(
     label="Select a :blue[Team]:",
-    options=sorted(teams_for_year),
+    options=list(team_stats_by_team),
     help="Choose a team",
     index=9  # Default is Golden State Warriors :)
 )
 
 st.markdown("<div style='margin-top: 30px;'></div>", unsafe_allow_html=True)
 
-# Filter the final DataFrame
-filtered_team_stats_df = team_stats_df[
-    (team_stats_df["year"] == selected_year)
-    & (team_stats_df["team_name"] == selected_team)
-]
+# Look up the selected team
+filtered_team_stats = team_stats_by_team[selected_team]
 
 # Display metrics in columns
 column_1, column_2, column_3 = st.columns([1, 1, 1])
 with column_1:
     st.metric(
         label=":blue[Total Wins]",
-        value=filtered_team_stats_df["total_wins"],
+        value=filtered_team_stats["total_wins"],
         border=True,
         help="Total number of wins in the year"
     )
     st.metric(
         label=":blue[Total Losses]",
-        value=filtered_team_stats_df["total_losses"],
+        value=filtered_team_stats["total_losses"],
         border=True,
         help="Total number of losses in the year"
     )
 with column_2:
     # Pie Chart for wins vs losses
-    wins = filtered_team_stats_df["total_wins"].values[0]
-    losses = filtered_team_stats_df["total_losses"].values[0]
+    wins = filtered_team_stats["total_wins"]
+    losses = filtered_team_stats["total_losses"]
     pie_chart_df = pd.DataFrame({
         "Result": ["Win", "Loss"],
         "Count": [wins, losses]
@@ -116,13 +117,13 @@ with column_2:
 with column_3:
     st.metric(
         label=":blue[Total Games]",
-        value=filtered_team_stats_df["total_games"],
+        value=filtered_team_stats["total_games"],
         border=True,
         help="Total number of games"
     )
     st.metric(
         label=":blue[Win Percentage (%)]",
-        value=filtered_team_stats_df["win_pct"],
+        value=filtered_team_stats["win_pct"],
         border=True,
         help="Win percentage for games in the year"
     )
@@ -138,7 +139,7 @@ st.markdown(
 )
 
 # Create a pivot DataFrame to use for the visualisation.
-pivot_df = team_stats_df.pivot(
+pivot_df = team_win_pcts_df.pivot(
     index="team_name",  # Y axis
     columns="year",  # X axis
     values="win_pct"  # Cell values
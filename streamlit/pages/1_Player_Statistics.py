@@ -1,11 +1,21 @@
-import streamlit as st
 import pandas as pd
-from sqlalchemy import create_engine
-from utils.load_sql_query_utils import load_table
+import streamlit as st
+from utils.database_utils import get_engine
+from utils.load_sql_query_utils import (
+    add_refresh_button,
+    load_lookup,
+    load_options,
+    load_table
+)
 import plotly.express as px
 
 
-FILE_NAME = "player_stats.sql"
+PLAYERS_FILE_NAME = "player_stats_players.sql"
+BY_PLAYER_FILE_NAME = "player_stats_by_player.sql"
+TOP_THREE_POINTERS_FILE_NAME = "top_three_pointers.sql"
+TOP_POINTS_PER_GAME_FILE_NAME = "top_points_per_game.sql"
+# Number of players in the top charts
+TOP_N = 10
 # Set the page title and layout size
 st.set_page_config(
     page_title="Player Stats",
@@ -15,49 +25,58 @@ st.set_page_config(
 
 st.title(":blue[Player Statistics] ⛹️")
 
-# Load database credentials from secrets.toml
-db_config = st.secrets["database"]
+# The engine and its connection pool are shared by every rerun and page
+engine = get_engine()
 
-engine = create_engine(
-    f"postgresql+psycopg2://{db_config['SOURCE_DB_USER']}:"
-    f"{db_config['SOURCE_DB_PASSWORD']}@"
-    f"{db_config['SOURCE_DB_HOST']}:"
-    f"{db_config['SOURCE_DB_PORT']}/{db_config['SOURCE_DB_NAME']}"
-)
-
-player_stats_df = load_table(FILE_NAME, engine)
+# Drop the cached tables on request, before they are read below
+add_refresh_button()
 
-# Get all the players and all the years
+# Get all the players and all the years, every player is listed in
+# every year
 all_years = range(2016, 2021)
-all_players = player_stats_df["player_name"].unique()
-
-# Build the full index
-full_index = pd.MultiIndex.from_product(
-    [all_players, all_years],
-    names=["player_name", "year"]
-)  # code generated by gen-AI
-
-# Reindex
-player_stats_df_full = player_stats_df.set_index(
-    ["player_name", "year"]
-).reindex(full_index).reset_index()
-
-# Fill null stats with 0
-count_stats = [
-    "points_per_game",
-    "assists_per_game",
-    "rebounds_per_game",
-    "total_three_pointers"
-]
-percentage_stats = [
-    "field_goal_pct_per_game",
-    "three_point_pct_per_game",
-    "free_throws_pct_per_game"
-]
-
-player_stats_df_full[count_stats] = player_stats_df_full[count_stats].fillna(0)
-player_stats_df_full[percentage_stats] = \
-    player_stats_df_full[percentage_stats].fillna(0)
+all_players = load_options(PLAYERS_FILE_NAME, engine, "player_name")
+
+
+def get_player_stats_by_year(player_name):
+    """
+    Fetch the stats of a single player keyed by (player, year), with a
+    row for every year built by the database. Only the selected player
+    is fetched, and the lookup is cached per player until the data
+    changes, so selecting the player again is a dictionary access.
+
+    Args:
+        player_name (str): Name of the player.
+
+    Returns:
+        dict: The player's stats in each year keyed by (player, year),
+        0 in the years the player did not play.
+    """
+    return load_lookup(
+        BY_PLAYER_FILE_NAME,
+        engine,
+        ["player_name", "year"],
+        {
+            "player_name": player_name,
+            "first_year": all_years[0],
+            "last_year": all_years[-1]
+        }
+    )
+
+
+def get_player_stats(player_name):
+    """
+    Get the stats of a single player as a dense grid with a row for
+    every year, from the player's cached lookup.
+
+    Args:
+        player_name (str): Name of the player.
+
+    Returns:
+        pd.DataFrame: The player's stats in each year, 0 in the years
+        the player did not play.
+    """
+    return pd.DataFrame(list(get_player_stats_by_year(player_name).values()))
+
 
 tab1, tab2, tab3, tab4 = st.tabs([
     "Individual Player Stats",
@@ -66,7 +85,7 @@ tab1, tab2, tab3, tab4 = st.tabs([
     "Top Points per Game"
 ])
 # Get the years
-years = sorted(player_stats_df_full["year"].unique())
+years = list(all_years)
 
 with tab1:
     # Add a dropdown to select year
@@ -76,16 +95,10 @@ with tab1:
         help="Choose a year (stats shown are for the calendar year not season)"
     )
 
-    # Filter players based on selected year
-    players_for_year = player_stats_df_full.loc[
-        player_stats_df_full["year"] == selected_year, "player_name"
-    ].unique()
-
-    # Add a dropdown to select player
-
+    # Add a dropdown to select player, every player is listed in every year
     selected_player = st.selectbox(
         label="Select a :blue[Player]:",
-        options=sorted(players_for_year),
+        options=all_players,
         help=("Choose a player"),
         index=813  # Default is Stephen Curry
     )
@@ -95,54 +108,52 @@ with tab1:
         unsafe_allow_html=True
     )
 
-    # Filter the final DataFrame
-    filtered_player_stats_df = player_stats_df_full[
-        (player_stats_df_full["year"] == selected_year)
-        & (player_stats_df_full["player_name"] == selected_player)
-    ]
+    # Get the selected player's stats over the years
+    filtered_only_player = get_player_stats(selected_player)
 
-    # Filter to get only the player
-    filtered_only_player = player_stats_df_full[
-        player_stats_df_full["player_name"] == selected_player]
+    # Look up the stats of the selected year
+    filtered_player_stats = get_player_stats_by_year(selected_player)[
+        (selected_player, selected_year)
+    ]
 
     # Show player stats as metrics
     column_1, column_2 = st.columns(2)
     with column_1:
         st.metric(
             label=":blue[Points per Game (ppg)]",
-            value=filtered_player_stats_df["points_per_game"],
+            value=filtered_player_stats["points_per_game"],
             border=True,
             help="Average points per game in the year"
         )
         st.metric(
             label=":blue[Rebounds per Game (rpg)]",
-            value=filtered_player_stats_df["rebounds_per_game"],
+            value=filtered_player_stats["rebounds_per_game"],
             border=True,
             help="Average rebounds per game in the year"
         )
         st.metric(
             label=":blue[Assists per Game (apg)]",
-            value=filtered_player_stats_df["assists_per_game"],
+            value=filtered_player_stats["assists_per_game"],
             border=True,
             help="Average assists per game in the year"
         )
     with column_2:
         st.metric(
             label=":blue[Field Goals Percentage per Game (%)]",
-            value=filtered_player_stats_df["field_goal_pct_per_game"],
+            value=filtered_player_stats["field_goal_pct_per_game"],
             border=True,
             help="Field goals percentage per game in the year"
         )
         st.metric(
             label=":blue[Three Pointer Percentage per Game (%)]",
-            value=filtered_player_stats_df["three_point_pct_per_game"],
+            value=filtered_player_stats["three_point_pct_per_game"],
             border=True,
             help="Three pointer percentage per game"
             " in the year"
         )
         st.metric(
             label=":blue[Free Throw Percentage per Game (%)]",
-            value=filtered_player_stats_df["free_throws_pct_per_game"],
+            value=filtered_player_stats["free_throws_pct_per_game"],
             border=True,
             help="Free throw percentage per game in the year"
         )
@@ -217,13 +228,9 @@ with tab2:
             help="Choose a year for Player 1"
         )
 
-        players_for_year_1 = player_stats_df_full.loc[
-            player_stats_df_full["year"] == selected_year_1, "player_name"
-        ].unique()
-
         selected_player_1 = st.selectbox(
             label="Select :blue[Player 1]:",
-            options=sorted(players_for_year_1),
+            options=all_players,
             help="Choose Player 1",
             index=813  # Default: Stephen Curry
         )
@@ -236,26 +243,19 @@ with tab2:
             help="Choose a year for Player 2"
         )
 
-        players_for_year_2 = player_stats_df_full.loc[
-            player_stats_df_full["year"] == selected_year_2, "player_name"
-        ].unique()
-
         selected_player_2 = st.selectbox(
             label="Select :red[Player 2]:",
-            options=sorted(players_for_year_2),
+            options=all_players,
             help="Choose Player 2",
             index=568  # Default: LeBron James
         )
 
-    # Filter stats for each player
-    player1_stats = player_stats_df_full[
-        (player_stats_df_full["year"] == selected_year_1)
-        & (player_stats_df_full["player_name"] == selected_player_1)
+    # Look up the stats of each player
+    player1_stats = get_player_stats_by_year(selected_player_1)[
+        (selected_player_1, selected_year_1)
     ]
-
-    player2_stats = player_stats_df_full[
-        (player_stats_df_full["year"] == selected_year_2)
-        & (player_stats_df_full["player_name"] == selected_player_2)
+    player2_stats = get_player_stats_by_year(selected_player_2)[
+        (selected_player_2, selected_year_2)
     ]
 
     st.markdown("<hr>", unsafe_allow_html=True)
@@ -267,37 +267,37 @@ with tab2:
         st.subheader(f":blue[{selected_player_1}] ({selected_year_1})")
         st.metric(
             label=":blue[Points per Game (ppg)]",
-            value=player1_stats["points_per_game"].values[0],
+            value=player1_stats["points_per_game"],
             help="Average points per game in the year for Player 1",
             border=True
         )
         st.metric(
             label=":blue[Rebounds per Game (rpg)]",
-            value=player1_stats["rebounds_per_game"].values[0],
+            value=player1_stats["rebounds_per_game"],
             help="Average rebounds per game in the year for Player 1",
             border=True
         )
         st.metric(
             label=":blue[Assists per Game (apg)]",
-            value=player1_stats["assists_per_game"].values[0],
+            value=player1_stats["assists_per_game"],
             help="Average assists per game in the year for Player 1",
             border=True
         )
         st.metric(
             label=":blue[Field Goals Percentage per Game (%)]",
-            value=player1_stats["field_goal_pct_per_game"].values[0],
+            value=player1_stats["field_goal_pct_per_game"],
             help="Field goals percentage per game in the year for Player 1",
             border=True
         )
         st.metric(
             label=":blue[Three Pointer Percentage per Game (%)]",
-            value=player1_stats["three_point_pct_per_game"].values[0],
+            value=player1_stats["three_point_pct_per_game"],
             help="Three pointer percentage per game in the year for Player 1",
             border=True
         )
         st.metric(
             label=":blue[Free Throw Percentage per Game (%)]",
-            value=player1_stats["free_throws_pct_per_game"].values[0],
+            value=player1_stats["free_throws_pct_per_game"],
             help="Free throw percentage per game"
             "in the year for Player 1",
             border=True
@@ -307,53 +307,47 @@ with tab2:
         st.subheader(f":red[{selected_player_2}] ({selected_year_2})")
         st.metric(
             label=":red[Points per Game (ppg)]",
-            value=player2_stats["points_per_game"].values[0],
+            value=player2_stats["points_per_game"],
             help="Average points per game in the year for Player 2",
             border=True
         )
         st.metric(
             label=":red[Rebounds per Game (rpg)]",
-            value=player2_stats["rebounds_per_game"].values[0],
+            value=player2_stats["rebounds_per_game"],
             help="Average rebounds per game in the year for Player 2",
             border=True
         )
         st.metric(
             label=":red[Assists per Game (apg)]",
-            value=player2_stats["assists_per_game"].values[0],
+            value=player2_stats["assists_per_game"],
             help="Average assists per game in the year for Player 2",
             border=True
         )
         st.metric(
             label=":red[Field Goals Percentage per Game (%)]",
-            value=player2_stats["field_goal_pct_per_game"].values[0],
+            value=player2_stats["field_goal_pct_per_game"],
             help="Field goals percentage per game in the year for Player 2",
             border=True
         )
         st.metric(
             label=":red[Three Pointer Percentage per Game (%)]",
-            value=player2_stats["three_point_pct_per_game"].values[0],
+            value=player2_stats["three_point_pct_per_game"],
             help="Three pointer percentage per game in the year for Player 2",
             border=True
         )
         st.metric(
             label=":red[Free Throw per Game (%)]",
-            value=player2_stats["free_throws_pct_per_game"].values[0],
+            value=player2_stats["free_throws_pct_per_game"],
             help="Free throw percentage per game"
             "in the year for Player 2",
             border=True
         )
 with tab3:
-    # Top three point shooters across all years
-    top_three_pointers_df = (
-        player_stats_df
-        .groupby("player_name", as_index=False)["total_three_pointers"]
-        .sum()
-        .sort_values(by="total_three_pointers", ascending=False)
+    # Top 10 three point shooters across all years, ranked by the database
+    top_three_pointers_df = load_table(
+        TOP_THREE_POINTERS_FILE_NAME, engine, {"limit": TOP_N}
     )
 
-    # Take the first 10 players
-    top_three_pointers_df = top_three_pointers_df.head(10)
-
     # Plot the bar chart
     bar_chart = px.bar(
         top_three_pointers_df,
@@ -374,17 +368,11 @@ with tab3:
     # Plot the bar graph
     st.plotly_chart(bar_chart, use_container_width=True)
 with tab4:
-    # Most point scorers
-    top_points_per_game_df = (
-        player_stats_df
-        .groupby("player_name", as_index=False)["points_per_game"]
-        .mean()
-        .sort_values(by="points_per_game", ascending=False)
+    # Top 10 point scorers, ranked by the database
+    top_points_per_game_df = load_table(
+        TOP_POINTS_PER_GAME_FILE_NAME, engine, {"limit": TOP_N}
     )
 
-    # Take the first 10
-    top_points_per_game_df = top_points_per_game_df.head(10)
-
     # Plot the bar chart
     bar_chart_2 = px.bar(
         top_points_per_game_df,
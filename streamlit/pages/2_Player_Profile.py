@@ -1,9 +1,16 @@
 import streamlit as st
-from sqlalchemy import create_engine
-from utils.load_sql_query_utils import load_table
+from utils.database_utils import get_engine
+from utils.load_sql_query_utils import (
+    add_refresh_button,
+    load_lookup,
+    load_options
+)
 
 
-FILE_NAME = "player_info_and_salaries.sql"
+PLAYERS_FILE_NAME = "player_info_players.sql"
+BY_PLAYER_FILE_NAME = "player_info_by_player.sql"
+# Player selected when the page opens
+DEFAULT_PLAYER = "Stephen Curry"
 # Set the page title and layout size
 st.set_page_config(
     page_title="Player Profile",
@@ -14,36 +21,27 @@ st.set_page_config(
 st.title(":blue[Player Profile] 👤")
 
 
-# Load database credentials from secrets.toml
-db_config = st.secrets["database"]
-
-engine = create_engine(
-    f"postgresql+psycopg2://{db_config['SOURCE_DB_USER']}:"
-    f"{db_config['SOURCE_DB_PASSWORD']}@"
-    f"{db_config['SOURCE_DB_HOST']}:"
-    f"{db_config['SOURCE_DB_PORT']}/{db_config['SOURCE_DB_NAME']}"
-)
+# The engine and its connection pool are shared by every rerun and page
+engine = get_engine()
 
-player_info_df = load_table(FILE_NAME, engine)
+# Drop the cached tables on request, before they are read below
+add_refresh_button()
 
-# Keep the most recent information for each player
-player_info_df = player_info_df.drop_duplicates(
-    subset="player_name",
-    keep="last"
-)
+players = load_options(PLAYERS_FILE_NAME, engine, "player_name")
 
 # Select player
 player = st.selectbox(
     "Select a :blue[Player]:",
-    player_info_df["player_name"],
+    players,
     help="Choose the player",
-    index=193  # Stephen Curry
+    index=players.index(DEFAULT_PLAYER) if DEFAULT_PLAYER in players else 0
 )
 
-# Filter the DataFrame for each player
-player_info = player_info_df[
-    player_info_df["player_name"] == player
-    ].iloc[0]
+# Fetch only the most recent information of the player, keyed by name
+# and cached per player until the data changes
+player_info = load_lookup(
+    BY_PLAYER_FILE_NAME, engine, "player_name", {"player_name": player}
+)[player]
 
 # Display the players' info
 st.markdown(
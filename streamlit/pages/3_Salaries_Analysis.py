@@ -1,9 +1,9 @@
 import streamlit as st
-from sqlalchemy import create_engine
 import plotly.express as px
-from utils.load_sql_query_utils import load_table
+from utils.database_utils import get_engine
+from utils.load_sql_query_utils import add_refresh_button, load_table
 
-FILE_NAME = "player_info_and_salaries.sql"
+FILE_NAME = "latest_player_salaries.sql"
 # Set the page title and layout size
 st.set_page_config(
     page_title="Salaries Analysis",
@@ -12,23 +12,14 @@ st.set_page_config(
 
 st.title(":blue[Salaries Analysis] 💸💸")
 
-# Load the database credentials from secrets.toml
-db_config = st.secrets["database"]
+# The engine and its connection pool are shared by every rerun and page
+engine = get_engine()
 
-engine = create_engine(
-    f"postgresql+psycopg2://{db_config['SOURCE_DB_USER']}:"
-    f"{db_config['SOURCE_DB_PASSWORD']}@"
-    f"{db_config['SOURCE_DB_HOST']}:"
-    f"{db_config['SOURCE_DB_PORT']}/{db_config['SOURCE_DB_NAME']}"
-)
-
-player_salaries_df = load_table(FILE_NAME, engine)
+# Drop the cached tables on request, before they are read below
+add_refresh_button()
 
-# Keep the most recent information for each player
-player_recent_salaries_df = player_salaries_df.drop_duplicates(
-    subset="player_name",
-    keep="last"
-)
+# Only fetch the most recent salary of each player
+player_recent_salaries_df = load_table(FILE_NAME, engine)
 
 # Remove the commas from the salary string then convert to int
 player_recent_salaries_df.loc[:, "salary"] = \
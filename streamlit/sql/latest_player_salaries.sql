@@ -0,0 +1,12 @@
+-- The most recent salary of each player
+SELECT DISTINCT ON (player_name)
+    player_name,
+    position,
+    weight_kg,
+    height_m,
+    salary
+FROM
+    de_2506_a.aa_player_info_and_salaries
+ORDER BY
+    player_name,
+    season_start_year DESC;
@@ -0,0 +1,8 @@
+SELECT
+    table_name,
+    version,
+    loaded_at
+FROM
+    de_2506_a.aa_load_versions
+ORDER BY
+    table_name;
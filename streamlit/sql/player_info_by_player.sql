@@ -0,0 +1,16 @@
+-- The most recent information of the player
+SELECT
+    season_start_year,
+    player_name,
+    position,
+    birth_date,
+    weight_kg,
+    height_m,
+    salary
+FROM
+    de_2506_a.aa_player_info_and_salaries
+WHERE
+    player_name = :player_name
+ORDER BY
+    season_start_year DESC
+LIMIT 1;
@@ -0,0 +1,20 @@
+-- One row per year for the player, with 0 for the stats of the years
+-- the player did not play
+SELECT
+    CAST(:player_name AS TEXT) AS player_name,
+    years.year,
+    COALESCE(stats.points_per_game, 0) AS points_per_game,
+    COALESCE(stats.assists_per_game, 0) AS assists_per_game,
+    COALESCE(stats.rebounds_per_game, 0) AS rebounds_per_game,
+    COALESCE(stats.field_goal_pct_per_game, 0) AS field_goal_pct_per_game,
+    COALESCE(stats.three_point_pct_per_game, 0) AS three_point_pct_per_game,
+    COALESCE(stats.free_throws_pct_per_game, 0) AS free_throws_pct_per_game,
+    COALESCE(stats.total_three_pointers, 0) AS total_three_pointers
+FROM
+    generate_series(:first_year, :last_year) AS years(year)
+LEFT JOIN
+    de_2506_a.aa_player_stats AS stats
+    ON stats.year = years.year
+    AND stats.player_name = :player_name
+ORDER BY
+    years.year;
@@ -0,0 +1,4 @@
+SELECT DISTINCT
+    player_name
+FROM
+    de_2506_a.aa_player_stats;
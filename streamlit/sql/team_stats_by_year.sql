@@ -6,4 +6,6 @@ SELECT
     total_losses,
     win_pct
 FROM
-    de_2506_a.aa_team_stats;
+    de_2506_a.aa_team_stats
+WHERE
+    year = :year;
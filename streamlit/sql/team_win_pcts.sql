@@ -0,0 +1,6 @@
+SELECT
+    year,
+    team_name,
+    win_pct
+FROM
+    de_2506_a.aa_team_stats;
@@ -0,0 +1,11 @@
+SELECT
+    player_name,
+    AVG(points_per_game) AS points_per_game
+FROM
+    de_2506_a.aa_player_stats
+GROUP BY
+    player_name
+ORDER BY
+    points_per_game DESC,
+    player_name
+LIMIT :limit;
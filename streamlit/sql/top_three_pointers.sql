@@ -0,0 +1,11 @@
+SELECT
+    player_name,
+    SUM(total_three_pointers) AS total_three_pointers
+FROM
+    de_2506_a.aa_player_stats
+GROUP BY
+    player_name
+ORDER BY
+    total_three_pointers DESC,
+    player_name
+LIMIT :limit;
@@ -0,0 +1,51 @@
+import streamlit as st
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+
+
+# Connection pool settings, overridable in the [database] section of
+# secrets.toml. Every session of the app shares the one pool.
+POOL_DEFAULTS = {
+    "POOL_SIZE": 5,
+    "POOL_MAX_OVERFLOW": 5,
+    "POOL_RECYCLE_SECONDS": 1800,
+    "POOL_TIMEOUT_SECONDS": 30,
+}
+
+
+# Cache the engine so it is built once per server process instead of on
+# every rerun of every page
+@st.cache_resource(show_spinner=False)
+def get_engine() -> Engine:
+    """
+    Build the SQLAlchemy engine of the source database from the
+    credentials in secrets.toml, with a connection pool shared by every
+    page and user session.
+
+    Connections are checked with a ping before use, so connections the
+    database dropped while the app was idle are replaced transparently.
+
+    Returns:
+        sqlalchemy.engine.Engine: The shared database engine.
+
+    Raises:
+        KeyError: If a database credential is missing from secrets.toml.
+    """
+    # Load database credentials from secrets.toml
+    db_config = st.secrets["database"]
+    pool_config = {
+        key: int(db_config.get(key, default))
+        for key, default in POOL_DEFAULTS.items()
+    }
+
+    return create_engine(
+        f"postgresql+psycopg2://{db_config['SOURCE_DB_USER']}:"
+        f"{db_config['SOURCE_DB_PASSWORD']}@"
+        f"{db_config['SOURCE_DB_HOST']}:"
+        f"{db_config['SOURCE_DB_PORT']}/{db_config['SOURCE_DB_NAME']}",
+        pool_size=pool_config["POOL_SIZE"],
+        max_overflow=pool_config["POOL_MAX_OVERFLOW"],
+        pool_recycle=pool_config["POOL_RECYCLE_SECONDS"],
+        pool_timeout=pool_config["POOL_TIMEOUT_SECONDS"],
+        pool_pre_ping=True,
+    )
@@ -1,30 +1,306 @@
 import streamlit as st
 import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 from utils.sql_utils import load_sql_query
 
 
-# Cache the function so it doesn't rerun every time the streamlit app reloads
-@st.cache_data(show_spinner=False)
-def load_table(filename, _engine):
+# Cache settings, overridable in the [cache] section of secrets.toml
+# - VERSION_CHECK_SECONDS: how long the load versions written by the ETL
+#   are trusted before they are read again
+# - TABLE_TTL_SECONDS: how long a table is kept even if its version
+#   cannot be read, e.g. before the ETL has written one
+# - MAX_CACHED_QUERIES: most query results kept, one per file and set
+#   of parameters
+CACHE_DEFAULTS = {
+    "VERSION_CHECK_SECONDS": 60,
+    "TABLE_TTL_SECONDS": 3600,
+    "MAX_CACHED_QUERIES": 1000,
+}
+
+VERSIONS_FILE_NAME = "load_versions.sql"
+
+
+def get_cache_setting(key):
+    """
+    Read a cache setting from secrets.toml, falling back to its default
+    when the [cache] section or the setting is missing.
+
+    Args:
+        key (str): Name of the setting in CACHE_DEFAULTS.
+
+    Returns:
+        int: The setting's value.
+    """
+    try:
+        return int(st.secrets["cache"][key])
+    except KeyError:
+        return CACHE_DEFAULTS[key]
+
+
+# Cache the versions briefly, so checking them costs one small query per
+# interval instead of one per rerun
+@st.cache_data(
+    show_spinner=False,
+    ttl=get_cache_setting("VERSION_CHECK_SECONDS")
+)
+def get_data_version(_engine):
+    """
+    Read the load versions the ETL bumps every time it loads a table.
+
+    Args:
+        _engine (sqlalchemy.engine.Engine): Database engine/connection
+        used to execute the query.
+
+    Returns:
+        str | None: The versions of every loaded table, which change
+        whenever any table is reloaded, or None when they cannot be read.
+    """
+    try:
+        versions = pd.read_sql(
+            text(load_sql_query(VERSIONS_FILE_NAME)), _engine
+        )
+    except SQLAlchemyError:
+        # The ETL has not written any versions yet, so only the TTL of the
+        # cached tables applies
+        return None
+    return ",".join(
+        f"{row.table_name}:{row.version}:{row.loaded_at}"
+        for row in versions.itertuples()
+    )
+
+
+# Cache the tables per data version and set of parameters, so a new load
+# is picked up on the next version check and the TTL covers databases
+# without versions
+@st.cache_data(
+    show_spinner=False,
+    ttl=get_cache_setting("TABLE_TTL_SECONDS"),
+    max_entries=get_cache_setting("MAX_CACHED_QUERIES")
+)
+def fetch_table(filename, data_version, _engine, params=None):
     """
     Load a SQL query from a file and execute it against a database engine.
-    The results are cached by Streamlit to avoid re-running the query
-    unnecessarily across app reruns.
 
     Args:
         filename (str): Path to the `.sql` file containing the query.
+        data_version (str | None): Version of the data the result is
+        cached under.
         _engine (sqlalchemy.engine.Engine): Database engine/connection
         used to execute the query.
+        params (dict | None): Values bound to the `:name` placeholders
+        of the query.
 
     Returns:
         pd.DataFrame: DataFrame containing the query results.
 
     Raises:
         Exception: If there is an error while loading the query file
-        or executing the SQL query.
+        or executing the SQL query. Nothing is cached then, so the query
+        runs again on the next rerun.
+    """
+    query = load_sql_query(filename)
+    return pd.read_sql(text(query), _engine, params=params)
+
+
+def stop_on_error(error):
+    """
+    Show why the data could not be fetched and stop the current run, as
+    the page cannot be drawn without it.
+
+    Args:
+        error (Exception): Error raised while fetching the data.
+    """
+    st.error(f"Error fetching data: {error}")
+    st.stop()
+
+
+def load_table(filename, _engine, params=None):
+    """
+    Load the results of a SQL query file, cached by Streamlit to avoid
+    re-running the query across app reruns. Queries taking parameters
+    are cached once per set of parameters, so each selection only
+    fetches the rows it shows.
+
+    The cache is refreshed once the ETL loads new data, when its TTL
+    expires, or from the refresh button. If the query fails, the error
+    is shown and the run stops.
+
+    Args:
+        filename (str): Path to the `.sql` file containing the query.
+        _engine (sqlalchemy.engine.Engine): Database engine/connection
+        used to execute the query.
+        params (dict | None): Values bound to the `:name` placeholders
+        of the query, e.g. {"year": 2018}.
+
+    Returns:
+        pd.DataFrame: DataFrame containing the query results.
+    """
+    try:
+        return fetch_table(
+            filename,
+            get_data_version(_engine),
+            _engine,
+            get_bound_params(params)
+        )
+    except Exception as e:
+        stop_on_error(e)
+
+
+# Cache the derived structures alongside the tables they are built from,
+# so they are only rebuilt when the data or the parameters change
+@st.cache_data(
+    show_spinner=False,
+    ttl=get_cache_setting("TABLE_TTL_SECONDS"),
+    max_entries=get_cache_setting("MAX_CACHED_QUERIES")
+)
+def build_lookup(filename, data_version, _engine, key, params=None):
+    """
+    Index the rows of a query result by a column.
+
+    Args:
+        filename (str): Path to the `.sql` file containing the query.
+        data_version (str | None): Version of the data the result is
+        cached under.
+        _engine (sqlalchemy.engine.Engine): Database engine/connection
+        used to execute the query.
+        key (str | list): Column whose values identify a row, or list
+        of columns whose tuples of values do.
+        params (dict | None): Values bound to the `:name` placeholders
+        of the query.
+
+    Returns:
+        dict: Each row as a dictionary keyed by its value of the key
+        column(s), in the sorted order of the keys.
+
+    Raises:
+        Exception: If the query fails, see `fetch_table`. Nothing is
+        cached then.
+    """
+    table = fetch_table(filename, data_version, _engine, params)
+    return table.sort_values(key).set_index(key, drop=False).to_dict(
+        "index"
+    )
+
+
+@st.cache_data(
+    show_spinner=False,
+    ttl=get_cache_setting("TABLE_TTL_SECONDS"),
+    max_entries=get_cache_setting("MAX_CACHED_QUERIES")
+)
+def build_options(filename, data_version, _engine, column, params=None):
+    """
+    List the distinct values of a column of a query result.
+
+    Args:
+        filename (str): Path to the `.sql` file containing the query.
+        data_version (str | None): Version of the data the result is
+        cached under.
+        _engine (sqlalchemy.engine.Engine): Database engine/connection
+        used to execute the query.
+        column (str): Column to list the values of.
+        params (dict | None): Values bound to the `:name` placeholders
+        of the query.
+
+    Returns:
+        list: The sorted distinct values of the column.
+
+    Raises:
+        Exception: If the query fails, see `fetch_table`. Nothing is
+        cached then.
+    """
+    table = fetch_table(filename, data_version, _engine, params)
+    return sorted(table[column].unique().tolist())
+
+
+def get_bound_params(params):
+    """
+    Convert the values of query parameters to types the database driver
+    can bind; selections of DataFrame values are NumPy scalars.
+
+    Args:
+        params (dict | None): Values of the `:name` placeholders.
+
+    Returns:
+        dict | None: The values as Python scalars.
+    """
+    if params is None:
+        return None
+    return {
+        name: value.item() if hasattr(value, "item") else value
+        for name, value in params.items()
+    }
+
+
+def load_lookup(filename, _engine, key, params=None):
+    """
+    Load the rows of a SQL query file indexed by a column, so a
+    selection is a dictionary access instead of a scan of the rows.
+    Built once per data version and set of parameters. If the query
+    fails, the error is shown and the run stops.
+
+    Args:
+        filename (str): Path to the `.sql` file containing the query.
+        _engine (sqlalchemy.engine.Engine): Database engine/connection
+        used to execute the query.
+        key (str | list): Column whose values identify a row, or list
+        of columns whose tuples of values do.
+        params (dict | None): Values bound to the `:name` placeholders
+        of the query.
+
+    Returns:
+        dict: Each row as a dictionary keyed by its value of the key
+        column(s), in the sorted order of the keys.
+    """
+    try:
+        return build_lookup(
+            filename,
+            get_data_version(_engine),
+            _engine,
+            key,
+            get_bound_params(params)
+        )
+    except Exception as e:
+        stop_on_error(e)
+
+
+def load_options(filename, _engine, column, params=None):
+    """
+    Load the options of a dropdown: the sorted distinct values of a
+    column of a SQL query file, built once per data version and set of
+    parameters. If the query fails, the error is shown and the run
+    stops.
+
+    Args:
+        filename (str): Path to the `.sql` file containing the query.
+        _engine (sqlalchemy.engine.Engine): Database engine/connection
+        used to execute the query.
+        column (str): Column to list the values of.
+        params (dict | None): Values bound to the `:name` placeholders
+        of the query.
+
+    Returns:
+        list: The sorted distinct values of the column.
     """
     try:
-        query = load_sql_query(filename)
-        return pd.read_sql(query, _engine)
+        return build_options(
+            filename,
+            get_data_version(_engine),
+            _engine,
+            column,
+            get_bound_params(params)
+        )
     except Exception as e:
-        st.error(f"Error fetching data: {e}")
+        stop_on_error(e)
+
+
+def add_refresh_button():
+    """
+    Add a button to the sidebar that drops every cached table, so the
+    next queries read the database again.
+    """
+    if st.sidebar.button(
+        "Refresh data",
+        help="Reload the data from the database"
+    ):
+        st.cache_data.clear()